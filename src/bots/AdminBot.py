@@ -2,7 +2,7 @@ import time
 import warnings
 
 from core.BotBase import BotBase
-from core.parser.Post import Post
+from core.parser.PostBase import PostBase
 
 from api.Cmd import Cmd
 from api.CommandProcessor import CommandProcessor
@@ -24,7 +24,7 @@ class AdminBot(BotBase):
         pass
 
 
-    def process_data(self, forum_data: Post) -> dict:
+    def process_data(self, forum_data: PostBase) -> dict:
         return {}
 
 
@@ -205,3 +205,106 @@ class AdminBot(BotBase):
 
             bot.enable()
             return Cmd.ok('Bot enabled')
+
+
+        @Cmd.help(
+        perm = Cmd.PERMISSION_ADMIN,
+        info = 'Shows the current osu!web request rate and how much of it each subsystem is using',
+        args = {
+        })
+        def cmd_get_rate_stats(self) -> dict:
+            from core.RateLimiter import RateLimiter
+
+            stats = RateLimiter.get_stats()
+            text  = [ f'Rate: {stats["rate"]:.2f} req/s   Tokens: {stats["tokens"]:.2f}' ]
+            for name, counters in stats['classes'].items():
+                text.append(
+                    f'{name:>8}: {counters["requests"]} requests   '
+                    f'{counters["rate_limited"]} rate limited   '
+                    f'{counters["wait_time"]:.1f}s waited'
+                )
+
+            return Cmd.ok('\n'.join(text))
+
+
+        @Cmd.help(
+        perm = Cmd.PERMISSION_ADMIN,
+        info = 'Shows how often cached osu!web pages did not have to be downloaded again',
+        args = {
+        })
+        def cmd_get_cache_stats(self) -> dict:
+            from core.SessionMgrV2 import SessionMgrV2
+
+            stats = SessionMgrV2.get_cache_stats()
+            return Cmd.ok(
+                f'Pages: {stats["entries"]}   Size: {stats["bytes"]/1024:.1f} KiB\n'
+                f'Hits: {stats["hits"]}   Misses: {stats["misses"]}   Saved: {stats["bytes_saved"]/1024:.1f} KiB'
+            )
+
+
+        @Cmd.help(
+        perm = Cmd.PERMISSION_ADMIN,
+        info = 'Shows how many posts are waiting for each bot, how long they waited, and how many were dropped or spilled to disk',
+        args = {
+            'bot_name' : Cmd.arg(str, True, 'Bot name; all bots if not given')
+        })
+        def cmd_get_queue_stats(self, bot_name: str | None = None) -> dict:
+            from core.ForumMonitor import ForumMonitor
+
+            try: bots: BotBase | list[BotBase] = ForumMonitor.get_bot(bot_name)
+            except KeyError:
+                return Cmd.err('No such bot')
+
+            if not isinstance(bots, list):
+                bots = [ bots ]
+
+            text = []
+            for bot in bots:
+                stats    = bot.get_queue_stats()
+                maxsize  = 'unbounded' if stats['maxsize'] == 0 else f'{stats["maxsize"]} {stats["policy"]}'
+                wait_avg = 'n/a' if stats['wait_avg'] is None else f'{stats["wait_avg"]:.2f}s'
+
+                text.append(
+                    f'{bot.name} ({maxsize})   Waiting: {stats["depth"]} ({stats["spilled"]} spilled)   Most waiting: {stats["depth_max"]}\n'
+                    f'    Posts: {stats["posts"]}   Dropped: {stats["dropped"]}   Spilled: {stats["spills"]}   Blocked: {stats["blocked_time"]:.1f}s\n'
+                    f'    Wait avg: {wait_avg}   Wait max: {stats["wait_max"]:.2f}s'
+                )
+
+            return Cmd.ok('\n'.join(text))
+
+
+        @Cmd.help(
+        perm = Cmd.PERMISSION_ADMIN,
+        info = 'Shows how many scoreboard post edits were made and how many were skipped for being replaced or unchanged',
+        args = {
+        })
+        def cmd_get_edit_stats(self) -> dict:
+            from core.PostEditor import PostEditor
+
+            stats = PostEditor.get_stats()
+            return Cmd.ok(
+                f'Submitted: {stats["submitted"]}   Edits made: {stats["edits"]}   Failed: {stats["failed"]}   Pending: {stats["pending"]}\n'
+                f'Skipped: {stats["coalesced"]} replaced by a later edit   {stats["unchanged"]} unchanged'
+            )
+
+
+        @Cmd.help(
+        perm = Cmd.PERMISSION_ADMIN,
+        info = 'Shows how many post fetches and bytes the forum monitor uses per post found, how long it expects between posts, and how many posts it parsed',
+        args = {
+        })
+        def cmd_get_probe_stats(self) -> dict:
+            from core.ForumMonitor import ForumMonitor
+
+            stats = ForumMonitor.get_probe_stats()
+
+            probes_per_post    = 'n/a' if stats['probes_per_post']    is None else f'{stats["probes_per_post"]:.2f}'
+            bytes_per_post     = 'n/a' if stats['bytes_per_post']     is None else f'{stats["bytes_per_post"]/1024:.1f} KiB'
+            predicted_interval = 'n/a' if stats['predicted_interval'] is None else f'{stats["predicted_interval"]:.1f}s'
+
+            return Cmd.ok(
+                f'Probes: {stats["probes"]}   Posts found: {stats["posts"]}   Probes per post: {probes_per_post}\n'
+                f'Downloaded: {stats["bytes"]/1024:.1f} KiB   Per post: {bytes_per_post}\n'
+                f'Expected time between posts: {predicted_interval}   Idle delay: {stats["idle_delay"]:.1f}s\n'
+                f'Posts parsed: {stats["parsed"]}   Skipped unparsed: {stats["parses_skipped"]}'
+            )
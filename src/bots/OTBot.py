@@ -3,13 +3,16 @@ from core.BotBase import BotBase
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from core.parser.Post import Post
+    from core.parser.PostBase import PostBase
 
 from api.Cmd import Cmd
 
 
 class OTBot(BotBase):
 
+    # Off-Topic
+    subforum_ids = frozenset({ 52 })
+
     def __init__(self):
         BotBase.__init__(self, OTBot.BotCmd, self.__class__.__name__, enable = True)
 
@@ -18,11 +21,7 @@ class OTBot(BotBase):
         pass
 
 
-    def filter_data(self, post: "Post"):
-        return int(post.topic.subforum_id) == 52
-
-
-    def process_data(self, post: "Post"):
+    def process_data(self, post: "PostBase"):
         self.logger.debug(f'Found OT post by: {post.creator.name} in thread: {post.topic.name}')
 
         data = {}
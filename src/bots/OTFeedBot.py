@@ -1,12 +1,15 @@
 from core.BotBase import BotBase
 from core.DiscordClient import DiscordClient
-from core.parser.Post import Post
+from core.parser.PostBase import PostBase
 
 from api.Cmd import Cmd
 
 
 class OTFeedBot(BotBase):
 
+    # Off-Topic
+    subforum_ids = frozenset({ 52 })
+
     def __init__(self):
         BotBase.__init__(self, self.BotCmd, self.__class__.__name__, enable = True)
 
@@ -15,11 +18,7 @@ class OTFeedBot(BotBase):
         pass
 
 
-    def filter_data(self, post: Post):
-        return int(post.topic.subforum_id) == 52
-
-
-    def process_data(self, post: Post):
+    def process_data(self, post: PostBase):
         self.logger.debug(f'New post: https://osu.ppy.sh/forum/p/{post.id}')
 
         # Get previous post's timestamp
@@ -1,5 +1,5 @@
 from core.BotBase import BotBase
-from core.parser.Post import Post
+from core.parser.PostBase import PostBase
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -24,7 +24,7 @@ class TestBot(BotBase):
 
 
     # In here goes all the code for reading comment json
-    def process_data(self, forum_data: Post):
+    def process_data(self, forum_data: PostBase):
         self.logger.debug('Bot process_data')
         return {}
 
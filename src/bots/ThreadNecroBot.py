@@ -1,8 +1,11 @@
 import math
 import random
+import calendar
 import datetime
 import logging
 
+from typing import Callable
+
 from dateutil.parser import parse
 from dateutil.relativedelta import relativedelta
 
@@ -13,17 +16,28 @@ from core.BotConfig import BotConfig
 from core.BotBase import BotBase
 from core.BotException import BotException
 from core.SessionMgrV2 import SessionMgrV2
-from core.parser.Post import Post
+from core.PostEditor import PostEditor
+from core.parser.PostBase import PostBase
 
 from api.Cmd import Cmd
 
-from .ThreadNecroBotCore.ThreadNecroBotCore import ThreadNecroBotCore
+from .ThreadNecroBotCore.ThreadNecroBotCoreBase import ThreadNecroBotCoreBase
+
 
+class ThreadNecroBot(BotBase):
 
-class ThreadNecroBot(BotBase, ThreadNecroBotCore):
+    # Constants of the database, so they need not be looked up through `core`
+    DB_TYPE_MONTHLY = ThreadNecroBotCoreBase.DB_TYPE_MONTHLY
+    DB_TYPE_ALLTIME = ThreadNecroBotCoreBase.DB_TYPE_ALLTIME
+    EPOCH_FORMAT    = ThreadNecroBotCoreBase.EPOCH_FORMAT
+    EPOCH_LEGACY    = ThreadNecroBotCoreBase.EPOCH_LEGACY
 
     __MULTI_POST_PTS_PENALTY = -100
 
+    # Scoring curve; see `calculate_score_gained_curr_user`
+    __PTS_EXP = math.log(2000.0/60.0)/math.log(24)
+    __PTS_MUL = 60.0/math.pow(60.0, __PTS_EXP)
+
     __SUBFORUM_ID = 68
 
     __MAX_ENTRIES_LOGS              = 10
@@ -37,24 +51,45 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
 
         self.topic_id        = BotConfig['ThreadNecroBot']['topic_id_dbg'] if is_dbg else BotConfig['ThreadNecroBot']['topic_id']
         self.main_post_id    = BotConfig['ThreadNecroBot']['post_id_dbg']  if is_dbg else BotConfig['ThreadNecroBot']['post_id']
-        self.main_post: Post = SessionMgrV2.get_post(self.main_post_id)
+        self.main_post: PostBase = SessionMgrV2.get_post(self.main_post_id)
+
+        self.subforum_ids = frozenset({ self.__SUBFORUM_ID })
+        self.topic_ids    = frozenset() if self.topic_id is None else frozenset({ int(self.topic_id) })
 
         self.banned = set()    # \TODO: this needs to go into db
 
+        # ( data, db type ) -> ( data version, section text ); see `write_post`
+        self.__render_cache: dict[tuple[str, int | None], tuple[int, str]] = {}
+        self.__posted_sections: tuple[str, ...] | None = None
+
 
     def post_init(self):
         is_dbg  = BotConfig['Core']['is_dbg']
         db_path = BotConfig['Core']['db_path_dbg'] if is_dbg else BotConfig['Core']['db_path']
-        ThreadNecroBotCore.__init__(self, db_path)
+        fsync   = bool(BotConfig['Core'].get('db_fsync', False))
+
+        # Data versions start over with the databases
+        self.__render_cache.clear()
+        self.__posted_sections = None
+
+        # `db_backend` picks the storage core; see `ThreadNecroBotCoreBase.create`
+        self.core = ThreadNecroBotCoreBase.create(
+            BotConfig['ThreadNecroBot'].get('db_backend', ThreadNecroBotCoreBase.BACKEND_TINYDB), db_path,
+            flush_delay  = float(BotConfig['Core'].get('db_flush_delay', 1.0)),
+            fsync        = fsync,
+            log_capacity = int(BotConfig['ThreadNecroBot'].get('log_capacity', 4096)),
+        )
 
 
-    def filter_data(self, post: Post) -> bool:
-        if post.topic.subforum_id != self.__SUBFORUM_ID:
-            return False
+    def stop(self):
+        BotBase.stop(self)
 
-        if post.topic.id != self.topic_id:
-            return False
+        # Don't leave the last scoreboard edit waiting on the edit interval
+        PostEditor.flush(self.main_post_id)
+        self.core.close_db()
 
+
+    def filter_data(self, post: PostBase) -> bool:
         if post.creator.id in self.banned:
             self.logger.info(f'Banned user posted; id: {post.creator.id}   username: {post.creator.name}')
             return False
@@ -62,7 +97,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         return True
 
 
-    def process_data(self, post: Post):
+    def process_data(self, post: PostBase):
         if not post.prev_post:
             msg = f'Previous post does not exist; Current post id: {post.id}'
             raise BotException(msg, show_traceback=False)
@@ -81,27 +116,54 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
             'prev_user_name' : post.prev_post.creator.name
         }
 
-        self.process_monthly_winner_event(data)
+        self.process_post_data(data)
+        self.write_post()
 
-        # Prev user must be processes before current user
-        # Also prev user processing won't work unless it's the same thread
-        self.process_prev_user(data)
-        self.process_curr_user(data)
-        #self.process_user_bonus(data)
 
-        self.write_post()
+    def process_post_data(self, data: dict):
+        """
+        Scores a necro post. Everything the post changes is written out together, or not at all if
+        processing fails part way.
+
+        fmt `data`:
+            {
+                'curr_post_id'   : int,
+                'prev_post_id'   : int,
+                'curr_post_time' : datetime,
+                'prev_post_time' : datetime,
+                'curr_user_id'   : int,
+                'prev_user_id'   : int,
+                'curr_user_name' : str,
+                'prev_user_name' : str
+            }
+        """
+        with self.core.transaction():
+            self.process_monthly_winner_event(data)
+
+            # Prev user must be processes before current user
+            # Also prev user processing won't work unless it's the same thread
+            self.process_prev_user(data)
+            self.process_curr_user(data)
+            #self.process_user_bonus(data)
 
 
     def write_post(self):
-        top_10_all_time_text     = self.get_top_10_text(self.DB_TYPE_ALLTIME)
-        top_scores_all_time_text = self.get_top_scores_text(self.DB_TYPE_ALLTIME)
-        log_all_time_text        = self.get_forum_log_text(self.DB_TYPE_ALLTIME)
+        # Sections are only rendered again if the data they show was written to since
+        sections = (
+            self.__render_section(ThreadNecroBotCoreBase.DATA_USERS,   self.DB_TYPE_ALLTIME, lambda: self.get_top_10_text(self.DB_TYPE_ALLTIME)),
+            self.__render_section(ThreadNecroBotCoreBase.DATA_SCORES,  self.DB_TYPE_ALLTIME, lambda: self.get_top_scores_text(self.DB_TYPE_ALLTIME)),
+            self.__render_section(ThreadNecroBotCoreBase.DATA_LOG,     self.DB_TYPE_ALLTIME, lambda: self.get_forum_log_text(self.DB_TYPE_ALLTIME)),
 
-        top_10_monthly_text      = self.get_top_10_text(self.DB_TYPE_MONTHLY)
-        top_scores_monthly_text  = self.get_top_scores_text(self.DB_TYPE_MONTHLY)
-        log_monthly_text         = self.get_forum_log_text(self.DB_TYPE_MONTHLY)
+            self.__render_section(ThreadNecroBotCoreBase.DATA_USERS,   self.DB_TYPE_MONTHLY, lambda: self.get_top_10_text(self.DB_TYPE_MONTHLY)),
+            self.__render_section(ThreadNecroBotCoreBase.DATA_SCORES,  self.DB_TYPE_MONTHLY, lambda: self.get_top_scores_text(self.DB_TYPE_MONTHLY)),
+            self.__render_section(ThreadNecroBotCoreBase.DATA_LOG,     self.DB_TYPE_MONTHLY, lambda: self.get_forum_log_text(self.DB_TYPE_MONTHLY)),
 
-        monthly_winners_text     = self.get_monthly_winners_text()
+            self.__render_section(ThreadNecroBotCoreBase.DATA_WINNERS, None,                 lambda: self.get_monthly_winners_text()),
+        )
+
+        # The post already shows all of it
+        if sections == self.__posted_sections:
+            return
 
         # \TODO: Investigate the total score mismatching for same user
         # For the user [Taiga] the score went down by some amount from before to after when the score is only added
@@ -143,16 +205,40 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
             '[code]{6}[/code][/notice]'
         )
 
-        post_content = post_format.format(
-            top_10_all_time_text,
-            top_scores_all_time_text,
-            log_all_time_text,
-            top_10_monthly_text,
-            top_scores_monthly_text,
-            log_monthly_text,
-            monthly_winners_text
-        )
-        SessionMgrV2.edit_post(self.main_post_id, post_content, append=False)
+        # A new month winner means the month rolled over; that goes up right away instead of waiting out the edit interval
+        rollover = self.__posted_sections is not None and sections[6] != self.__posted_sections[6]
+
+        post_content = post_format.format(*sections)
+        PostEditor.submit(self.main_post_id, post_content, immediate=rollover)
+
+        self.__posted_sections = sections
+
+
+    def __render_section(self, data: str, db_type: int | None, render: Callable[[], str]) -> str:
+        """
+        Gives the text of a post section, rendering it again only if `data` was written to since it was last rendered
+
+        Parameters
+        ----------
+        data : str
+            The data the section shows; see `ThreadNecroBotCoreBase.get_data_version`
+
+        db_type : int | None
+            The db type of the data the section shows
+
+        render : Callable[[], str]
+            Renders the section
+        """
+        # Read before rendering, so a write made while rendering gets it rendered again next time
+        version = self.core.get_data_version(data, db_type)
+
+        cached = self.__render_cache.get(( data, db_type ), None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        text = render()
+        self.__render_cache[( data, db_type )] = ( version, text )
+        return text
 
 
     def calculate_score_gained_prev_user(self, prev_post_info: dict, data: dict):
@@ -175,7 +261,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         if not prev_post_info:
             return -1
 
-        score = self.get_user_points(prev_post_info['prev_post_user_id'], self.DB_TYPE_MONTHLY)
+        score = self.core.get_user_points(prev_post_info['prev_post_user_id'], self.DB_TYPE_MONTHLY)
 
         # Don't halve lower than this, no point
         if score < -1000000000:
@@ -228,7 +314,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         assert isinstance(prev_post_time, datetime.datetime)
 
         seconds_passed = (curr_post_time - prev_post_time).total_seconds()
-        return self._b * math.pow(seconds_passed/60.0, self._n)
+        return self.__PTS_MUL * math.pow(seconds_passed/60.0, self.__PTS_EXP)
 
 
     def process_monthly_winner_event(self, data: dict):
@@ -251,24 +337,80 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
                 { 'time' : str, 'user_id' : int, 'points' : float, 'user_name' : str},
                 ...
             ]
+
+        The time of the next rollover is kept with the current epoch, so a post that does not roll
+        the month over only has its time compared with it.
         """
-        monthly_winners_list = self.get_monthly_winners_list()
+        epoch = self.core.get_epoch()
+        if epoch is None:
+            epoch = self.__start_first_epoch()
+
+        if self.__get_timestamp(data['curr_post_time']) < epoch['rollover_time']:
+            return
+
+        self.core.update_monthly_winners(str(data['curr_post_time'].date()))
+
+        # A month runs from when the previous winner was recorded
+        start_date = parse(self.core.get_monthly_winners_list()[-1]['time']).replace(tzinfo=None)
+        self.core.start_epoch(start_date.strftime(self.EPOCH_FORMAT), self.__get_timestamp(start_date + relativedelta(months=1)))
+
+        self.logger.info('Monthly winner recorded; New Monthly Chart made!')
+
+
+    def __start_first_epoch(self) -> table.Document:
+        """
+        Starts the epoch of the month in progress in databases that do not have one yet, and gives it
+        """
+        monthly_winners_list = self.core.get_monthly_winners_list()
         if not monthly_winners_list:
-            starting_date = self.main_post.date.replace(tzinfo=None)
-            next_date     = starting_date + relativedelta(months=1)
+            start_date = self.main_post.date.replace(tzinfo=None)
         else:
-            previous_date = parse(monthly_winners_list[-1]['time']).replace(tzinfo=None)
-            next_date     = previous_date + relativedelta(months=1)
+            start_date = parse(monthly_winners_list[-1]['time']).replace(tzinfo=None)
+
+        # Monthly data kept before epochs were stays where it is
+        epoch = self.EPOCH_LEGACY if self.core.get_ranked_list(self.DB_TYPE_MONTHLY, 0, 1) else start_date.strftime(self.EPOCH_FORMAT)
+        self.core.start_epoch(epoch, self.__get_timestamp(start_date + relativedelta(months=1)))
 
-        current_date  = data['curr_post_time'].replace(tzinfo=None)
-        current_delta = current_date - previous_date
-        target_delta  = next_date    - previous_date
+        return self.core.get_epoch()
 
-        if current_delta >= target_delta:
-            self.update_monthly_winners()
-            self.reset_monthly_data()
 
-            self.logger.info('Monthly winner recorded; New Monthly Chart made!')
+    @staticmethod
+    def __get_timestamp(date: datetime.datetime) -> int:
+        """
+        Unix time of the date's wall clock time, ignoring its timezone same as the dates it is compared with
+        """
+        return calendar.timegm(date.timetuple())
+
+
+    def get_recorded_months(self) -> dict[str, str]:
+        """
+        Gives the months that have monthly points recorded, oldest first.
+
+        Points kept before epochs were (`EPOCH_LEGACY`) are listed under the month they were kept for:
+        the month before the first epoch started after them, or while they are still current, the month
+        before their rollover.
+
+        Returns
+        -------
+        dict[str, str]
+            Month in `EPOCH_FORMAT` -> epoch its points are kept under, as taken by `get_ranked_list`
+        """
+        epochs = self.core.get_epochs()
+        months = { epoch : epoch for epoch in epochs if epoch != self.EPOCH_LEGACY }
+        if self.EPOCH_LEGACY not in epochs:
+            return months
+
+        epoch = self.core.get_epoch()
+        if epoch is None:
+            # No epoch was started yet, so they are still this month's
+            month_next = datetime.datetime.now(datetime.timezone.utc) + relativedelta(months=1)
+        elif epoch['epoch'] == self.EPOCH_LEGACY:
+            month_next = datetime.datetime.fromtimestamp(epoch['rollover_time'], datetime.timezone.utc)
+        else:
+            month_next = datetime.datetime.strptime(min([ epoch['epoch'], *months ]), self.EPOCH_FORMAT)
+
+        month_legacy = ( month_next - relativedelta(months=1) ).strftime(self.EPOCH_FORMAT)
+        return { month_legacy : self.EPOCH_LEGACY, **months }
 
 
     def process_prev_user(self, data: dict):
@@ -286,7 +428,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         }
         """
         # If prev_post_info is none (prev post doesn't exist yet)
-        prev_post_info = self.get_prev_post_info()
+        prev_post_info = self.core.get_prev_post_info()
         if not isinstance(prev_post_info, table.Document):
             return
 
@@ -298,9 +440,9 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
 
         log_timestamp = None
         if self.is_multi_post(prev_post_info, data):
-            log_timestamp = ThreadNecroBotCore.LOG_TIMESTAMP_MULTI
+            log_timestamp = ThreadNecroBotCoreBase.LOG_TIMESTAMP_MULTI
         elif self.is_deleted_post(prev_post_info, data):
-            log_timestamp = ThreadNecroBotCore.LOG_TIMESTAMP_DELET
+            log_timestamp = ThreadNecroBotCoreBase.LOG_TIMESTAMP_DELET
 
         data = {
             'time'        : str(f'{log_timestamp}'),
@@ -310,12 +452,12 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
             'added_score' : float(f'{added_score:.3f}')
         }
 
-        self.update_user_data(data)
+        self.core.update_user_data(data)
 
         if log_timestamp:
-            self.update_log_data(data)
+            self.core.update_log_data(data)
 
-            log_list = self.get_log_list(self.DB_TYPE_ALLTIME)
+            log_list = self.core.get_log_list(self.DB_TYPE_ALLTIME, 0, self.__MAX_ENTRIES_LOGS)
             self.logger.info(self.generate_log_line(data, log_list))
 
 
@@ -336,7 +478,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         self.logger.debug('Processing curr user')
 
         # If prev_post_info is none (prev post doesn't exist yet)
-        prev_post_info = self.get_prev_post_info()
+        prev_post_info = self.core.get_prev_post_info()
         if not isinstance(prev_post_info, dict):
             prev_post_info = {
                 'prev_post_id'      : data['prev_post_id'],
@@ -353,12 +495,12 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
             'added_score' : float(f'{added_score:.3f}'),
         }
 
-        self.update_user_data(data)
-        self.update_log_data(data)
-        self.update_top_score_data(data)
-        self.update_metadata(data)
+        self.core.update_user_data(data)
+        self.core.update_log_data(data)
+        self.core.update_top_score_data(data)
+        self.core.update_metadata(data)
 
-        log_list = self.get_log_list(self.DB_TYPE_ALLTIME)
+        log_list = self.core.get_log_list(self.DB_TYPE_ALLTIME, 0, self.__MAX_ENTRIES_LOGS)
         self.logger.info(self.generate_log_line(data, log_list))
 
 
@@ -376,7 +518,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
                 'prev_user_name' : str
             }
         """
-        rank = self.get_user_rank(str(data['curr_user_id']), self.DB_TYPE_ALLTIME)
+        rank = self.core.get_user_rank(str(data['curr_user_id']), self.DB_TYPE_ALLTIME)
         if not rank:
             return
 
@@ -384,19 +526,19 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         if number != 1:
             return
 
-        added_score = float(self.get_top_scores_list(self.DB_TYPE_ALLTIME)[-1]['added_score'])
+        added_score = float(self.core.get_top_scores_list(self.DB_TYPE_ALLTIME)[-1]['added_score'])
         data = {
-            'time'        : str(ThreadNecroBotCore.LOG_TIMESTAMP_BONUS),
+            'time'        : str(ThreadNecroBotCoreBase.LOG_TIMESTAMP_BONUS),
             'user_id'     : int(data['curr_user_id']),
             'user_name'   : str(data['curr_user_name']),
             'post_id'     : int(data['curr_post_id']),
             'added_score' : float(f'{added_score:.3f}'),
         }
 
-        self.update_user_data(data)
-        self.update_log_data(data)
+        self.core.update_user_data(data)
+        self.core.update_log_data(data)
 
-        log_list = self.get_log_list(self.DB_TYPE_ALLTIME)
+        log_list = self.core.get_log_list(self.DB_TYPE_ALLTIME, 0, self.__MAX_ENTRIES_LOGS)
         self.logger.info(self.generate_log_line(data, log_list))
 
 
@@ -475,11 +617,11 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
 
 
     def get_forum_log_text(self, db_type: int):
-        log_list = self.get_log_list(db_type)
+        log_list = self.core.get_log_list(db_type, 0, self.__MAX_ENTRIES_LOGS)
         log_text = ''
 
         # Generate log lines
-        for log_data in log_list[:self.__MAX_ENTRIES_LOGS]:
+        for log_data in log_list:
             log_text += self.generate_log_line(log_data, log_list) + '\n'
 
         if log_text == '':
@@ -491,7 +633,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
     def get_top_scores_text(self, db_type: int):
         max_entries = self.__MAX_ENTRIES_TOP_SCORE_ALLTIME if ( db_type == self.DB_TYPE_ALLTIME ) else self.__MAX_ENTRIES_TOP_SCORE_MONTHLY
 
-        top_scores_list = self.get_top_scores_list(db_type)
+        top_scores_list = self.core.get_top_scores_list(db_type)
         top_scores_list = top_scores_list[:max_entries]
 
         # Determine the longers username in the top scores list for text alignment
@@ -514,7 +656,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
 
     def get_top_10_text(self, db_type: int):
         max_entries = self.__MAX_ENTRIES_TOP_SCORE_ALLTIME if ( db_type == self.DB_TYPE_ALLTIME ) else self.__MAX_ENTRIES_TOP_SCORE_MONTHLY
-        ranked_list = self.get_ranked_list(db_type)
+        ranked_list = self.core.get_ranked_list(db_type, 0, max_entries)
 
         longest_username = 0
         for user in ranked_list:
@@ -537,7 +679,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
 
 
     def get_monthly_winners_text(self):
-        monthly_winners_list = self.get_monthly_winners_list()
+        monthly_winners_list = self.core.get_monthly_winners_list()
 
         longest_username = 0
         for user in monthly_winners_list:
@@ -608,7 +750,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
                     ...
                 }
             """
-            entry = self.obj.get_user(user_name)
+            entry = self.obj.core.get_user(user_name)
             if not entry:
                 return Cmd.err(f'Unable to find user "{user_name}"')
 
@@ -624,18 +766,14 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         })
         def cmd_get_log(self, num: int = 10, idx: int = 0) -> dict:
             """
-            fmt DB:
-                'log_data' : {
-                    [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
-                    [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
-                    ...
-                }
+            fmt DB (`LogRing`, one fixed size record per entry):
+                [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float }
             """
-            entries = self.obj.get_log_list(idx, int(idx), int(num))
+            entries = self.obj.core.get_log_list(self.obj.DB_TYPE_ALLTIME, int(idx), int(num))
 
             return Cmd.ok(''.join(
                 f'{i:>3}: [{entry["time"]:<16}] {entry["user_name"]:<16} | all time: {entry["score_alltime"]:>8.3f} pts   monthly: {entry["score_monthly"]:>8.3f} pts\n'
-                for i, entry in enumerate(entries)
+                for i, entry in enumerate(entries, int(idx))
             ))
 
 
@@ -666,18 +804,18 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
                 }
             """
             # Request
-            entry = self.obj.get_user(user_name)
+            entry = self.obj.core.get_user(user_name)
             if not entry:
                 return Cmd.err(f'Unable to find user "{user_name}"')
 
-            self.obj.update_user_data({
+            self.obj.core.update_user_data({
                 'user_id'     : entry.doc_id,
                 'user_name'   : entry['user_name'],
                 'post_id'     : entry['post_id'],
                 'added_score' : float(f'{float(points):.3f}'),
             })
-            self.obj.update_log_data({
-                'time'        : str(ThreadNecroBotCore.LOG_TIMESTAMP_ADMIN),
+            self.obj.core.update_log_data({
+                'time'        : str(ThreadNecroBotCoreBase.LOG_TIMESTAMP_ADMIN),
                 'user_id'     : entry.doc_id,
                 'user_name'   : entry['user_name'],
                 'post_id'     : entry['post_id'],
@@ -685,8 +823,8 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
             })
             self.obj.write_post()
 
-            pts_alltime = self.obj.get_user_points(entry.doc_id, self.obj.DB_TYPE_ALLTIME)
-            pts_monthly = self.obj.get_user_points(entry.doc_id, self.obj.DB_TYPE_MONTHLY)
+            pts_alltime = self.obj.core.get_user_points(entry.doc_id, self.obj.DB_TYPE_ALLTIME)
+            pts_monthly = self.obj.core.get_user_points(entry.doc_id, self.obj.DB_TYPE_MONTHLY)
 
             return Cmd.ok(
                 f'Updated user "{user_name}": {pts_alltime} pts all time, {pts_monthly} pts monthly'
@@ -699,7 +837,7 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         args = {
         })
         def cmd_get_prev_post_info(self) -> dict:
-            entry = self.obj.get_prev_post_info()
+            entry = self.obj.core.get_prev_post_info()
             if not isinstance(entry, table.Document):
                 return Cmd.err('Unable to find previous post info')
 
@@ -745,17 +883,49 @@ class ThreadNecroBot(BotBase, ThreadNecroBotCore):
         info = 'Retrieves the user\'s rank based on the specified user ID',
         args = {
             'user_name' : Cmd.arg(str,  False, 'User name'),
-            'monthly'   : Cmd.arg(bool, True, '(optional) Monthly or all time (0 or 1)')
+            'monthly'   : Cmd.arg(bool, True, '(optional) Monthly or all time (0 or 1)'),
+            'around'    : Cmd.arg(int,  True, '(optional) Number of users ranked above and below the user to also list')
         })
-        def cmd_get_user_rank(self, user_name: str, monthly: bool = False) -> dict:
-            entry = self.obj.get_user(user_name)
+        def cmd_get_user_rank(self, user_name: str, monthly: bool = False, around: int = 0) -> dict:
+            entry = self.obj.core.get_user(user_name)
             if not entry:
                 return Cmd.err('user not found')
 
-            db_type = ThreadNecroBotCore.DB_TYPE_MONTHLY if monthly else ThreadNecroBotCore.DB_TYPE_ALLTIME
-            rank = self.obj.get_user_rank(entry.doc_id, db_type)
+            db_type = self.obj.DB_TYPE_MONTHLY if monthly else self.obj.DB_TYPE_ALLTIME
+            rank = self.obj.core.get_user_rank(entry.doc_id, db_type)
+
+            text   = f'User is ranked {rank}'
+            around = int(around)
+            if rank is not None and around > 0:
+                idx = max(rank - 1 - around, 0)
+                for i, user in enumerate(self.obj.core.get_ranked_list(db_type, idx, rank - idx + around)):
+                    text += f'\n#{idx + i + 1} {user["user_name"]}   {user["points"]} pts'
+
+            return Cmd.ok(text)
 
-            return Cmd.ok(f'User is ranked {rank}')
+
+        @Cmd.help(
+        perm = Cmd.PERMISSION_PUBLIC,
+        info = 'Prints the top users of a past month, or the months that can be looked up',
+        args = {
+            'month' : Cmd.arg(str, True, '(optional) Month in YYYY-MM format'),
+            'num'   : Cmd.arg(int, True, '(optional) Number of users to list')
+        })
+        def cmd_get_month_top(self, month: str = '', num: int = 10) -> dict:
+            months = self.obj.get_recorded_months()
+            if month not in months:
+                if not months:
+                    return Cmd.err('No months recorded yet')
+
+                return Cmd.err(f'Months recorded: {", ".join(months)}')
+
+            ranked_list = self.obj.core.get_ranked_list(self.obj.DB_TYPE_MONTHLY, 0, int(num), epoch=months[month])
+            if not ranked_list:
+                return Cmd.ok(f'No points recorded in {month}')
+
+            return Cmd.ok('\n'.join(
+                f'#{i + 1} {user["user_name"]}   {user["points"]} pts' for i, user in enumerate(ranked_list)
+            ))
 
 
         @Cmd.help(
@@ -0,0 +1,242 @@
+import bisect
+
+from typing import Iterable
+
+
+class Leaderboard():
+    """
+    In-memory ranking of users by points that is kept up to date as points change.
+
+    Users are kept sorted highest points first in a list of short sorted sublists, with a Fenwick
+    tree over the sublist lengths. Updating a user's points, finding a user's rank, and finding the
+    user at a rank are logarithmic in the number of users, instead of sorting every user each time.
+
+    Users with equal points are ranked in the order they were first added, same as sorting the
+    database tables by points does.
+
+    Not thread safe; guard it with the lock of the database it mirrors.
+    """
+
+    # Sublists are split once they get twice this long
+    __LOAD = 512
+
+    # Key fields
+    __NEG_POINTS = 0
+    __SEQ        = 1
+    __USER_ID    = 2
+
+    def __init__(self):
+        # Sorted keys: ( -points, order added, user id )
+        self.__lists: list[list[tuple[float, int, int]]] = []
+        self.__maxes: list[tuple[float, int, int]] = []
+        self.__tree:  list[int] = []
+
+        self.__keys: dict[int, tuple[float, int, int]] = {}
+        self.__next_seq = 0
+
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.__keys
+
+
+    def load(self, entries: Iterable[tuple[int, float]]):
+        """
+        Replaces the leaderboard with the given users, sorting them all at once
+
+        Parameters
+        ----------
+        entries : Iterable[tuple[int, float]]
+            ( user id, points ) of each user, in the order they were added
+        """
+        self.clear()
+
+        for user_id, points in entries:
+            self.__keys[user_id] = ( -points, self.__next_seq, user_id )
+            self.__next_seq += 1
+
+        keys = sorted(self.__keys.values())
+        self.__lists = [ keys[i : i + self.__LOAD] for i in range(0, len(keys), self.__LOAD) ]
+        self.__maxes = [ lst[-1] for lst in self.__lists ]
+        self.__build_tree()
+
+
+    def update(self, user_id: int, points: float):
+        """
+        Sets the points of the user, adding the user if not on the leaderboard yet
+        """
+        key = self.__keys.get(user_id, None)
+        if key is None:
+            key = ( -points, self.__next_seq, user_id )
+            self.__next_seq += 1
+        else:
+            self.__remove_key(key)
+            key = ( -points, key[self.__SEQ], user_id )
+
+        self.__keys[user_id] = key
+        self.__insert_key(key)
+
+
+    def remove(self, user_id: int):
+        key = self.__keys.pop(user_id, None)
+        if key is not None:
+            self.__remove_key(key)
+
+
+    def clear(self):
+        self.__lists.clear()
+        self.__maxes.clear()
+        self.__tree.clear()
+        self.__keys.clear()
+        self.__next_seq = 0
+
+
+    def get_points(self, user_id: int) -> float | None:
+        key = self.__keys.get(user_id, None)
+        return None if key is None else -key[self.__NEG_POINTS]
+
+
+    def get_rank(self, user_id: int) -> int | None:
+        """
+        Returns
+        -------
+        int | None
+            The rank of the user starting at 1, or None if the user is not on the leaderboard
+        """
+        key = self.__keys.get(user_id, None)
+        if key is None:
+            return None
+
+        pos = bisect.bisect_left(self.__maxes, key)
+        idx = bisect.bisect_left(self.__lists[pos], key)
+        return self.__prefix(pos) + idx + 1
+
+
+    def get_range(self, idx: int = 0, num: int | None = None) -> list[tuple[int, float]]:
+        """
+        Gets the users ranked from position `idx` on, highest points first
+
+        Parameters
+        ----------
+        idx : int
+            Position to start from, 0 being the user with the most points
+
+        num : int | None
+            Maximum number of users to get. All users from `idx` on if None.
+
+        Returns
+        -------
+        list[tuple[int, float]]
+            ( user id, points ) of each user
+        """
+        idx = max(idx, 0)
+        end = len(self.__keys) if num is None else min(idx + max(num, 0), len(self.__keys))
+        if idx >= end:
+            return []
+
+        pos, i = self.__locate(idx)
+
+        entries = []
+        while len(entries) < end - idx:
+            lst   = self.__lists[pos]
+            take  = lst[i : i + (end - idx - len(entries))]
+            entries.extend(( key[self.__USER_ID], -key[self.__NEG_POINTS] ) for key in take)
+
+            pos += 1
+            i    = 0
+
+        return entries
+
+
+    def __insert_key(self, key: tuple[float, int, int]):
+        if not self.__lists:
+            self.__lists.append([ key ])
+            self.__maxes.append(key)
+            self.__build_tree()
+            return
+
+        pos = bisect.bisect_left(self.__maxes, key)
+        if pos == len(self.__maxes):
+            pos -= 1
+            self.__lists[pos].append(key)
+            self.__maxes[pos] = key
+        else:
+            bisect.insort(self.__lists[pos], key)
+
+        self.__tree_add(pos, 1)
+
+        lst = self.__lists[pos]
+        if len(lst) > 2*self.__LOAD:
+            half = lst[self.__LOAD:]
+            del lst[self.__LOAD:]
+
+            self.__maxes[pos] = lst[-1]
+            self.__lists.insert(pos + 1, half)
+            self.__maxes.insert(pos + 1, half[-1])
+            self.__build_tree()
+
+
+    def __remove_key(self, key: tuple[float, int, int]):
+        pos = bisect.bisect_left(self.__maxes, key)
+        lst = self.__lists[pos]
+        del lst[bisect.bisect_left(lst, key)]
+
+        if not lst:
+            del self.__lists[pos]
+            del self.__maxes[pos]
+            self.__build_tree()
+            return
+
+        self.__maxes[pos] = lst[-1]
+        self.__tree_add(pos, -1)
+
+
+    def __build_tree(self):
+        tree = [ len(lst) for lst in self.__lists ]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+
+        self.__tree = tree
+
+
+    def __tree_add(self, pos: int, delta: int):
+        while pos < len(self.__tree):
+            self.__tree[pos] += delta
+            pos |= pos + 1
+
+
+    def __prefix(self, pos: int) -> int:
+        """
+        Number of users in the sublists before `pos`
+        """
+        total = 0
+        pos  -= 1
+        while pos >= 0:
+            total += self.__tree[pos]
+            pos    = (pos & (pos + 1)) - 1
+
+        return total
+
+
+    def __locate(self, idx: int) -> tuple[int, int]:
+        """
+        Finds the sublist and position within it of the user at position `idx`
+        """
+        pos  = 0
+        step = 1 << len(self.__tree).bit_length()
+
+        # Descend the tree for the last sublist whose prefix count is at most idx
+        while step:
+            nxt = pos + step
+            if nxt <= len(self.__tree) and self.__tree[nxt - 1] <= idx:
+                idx -= self.__tree[nxt - 1]
+                pos  = nxt
+
+            step >>= 1
+
+        return pos, idx
@@ -0,0 +1,393 @@
+import os
+import gzip
+import json
+import mmap
+import struct
+import logging
+import threading
+
+from typing import Iterator
+
+from tinydb import table
+
+
+class LogRing():
+    """
+    Score log kept in a fixed size file of preallocated records, used as a ring buffer.
+
+    The file is memory mapped. Appending writes one record in place and moves the cursor in the
+    header, and reading the last k entries decodes just those k records, so neither depends on how
+    many entries were ever logged. Entries are numbered in the order they were appended, starting
+    at 1, and that number is their doc id.
+
+    Besides the cursor for all time, the header keeps a cursor for where the current month started,
+    so monthly reads stop at the first entry of the month.
+
+    Once the ring is full, the oldest entries are moved to a gzip compressed archive of json lines
+    in chunks of `ARCHIVE_CHUNK` right before they are overwritten, so the log file itself does not
+    grow. If the process dies between archiving a chunk and recording that in the header, the chunk
+    is archived again; `read_archive` skips the repeats.
+
+    Appends and monthly resets made between `begin` and `commit` are held in memory and written out
+    together by `commit`, or dropped by `rollback`. `pending` gives them in a form that can be saved
+    and written out later with `apply`, which can be repeated safely.
+
+    Parameters
+    ----------
+    path : str
+        Path to the log file. Created if it does not exist.
+
+    archive_path : str
+        Path to the archive of entries rolled out of the ring
+
+    capacity : int
+        Number of entries kept in the ring. Rounded up to a multiple of `ARCHIVE_CHUNK`. An existing
+        log file keeps the capacity it was created with.
+
+    fsync : bool
+        Whether to sync the log file and archive to disk on every write
+    """
+
+    __logger = logging.getLogger(__qualname__)
+
+    ARCHIVE_CHUNK = 256
+
+    __MAGIC   = b'NECROLOG'
+    __VERSION = 1
+
+    # magic, version, capacity, next seq, monthly start seq, next seq to archive
+    __HEADER      = struct.Struct('<8sIIqqq')
+    __HEADER_SIZE = 64
+
+    # seq + 1 (0 for an empty slot), user id, post id, added score, score all time, score monthly, time, user name
+    __RECORD = struct.Struct('<qqqddd32s40s')
+
+    __CURSORS_OFFSET = struct.calcsize('<8sII')
+    __CURSORS        = struct.Struct('<qqq')
+
+    def __init__(self, path: str, archive_path: str, capacity: int = 4096, fsync: bool = False):
+        self.__path         = path
+        self.__archive_path = archive_path
+        self.__fsync        = fsync
+
+        self.__lock = threading.RLock()
+
+        capacity = -(-max(capacity, 1) // self.ARCHIVE_CHUNK) * self.ARCHIVE_CHUNK
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            self.__create(capacity)
+
+        self.__file = open(path, 'r+b')
+        self.__mmap = mmap.mmap(self.__file.fileno(), 0)
+
+        magic, version, self.__capacity, self.__next_seq, self.__monthly_seq, self.__archived_seq = \
+            self.__HEADER.unpack_from(self.__mmap, 0)
+
+        if magic != self.__MAGIC or version != self.__VERSION:
+            self.close()
+            raise ValueError(f'{path} is not a log file')
+
+        if self.__capacity != capacity:
+            self.__logger.warning(f'{path} keeps {self.__capacity} entries; ignoring capacity of {capacity}')
+
+        # Appends and cursors not written out yet while in `begin` ... `commit`
+        self.__staging = False
+        self.__staged: dict[int, dict] = {}
+        self.__staged_next_seq    = self.__next_seq
+        self.__staged_monthly_seq = self.__monthly_seq
+
+
+    def __len__(self) -> int:
+        """
+        Number of entries in the ring, not counting archived ones
+        """
+        with self.__lock:
+            return min(self.__staged_next_seq, self.__capacity)
+
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self.__lock
+
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+
+    def close(self):
+        with self.__lock:
+            if self.__mmap.closed:
+                return
+
+            self.__mmap.flush()
+            self.__mmap.close()
+            self.__file.close()
+
+
+    def append(self, entry: dict) -> int:
+        """
+        Logs an entry
+
+        fmt `entry`:
+            { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float }
+
+        Returns
+        -------
+        int
+            Doc id of the entry
+        """
+        with self.__lock:
+            seq = self.__staged_next_seq
+
+            # Read back the same whether still held in memory or already written
+            self.__staged[seq] = self.__to_entry(self.__RECORD.unpack(self.__pack(seq, entry)))
+            self.__staged_next_seq = seq + 1
+
+            if not self.__staging:
+                self.commit()
+
+            return seq + 1
+
+
+    def reset_monthly(self):
+        """
+        Starts a new month; monthly reads stop at entries logged from now on
+        """
+        with self.__lock:
+            self.__staged_monthly_seq = self.__staged_next_seq
+
+            if not self.__staging:
+                self.commit()
+
+
+    def get_num(self, monthly: bool) -> int:
+        """
+        Number of entries logged, all time or this month. Includes archived entries.
+        """
+        with self.__lock:
+            return self.__staged_next_seq - (self.__staged_monthly_seq if monthly else 0)
+
+
+    def get_range(self, idx: int = 0, num: int | None = None, monthly: bool = False) -> list[table.Document]:
+        """
+        Gets the last entries logged, newest first
+
+        Parameters
+        ----------
+        idx : int
+            Number of newest entries to skip
+
+        num : int | None
+            Maximum number of entries to get. All entries left in the ring if None.
+
+        monthly : bool
+            Whether to stop at the first entry of the month
+
+        Returns
+        -------
+        list[table.Document]
+            The entries. Entries rolled out to the archive are not included.
+        """
+        with self.__lock:
+            first = max(self.__staged_next_seq - self.__capacity, self.__staged_monthly_seq if monthly else 0)
+            start = self.__staged_next_seq - 1 - max(idx, 0)
+            end   = first - 1 if num is None else max(start - max(num, 0), first - 1)
+
+            entries = []
+            for seq in range(start, end, -1):
+                entry = self.__staged.get(seq, None)
+                if entry is None:
+                    entry = self.__read_record(seq)
+
+                # Already overwritten by an append the process died in the middle of; it is in the archive
+                if entry is None:
+                    break
+
+                entries.append(table.Document(entry, doc_id=seq + 1))
+
+            return entries
+
+
+    def read_archive(self) -> Iterator[table.Document]:
+        """
+        Gives the entries rolled out of the ring, oldest first
+        """
+        if not os.path.exists(self.__archive_path):
+            return
+
+        next_doc_id = 1
+        with gzip.open(self.__archive_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                data   = json.loads(line)
+                doc_id = data.pop('doc_id')
+
+                # Chunks archived again after dying before the header was updated
+                if doc_id < next_doc_id:
+                    continue
+
+                next_doc_id = doc_id + 1
+                yield table.Document(data, doc_id=doc_id)
+
+
+    def begin(self):
+        """
+        Holds appends and monthly resets in memory until `commit` or `rollback`
+        """
+        with self.__lock:
+            self.__staging = True
+
+
+    def pending(self) -> dict | None:
+        """
+        Returns
+        -------
+        dict | None
+            The appends and cursors held since `begin` in a json serializable form for `apply`,
+            or None if nothing changed
+        """
+        with self.__lock:
+            if not self.__staged and self.__staged_monthly_seq == self.__monthly_seq:
+                return None
+
+            return {
+                'next_seq'    : self.__staged_next_seq,
+                'monthly_seq' : self.__staged_monthly_seq,
+                'entries'     : { str(seq) : entry for seq, entry in self.__staged.items() },
+            }
+
+
+    def commit(self):
+        """
+        Writes out the appends and monthly resets held since `begin`
+        """
+        with self.__lock:
+            pending = self.pending()
+            if pending is not None:
+                self.apply(pending)
+
+            self.__staging = False
+
+
+    def rollback(self):
+        """
+        Drops the appends and monthly resets held since `begin`
+        """
+        with self.__lock:
+            self.__staged.clear()
+            self.__staged_next_seq    = self.__next_seq
+            self.__staged_monthly_seq = self.__monthly_seq
+            self.__staging = False
+
+
+    def apply(self, pending: dict):
+        """
+        Writes out appends and cursors given by `pending`. Entries are only seen once the cursors in
+        the header are updated, which is done last.
+        """
+        with self.__lock:
+            for seq, entry in sorted(( int(seq), entry ) for seq, entry in pending['entries'].items()):
+                # Move the chunk this entry overwrites to the archive first
+                while seq - self.__capacity >= self.__archived_seq:
+                    self.__archive_chunk()
+
+                self.__write_record(seq, entry)
+
+            self.__next_seq    = max(self.__next_seq, pending['next_seq'])
+            self.__monthly_seq = pending['monthly_seq']
+            self.__write_cursors()
+
+            self.__staged.clear()
+            self.__staged_next_seq    = self.__next_seq
+            self.__staged_monthly_seq = self.__monthly_seq
+
+
+    def __create(self, capacity: int):
+        os.makedirs(os.path.dirname(self.__path) or '.', exist_ok=True)
+
+        with open(self.__path, 'wb') as f:
+            f.write(self.__HEADER.pack(self.__MAGIC, self.__VERSION, capacity, 0, 0, 0).ljust(self.__HEADER_SIZE, b'\0'))
+            f.truncate(self.__HEADER_SIZE + capacity*self.__RECORD.size)
+            f.flush()
+            if self.__fsync:
+                os.fsync(f.fileno())
+
+
+    def __offset(self, seq: int) -> int:
+        return self.__HEADER_SIZE + (seq % self.__capacity)*self.__RECORD.size
+
+
+    def __read_record(self, seq: int) -> dict | None:
+        """
+        Decodes the entry at `seq`, or gives None if its slot holds a different entry
+        """
+        fields = self.__RECORD.unpack_from(self.__mmap, self.__offset(seq))
+        if fields[0] != seq + 1:
+            return None
+
+        return self.__to_entry(fields)
+
+
+    def __write_record(self, seq: int, entry: dict):
+        offset = self.__offset(seq)
+        self.__mmap[offset : offset + self.__RECORD.size] = self.__pack(seq, entry)
+
+
+    @classmethod
+    def __pack(cls, seq: int, entry: dict) -> bytes:
+        return cls.__RECORD.pack(
+            seq + 1,
+            int(entry.get('user_id') or 0),
+            int(entry.get('post_id') or 0),
+            float(entry.get('added_score') or 0),
+            float(entry.get('score_alltime') or 0),
+            float(entry.get('score_monthly') or 0),
+            str(entry.get('time') or '').encode('utf-8')[:32],
+            str(entry.get('user_name') or '').encode('utf-8')[:40],
+        )
+
+
+    @staticmethod
+    def __to_entry(fields: tuple) -> dict:
+        _, user_id, post_id, added_score, score_alltime, score_monthly, time, user_name = fields
+
+        # Text cut at the end of the field may end part way through a character
+        return {
+            'time'          : time.rstrip(b'\0').decode('utf-8', 'ignore'),
+            'user_name'     : user_name.rstrip(b'\0').decode('utf-8', 'ignore'),
+            'user_id'       : user_id,
+            'post_id'       : post_id,
+            'added_score'   : added_score,
+            'score_alltime' : score_alltime,
+            'score_monthly' : score_monthly,
+        }
+
+
+    def __write_cursors(self):
+        self.__CURSORS.pack_into(self.__mmap, self.__CURSORS_OFFSET, self.__next_seq, self.__monthly_seq, self.__archived_seq)
+
+        if self.__fsync:
+            self.__mmap.flush()
+
+
+    def __archive_chunk(self):
+        """
+        Appends the oldest chunk of entries not archived yet to the archive
+        """
+        seqs = range(self.__archived_seq, self.__archived_seq + self.ARCHIVE_CHUNK)
+        lines = ''.join(
+            json.dumps({ 'doc_id' : seq + 1, **entry }) + '\n'
+            for seq in seqs
+            if ( entry := self.__read_record(seq) ) is not None
+        )
+
+        # Each chunk is its own gzip member; gzip reads consecutive members as one stream
+        with open(self.__archive_path, 'ab') as f:
+            f.write(gzip.compress(lines.encode('utf-8')))
+            f.flush()
+            if self.__fsync:
+                os.fsync(f.fileno())
+
+        self.__archived_seq += self.ARCHIVE_CHUNK
+        self.__write_cursors()
+
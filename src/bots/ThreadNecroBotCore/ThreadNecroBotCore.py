@@ -1,41 +1,36 @@
 import os
-import math
-import logging
+import json
+import atexit
 import datetime
+import threading
+import contextlib
+
+from typing import Iterator
 
 import tinydb
 from tinydb import table
 
+from misc.write_behind_storage import WriteBehindStorage
 
-class ThreadNecroBotCore():
-
-    logger = logging.getLogger('ThreadNecroBot')
-
-    DB_TYPE_MONTHLY = 0
-    DB_TYPE_ALLTIME = 1
+from .ThreadNecroBotCoreBase import ThreadNecroBotCoreBase
+from .Leaderboard import Leaderboard
+from .LogRing import LogRing
+from .TopScores import TopScores
 
-    __LOG_TIMESTAMPS = [
-        '          ADMIN          ',
-        '          BONUS          ',
-        '       MULTI POST        ',
-        '      DELETED POST       '
-    ]
 
-    __ID_TIMESTAMP_ADMIN = 0
-    __ID_TIMESTAMP_BONUS = 1
-    __ID_TIMESTAMP_MULTI = 2
-    __ID_TIMESTAMP_DELET = 3
-
-    LOG_TIMESTAMP_ADMIN = __LOG_TIMESTAMPS[__ID_TIMESTAMP_ADMIN]
-    LOG_TIMESTAMP_BONUS = __LOG_TIMESTAMPS[__ID_TIMESTAMP_BONUS]
-    LOG_TIMESTAMP_MULTI = __LOG_TIMESTAMPS[__ID_TIMESTAMP_MULTI]
-    LOG_TIMESTAMP_DELET = __LOG_TIMESTAMPS[__ID_TIMESTAMP_DELET]
+class ThreadNecroBotCore(ThreadNecroBotCoreBase):
+    """
+    `ThreadNecroBotCoreBase` backed by TinyDB json files
+    """
 
     __DB_FILE_LOGS          = 'ThreadNecroBot_DataLogs.json'
+    __DB_FILE_LOG_RING      = 'ThreadNecroBot_DataLogs.ring'
+    __DB_FILE_LOG_ARCHIVE   = 'ThreadNecroBot_DataLogs.archive.jsonl.gz'
     __DB_FILE_WINNERS       = 'ThreadNecroBot_DataWinners.json'
     __DB_FILE_SCORES        = 'ThreadNecroBot_DataScores.json'
     __DB_FILE_USERS         = 'ThreadNecroBot_DataUsers.json'
     __DB_FILE_META          = 'ThreadNecroBot_DataMeta.json'
+    __DB_FILE_JOURNAL       = 'ThreadNecroBot_Journal.json'
 
     __TABLE_LOGS            = 'log_data'
     __TABLE_LOGS_META       = 'log_data_meta'
@@ -46,19 +41,312 @@ class ThreadNecroBotCore():
     __TABLE_USERS_ALLTIME   = 'user_points_alltime'
     __TABLE_USERS_MONTHLY   = 'user_points_monthly'
     __TABLE_META_PREV_POST  = 'prevpost'
+    __TABLE_META_EPOCH      = 'epoch'
+
+    # The log is kept in a `LogRing` instead; __DB_FILE_LOGS is only read by migrations
+    __DB_FILES = [ __DB_FILE_WINNERS, __DB_FILE_SCORES, __DB_FILE_USERS, __DB_FILE_META ]
 
     __MAX_ENTRIES_LOGS      = 10
     __MAX_ENTRIES_TOP_SCORE = 100
 
-    def __init__(self, db_path: str):
-        self.__db_path = db_path
-        self.banned = []
+    def __init__(self, db_path: str, flush_delay: float = 1.0, fsync: bool = False, log_capacity: int = 4096):
+        """
+        Parameters
+        ----------
+        db_path : str
+            Directory the database files are in
 
-        self._n = math.log(2000.0/60.0)/math.log(24)
-        self._b = 60.0/math.pow(60.0, self._n)
+        flush_delay : float
+            Seconds to hold database writes in memory before writing them to disk. See `WriteBehindStorage`.
+
+        fsync : bool
+            Whether to fsync database files when writing them to disk
+
+        log_capacity : int
+            Number of score log entries kept in the log file before older ones are moved to the archive. See `LogRing`.
+        """
+        ThreadNecroBotCoreBase.__init__(self)
+
+        self.__db_path = db_path
 
         os.makedirs(self.__db_path, mode=0o660, exist_ok=True)
 
+        # Databases are opened on first use and kept open until `close_db`
+        self.__db_flush_delay = flush_delay
+        self.__db_fsync       = fsync
+        self.__dbs: dict[str, tinydb.TinyDB] = {}
+        self.__dbs_lock = threading.Lock()
+
+        self.__log: LogRing | None = None
+        self.__log_capacity = log_capacity
+
+        # Nesting depth of `transaction` blocks in the thread holding the databases
+        self.__tx_depth = 0
+
+        # Finish writing out a transaction the process died in the middle of
+        self.__recover_journal()
+
+        # Users ranked by points, loaded from the users database on first use and updated along with it
+        self.__leaderboards: dict[int, Leaderboard] = {}
+
+        # Top scores tables, loaded from the scores database on first use and updated along with it
+        self.__top_scores: dict[str, TopScores] = {}
+
+        # Current epoch, loaded from the meta database on first use and updated along with it
+        self.__epoch: table.Document | None = None
+        self.__epoch_loaded = False
+
+        # Writes not flushed yet would be lost otherwise
+        atexit.register(self.close_db)
+
+
+    def close_db(self):
+        """
+        Writes out anything not flushed yet and closes the databases. They are opened again on next use.
+        """
+        with self.__dbs_lock:
+            for db in self.__dbs.values():
+                db.close()
+
+            self.__dbs.clear()
+
+            if self.__log is not None:
+                self.__log.close()
+                self.__log = None
+
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Groups the database updates made in the `with` block into one unit that is written to disk
+        all at once at the end of the block, or not at all.
+
+        All databases are locked from other threads for the duration of the block. Updates stay in
+        memory until the block ends, then the new contents of every changed database are written to
+        a journal before the databases themselves, so a crash part way through is finished from the
+        journal on next start. If the block raises, the updates made in it are dropped.
+
+        Nested blocks are part of the outermost one.
+        """
+        with contextlib.ExitStack() as stack:
+            # Always locked in the same order so two transactions cannot deadlock
+            dbs = { db_file : self.__get_db(db_file) for db_file in self.__DB_FILES }
+            for db in dbs.values():
+                stack.enter_context(db.storage.lock)
+
+            log = self.__get_log()
+            stack.enter_context(log.lock)
+
+            if self.__tx_depth > 0:
+                yield
+                return
+
+            # Writes made before the transaction are not part of it
+            for db in dbs.values():
+                db.storage.flush()
+
+            for db in dbs.values():
+                stack.enter_context(db.storage.batch(flush=False))
+
+            log.begin()
+
+            self.__tx_depth += 1
+            try:
+                yield
+            except BaseException:
+                for db in dbs.values():
+                    db.storage.reload()
+                    self.__reset_tables(db)
+
+                log.rollback()
+
+                # Loaded from the databases again on next use
+                self.__leaderboards.clear()
+                self.__top_scores.clear()
+                self.__epoch_loaded = False
+
+                # Anything derived while the transaction was going on is out of date
+                self._bump_data_version()
+                raise
+            finally:
+                self.__tx_depth -= 1
+
+            self.__commit(dbs, log)
+
+
+    def __commit(self, dbs: dict[str, tinydb.TinyDB], log: LogRing):
+        """
+        Writes out the databases changed in a transaction. Must be called with all databases locked.
+        """
+        dirty       = { db_file : db for db_file, db in dbs.items() if db.storage.dirty }
+        log_pending = log.pending()
+
+        # A single database is already replaced atomically when flushed, and log appends are only seen once all written
+        if len(dirty) + ( log_pending is not None ) <= 1:
+            for db in dirty.values():
+                db.storage.flush()
+
+            log.commit()
+            return
+
+        journal = { db_file : db.storage.read() for db_file, db in dirty.items() }
+        if log_pending is not None:
+            journal[self.__DB_FILE_LOG_RING] = log_pending
+
+        journal_path = f'{self.__db_path}/{self.__DB_FILE_JOURNAL}'
+        self.__write_json(journal_path, journal)
+
+        for db in dirty.values():
+            db.storage.flush()
+
+        log.commit()
+
+        os.remove(journal_path)
+
+
+    def __recover_journal(self):
+        """
+        Writes out the databases of a transaction that was journaled but possibly not fully written.
+        Must be called before any database is opened.
+        """
+        journal_path = f'{self.__db_path}/{self.__DB_FILE_JOURNAL}'
+
+        # The process died while writing the journal; none of the databases were written yet
+        if os.path.exists(f'{journal_path}.tmp'):
+            os.remove(f'{journal_path}.tmp')
+
+        if not os.path.exists(journal_path):
+            return
+
+        self.logger.warning('Recovering databases from unfinished transaction')
+
+        with open(journal_path, 'r') as f:
+            journal = json.load(f)
+
+        for db_file, data in journal.items():
+            if db_file == self.__DB_FILE_LOG_RING:
+                self.__get_log().apply(data)
+                continue
+
+            self.__write_json(f'{self.__db_path}/{db_file}', data)
+
+        os.remove(journal_path)
+
+
+    def __write_json(self, path: str, data: dict | None):
+        """
+        Writes to a temporary file and renames it into place, same as `WriteBehindStorage.flush`
+        """
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            if self.__db_fsync:
+                os.fsync(f.fileno())
+
+        os.replace(f'{path}.tmp', path)
+
+
+    def __get_db(self, db_file: str) -> tinydb.TinyDB:
+        """
+        Gives the open database for the given file, opening it if needed
+        """
+        with self.__dbs_lock:
+            db = self.__dbs.get(db_file, None)
+            if db is None:
+                db = tinydb.TinyDB(
+                    f'{self.__db_path}/{db_file}', storage=WriteBehindStorage,
+                    flush_delay=self.__db_flush_delay, fsync=self.__db_fsync
+                )
+                self.__dbs[db_file] = db
+
+            return db
+
+
+    @staticmethod
+    def __reset_tables(db: tinydb.TinyDB):
+        """
+        Drops the table objects the database caches, so tables are read from its storage again on next use.
+
+        Tables cache the next doc id to insert at, which is not reset when the storage is reloaded
+        and may have moved past the reloaded data. TinyDB has no public way of resetting it, so this
+        relies on `TinyDB._tables` holding the table objects, as of TinyDB 4.x (4.9 at the time of
+        writing); see requirements.txt.
+        """
+        db._tables.clear()
+
+
+    def __get_log(self) -> LogRing:
+        """
+        Gives the open score log, opening it if needed
+        """
+        with self.__dbs_lock:
+            if self.__log is None:
+                self.__log = LogRing(
+                    f'{self.__db_path}/{self.__DB_FILE_LOG_RING}', f'{self.__db_path}/{self.__DB_FILE_LOG_ARCHIVE}',
+                    capacity=self.__log_capacity, fsync=self.__db_fsync
+                )
+
+            return self.__log
+
+
+    @contextlib.contextmanager
+    def __open_db(self, db_file: str) -> Iterator[tinydb.TinyDB]:
+        """
+        Gives the open database for the given file, opening it if needed. The database is
+        locked from other threads for the duration of the `with` block.
+        """
+        db = self.__get_db(db_file)
+
+        with db.storage.lock:
+            yield db
+
+
+    def __get_leaderboard(self, db: tinydb.TinyDB, type_id: int) -> Leaderboard:
+        """
+        Gives the leaderboard for the given points table, loading it from the users database if needed.
+        Must be called with the users database open.
+        """
+        leaderboard = self.__leaderboards.get(type_id, None)
+        if leaderboard is None:
+            leaderboard = self.__load_leaderboard(db, self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__get_users_monthly_table())
+            self.__leaderboards[type_id] = leaderboard
+
+        return leaderboard
+
+
+    @staticmethod
+    def __load_leaderboard(db: tinydb.TinyDB, table_name: str) -> Leaderboard:
+        leaderboard = Leaderboard()
+        leaderboard.load(( entry.doc_id, float(entry['points']) ) for entry in db.table(table_name).all())
+        return leaderboard
+
+
+    def __get_epoch_key(self) -> str:
+        epoch = self.get_epoch()
+        return self.EPOCH_LEGACY if epoch is None else epoch['epoch']
+
+
+    def __get_users_monthly_table(self) -> str:
+        return self._monthly_table_name(self.__TABLE_USERS_MONTHLY, self.__get_epoch_key())
+
+
+    def __get_scores_monthly_table(self) -> str:
+        return self._monthly_table_name(self.__TABLE_SCORES_MONTHLY, self.__get_epoch_key())
+
+
+    def __get_top_scores(self, db: tinydb.TinyDB, table_name: str) -> TopScores:
+        """
+        Gives the top scores for the given table, loading them from the scores database if needed.
+        Must be called with the scores database open.
+        """
+        top_scores = self.__top_scores.get(table_name, None)
+        if top_scores is None:
+            top_scores = TopScores(self.__MAX_ENTRIES_TOP_SCORE)
+            top_scores.load(db.table(table_name).all())
+            self.__top_scores[table_name] = top_scores
+
+        return top_scores
+
 
     def update_user_data(self, user_data: dict):
         """
@@ -82,7 +370,7 @@ class ThreadNecroBotCore():
                 [user_id:int] : { 'points' : float },
                 ...
             },
-            "user_points_monthly" : {
+            "user_points_monthly_<epoch>" : {
                 [user_id:int] : { 'points' : float },
                 [user_id:int] : { 'points' : float },
                 ...
@@ -97,8 +385,9 @@ class ThreadNecroBotCore():
         points_monthly = f'{points_monthly:.3f}'
 
         uid = int(user_data['user_id'])
+        table_monthly = self.__get_users_monthly_table()
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_USERS}') as db:
+        with self.__open_db(self.__DB_FILE_USERS) as db:
             table_user = db.table(self.__TABLE_USERS_DATA)
 
             data = {}
@@ -113,107 +402,87 @@ class ThreadNecroBotCore():
                 'points' : float(points_alltime),
             }, doc_id = uid))
 
-            table_user = db.table(self.__TABLE_USERS_MONTHLY)
+            table_user = db.table(table_monthly)
             table_user.upsert(table.Document({
                 'points' : float(points_monthly)
             }, doc_id = uid))
 
+            self.__get_leaderboard(db, self.DB_TYPE_ALLTIME).update(uid, float(points_alltime))
+            self.__get_leaderboard(db, self.DB_TYPE_MONTHLY).update(uid, float(points_monthly))
+
+            self._bump_data_version(self.DATA_USERS, self.DB_TYPE_ALLTIME, self.DB_TYPE_MONTHLY)
+
 
     def update_log_data(self, log_data: dict):
         """
         Operations:
-        1. Resolve `db_type` to table
-        2. Use index in log table meta to determine which entry in log table to update
-        3. Update log table entry and increment (or wrap) log table meta entry index
+        1. Fill in the user's all time and monthly points after the update
+        2. Append the entry to the log, moving the oldest entries to the archive if the log is full
 
         fmt `log_data`:
             { time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float }
 
-        fmt DB:
-            "log_data" : {
-                [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
-                [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
-                ...
-            },
-            "log_data_meta : {
-                [type:int] : { 'num' : int },
-            }
+        fmt DB (`LogRing`, one fixed size record per entry):
+            [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float }
         """
         score_alltime = self.get_user_points(log_data['user_id'], self.DB_TYPE_ALLTIME)
         score_monthly = self.get_user_points(log_data['user_id'], self.DB_TYPE_MONTHLY)
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_LOGS}') as db:
-            table_meta = db.table(self.__TABLE_LOGS_META)
-
-            # Get number of monthly log entries
-            entry = table_meta.get(doc_id=self.DB_TYPE_MONTHLY)
+        log_data.update({
+            'score_alltime' : score_alltime,
+            'score_monthly' : score_monthly
+        })
 
-            try:
-                if not isinstance(entry, table.Document):
-                    raise TypeError
-
-                num = entry['num']
-            except ( KeyError, TypeError ):
-                num = 0
-
-            # Update num metadata entry
-            table_meta.update(table.Document({ 'num' : num + 1 }, doc_id=self.DB_TYPE_MONTHLY))
-
-            # Add log entry
-            log_data.update({
-                'score_alltime' : score_alltime,
-                'score_monthly' : score_monthly
-            })
-
-            table_log = db.table(self.__TABLE_LOGS)
-            table_log.insert(log_data)
+        self.__get_log().append(log_data)
+        self._bump_data_version(self.DATA_LOG, self.DB_TYPE_ALLTIME, self.DB_TYPE_MONTHLY)
 
 
     def update_top_score_data(self, new_score_data: dict):
         """
-        Operations:
+        Operations (for both all time and monthly tables, written to disk together):
         - Inserts a new added score entry
-        - Removes lowest added score entry if reached max entries limit
+        - Replaces lowest added score entry if reached max entries limit and the new score is greater
 
         fmt `new_score_data`:
             { 'time' : str, 'user_id' : str, 'user_name' : str, 'post_id' : int, 'added_score' : float }
 
         fmt DB:
-            "top_scores", "top_scores_monthly" : {
+            "top_scores", "top_scores_monthly_<epoch>" : {
                 [idx:int] : { 'time' : str, 'user_id' : int, 'user_name' : str, 'post_id' : int, 'added_score' : float },
                 [idx:int] : { 'time' : str, 'user_id' : int, 'user_name' : str, 'post_id' : int, 'added_score' : float },
                 ...
             }
         """
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_SCORES}') as db:
-            for table_name in [ self.__TABLE_SCORES_ALLTIME, self.__TABLE_SCORES_MONTHLY ]:
-                table_scores = db.table(table_name)
+        table_monthly = self.__get_scores_monthly_table()
 
-                # Limit number of top scores in db
-                if len(table_scores) < self.__MAX_ENTRIES_TOP_SCORE:
-                    table_scores.insert(table.Document(new_score_data, doc_id=len(table_scores)))
-                    return
+        with self.__open_db(self.__DB_FILE_SCORES) as db, db.storage.batch():
+            for table_name in [ self.__TABLE_SCORES_ALLTIME, table_monthly ]:
+                top_scores = self.__get_top_scores(db, table_name)
 
-                # Search for lowest added score and replace if new score is greater
-                entries = table_scores.all()
+                # Next free entry, or the lowest added score if the new score is greater
+                doc_id = top_scores.get_slot(float(new_score_data['added_score']))
+                if doc_id is None:
+                    continue
 
-                min_idx = min(range(len(entries)), key=lambda i: float(entries.__getitem__(i)['added_score']))
-                min_val = float(entries[min_idx]['added_score'])
+                entry = table.Document(dict(new_score_data), doc_id=doc_id)
+                db.table(table_name).upsert(entry)
+                top_scores.put(entry)
 
-                is_old_score_greater = (float(new_score_data['added_score']) <= min_val)
-                if is_old_score_greater:
-                    return
+                self._bump_data_version(self.DATA_SCORES, self.DB_TYPE_ALLTIME if table_name == self.__TABLE_SCORES_ALLTIME else self.DB_TYPE_MONTHLY)
 
-                table_scores.upsert(table.Document(new_score_data, doc_id=min_idx))
 
-
-    def update_monthly_winners(self):
+    def update_monthly_winners(self, time: str | None = None):
         """
         Operations:
         1. Get top 10 scores and determine which entry is #1 (record entry as "no winner" if list is empty)
         2. Append entry to winners list
         3. Update table
 
+        Parameters
+        ----------
+        time : str | None
+            Date the month ended, recorded with the winner. Today if None.
+
         fmt DB:
             'monthly_winners' : {
                 [idx:int] : { 'time' : str, 'user_id' : int, 'user_name' : str, 'points' : float },
@@ -231,19 +500,21 @@ class ThreadNecroBotCore():
 
         # If the monthly winners list doesn't exist, that means we are doing this for the first time
         # Grab the All-time top 10 if that is so because monthly top 10 is incomplete
-        top_scores_list = self.get_ranked_list(self.DB_TYPE_MONTHLY)
+        top_scores_list = self.get_ranked_list(self.DB_TYPE_MONTHLY, 0, 1)
         if len(top_scores_list) != 0:
             monthly_winner = top_scores_list[0]
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_WINNERS}') as db:
+        with self.__open_db(self.__DB_FILE_WINNERS) as db:
             table_winners = db.table(self.__TABLE_WINNERS)
             table_winners.upsert(table.Document({
-                'time'      : str(datetime.datetime.now().date()),
+                'time'      : time or str(datetime.datetime.now().date()),
                 'user_id'   : monthly_winner.doc_id,
                 'user_name' : monthly_winner['user_name'],
                 'points'    : monthly_winner['points'],
             }, len(table_winners)))
 
+            self._bump_data_version(self.DATA_WINNERS)
+
 
     def update_metadata(self, data: dict):
         """
@@ -256,7 +527,7 @@ class ThreadNecroBotCore():
                 ...
             }
         """
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_META}') as db:
+        with self.__open_db(self.__DB_FILE_META) as db:
             table_meta = db.table(self.__TABLE_META_PREV_POST)
             table_meta.upsert(table.Document({
                 'prev_post_id'        : data['post_id'],
@@ -287,7 +558,7 @@ class ThreadNecroBotCore():
         """
         query = tinydb.Query()
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_USERS}') as db:
+        with self.__open_db(self.__DB_FILE_USERS) as db:
             table_users = db.table(self.__TABLE_USERS_DATA)
             entry_user_data = table_users.get(query['user_name'] == user_name)
             if not isinstance(entry_user_data, table.Document):
@@ -332,9 +603,9 @@ class ThreadNecroBotCore():
         float
             The number of points the user has
         """
-        table_db = self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__TABLE_USERS_MONTHLY
+        table_db = self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__get_users_monthly_table()
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_USERS}') as db:
+        with self.__open_db(self.__DB_FILE_USERS) as db:
             table_users = db.table(table_db)
             entry = table_users.get(doc_id = int(user_id))
 
@@ -381,41 +652,16 @@ class ThreadNecroBotCore():
         int | None
             The rank of the user or None if the user is not found
         """
-        table = self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__TABLE_USERS_MONTHLY
-
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_USERS}') as db:
-            table_users = db.table(table)
-
-            entries = table_users.all()
-            ranked_uids = list([
-                int(entry.doc_id) for entry in
-                sorted(
-                    entries,
-                    key = lambda entry: float(entry['points']),
-                    reverse = True
-                )
-            ])
-
-            try: rank = ranked_uids.index(int(user_id)) + 1
-            except ValueError:
-                return None
-
-            return rank
+        with self.__open_db(self.__DB_FILE_USERS) as db:
+            return self.__get_leaderboard(db, type_id).get_rank(int(user_id))
 
 
     def get_log_list(self, db_type: int, idx: int = 0, num: int | None = None) -> list[table.Document]:
         """
         Retrieves a list of log entries from the database
 
-        fmt DB:
-            'log_data' : {
-                [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
-                [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
-                ...
-            },
-            "log_data_meta : {
-                [type:int] : { 'num' : int },
-            }
+        fmt DB (`LogRing`, one fixed size record per entry):
+            [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float }
 
         Parameters
         ----------
@@ -425,41 +671,17 @@ class ThreadNecroBotCore():
             - (1) self.DB_TYPE_MONTHLY: Retrieves monthly top scores
 
         idx : int
-            The starting index of the log entries to retrieve
+            The number of newest log entries to skip
 
-        num : int
-            The number of log entries to retrieve
+        num : int | None
+            The number of log entries to retrieve. All entries still in the log if None.
 
         Returns
         -------
         list[table.Document]
-            A list of log entries
+            A list of log entries, newest first
         """
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_LOGS}') as db:
-            if db_type == self.DB_TYPE_MONTHLY:
-                # If it's monthly, figure out how many monthly entries to retrieve
-                table_log_meta = db.table(self.__TABLE_LOGS_META)
-                entry = table_log_meta.get(doc_id=0)
-
-                try:
-                    if not isinstance(entry, table.Document):
-                        raise TypeError
-
-                    num = entry['num']
-                except ( KeyError, TypeError ):
-                    pass
-
-            table_log = db.table(self.__TABLE_LOGS)
-            lst_len   = len(table_log)
-
-            if isinstance(num, type(None)):
-                num = lst_len
-
-            return [
-                entry
-                for i in range(lst_len - idx, lst_len - idx - num, -1)
-                if isinstance(entry := table_log.get(doc_id = i), table.Document)
-            ]
+        return self.__get_log().get_range(idx, num, monthly=( db_type == self.DB_TYPE_MONTHLY ))
 
 
     def get_top_scores_list(self, db_type: int) -> list[table.Document]:
@@ -491,19 +713,13 @@ class ThreadNecroBotCore():
             A list of top score entries
 
         """
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_SCORES}') as db:
-            table_scores = db.table(
-                self.__TABLE_SCORES_ALLTIME if db_type == self.DB_TYPE_ALLTIME else self.__TABLE_SCORES_MONTHLY
-            )
+        table_name = self.__TABLE_SCORES_ALLTIME if db_type == self.DB_TYPE_ALLTIME else self.__get_scores_monthly_table()
 
-            return sorted(
-                table_scores.all(),
-                key = lambda entry: float(entry['added_score']),
-                reverse = True
-            )
+        with self.__open_db(self.__DB_FILE_SCORES) as db:
+            return self.__get_top_scores(db, table_name).get_sorted()
 
 
-    def get_ranked_list(self, type_id: int) -> list[table.Document]:
+    def get_ranked_list(self, type_id: int, idx: int = 0, num: int | None = None, epoch: str | None = None) -> list[table.Document]:
         """
         Retrieves a list of users from the database ranked in order of points,
         ordered highest to lowest
@@ -532,6 +748,15 @@ class ThreadNecroBotCore():
             - (0) self.DB_TYPE_ALLTIME: Retrieves all time top scores
             - (1) self.DB_TYPE_MONTHLY: Retrieves monthly top scores
 
+        idx : int
+            The rank to start from, 0 being the user with the most points
+
+        num : int | None
+            The number of users to retrieve. All users from `idx` on if None.
+
+        epoch : str | None
+            The month to rank monthly points of, as given by `get_epochs`. The current month if None.
+
         Returns
         -------
         list[table.Document]
@@ -543,21 +768,27 @@ class ThreadNecroBotCore():
                     ...
                 ]
         """
-        table_name = self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__TABLE_USERS_MONTHLY
+        # Past months are not kept ranked; they are ranked on the spot
+        table_past = None
+        if type_id == self.DB_TYPE_MONTHLY and epoch is not None and epoch != self.__get_epoch_key():
+            self._check_epoch(epoch)
+            table_past = self._monthly_table_name(self.__TABLE_USERS_MONTHLY, epoch)
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_USERS}') as db:
-            table_users = db.table(table_name)
+        with self.__open_db(self.__DB_FILE_USERS) as db:
+            ranked_entries = []
 
-            ranked_entries = table_users.all()
-            ranked_entries.sort(key = lambda entry: float(entry['points']), reverse = True)
+            leaderboard = self.__get_leaderboard(db, type_id) if table_past is None else self.__load_leaderboard(db, table_past)
 
             table_users = db.table(self.__TABLE_USERS_DATA)
-            for entry in ranked_entries:
+            for user_id, points in leaderboard.get_range(idx, num):
                 # Insert user name into entries
-                data = table_users.get(doc_id = entry.doc_id)
+                data = table_users.get(doc_id = user_id)
 
                 assert isinstance(data, table.Document)
-                entry['user_name'] = data['user_name']
+                ranked_entries.append(table.Document({
+                    'points'    : points,
+                    'user_name' : data['user_name'],
+                }, doc_id = user_id))
 
             return ranked_entries
 
@@ -578,25 +809,92 @@ class ThreadNecroBotCore():
         list[table.Document]
             A list of monthly winners
         """
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_WINNERS}') as db:
+        with self.__open_db(self.__DB_FILE_WINNERS) as db:
             table_winners = db.table(self.__TABLE_WINNERS)
             return table_winners.all()
 
 
-    def reset_monthly_data(self):
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_SCORES}') as db:
-            table_scores = db.table(self.__TABLE_SCORES_MONTHLY)
-            table_scores.truncate()
+    def get_epoch(self) -> table.Document | None:
+        """
+        Retrieves the current epoch: the month monthly data is kept for, and when the next one starts
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_USERS}') as db:
-            table_users = db.table(self.__TABLE_USERS_MONTHLY)
-            table_users.truncate()
+        fmt DB:
+            "epoch" : {
+                [id:int] : { 'epoch' : str, 'rollover_time' : int },
+            }
 
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_LOGS}') as db:
-            table_logs_meta = db.table(self.__TABLE_LOGS_META)
-            table_logs_meta.upsert(table.Document({
-                'num' : 0
-            }, doc_id=0))
+        Returns
+        -------
+        table.Document | None
+            The epoch key in `EPOCH_FORMAT` (or `EPOCH_LEGACY`) and the unix time of the next rollover,
+            or None if no epoch was started yet
+        """
+        if not self.__epoch_loaded:
+            with self.__open_db(self.__DB_FILE_META) as db:
+                self.__epoch = db.table(self.__TABLE_META_EPOCH).get(None, doc_id=0)
+                self.__epoch_loaded = True
+
+        if self.__epoch is None:
+            return None
+
+        return table.Document(dict(self.__epoch), doc_id=self.__epoch.doc_id)
+
+
+    def get_epochs(self) -> list[str]:
+        """
+        Retrieves the epochs that have monthly points recorded, oldest first. `EPOCH_LEGACY`, if it has
+        points recorded, is the oldest.
+        """
+        prefix = f'{self.__TABLE_USERS_MONTHLY}_'
+
+        with self.__open_db(self.__DB_FILE_USERS) as db:
+            epochs = sorted(name[len(prefix):] for name in db.tables() if name.startswith(prefix) and len(db.table(name)) > 0)
+            if len(db.table(self.__TABLE_USERS_MONTHLY)) > 0:
+                epochs.insert(0, self.EPOCH_LEGACY)
+
+            return epochs
+
+
+    def start_epoch(self, epoch: str, rollover_time: int):
+        """
+        Starts keeping monthly data for a new month.
+
+        Monthly data of each epoch is kept in its own tables, so this only switches which tables are
+        current; earlier months are left as they are and can still be read with `get_ranked_list`.
+        Starting the current epoch again only changes its rollover time.
+
+        fmt DB:
+            "epoch" : {
+                [id:int] : { 'epoch' : str, 'rollover_time' : int },
+            }
+
+        Parameters
+        ----------
+        epoch : str
+            The month in `EPOCH_FORMAT`, or `EPOCH_LEGACY`
+
+        rollover_time : int
+            Unix time the epoch after this one starts at
+        """
+        self._check_epoch(epoch)
+        epoch_prev = self.__get_epoch_key()
+
+        with self.__open_db(self.__DB_FILE_META) as db:
+            entry = table.Document({ 'epoch' : epoch, 'rollover_time' : int(rollover_time) }, doc_id=0)
+            db.table(self.__TABLE_META_EPOCH).upsert(entry)
+            self.__epoch = entry
+
+        if epoch == epoch_prev:
+            return
+
+        # The new epoch's tables are loaded on next use
+        self.__leaderboards.pop(self.DB_TYPE_MONTHLY, None)
+        self.__top_scores.pop(self._monthly_table_name(self.__TABLE_SCORES_MONTHLY, epoch_prev), None)
+
+        self.__get_log().reset_monthly()
+
+        for data in [ self.DATA_USERS, self.DATA_SCORES, self.DATA_LOG ]:
+            self._bump_data_version(data, self.DB_TYPE_MONTHLY)
 
 
     def get_prev_post_info(self) -> table.Document | list[table.Document] | None:
@@ -614,6 +912,6 @@ class ThreadNecroBotCore():
         table.Document
             The previous post id, time, and user id
         """
-        with tinydb.TinyDB(f'{self.__db_path}/{self.__DB_FILE_META}') as db:
+        with self.__open_db(self.__DB_FILE_META) as db:
             table_meta = db.table(self.__TABLE_META_PREV_POST)
             return table_meta.get(None, doc_id=0)
@@ -0,0 +1,213 @@
+import re
+import logging
+import contextlib
+
+from typing import Iterator
+
+from tinydb import table
+
+
+class ThreadNecroBotCoreBase():
+    """
+    ThreadNecroBot's database, shared by the storage backends. Meant to be overridden;
+    `ThreadNecroBotCore` keeps the data in TinyDB json files, `ThreadNecroBotCoreSqlite` in a
+    single SQLite database. Use `create` to open the one a bot is configured with.
+    """
+
+    logger = logging.getLogger('ThreadNecroBot')
+
+    DB_TYPE_MONTHLY = 0
+    DB_TYPE_ALLTIME = 1
+
+    # Data tracked by `get_data_version`
+    DATA_USERS   = 'users'
+    DATA_SCORES  = 'scores'
+    DATA_LOG     = 'log'
+    DATA_WINNERS = 'winners'
+
+    # Monthly data is kept per month, in tables suffixed with the month's epoch key; see `start_epoch`
+    EPOCH_FORMAT = '%Y-%m'
+
+    # Epoch of monthly data kept from before epochs were, in the unsuffixed tables
+    EPOCH_LEGACY = ''
+
+    BACKEND_TINYDB = 'tinydb'
+    BACKEND_SQLITE = 'sqlite'
+
+    __EPOCH_PATTERN = re.compile(r'\d{4}-\d{2}')
+
+    __LOG_TIMESTAMPS = [
+        '          ADMIN          ',
+        '          BONUS          ',
+        '       MULTI POST        ',
+        '      DELETED POST       '
+    ]
+
+    __ID_TIMESTAMP_ADMIN = 0
+    __ID_TIMESTAMP_BONUS = 1
+    __ID_TIMESTAMP_MULTI = 2
+    __ID_TIMESTAMP_DELET = 3
+
+    LOG_TIMESTAMP_ADMIN = __LOG_TIMESTAMPS[__ID_TIMESTAMP_ADMIN]
+    LOG_TIMESTAMP_BONUS = __LOG_TIMESTAMPS[__ID_TIMESTAMP_BONUS]
+    LOG_TIMESTAMP_MULTI = __LOG_TIMESTAMPS[__ID_TIMESTAMP_MULTI]
+    LOG_TIMESTAMP_DELET = __LOG_TIMESTAMPS[__ID_TIMESTAMP_DELET]
+
+    def __init__(self):
+        # Counts writes to each ( data, db type ); see `get_data_version`
+        self._data_versions: dict[tuple[str, int | None], int] = {}
+
+
+    @staticmethod
+    def create(backend: str, db_path: str, fsync: bool = False, **kwargs) -> "ThreadNecroBotCoreBase":
+        """
+        Opens the database of the given backend
+
+        Parameters
+        ----------
+        backend : str
+            `BACKEND_TINYDB` or `BACKEND_SQLITE`
+
+        db_path : str
+            Directory the database files are in
+
+        fsync : bool
+            Whether to fsync the database on writes
+
+        kwargs
+            Options of `ThreadNecroBotCore`; ignored by the SQLite backend, which has none
+
+        Raises
+        ------
+        ValueError
+            If the backend is not one of the above
+        """
+        from .ThreadNecroBotCore import ThreadNecroBotCore
+        from .ThreadNecroBotCoreSqlite import ThreadNecroBotCoreSqlite
+
+        if backend == ThreadNecroBotCoreBase.BACKEND_TINYDB:
+            return ThreadNecroBotCore(db_path, fsync=fsync, **kwargs)
+
+        if backend == ThreadNecroBotCoreBase.BACKEND_SQLITE:
+            return ThreadNecroBotCoreSqlite(db_path, fsync=fsync)
+
+        raise ValueError(f'Invalid database backend: {backend!r}')
+
+
+    def get_data_version(self, data: str, db_type: int | None = None) -> int:
+        """
+        Gives a number that changes whenever the given data is written to, so anything derived
+        from it only needs to be redone when the number changed.
+
+        Parameters
+        ----------
+        data : str
+            One of `DATA_USERS`, `DATA_SCORES`, `DATA_LOG`, `DATA_WINNERS`
+
+        db_type : int | None
+            self.DB_TYPE_ALLTIME or self.DB_TYPE_MONTHLY. None for `DATA_WINNERS`.
+        """
+        return self._data_versions.get(( data, db_type ), 0)
+
+
+    def _bump_data_version(self, data: str | None = None, *db_types: int | None):
+        """
+        Marks data as written to, for each of `db_types`. Marks everything if `data` is None.
+        """
+        if data is None:
+            for key in self._data_versions:
+                self._data_versions[key] += 1
+            return
+
+        for db_type in db_types or ( None, ):
+            self._data_versions[( data, db_type )] = self._data_versions.get(( data, db_type ), 0) + 1
+
+
+    @classmethod
+    def _check_epoch(cls, epoch: str):
+        """
+        Raises ValueError unless `epoch` is `EPOCH_LEGACY` or a month in `EPOCH_FORMAT`
+        """
+        if epoch != cls.EPOCH_LEGACY and not cls.__EPOCH_PATTERN.fullmatch(str(epoch)):
+            raise ValueError(f'Invalid epoch: {epoch!r}')
+
+
+    @classmethod
+    def _monthly_table_name(cls, table_name: str, epoch: str) -> str:
+        """
+        Gives the name of the table holding monthly data of the given epoch
+        """
+        return table_name if epoch == cls.EPOCH_LEGACY else f'{table_name}_{epoch}'
+
+
+    def close_db(self):
+        raise NotImplementedError
+
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        raise NotImplementedError
+
+
+    def update_user_data(self, user_data: dict):
+        raise NotImplementedError
+
+
+    def update_log_data(self, log_data: dict):
+        raise NotImplementedError
+
+
+    def update_top_score_data(self, new_score_data: dict):
+        raise NotImplementedError
+
+
+    def update_monthly_winners(self, time: str | None = None):
+        raise NotImplementedError
+
+
+    def update_metadata(self, data: dict):
+        raise NotImplementedError
+
+
+    def get_user(self, user_name: str) -> table.Document | None:
+        raise NotImplementedError
+
+
+    def get_user_points(self, user_id: str | int, type_id: int) -> float:
+        raise NotImplementedError
+
+
+    def get_user_rank(self, user_id: str | int, type_id: int) -> int | None:
+        raise NotImplementedError
+
+
+    def get_log_list(self, db_type: int, idx: int = 0, num: int | None = None) -> list[table.Document]:
+        raise NotImplementedError
+
+
+    def get_top_scores_list(self, db_type: int) -> list[table.Document]:
+        raise NotImplementedError
+
+
+    def get_ranked_list(self, type_id: int, idx: int = 0, num: int | None = None, epoch: str | None = None) -> list[table.Document]:
+        raise NotImplementedError
+
+
+    def get_monthly_winners_list(self) -> list[table.Document]:
+        raise NotImplementedError
+
+
+    def get_epoch(self) -> table.Document | None:
+        raise NotImplementedError
+
+
+    def get_epochs(self) -> list[str]:
+        raise NotImplementedError
+
+
+    def start_epoch(self, epoch: str, rollover_time: int):
+        raise NotImplementedError
+
+
+    def get_prev_post_info(self) -> table.Document | list[table.Document] | None:
+        raise NotImplementedError
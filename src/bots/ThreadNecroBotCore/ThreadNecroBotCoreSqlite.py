@@ -0,0 +1,628 @@
+import os
+import atexit
+import sqlite3
+import datetime
+import threading
+import contextlib
+
+from typing import Iterator
+
+from tinydb import table
+
+from .ThreadNecroBotCoreBase import ThreadNecroBotCoreBase
+from .Leaderboard import Leaderboard
+from .TopScores import TopScores
+
+
+class ThreadNecroBotCoreSqlite(ThreadNecroBotCoreBase):
+    """
+    `ThreadNecroBotCoreBase` backed by a single SQLite database instead of TinyDB json files.
+
+    Each TinyDB table becomes an SQLite table of the same name, and reads return `table.Document`s
+    with the same doc ids and fields the TinyDB core returns, so ThreadNecroBot works the same with
+    either. Users are looked up by name through an index. Ranks and top scores come from a
+    `Leaderboard` and `TopScores` kept along with their tables, same as the TinyDB core.
+
+    Rows keep their insertion order in the implicit rowid, which breaks ties the same way TinyDB's
+    insertion ordered tables do.
+
+    The database is opened in WAL mode, so reads do not wait on writes, and each call is
+    committed as one transaction unless made inside `transaction`.
+    """
+
+    __DB_FILE               = 'ThreadNecroBot.sqlite3'
+
+    __TABLE_LOGS            = 'log_data'
+    __TABLE_LOGS_META       = 'log_data_meta'
+    __TABLE_SCORES_ALLTIME  = 'top_scores'
+    __TABLE_SCORES_MONTHLY  = 'top_scores_monthly'
+    __TABLE_WINNERS         = 'monthly_winners'
+    __TABLE_USERS_DATA      = 'user_data'
+    __TABLE_USERS_ALLTIME   = 'user_points_alltime'
+    __TABLE_USERS_MONTHLY   = 'user_points_monthly'
+    __TABLE_META_PREV_POST  = 'prevpost'
+    __TABLE_META_EPOCH      = 'epoch'
+
+    __MAX_ENTRIES_TOP_SCORE = 100
+
+    # Monthly tables of each epoch are created from these on first use
+    __SCHEMA_MONTHLY = {
+        __TABLE_USERS_MONTHLY : [
+            'CREATE TABLE IF NOT EXISTS "{0}" (user_id INTEGER NOT NULL UNIQUE, points REAL NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS "idx_{0}_points" ON "{0}" (points DESC)',
+        ],
+        __TABLE_SCORES_MONTHLY : [
+            'CREATE TABLE IF NOT EXISTS "{0}" (idx INTEGER PRIMARY KEY, time TEXT, user_id INTEGER, user_name TEXT, post_id INTEGER, added_score REAL)',
+            'CREATE INDEX IF NOT EXISTS "idx_{0}_post_id" ON "{0}" (post_id)',
+        ],
+    }
+
+    __SCHEMA = f'''
+        CREATE TABLE IF NOT EXISTS {__TABLE_USERS_DATA} (
+            user_id   INTEGER NOT NULL UNIQUE,
+            user_name TEXT,
+            post_id   INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_USERS_DATA}_user_name ON {__TABLE_USERS_DATA} (user_name);
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_USERS_DATA}_post_id   ON {__TABLE_USERS_DATA} (post_id);
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_USERS_ALLTIME} (
+            user_id INTEGER NOT NULL UNIQUE,
+            points  REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_USERS_ALLTIME}_points ON {__TABLE_USERS_ALLTIME} (points DESC);
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_USERS_MONTHLY} (
+            user_id INTEGER NOT NULL UNIQUE,
+            points  REAL    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_USERS_MONTHLY}_points ON {__TABLE_USERS_MONTHLY} (points DESC);
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_LOGS} (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            time          TEXT,
+            user_name     TEXT,
+            user_id       INTEGER,
+            post_id       INTEGER,
+            added_score   REAL,
+            score_alltime REAL,
+            score_monthly REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_LOGS}_post_id ON {__TABLE_LOGS} (post_id);
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_LOGS_META} (
+            type INTEGER PRIMARY KEY,
+            num  INTEGER
+        );
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_SCORES_ALLTIME} (
+            idx         INTEGER PRIMARY KEY,
+            time        TEXT,
+            user_id     INTEGER,
+            user_name   TEXT,
+            post_id     INTEGER,
+            added_score REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_SCORES_ALLTIME}_post_id ON {__TABLE_SCORES_ALLTIME} (post_id);
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_SCORES_MONTHLY} (
+            idx         INTEGER PRIMARY KEY,
+            time        TEXT,
+            user_id     INTEGER,
+            user_name   TEXT,
+            post_id     INTEGER,
+            added_score REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_{__TABLE_SCORES_MONTHLY}_post_id ON {__TABLE_SCORES_MONTHLY} (post_id);
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_WINNERS} (
+            idx       INTEGER PRIMARY KEY,
+            time      TEXT,
+            user_id   INTEGER,
+            user_name TEXT,
+            points    REAL
+        );
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_META_PREV_POST} (
+            id                  INTEGER PRIMARY KEY,
+            prev_post_id        INTEGER,
+            prev_post_time      TEXT,
+            prev_post_user_id   INTEGER,
+            prev_post_user_name TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS {__TABLE_META_EPOCH} (
+            id            INTEGER PRIMARY KEY,
+            epoch         TEXT,
+            rollover_time INTEGER
+        );
+    '''
+
+    def __init__(self, db_path: str, fsync: bool = False):
+        """
+        Parameters
+        ----------
+        db_path : str
+            Directory the database file is in
+
+        fsync : bool
+            Whether to fsync the database on every commit (`synchronous = FULL`). Otherwise commits
+            survive the process dying but the last ones may be lost on power loss.
+        """
+        ThreadNecroBotCoreBase.__init__(self)
+
+        self.__db_path  = db_path
+        self.__db_fsync = fsync
+
+        os.makedirs(self.__db_path, mode=0o660, exist_ok=True)
+
+        # The database is opened on first use and kept open until `close_db`
+        self.__conn: sqlite3.Connection | None = None
+        self.__lock = threading.RLock()
+
+        # Nesting depth of `transaction` blocks in the thread holding the database
+        self.__tx_depth = 0
+
+        # Users ranked by points, loaded from the database on first use and updated along with it
+        self.__leaderboards: dict[int, Leaderboard] = {}
+
+        # Top scores tables, loaded from the database on first use and updated along with it
+        self.__top_scores: dict[str, TopScores] = {}
+
+        # Current epoch, loaded from the database on first use and updated along with it
+        self.__epoch: table.Document | None = None
+        self.__epoch_loaded = False
+
+        # Monthly tables known to exist
+        self.__monthly_tables: set[str] = set()
+
+        # Leaves the WAL checkpointed into the database file
+        atexit.register(self.close_db)
+
+
+    def close_db(self):
+        """
+        Closes the database. It is opened again on next use.
+        """
+        with self.__lock:
+            if self.__conn is not None:
+                self.__conn.close()
+                self.__conn = None
+
+            self.__monthly_tables.clear()
+
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Groups the database updates made in the `with` block into one SQLite transaction, committed
+        at the end of the block or rolled back if it raises. The database is locked from other
+        threads for the duration of the block.
+
+        Nested blocks are part of the outermost one.
+        """
+        with self.__open_db():
+            if self.__tx_depth > 0:
+                yield
+                return
+
+            self.__tx_depth += 1
+            try:
+                yield
+            except BaseException:
+                # Loaded from the database again on next use
+                self.__leaderboards.clear()
+                self.__top_scores.clear()
+                self.__epoch_loaded = False
+                self.__monthly_tables.clear()
+
+                # Anything derived while the transaction was going on is out of date
+                self._bump_data_version()
+                raise
+            finally:
+                self.__tx_depth -= 1
+
+
+    @contextlib.contextmanager
+    def __open_db(self) -> Iterator[sqlite3.Connection]:
+        """
+        Gives the open database, opening it if needed. The database is locked from other threads
+        for the duration of the `with` block, and changes made in it are committed at the end of it,
+        or at the end of the `transaction` block it is in.
+        """
+        with self.__lock:
+            if self.__conn is None:
+                conn = sqlite3.connect(f'{self.__db_path}/{self.__DB_FILE}', check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                conn.execute('PRAGMA journal_mode = WAL')
+                conn.execute(f'PRAGMA synchronous = {"FULL" if self.__db_fsync else "NORMAL"}')
+                conn.executescript(self.__SCHEMA)
+                self.__conn = conn
+
+            if self.__tx_depth > 0:
+                yield self.__conn
+                return
+
+            with self.__conn:
+                yield self.__conn
+
+
+    def __get_leaderboard(self, db: sqlite3.Connection, type_id: int) -> Leaderboard:
+        """
+        Gives the leaderboard for the given points table, loading it from the database if needed.
+        Must be called with the database open.
+        """
+        leaderboard = self.__leaderboards.get(type_id, None)
+        if leaderboard is None:
+            leaderboard = self.__load_leaderboard(db, self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__get_users_monthly_table(db))
+            self.__leaderboards[type_id] = leaderboard
+
+        return leaderboard
+
+
+    @staticmethod
+    def __load_leaderboard(db: sqlite3.Connection, table_name: str) -> Leaderboard:
+        leaderboard = Leaderboard()
+        leaderboard.load(( row['user_id'], row['points'] ) for row in db.execute(f'SELECT user_id, points FROM "{table_name}" ORDER BY rowid'))
+        return leaderboard
+
+
+    def __get_epoch_key(self) -> str:
+        epoch = self.get_epoch()
+        return self.EPOCH_LEGACY if epoch is None else epoch['epoch']
+
+
+    def __get_monthly_table(self, db: sqlite3.Connection, table_name: str, epoch: str) -> str:
+        """
+        Gives the name of the monthly table of the given epoch, creating it if needed.
+        Must be called with the database open.
+        """
+        name = self._monthly_table_name(table_name, epoch)
+        if name not in self.__monthly_tables:
+            for statement in self.__SCHEMA_MONTHLY[table_name]:
+                db.execute(statement.format(name))
+
+            self.__monthly_tables.add(name)
+
+        return name
+
+
+    def __get_users_monthly_table(self, db: sqlite3.Connection) -> str:
+        return self.__get_monthly_table(db, self.__TABLE_USERS_MONTHLY, self.__get_epoch_key())
+
+
+    def __get_scores_monthly_table(self, db: sqlite3.Connection) -> str:
+        return self.__get_monthly_table(db, self.__TABLE_SCORES_MONTHLY, self.__get_epoch_key())
+
+
+    def __get_top_scores(self, db: sqlite3.Connection, table_name: str) -> TopScores:
+        """
+        Gives the top scores for the given table, loading them from the database if needed.
+        Must be called with the database open.
+        """
+        top_scores = self.__top_scores.get(table_name, None)
+        if top_scores is None:
+            top_scores = TopScores(self.__MAX_ENTRIES_TOP_SCORE)
+            top_scores.load(self.__to_document(row, 'idx') for row in db.execute(f'SELECT * FROM "{table_name}"'))
+            self.__top_scores[table_name] = top_scores
+
+        return top_scores
+
+
+    @staticmethod
+    def __to_document(row: sqlite3.Row, id_col: str) -> table.Document:
+        """
+        Makes a TinyDB style document out of a row, leaving out the id column and fields that were never set
+        """
+        return table.Document({
+            key : row[key] for key in row.keys() if key != id_col and row[key] is not None
+        }, doc_id=row[id_col])
+
+
+    def update_user_data(self, user_data: dict):
+        """
+        See `ThreadNecroBotCore.update_user_data`
+        """
+        points_alltime = self.get_user_points(user_data['user_id'], self.DB_TYPE_ALLTIME)
+        points_alltime += float(user_data['added_score'])
+        points_alltime = f'{points_alltime:.3f}'
+
+        points_monthly = self.get_user_points(user_data['user_id'], self.DB_TYPE_MONTHLY)
+        points_monthly += float(user_data['added_score'])
+        points_monthly = f'{points_monthly:.3f}'
+
+        uid = int(user_data['user_id'])
+
+        with self.__open_db() as db:
+            # NOTE: This might leave username blank in some edge cases
+            db.execute(
+                f'INSERT INTO {self.__TABLE_USERS_DATA} (user_id, user_name, post_id) VALUES (?, ?, ?) '
+                f'ON CONFLICT (user_id) DO UPDATE SET post_id = excluded.post_id, user_name = COALESCE(excluded.user_name, user_name)',
+                ( uid, user_data.get('user_name', None), int(user_data['post_id']) )
+            )
+
+            for table_name, points in [ ( self.__TABLE_USERS_ALLTIME, points_alltime ), ( self.__get_users_monthly_table(db), points_monthly ) ]:
+                db.execute(
+                    f'INSERT INTO "{table_name}" (user_id, points) VALUES (?, ?) '
+                    f'ON CONFLICT (user_id) DO UPDATE SET points = excluded.points',
+                    ( uid, float(points) )
+                )
+
+            self.__get_leaderboard(db, self.DB_TYPE_ALLTIME).update(uid, float(points_alltime))
+            self.__get_leaderboard(db, self.DB_TYPE_MONTHLY).update(uid, float(points_monthly))
+
+            self._bump_data_version(self.DATA_USERS, self.DB_TYPE_ALLTIME, self.DB_TYPE_MONTHLY)
+
+
+    def update_log_data(self, log_data: dict):
+        """
+        See `ThreadNecroBotCore.update_log_data`
+        """
+        score_alltime = self.get_user_points(log_data['user_id'], self.DB_TYPE_ALLTIME)
+        score_monthly = self.get_user_points(log_data['user_id'], self.DB_TYPE_MONTHLY)
+
+        with self.__open_db() as db:
+            # Count monthly log entries
+            db.execute(
+                f'INSERT INTO {self.__TABLE_LOGS_META} (type, num) VALUES (?, 1) ON CONFLICT (type) DO UPDATE SET num = num + 1',
+                ( self.DB_TYPE_MONTHLY, )
+            )
+
+            # Add log entry
+            log_data.update({
+                'score_alltime' : score_alltime,
+                'score_monthly' : score_monthly
+            })
+
+            db.execute(
+                f'INSERT INTO {self.__TABLE_LOGS} (time, user_name, user_id, post_id, added_score, score_alltime, score_monthly) '
+                f'VALUES (:time, :user_name, :user_id, :post_id, :added_score, :score_alltime, :score_monthly)',
+                { 'user_name' : None, **log_data }
+            )
+
+            self._bump_data_version(self.DATA_LOG, self.DB_TYPE_ALLTIME, self.DB_TYPE_MONTHLY)
+
+
+    def update_top_score_data(self, new_score_data: dict):
+        """
+        See `ThreadNecroBotCore.update_top_score_data`
+        """
+        with self.__open_db() as db:
+            for table_name in [ self.__TABLE_SCORES_ALLTIME, self.__get_scores_monthly_table(db) ]:
+                top_scores = self.__get_top_scores(db, table_name)
+
+                # Next free entry, or the lowest added score if the new score is greater
+                idx = top_scores.get_slot(float(new_score_data['added_score']))
+                if idx is None:
+                    continue
+
+                db.execute(
+                    f'INSERT OR REPLACE INTO "{table_name}" (idx, time, user_id, user_name, post_id, added_score) '
+                    f'VALUES (:idx, :time, :user_id, :user_name, :post_id, :added_score)',
+                    { **new_score_data, 'idx' : idx }
+                )
+
+                # Keep the entry as stored, with the column types applied
+                row = db.execute(f'SELECT * FROM "{table_name}" WHERE idx = ?', ( idx, )).fetchone()
+                top_scores.put(self.__to_document(row, 'idx'))
+
+                self._bump_data_version(self.DATA_SCORES, self.DB_TYPE_ALLTIME if table_name == self.__TABLE_SCORES_ALLTIME else self.DB_TYPE_MONTHLY)
+
+
+    def update_monthly_winners(self, time: str | None = None):
+        """
+        See `ThreadNecroBotCore.update_monthly_winners`
+        """
+        # Default if monthly ranked list is empty
+        monthly_winner = table.Document({
+            'user_name' : 'No Winner',
+            'points'    : 0.0
+        }, doc_id=-1)
+
+        top_scores_list = self.get_ranked_list(self.DB_TYPE_MONTHLY, 0, 1)
+        if len(top_scores_list) != 0:
+            monthly_winner = top_scores_list[0]
+
+        with self.__open_db() as db:
+            db.execute(
+                f'INSERT OR REPLACE INTO {self.__TABLE_WINNERS} (idx, time, user_id, user_name, points) '
+                f'VALUES ((SELECT COUNT(*) FROM {self.__TABLE_WINNERS}), ?, ?, ?, ?)',
+                ( time or str(datetime.datetime.now().date()), monthly_winner.doc_id, monthly_winner['user_name'], monthly_winner['points'] )
+            )
+
+            self._bump_data_version(self.DATA_WINNERS)
+
+
+    def update_metadata(self, data: dict):
+        """
+        See `ThreadNecroBotCore.update_metadata`
+        """
+        with self.__open_db() as db:
+            db.execute(
+                f'INSERT OR REPLACE INTO {self.__TABLE_META_PREV_POST} (id, prev_post_id, prev_post_time, prev_post_user_id, prev_post_user_name) '
+                f'VALUES (0, ?, ?, ?, ?)',
+                ( data['post_id'], data['time'], data['user_id'], data['user_name'] )
+            )
+
+
+    def get_user(self, user_name: str) -> table.Document | None:
+        """
+        See `ThreadNecroBotCore.get_user`
+        """
+        with self.__open_db() as db:
+            row = db.execute(
+                f'SELECT user_id, user_name, post_id FROM {self.__TABLE_USERS_DATA} WHERE user_name = ? ORDER BY rowid LIMIT 1',
+                ( user_name, )
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return self.__to_document(row, 'user_id')
+
+
+    def get_user_points(self, user_id: str | int, type_id: int) -> float:
+        """
+        See `ThreadNecroBotCore.get_user_points`
+        """
+        with self.__open_db() as db:
+            table_name = self.__TABLE_USERS_ALLTIME if type_id == self.DB_TYPE_ALLTIME else self.__get_users_monthly_table(db)
+            row = db.execute(f'SELECT points FROM "{table_name}" WHERE user_id = ?', ( int(user_id), )).fetchone()
+
+        return 0 if row is None else row['points']
+
+
+    def get_user_rank(self, user_id: str | int, type_id: int) -> int | None:
+        """
+        See `ThreadNecroBotCore.get_user_rank`
+        """
+        with self.__open_db() as db:
+            return self.__get_leaderboard(db, type_id).get_rank(int(user_id))
+
+
+    def get_log_list(self, db_type: int, idx: int = 0, num: int | None = None) -> list[table.Document]:
+        """
+        See `ThreadNecroBotCore.get_log_list`
+        """
+        with self.__open_db() as db:
+            # Monthly entries are the last `num` ones logged
+            first_id = 0
+            if db_type == self.DB_TYPE_MONTHLY:
+                row = db.execute(f'SELECT num FROM {self.__TABLE_LOGS_META} WHERE type = ?', ( self.DB_TYPE_MONTHLY, )).fetchone()
+                if row is not None and row['num'] is not None:
+                    last_id  = db.execute(f'SELECT MAX(id) FROM {self.__TABLE_LOGS}').fetchone()[0] or 0
+                    first_id = last_id - row['num']
+
+            # Walks the primary key back from the newest entry, so only idx + num rows are visited
+            rows = db.execute(
+                f'SELECT * FROM {self.__TABLE_LOGS} WHERE id > ? ORDER BY id DESC LIMIT ? OFFSET ?',
+                ( first_id, -1 if num is None else max(num, 0), max(idx, 0) )
+            ).fetchall()
+
+        return [ self.__to_document(row, 'id') for row in rows ]
+
+
+    def get_top_scores_list(self, db_type: int) -> list[table.Document]:
+        """
+        See `ThreadNecroBotCore.get_top_scores_list`
+        """
+        with self.__open_db() as db:
+            table_name = self.__TABLE_SCORES_ALLTIME if db_type == self.DB_TYPE_ALLTIME else self.__get_scores_monthly_table(db)
+            return self.__get_top_scores(db, table_name).get_sorted()
+
+
+    def get_ranked_list(self, type_id: int, idx: int = 0, num: int | None = None, epoch: str | None = None) -> list[table.Document]:
+        """
+        See `ThreadNecroBotCore.get_ranked_list`
+        """
+        with self.__open_db() as db:
+            if type_id == self.DB_TYPE_MONTHLY and epoch is not None and epoch != self.__get_epoch_key():
+                # Past months are not kept ranked; they are ranked on the spot
+                self._check_epoch(epoch)
+                if epoch not in self.get_epochs():
+                    return []
+
+                entries = self.__load_leaderboard(db, self._monthly_table_name(self.__TABLE_USERS_MONTHLY, epoch)).get_range(idx, num)
+            else:
+                entries = self.__get_leaderboard(db, type_id).get_range(idx, num)
+
+            # Look up user names in batches, staying under SQLite's limit on query parameters
+            user_names = {}
+            for i in range(0, len(entries), 500):
+                user_ids = [ user_id for user_id, _ in entries[i : i + 500] ]
+                rows = db.execute(
+                    f'SELECT user_id, user_name FROM {self.__TABLE_USERS_DATA} WHERE user_id IN ({", ".join("?"*len(user_ids))})',
+                    user_ids
+                )
+                user_names.update({ row['user_id'] : row['user_name'] for row in rows })
+
+        return [
+            table.Document({ 'points' : points, 'user_name' : user_names[user_id] }, doc_id=user_id)
+            for user_id, points in entries
+        ]
+
+
+    def get_monthly_winners_list(self) -> list[table.Document]:
+        """
+        See `ThreadNecroBotCore.get_monthly_winners_list`
+        """
+        with self.__open_db() as db:
+            rows = db.execute(f'SELECT * FROM {self.__TABLE_WINNERS} ORDER BY idx ASC').fetchall()
+
+        return [ self.__to_document(row, 'idx') for row in rows ]
+
+
+    def get_epoch(self) -> table.Document | None:
+        """
+        See `ThreadNecroBotCore.get_epoch`
+        """
+        if not self.__epoch_loaded:
+            with self.__open_db() as db:
+                row = db.execute(f'SELECT * FROM {self.__TABLE_META_EPOCH} WHERE id = 0').fetchone()
+                self.__epoch = None if row is None else self.__to_document(row, 'id')
+                self.__epoch_loaded = True
+
+        if self.__epoch is None:
+            return None
+
+        return table.Document(dict(self.__epoch), doc_id=self.__epoch.doc_id)
+
+
+    def get_epochs(self) -> list[str]:
+        """
+        See `ThreadNecroBotCore.get_epochs`
+        """
+        prefix = f'{self.__TABLE_USERS_MONTHLY}_'
+
+        with self.__open_db() as db:
+            rows = db.execute(f"SELECT name FROM sqlite_master WHERE type = 'table' AND substr(name, 1, ?) = ?", ( len(prefix), prefix )).fetchall()
+            epochs = sorted(
+                row['name'][len(prefix):] for row in rows
+                if db.execute(f'SELECT EXISTS (SELECT 1 FROM "{row["name"]}")').fetchone()[0]
+            )
+
+            if db.execute(f'SELECT EXISTS (SELECT 1 FROM {self.__TABLE_USERS_MONTHLY})').fetchone()[0]:
+                epochs.insert(0, self.EPOCH_LEGACY)
+
+            return epochs
+
+
+    def start_epoch(self, epoch: str, rollover_time: int):
+        """
+        See `ThreadNecroBotCore.start_epoch`
+        """
+        self._check_epoch(epoch)
+
+        with self.__open_db() as db:
+            epoch_prev = self.__get_epoch_key()
+
+            db.execute(
+                f'INSERT OR REPLACE INTO {self.__TABLE_META_EPOCH} (id, epoch, rollover_time) VALUES (0, ?, ?)',
+                ( epoch, int(rollover_time) )
+            )
+            self.__epoch = table.Document({ 'epoch' : epoch, 'rollover_time' : int(rollover_time) }, doc_id=0)
+
+            if epoch == epoch_prev:
+                return
+
+            # The new epoch's tables are created and loaded on next use
+            self.__leaderboards.pop(self.DB_TYPE_MONTHLY, None)
+            self.__top_scores.pop(self._monthly_table_name(self.__TABLE_SCORES_MONTHLY, epoch_prev), None)
+
+            db.execute(f'INSERT OR REPLACE INTO {self.__TABLE_LOGS_META} (type, num) VALUES (?, 0)', ( self.DB_TYPE_MONTHLY, ))
+
+            for data in [ self.DATA_USERS, self.DATA_SCORES, self.DATA_LOG ]:
+                self._bump_data_version(data, self.DB_TYPE_MONTHLY)
+
+
+    def get_prev_post_info(self) -> table.Document | list[table.Document] | None:
+        """
+        See `ThreadNecroBotCore.get_prev_post_info`
+        """
+        with self.__open_db() as db:
+            row = db.execute(f'SELECT * FROM {self.__TABLE_META_PREV_POST} WHERE id = 0').fetchone()
+
+        if row is None:
+            return None
+
+        return self.__to_document(row, 'id')
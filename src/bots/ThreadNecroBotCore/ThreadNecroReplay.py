@@ -0,0 +1,226 @@
+import os
+import logging
+import concurrent.futures
+
+from typing import Iterable, Iterator
+
+from core.parser import parse_topic_record
+from core.parser.records import PostRecord
+
+from ..ThreadNecroBot import ThreadNecroBot
+from .ThreadNecroBotCoreBase import ThreadNecroBotCoreBase
+
+
+class ThreadNecroReplay(ThreadNecroBot):
+    """
+    Rebuilds ThreadNecroBot's database offline by replaying the necro thread's posts through the
+    bot's scoring, instead of waiting for the forum monitor to see each post live.
+
+    Topic pages are parsed in parallel across processes, and the posts on them are scored in post
+    id order, the same way `ThreadNecroBot.process_data` scores them. All of the replay is one
+    `transaction`, so the database is written out once at the end, or left untouched if replaying
+    fails part way.
+
+    Posts that were deleted before the pages were saved are not on them, so they are neither scored
+    nor penalized.
+
+    Parameters
+    ----------
+    db_path : str
+        Directory to build the database in. Should be empty; replayed posts are added on top of
+        whatever is there.
+
+    backend : str
+        Database backend to build, 'tinydb' or 'sqlite'
+    """
+
+    # Posts shown per topic page
+    POSTS_PER_PAGE = 20
+
+    def __init__(self, db_path: str, backend: str = 'tinydb'):
+        # Only the scoring of the bot is used; it is not started or connected to the forum
+        self.logger    = logging.getLogger('bots.ThreadNecroReplay')
+        self.banned    = set()
+        self.main_post = None
+
+        self.core = ThreadNecroBotCoreBase.create(backend, db_path, flush_delay=0)
+
+
+    @staticmethod
+    def read_pages(path: str) -> Iterator[bytes]:
+        """
+        Gives the saved topic pages (*.htm, *.html) in a directory, in file name order
+        """
+        for file_name in sorted(os.listdir(path)):
+            if os.path.splitext(file_name)[1].lower() not in [ '.htm', '.html' ]:
+                continue
+
+            with open(os.path.join(path, file_name), 'rb') as f:
+                yield f.read()
+
+
+    @classmethod
+    def fetch_pages(cls, topic_id: int, post_id_start: int, post_id_end: int) -> Iterator[bytes]:
+        """
+        Downloads the topic pages holding the posts from `post_id_start` to `post_id_end`
+
+        The post numbers of the first and last post are looked up first, so the pages in between
+        can be requested by post number without parsing each one before fetching the next.
+        """
+        from core.SessionMgrV2 import SessionMgrV2
+
+        post_num_start = SessionMgrV2.get_post(post_id_start).post_num
+        post_num_end   = SessionMgrV2.get_post(post_id_end).post_num
+
+        for post_num in range(post_num_start, post_num_end + 1, cls.POSTS_PER_PAGE):
+            yield SessionMgrV2.fetch_web_data(f'https://osu.ppy.sh/community/forums/topics/{topic_id}/?n={post_num}').content
+
+
+    @staticmethod
+    def parse_pages(pages: Iterable[bytes], topic_id: int, backend: str = 'lxml', processes: int | None = None,
+                    post_id_start: int | None = None, post_id_end: int | None = None) -> list[PostRecord]:
+        """
+        Parses topic pages across processes and gives the posts of the given topic on them, oldest first
+
+        Parameters
+        ----------
+        pages : Iterable[bytes]
+            Topic pages. Pages of other topics are skipped, and posts on more than one page are kept once.
+
+        topic_id : int
+            Id of the necro thread
+
+        backend : str
+            Parser backend, 'lxml' or 'bs4'
+
+        processes : int | None
+            Number of worker processes. The number of CPUs if None.
+
+        post_id_start, post_id_end : int | None
+            Only keep posts with ids in this range, inclusive
+
+        Returns
+        -------
+        list[PostRecord]
+            The posts, ordered by post id
+        """
+        posts: dict[int, PostRecord] = {}
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [ pool.submit(parse_topic_record, page, backend) for page in pages ]
+
+            for future in futures:
+                topic = future.result()
+                if topic.id != topic_id:
+                    continue
+
+                for post in topic.posts:
+                    if post_id_start is not None and post.id < post_id_start:
+                        continue
+
+                    if post_id_end is not None and post.id > post_id_end:
+                        continue
+
+                    posts[post.id] = post
+
+        return [ posts[post_id] for post_id in sorted(posts) ]
+
+
+    def replay(self, posts: list[PostRecord]) -> list[str]:
+        """
+        Scores the posts in order. The first post is only used as the previous post of the second,
+        same as the bot needs a previous post to score one.
+
+        Parameters
+        ----------
+        posts : list[PostRecord]
+            Posts of the necro thread, oldest first
+
+        Returns
+        -------
+        list[str]
+            Warnings about gaps in the posts, where posts numbers are not consecutive
+        """
+        warnings = []
+
+        # Months are counted from the thread's first post, or the first post replayed if that is not there
+        if self.main_post is None and posts:
+            self.main_post = posts[0]
+
+        with self.core.transaction():
+            for prev_post, post in zip(posts, posts[1:]):
+                if post.post_num != prev_post.post_num + 1:
+                    warnings.append(f'Posts #{prev_post.post_num} (id {prev_post.id}) and #{post.post_num} (id {post.id}) are not consecutive')
+
+                self.process_post_data({
+                    'curr_post_id'   : post.id,
+                    'prev_post_id'   : prev_post.id,
+                    'curr_post_time' : post.date,
+                    'prev_post_time' : prev_post.date,
+                    'curr_user_id'   : int(post.creator_id),
+                    'prev_user_id'   : int(prev_post.creator_id),
+                    'curr_user_name' : post.creator_name,
+                    'prev_user_name' : prev_post.creator_name,
+                })
+
+        return warnings
+
+
+    @classmethod
+    def diff(cls, live: ThreadNecroBotCoreBase, rebuilt: ThreadNecroBotCoreBase) -> list[str]:
+        """
+        Compares a rebuilt database with the live one
+
+        Returns
+        -------
+        list[str]
+            A line for each user whose points differ, each top score and monthly winner only in one
+            of them, and the previous post if it differs. Empty if they match.
+        """
+        lines = []
+
+        for db_type, name in [ ( cls.DB_TYPE_ALLTIME, 'all time' ), ( cls.DB_TYPE_MONTHLY, 'monthly' ) ]:
+            points_live    = { entry.doc_id : entry for entry in live.get_ranked_list(db_type) }
+            points_rebuilt = { entry.doc_id : entry for entry in rebuilt.get_ranked_list(db_type) }
+
+            for user_id in sorted(points_live.keys() | points_rebuilt.keys()):
+                entry_live    = points_live.get(user_id, None)
+                entry_rebuilt = points_rebuilt.get(user_id, None)
+
+                pts_live    = 0.0 if entry_live    is None else float(entry_live['points'])
+                pts_rebuilt = 0.0 if entry_rebuilt is None else float(entry_rebuilt['points'])
+                if round(pts_rebuilt - pts_live, 3) == 0:
+                    continue
+
+                user_name = ( entry_rebuilt or entry_live )['user_name']
+                lines.append(f'{name} points   {user_name} ({user_id}): {pts_live:.3f} -> {pts_rebuilt:.3f} ({pts_rebuilt - pts_live:+.3f})')
+
+            scores_live    = { ( entry['post_id'], float(entry['added_score']) ) for entry in live.get_top_scores_list(db_type) }
+            scores_rebuilt = { ( entry['post_id'], float(entry['added_score']) ) for entry in rebuilt.get_top_scores_list(db_type) }
+
+            for post_id, added_score in sorted(scores_live - scores_rebuilt):
+                lines.append(f'{name} top score   post {post_id} {added_score:.3f} pts only in live')
+
+            for post_id, added_score in sorted(scores_rebuilt - scores_live):
+                lines.append(f'{name} top score   post {post_id} {added_score:.3f} pts only in rebuilt')
+
+        winners_live    = [ ( entry['time'], entry['user_name'], float(entry['points']) ) for entry in live.get_monthly_winners_list() ]
+        winners_rebuilt = [ ( entry['time'], entry['user_name'], float(entry['points']) ) for entry in rebuilt.get_monthly_winners_list() ]
+
+        for winner in winners_live:
+            if winner not in winners_rebuilt:
+                lines.append(f'monthly winner   {winner[0]} {winner[1]} {winner[2]:.3f} pts only in live')
+
+        for winner in winners_rebuilt:
+            if winner not in winners_live:
+                lines.append(f'monthly winner   {winner[0]} {winner[1]} {winner[2]:.3f} pts only in rebuilt')
+
+        prev_live    = live.get_prev_post_info()
+        prev_rebuilt = rebuilt.get_prev_post_info()
+        if ( prev_live or {} ).get('prev_post_id') != ( prev_rebuilt or {} ).get('prev_post_id'):
+            lines.append(
+                f'previous post   {( prev_live or {} ).get("prev_post_id")} in live, '
+                f'{( prev_rebuilt or {} ).get("prev_post_id")} in rebuilt'
+            )
+
+        return lines
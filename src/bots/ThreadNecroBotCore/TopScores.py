@@ -0,0 +1,95 @@
+import heapq
+
+from typing import Iterable
+
+from tinydb import table
+
+
+class TopScores():
+    """
+    In-memory copy of a top scores table that keeps at most `max_entries` scores.
+
+    Scores are kept in a min-heap on the added score, so checking whether a new score makes the
+    table and finding the entry it replaces is O(1), and putting it in is O(log K). The list sorted
+    highest first is only rebuilt on the first read after a change.
+
+    Entries are identified by their doc id in the table. A new score goes to the next free doc id
+    while the table is not full, and takes the doc id of the lowest score after that. Ties are
+    replaced and listed lowest doc id first, same as scanning and sorting the table does.
+
+    Not thread safe; guard it with the lock of the database it mirrors.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of scores kept
+    """
+
+    def __init__(self, max_entries: int):
+        self.__max_entries = max_entries
+
+        # ( added score, doc id, entry )
+        self.__heap: list[tuple[float, int, table.Document]] = []
+        self.__sorted: list[table.Document] | None = None
+
+
+    def __len__(self) -> int:
+        return len(self.__heap)
+
+
+    def load(self, entries: Iterable[table.Document]):
+        """
+        Replaces the scores with the entries of the table
+        """
+        self.__heap = [ ( float(entry['added_score']), entry.doc_id, entry ) for entry in entries ]
+        heapq.heapify(self.__heap)
+        self.__sorted = None
+
+
+    def clear(self):
+        self.__heap.clear()
+        self.__sorted = None
+
+
+    def get_slot(self, added_score: float) -> int | None:
+        """
+        Returns
+        -------
+        int | None
+            The doc id a score of `added_score` should be stored at, or None if it does not make the table
+        """
+        if len(self.__heap) < self.__max_entries:
+            return len(self.__heap)
+
+        if added_score <= self.__heap[0][0]:
+            return None
+
+        return self.__heap[0][1]
+
+
+    def put(self, entry: table.Document):
+        """
+        Puts in an entry stored at the doc id given by `get_slot`, replacing the lowest score if the table is full
+        """
+        item = ( float(entry['added_score']), entry.doc_id, entry )
+
+        if len(self.__heap) < self.__max_entries:
+            heapq.heappush(self.__heap, item)
+        else:
+            assert self.__heap[0][1] == entry.doc_id, 'Entry must replace the lowest score'
+            heapq.heapreplace(self.__heap, item)
+
+        self.__sorted = None
+
+
+    def get_sorted(self) -> list[table.Document]:
+        """
+        Returns
+        -------
+        list[table.Document]
+            Copies of the entries, highest added score first
+        """
+        if self.__sorted is None:
+            self.__sorted = [ entry for _, _, entry in sorted(self.__heap, key=lambda item: ( -item[0], item[1] )) ]
+
+        return [ table.Document(dict(entry), doc_id=entry.doc_id) for entry in self.__sorted ]
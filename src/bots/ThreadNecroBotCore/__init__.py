@@ -1 +1,6 @@
+from .Leaderboard import Leaderboard
+from .TopScores import TopScores
+from .LogRing import LogRing
+from .ThreadNecroBotCoreBase import ThreadNecroBotCoreBase
 from .ThreadNecroBotCore import ThreadNecroBotCore
+from .ThreadNecroBotCoreSqlite import ThreadNecroBotCoreSqlite
@@ -2,7 +2,9 @@ import logging
 import queue
 import threading
 
-from .parser import Post
+from .parser import PostBase, ParserError
+from .BotConfig import BotConfig
+from .BotQueue import BotQueue
 from misc.thread_enchanced import ThreadEnchanced
 
 from typing import TYPE_CHECKING
@@ -12,13 +14,21 @@ if TYPE_CHECKING:
 
 class BotBase:
 
+    # Posts the bot subscribes to, by subforum, topic, and poster ids; None for any. BotCore indexes
+    # bots by these, so a post is only handed to the bots subscribed to it. Set on the class, or in
+    # `__init__` for ids read from the config. Anything these can't express goes in `filter_data`.
+    subforum_ids: frozenset[int] | None = None
+    topic_ids:    frozenset[int] | None = None
+    user_ids:     frozenset[int] | None = None
+
     def __init__(self, cmd: "type[Cmd]", name: str, enable: bool):
         self.logger    = logging.getLogger(f'bots.{name}')
         self.__enable  = enable
         self.__name    = name
         self.__bot_cmd = cmd(self)
 
-        self.__post_queue = queue.Queue()
+        self.__post_queue = self.__new_queue(name)
+        self.__detach     = bool(BotConfig['Core'].get('detach_posts', True))
         self.__bot_thread = None
         self.start()
 
@@ -27,6 +37,21 @@ class BotBase:
         raise NotImplementedError()
 
 
+    @staticmethod
+    def __new_queue(name: str) -> BotQueue:
+        # The bot's own config section overrides the defaults in Core
+        config = BotConfig.get(name) or {}
+        size   = int(config.get('queue_size', BotConfig['Core'].get('bot_queue_size', 0)))
+        policy = config.get('queue_policy', BotConfig['Core'].get('bot_queue_policy', BotQueue.POLICY_BLOCK))
+
+        spill_path = None
+        if policy == BotQueue.POLICY_SPILL:
+            db_path    = BotConfig['Core']['db_path_dbg'] if BotConfig['Core']['is_dbg'] else BotConfig['Core']['db_path']
+            spill_path = f'{db_path}/queues/{name}.spill'
+
+        return BotQueue(size, policy, spill_path)
+
+
     @property
     def cmd(self) -> "Cmd":
         return self.__bot_cmd
@@ -59,6 +84,7 @@ class BotBase:
         if self.__bot_thread is not None and self.__bot_thread.is_alive():
             return
 
+        self.__post_queue.open()
         self.__bot_thread = ThreadEnchanced(
             target=self.__loop, args=( threading.Event(), threading.Event() ),
             daemon=True
@@ -74,6 +100,9 @@ class BotBase:
             return
 
         self.logger.info(f'Stopping bot {self.__name}...')
+
+        # Done first, so the forum monitor is not held up by a full queue while the bot finishes its post
+        self.__post_queue.close()
         self.__bot_thread.stop()
 
 
@@ -82,36 +111,92 @@ class BotBase:
         return self.__enable
 
 
-    def event(self, forum_data: Post):
+    def get_queue_stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Metrics of the queue of posts waiting for the bot, see `BotQueue.get_stats`
+        """
+        return self.__post_queue.get_stats()
+
+
+    def event(self, forum_data: PostBase):
         """
         To be called for each new post
 
         Parameters
         ----------
-        forum_data : Post
+        forum_data : PostBase
             The `Post` object to process.
         """
         if not self.__enable:
             return
 
+        if not self.is_subscribed(forum_data):
+            return
+
         if not self.filter_data(forum_data):
             self.logger.debug(f'Filtered out post {forum_data.id} in {forum_data.topic.subforum_name}')
             return
 
+        # Queued posts are detached from the parsed page, so a bot falling behind holds their fields rather than whole pages.
+        # Detached posts have no page elements (`body_root`, `contents_root`).
+        if self.__detach:
+            try: forum_data = forum_data.detach()
+            except ParserError as e:
+                self.logger.warning(f'Unable to detach post {forum_data.id} from its page; queuing it attached: {e}')
+
         self.logger.debug(f'Queuing post {forum_data.id} in {forum_data.topic.subforum_name}')
         self.__post_queue.put(forum_data)
 
 
-    def filter_data(self, forum_data: Post) -> bool:
+    def is_subscribed(self, forum_data: PostBase) -> bool:
+        """
+        Whether the post is in the subforums and topics, and by the users, the bot subscribes to
+
+        Parameters
+        ----------
+        forum_data : PostBase
+            The `Post` object to check.
+        """
+        # Only what is subscribed by is read from the post, so the rest of it is not parsed
+        if self.subforum_ids is not None and int(forum_data.topic.subforum_id) not in self.subforum_ids:
+            return False
+
+        if self.topic_ids is not None and int(forum_data.topic.id) not in self.topic_ids:
+            return False
+
+        if self.user_ids is not None and int(forum_data.creator.id) not in self.user_ids:
+            return False
+
+        return True
+
+
+    def is_subscribed_to(self, subforum_id: int, topic_id: int) -> bool:
+        """
+        Whether the bot subscribes to posts in the given subforum and topic, by any user
+        """
+        if self.subforum_ids is not None and subforum_id not in self.subforum_ids:
+            return False
+
+        if self.topic_ids is not None and topic_id not in self.topic_ids:
+            return False
+
+        return True
+
+
+    def filter_data(self, forum_data: PostBase) -> bool:
         """
         Bot filter criteria. By default, it doesn't filter anything.
-        Reimplement this method if it's desired to filter posts.
+        Reimplement this method if it's desired to filter posts by more
+        than the subscriptions; it's only called for posts subscribed to.
 
         Not meant to be used publically.
 
         Parameters
         ----------
-        forum_data : Post
+        forum_data : PostBase
             The `Post` object to filter.
 
         Returns
@@ -122,7 +207,7 @@ class BotBase:
         return True
 
 
-    def process_data(self, forum_data: Post) -> None:
+    def process_data(self, forum_data: PostBase) -> None:
         """
         Processes the given forum data; used by the bot module to process
         data. This method should be overridden in a child class to do
@@ -132,7 +217,7 @@ class BotBase:
 
         Parameters
         ----------
-        forum_data : Post
+        forum_data : PostBase
             The `Post` object to process.
 
         Raises
@@ -144,6 +229,13 @@ class BotBase:
 
 
     def __loop(self, target_event: threading.Event, thread_event: threading.Event):
+        # Nothing takes posts once the loop exits, so the forum monitor must not block on a full queue
+        try: self.__process_loop(target_event, thread_event)
+        finally:
+            self.__post_queue.close()
+
+
+    def __process_loop(self, target_event: threading.Event, thread_event: threading.Event):
         while True:
             target_event.set()
             if thread_event.is_set():
@@ -155,7 +247,7 @@ class BotBase:
             except queue.Empty:
                 continue
 
-            assert isinstance(post, Post)
+            assert isinstance(post, PostBase)
 
             self.logger.debug(f'Processing post {post.id}')
             self.process_data(post)
@@ -7,7 +7,7 @@ import warnings
 from .BotException import BotException
 from .BotConfig import BotConfig
 from .BotBase import BotBase
-from .parser import Post
+from .parser import PostBase
 
 from api.ApiServer import ApiServer
 
@@ -34,6 +34,11 @@ class BotCore():
         # Initialize the bot modules
         self.__bots: dict[str, BotBase] = {}
 
+        # Bots by what they subscribe to; see `update_routes`
+        self.__routes_topic:    dict[int, list[BotBase]] = {}
+        self.__routes_subforum: dict[int, list[BotBase]] = {}
+        self.__routes_any:      list[BotBase] = []
+
         try: self.__init_bots()
         except Exception as e:
             raise BotException(
@@ -84,20 +89,78 @@ class BotCore():
                 ))
                 continue
 
+        self.update_routes()
+
         # Now that all bots are initialized, initialize the API server
         ApiServer.init(list(self.__bots.values()))
 
 
-    def forum_driver(self, post: Post):
+    def update_routes(self):
+        """
+        Indexes the bots by the subforums and topics they subscribe to. Bots subscribed to topics are
+        indexed by topic, bots subscribed only to subforums by subforum, and the rest are given every
+        post. Needs to be called again if a bot changes its subscriptions.
+        """
+        routes_topic:    dict[int, list[BotBase]] = {}
+        routes_subforum: dict[int, list[BotBase]] = {}
+        routes_any:      list[BotBase] = []
+
+        for bot in self.__bots.values():
+            if bot.topic_ids is not None:
+                for topic_id in bot.topic_ids:
+                    routes_topic.setdefault(int(topic_id), []).append(bot)
+            elif bot.subforum_ids is not None:
+                for subforum_id in bot.subforum_ids:
+                    routes_subforum.setdefault(int(subforum_id), []).append(bot)
+            else:
+                routes_any.append(bot)
+
+        self.__routes_topic    = routes_topic
+        self.__routes_subforum = routes_subforum
+        self.__routes_any      = routes_any
+
+        self.__logger.debug(
+            f'Routes: {len(routes_topic)} topics, {len(routes_subforum)} subforums, '
+            f'{len(routes_any)} bots for any post'
+        )
+
+
+    def has_subscriber(self, subforum_id: int, topic_id: int) -> bool:
+        """
+        Whether any enabled bot subscribes to posts in the given subforum and topic. Bots subscribed
+        by poster count as subscribers, since the poster is not known without parsing the post.
+
+        Parameters
+        ----------
+        subforum_id: int
+            Id of the subforum the topic is in.
+
+        topic_id: int
+            Id of the topic.
+        """
+        bots = self.__routes_topic.get(topic_id, []) + self.__routes_subforum.get(subforum_id, []) + self.__routes_any
+        return any(bot.is_enabled and bot.is_subscribed_to(subforum_id, topic_id) for bot in bots)
+
+
+    def forum_driver(self, post: PostBase):
         """
-        For each bot, run the event function with the given post.
+        Run the event function with the given post for each bot subscribed to it.
+
+        The bots are looked up by the post's topic and subforum, so bots that don't subscribe
+        to them are not called at all.
 
         Parameters
         ----------
-        post: Post
+        post: PostBase
             The post to process.
         """
-        for bot in self.__bots.values():
+        topic_id = int(post.topic.id)
+
+        bots = self.__routes_topic.get(topic_id, [])
+        if self.__routes_subforum:
+            bots = bots + self.__routes_subforum.get(int(post.topic.subforum_id), [])
+
+        for bot in bots + self.__routes_any:
             bot.event(post)
 
 
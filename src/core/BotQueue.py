@@ -0,0 +1,278 @@
+import os
+import time
+import queue
+import pickle
+import logging
+import threading
+import collections
+
+from .parser import PostBase, RecordTopic, ParserError
+from .parser.records import TopicRecord
+
+
+
+class BotQueue():
+    """
+    Queue of posts waiting for a bot to process them.
+
+    With a `maxsize` above 0, at most that many posts are held in memory, and `policy` decides what
+    happens to a post put while the queue is full:
+    - 'block':       `put` waits until the bot takes a post, holding up the forum monitor
+    - 'drop_oldest': the oldest post waiting is dropped to make room
+    - 'spill':       the post is written to `spill_path` and read back once there is room. Only the
+                     records of the post's topic are written, once for posts from the same page put
+                     one after another, so posts read back are `RecordPost`s without the parsed
+                     page. Posts put while some are spilled are spilled too, so posts are still
+                     taken in the order they were put. A post whose topic cannot be made into a
+                     record is kept in memory instead, ahead of the posts spilled before it.
+
+    The spill file is only for holding posts off memory, not across restarts; it is emptied when
+    opened and whenever every post in it was read back.
+
+    While the queue is closed, nothing is taking posts from it, so `put` does not block; a full
+    queue with the 'block' policy drops the oldest post instead. See `close`.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of posts held in memory. 0 for no limit.
+
+    policy : str
+        What to do with posts put while the queue is full, 'block', 'drop_oldest', or 'spill'
+
+    spill_path : str | None
+        File posts are spilled to. Needed for the 'spill' policy.
+    """
+
+    POLICY_BLOCK       = 'block'
+    POLICY_DROP_OLDEST = 'drop_oldest'
+    POLICY_SPILL       = 'spill'
+
+    __logger = logging.getLogger(__qualname__)
+
+    def __init__(self, maxsize: int = 0, policy: str = POLICY_BLOCK, spill_path: str | None = None):
+        if policy not in [ self.POLICY_BLOCK, self.POLICY_DROP_OLDEST, self.POLICY_SPILL ]:
+            raise ValueError(f'Unknown queue policy: {policy}')
+
+        if policy == self.POLICY_SPILL and spill_path is None:
+            raise ValueError('The spill policy needs a spill path')
+
+        self.__maxsize    = max(0, int(maxsize))
+        self.__policy     = policy
+        self.__spill_path = spill_path
+
+        self.__cond   = threading.Condition()
+        self.__closed = False
+
+        # ( time put, post ), oldest first
+        self.__posts: collections.deque[tuple[float, PostBase]] = collections.deque()
+
+        # Posts in the spill file not read back yet, and where the next one to read back starts
+        self.__spill_file   = None
+        self.__spilled      = 0
+        self.__spill_offset = 0
+
+        # Topic record last written to the spill file, and the topic last read back from it
+        self.__spill_topic:   TopicRecord | None = None
+        self.__unspill_topic: RecordTopic | None = None
+
+        self.__depth_max = 0
+        self.__stats = {
+            'posts'        : 0,
+            'dropped'      : 0,
+            'spills'       : 0,
+            'blocked_time' : 0.0,
+            'wait_time'    : 0.0,
+            'wait_max'     : 0.0,
+            'taken'        : 0,
+        }
+
+
+    def qsize(self) -> int:
+        """
+        Number of posts waiting, including spilled ones
+        """
+        with self.__cond:
+            return len(self.__posts) + self.__spilled
+
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+
+    def close(self):
+        """
+        Marks that posts are no longer being taken, such as when the bot is stopped, and wakes up
+        any `put` blocked waiting for room
+        """
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+
+
+    def open(self):
+        """
+        Marks that posts are being taken again
+        """
+        with self.__cond:
+            self.__closed = False
+
+
+    def put(self, post: PostBase):
+        """
+        Queues a post, handling a full queue according to the policy
+        """
+        time_put = time.monotonic()
+
+        with self.__cond:
+            self.__stats['posts'] += 1
+
+            if self.__maxsize > 0 and ( len(self.__posts) >= self.__maxsize or self.__spilled > 0 ):
+                if self.__policy == self.POLICY_BLOCK:
+                    self.__cond.wait_for(lambda: len(self.__posts) < self.__maxsize or self.__closed)
+                    self.__stats['blocked_time'] += time.monotonic() - time_put
+
+                # Still full with the 'block' policy only if the queue was closed while waiting
+                if self.__policy == self.POLICY_DROP_OLDEST or ( self.__policy == self.POLICY_BLOCK and len(self.__posts) >= self.__maxsize ):
+                    _, dropped = self.__posts.popleft()
+                    self.__stats['dropped'] += 1
+                    self.__logger.debug(f'Queue full; dropped post {dropped.id}')
+
+                elif self.__policy == self.POLICY_SPILL and self.__spill(time_put, post):
+                    self.__cond.notify_all()
+                    return
+
+            self.__posts.append(( time_put, post ))
+            self.__depth_max = max(self.__depth_max, len(self.__posts) + self.__spilled)
+            self.__cond.notify_all()
+
+
+    def get(self, block: bool = True, timeout: float | None = None) -> PostBase:
+        """
+        Takes the oldest post waiting
+
+        Raises
+        ------
+        queue.Empty
+            If there is no post waiting after `timeout` seconds, or right away if not `block`
+        """
+        with self.__cond:
+            if not self.__cond.wait_for(lambda: len(self.__posts) > 0, timeout if block else 0):
+                raise queue.Empty
+
+            time_put, post = self.__posts.popleft()
+
+            # Spilled posts are newer than any held in memory
+            while self.__spilled > 0 and len(self.__posts) < self.__maxsize:
+                unspilled = self.__unspill()
+                if unspilled is not None:
+                    self.__posts.append(unspilled)
+
+            time_wait = time.monotonic() - time_put
+            self.__stats['taken']     += 1
+            self.__stats['wait_time'] += time_wait
+            self.__stats['wait_max']   = max(self.__stats['wait_max'], time_wait)
+
+            self.__cond.notify_all()
+            return post
+
+
+    def get_stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Queue metrics. Format:
+            {
+                "maxsize"      : (maximum number of posts held in memory, 0 for no limit: int),
+                "policy"       : (what is done with posts put while full: str),
+                "depth"        : (posts waiting, including spilled ones: int),
+                "depth_max"    : (most posts waiting at once: int),
+                "spilled"      : (posts waiting in the spill file: int),
+                "posts"        : (posts put: int),
+                "dropped"      : (posts dropped for the queue being full, or for not being read back from the spill file: int),
+                "spills"       : (posts written to the spill file: int),
+                "blocked_time" : (seconds `put` waited for room: float),
+                "wait_avg"     : (average seconds a post waited to be taken: float | None),
+                "wait_max"     : (longest seconds a post waited to be taken: float),
+            }
+        """
+        with self.__cond:
+            taken = self.__stats['taken']
+
+            return {
+                'maxsize'      : self.__maxsize,
+                'policy'       : self.__policy,
+                'depth'        : len(self.__posts) + self.__spilled,
+                'depth_max'    : self.__depth_max,
+                'spilled'      : self.__spilled,
+                'posts'        : self.__stats['posts'],
+                'dropped'      : self.__stats['dropped'],
+                'spills'       : self.__stats['spills'],
+                'blocked_time' : self.__stats['blocked_time'],
+                'wait_avg'     : self.__stats['wait_time'] / taken if taken > 0 else None,
+                'wait_max'     : self.__stats['wait_max'],
+            }
+
+
+    def __spill(self, time_put: float, post: PostBase) -> bool:
+        """
+        Returns whether the post was spilled. It is not if its topic cannot be made into a record.
+        """
+        try:
+            post_id = post.id
+            topic   = post.topic.detach().to_record()
+        except ParserError as e:
+            self.__logger.warning(f'Unable to spill post; keeping it in memory: {e}')
+            return False
+
+        if self.__spill_file is None:
+            os.makedirs(os.path.dirname(self.__spill_path) or '.', exist_ok=True)
+            self.__spill_file = open(self.__spill_path, 'w+b')
+
+        self.__spill_file.seek(0, os.SEEK_END)
+
+        # Posts from the same page share the topic record written ahead of the first of them
+        if topic is not self.__spill_topic:
+            pickle.dump(topic, self.__spill_file)
+            self.__spill_topic = topic
+
+        pickle.dump(( time_put, post_id ), self.__spill_file)
+        self.__spill_file.flush()
+
+        self.__spilled += 1
+        self.__stats['spills'] += 1
+        self.__depth_max = max(self.__depth_max, len(self.__posts) + self.__spilled)
+        return True
+
+
+    def __unspill(self) -> tuple[float, PostBase] | None:
+        """
+        Reads back the oldest spilled post. Returns None if it is missing from its topic record,
+        in which case it is dropped.
+        """
+        self.__spill_file.seek(self.__spill_offset)
+
+        entry = pickle.load(self.__spill_file)
+        if isinstance(entry, TopicRecord):
+            self.__unspill_topic = RecordTopic(entry)
+            entry = pickle.load(self.__spill_file)
+
+        self.__spill_offset = self.__spill_file.tell()
+        time_put, post_id = entry
+        topic = self.__unspill_topic
+
+        self.__spilled -= 1
+        if self.__spilled == 0:
+            self.__spill_file.truncate(0)
+            self.__spill_offset  = 0
+            self.__spill_topic   = None
+            self.__unspill_topic = None
+
+        post = next((topic_post for topic_post in topic.posts if topic_post.id == post_id), None)
+        if post is None:
+            self.__stats['dropped'] += 1
+            self.__logger.warning(f'Spilled post {post_id} is missing from its topic record; dropped')
+            return None
+
+        return time_put, post
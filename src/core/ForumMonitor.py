@@ -1,9 +1,13 @@
+import re
 import time
 import logging
 import requests
 import warnings
 import threading
 import queue
+import collections
+import multiprocessing
+import concurrent.futures
 
 import tinydb
 from tinydb import table
@@ -14,8 +18,12 @@ from misc.threaded_obj import Threaded
 from .BotConfig import BotConfig
 from .BotCore import BotCore
 from .SessionMgrV2 import SessionMgrV2
+from .RateLimiter import RateLimiter
+from .UnresolvedPosts import UnresolvedPosts
+from .PostArrivalPredictor import PostArrivalPredictor
 from .BotException import BotException
 from .DiscordClient import DiscordClient
+from .parser import RecordTopic, extract_topic_ids, parse_topic_record
 
 
 
@@ -27,6 +35,8 @@ class ForumMonitor(BotCore):
     __DB_TABLE_BOTCORE    = 'Botcore'
     __DB_ID_FORUM_MONITOR = 0
 
+    __RE_POST_ID = re.compile(rb'data-post-id="(\d+)"')
+
     __instance = None
 
     def __new__(cls):
@@ -57,12 +67,58 @@ class ForumMonitor(BotCore):
         self.__latest_post_id = Threaded(self.__retrieve_latest_post())
         self.__check_post_ids = Threaded([ self.__latest_post_id.get() + 1 ])
 
+        # Post ids skipped over while looking for new posts, to be checked again later
+        self.__unresolved = UnresolvedPosts(
+            max_ids      = int(BotConfig['Core'].get('unresolved_max_ids', 1000)),
+            max_attempts = int(BotConfig['Core'].get('unresolved_max_attempts', 8)),
+            retry_delay  = float(BotConfig['Core'].get('unresolved_retry_delay', 30.0)),
+        )
+        self.__unresolved.from_list(self.__retrieve_unresolved_posts())
+
+        # Estimate of time between new posts, used to probe less often when the forums are quiet
+        self.__arrivals = PostArrivalPredictor(
+            alpha        = float(BotConfig['Core'].get('post_rate_alpha', 0.05)),
+            max_interval = 3600,
+        )
+        self.__arrivals.from_dict(self.__retrieve_post_rate())
+
+        # State that changes with most found posts is kept in memory and saved at most this often, and on stop
+        self.__state_save_interval = float(BotConfig['Core'].get('state_save_interval', 60.0))
+        self.__state_saved_at      = time.time()
+
+        # Number of post fetches made and number of posts they found
+        self.__probe_count = Threaded(0)
+        self.__found_count = Threaded(0)
+
+        # Whether to stop reading probe responses early when the post is missing
+        self.__stream_probes = bool(BotConfig['Core'].get('stream_probes', False))
+
+        # Whether to take posts that follow a found post on its topic page from that page instead of probing for them
+        self.__batch_posts = bool(BotConfig['Core'].get('batch_posts', True))
+
+        # Whether to drop pages no bot subscribes to before parsing them
+        self.__prefilter_posts = bool(BotConfig['Core'].get('prefilter_posts', True))
+
+        # Number of worker processes to parse pages in; 0 parses them in the post handling thread
+        self.__parse_processes = max(0, int(BotConfig['Core'].get('parse_processes', 0)))
+
+        # Number of posts parsed and handed to the bots, and number dropped before parsing
+        self.__parsed_count  = Threaded(0)
+        self.__skipped_count = Threaded(0)
+
+        # Concurrent probing settings. Request starts are spaced `__check_rate` apart across all probing threads
+        self.__check_window    = max(1, int(BotConfig['Core'].get('check_window', 1)))
+        self.__check_pool      = None
+        self.__rate_lock       = threading.Lock()
+        self.__rate_next_start = 0.0
+
         self.__thread_check_post_loop = ThreadEnchanced(
             target=self.__check_posts_loop, args=( threading.Event(), threading.Event() ),
             daemon=True
         )
         self.__thread_new_post_loop = ThreadEnchanced(
-            target=self.__handle_posts_loop, args=( threading.Event(), threading.Event() ),
+            target=self.__handle_posts_pool_loop if self.__parse_processes > 0 else self.__handle_posts_loop,
+            args=( threading.Event(), threading.Event() ),
             daemon=True
         )
         self.__post_queue = queue.Queue()
@@ -82,10 +138,11 @@ class ForumMonitor(BotCore):
         fmt DB:
             {
                 "0": {
-                    "avg_post_rate"    : int,
+                    "avg_post_rate"    : { "global" : float | None, "hourly" : [ float | None, ... ] },
                     "avg_thread_rate"  : int,
                     "latest_post_id"   : int,
                     "latest_thread_id" : int,
+                    "unresolved_post_ids" : [ [ start: int, end: int, attempts: int, next_retry: float ], ... ],
                 }
             }
         """
@@ -144,7 +201,7 @@ class ForumMonitor(BotCore):
         fmt DB:
             {
                 "0": {
-                    "avg_post_rate"    : int,
+                    "avg_post_rate"    : { "global" : float | None, "hourly" : [ float | None, ... ] },
                     "avg_thread_rate"  : int,
                     "latest_post_id"   : int,
                     "latest_thread_id" : int,
@@ -211,6 +268,193 @@ class ForumMonitor(BotCore):
         self.__logger.debug(f'SET latest_post_id: {post_id}')
 
 
+    def get_unresolved_posts(self) -> UnresolvedPosts:
+        """
+        Returns
+        -------
+        UnresolvedPosts
+            Post ids that were skipped over and are still being checked for
+        """
+        return self.__unresolved
+
+
+    def get_probe_stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Post probing metrics. Format:
+            {
+                "probes"             : (number of post fetches made: int),
+                "posts"              : (number of posts found: int),
+                "probes_per_post"    : (post fetches made per post found: float | None),
+                "bytes"              : (response bytes read by post fetches: int),
+                "bytes_per_post"     : (response bytes read per post found: float | None),
+                "predicted_interval" : (expected seconds between posts right now: float | None),
+                "idle_delay"         : (extra seconds waited after finding no new posts right now: float),
+                "parsed"             : (number of posts parsed and handed to the bots: int),
+                "parses_skipped"     : (number of posts dropped unparsed for having no subscribed bot: int),
+            }
+        """
+        probes = self.__probe_count.get()
+        posts  = self.__found_count.get()
+        nbytes = SessionMgrV2.get_bytes_read(RateLimiter.PRIORITY_MONITOR)
+
+        return {
+            'probes'             : probes,
+            'posts'              : posts,
+            'probes_per_post'    : probes / posts if posts > 0 else None,
+            'bytes'              : nbytes,
+            'bytes_per_post'     : nbytes / posts if posts > 0 else None,
+            'predicted_interval' : self.__arrivals.predict(time.time()),
+            'idle_delay'         : self.__get_idle_delay(),
+            'parsed'             : self.__parsed_count.get(),
+            'parses_skipped'     : self.__skipped_count.get(),
+        }
+
+
+    def __get_idle_delay(self) -> float:
+        """
+        Returns how much longer than the post rate to wait before probing again
+        after finding no new posts. It is some fraction of the expected time between
+        posts for the current hour of the week, so probing eases off when the forums
+        are quiet and stays at the post rate when they are busy.
+        """
+        interval = self.__arrivals.predict(time.time())
+        if interval is None:
+            return 0
+
+        idle_max    = BotConfig['Core'].get('rate_post_idle_max', 30.0)
+        idle_factor = BotConfig['Core'].get('rate_post_idle_factor', 0.5)
+
+        return max(0, min(idle_max, idle_factor*interval) - self.__check_rate.get())
+
+
+    def __retrieve_post_rate(self) -> dict:
+        """
+        Retrieves the post arrival estimates from db.
+
+        fmt DB:
+            {
+                "0": {
+                    "avg_post_rate" : { "global" : float | None, "hourly" : [ float | None, ... ] },
+                }
+            }
+
+        Returns
+        -------
+        dict
+            Post arrival estimates, as accepted by `PostArrivalPredictor.from_dict`
+        """
+        with tinydb.TinyDB(f'{self._db_path}/{self.__DB_FILE_BOTCORE}') as db:
+            table_botcore = db.table(self.__DB_TABLE_BOTCORE)
+
+            entry = table_botcore.get(doc_id=self.__DB_ID_FORUM_MONITOR)
+            if not isinstance(entry, table.Document) or not isinstance(entry.get('avg_post_rate'), dict):
+                return {}
+
+            return entry['avg_post_rate']
+
+
+    def __save_state(self, force: bool = False):
+        """
+        Saves the post arrival estimates and the unresolved post ids to db, if `state_save_interval`
+        seconds passed since they were last saved. Saving rewrites the whole db file, so it is not
+        done for every post found or unresolved post id checked again.
+
+        Parameters
+        ----------
+        force : bool
+            Whether to save regardless of when they were last saved
+
+        fmt DB:
+            {
+                "0": {
+                    "avg_post_rate"       : { "global" : float | None, "hourly" : [ float | None, ... ] },
+                    "unresolved_post_ids" : [ [ start: int, end: int, attempts: int, next_retry: float ], ... ],
+                }
+            }
+        """
+        time_now = time.time()
+        if not force and time_now - self.__state_saved_at < self.__state_save_interval:
+            return
+
+        with tinydb.TinyDB(f'{self._db_path}/{self.__DB_FILE_BOTCORE}') as db:
+            table_botcore = db.table(self.__DB_TABLE_BOTCORE)
+            table_botcore.upsert(table.Document(
+                {
+                    'avg_post_rate'       : self.__arrivals.to_dict(),
+                    'unresolved_post_ids' : self.__unresolved.to_list(),
+                },
+                self.__DB_ID_FORUM_MONITOR
+            ))
+
+        self.__state_saved_at = time_now
+
+
+    def __retrieve_unresolved_posts(self) -> list[list]:
+        """
+        Retrieves the unresolved post ids from db.
+
+        fmt DB:
+            {
+                "0": {
+                    "unresolved_post_ids" : [ [ start: int, end: int, attempts: int, next_retry: float ], ... ],
+                }
+            }
+
+        Returns
+        -------
+        list[list]
+            Unresolved post id intervals, as accepted by `UnresolvedPosts.from_list`
+        """
+        with tinydb.TinyDB(f'{self._db_path}/{self.__DB_FILE_BOTCORE}') as db:
+            table_botcore = db.table(self.__DB_TABLE_BOTCORE)
+
+            entry = table_botcore.get(doc_id=self.__DB_ID_FORUM_MONITOR)
+            if not isinstance(entry, table.Document):
+                return []
+
+            return entry.get('unresolved_post_ids', [])
+
+
+    def __save_unresolved_posts(self):
+        """
+        Saves the unresolved post ids to db.
+
+        fmt DB:
+            {
+                "0": {
+                    "unresolved_post_ids" : [ [ start: int, end: int, attempts: int, next_retry: float ], ... ],
+                }
+            }
+        """
+        with tinydb.TinyDB(f'{self._db_path}/{self.__DB_FILE_BOTCORE}') as db:
+            table_botcore = db.table(self.__DB_TABLE_BOTCORE)
+            table_botcore.upsert(table.Document(
+                {
+                    'unresolved_post_ids' : self.__unresolved.to_list()
+                },
+                self.__DB_ID_FORUM_MONITOR
+            ))
+
+
+    def __track_unresolved(self, first_post_id: int, found_post_ids: list[int]):
+        """
+        Starts tracking the post ids from `first_post_id` up to the last found post id
+        that were not found.
+        """
+        time_now = time.time()
+
+        post_id_prev = first_post_id
+        for post_id in found_post_ids:
+            self.__unresolved.add(post_id_prev, post_id, time_now)
+            post_id_prev = post_id + 1
+
+        if found_post_ids[-1] > first_post_id + len(found_post_ids) - 1:
+            self.__save_unresolved_posts()
+
+
     def fetch_post(self, post_id: int | str) -> requests.Response:
         """
         Fetches a post from osu!web.
@@ -234,7 +478,7 @@ class ForumMonitor(BotCore):
         self.__logger.debug(f'Fetching post id: {post_id}')
 
         # Try to get web data. If not possible due to server error, then abort and retry after some time
-        return SessionMgrV2.fetch_web_data(post_url)
+        return SessionMgrV2.fetch_web_data(post_url, RateLimiter.PRIORITY_MONITOR, stream=self.__stream_probes)
 
 
     def run(self):
@@ -272,6 +516,12 @@ class ForumMonitor(BotCore):
         self.__thread_new_post_loop.stop()
         self.__thread_new_post_loop.join()
 
+        if self.__check_pool is not None:
+            self.__check_pool.shutdown(wait=False, cancel_futures=True)
+            self.__check_pool = None
+
+        self.__save_state(force=True)
+
 
     def __check_posts(self, check_post_ids: list[int], timeout: float = 60) -> tuple[int, requests.Response | None]:
         """
@@ -329,6 +579,7 @@ class ForumMonitor(BotCore):
 
             time.sleep(self.__check_rate.get())
 
+            self.__probe_count += 1
             try: page = self.fetch_post(check_post_ids[i])
             except BotException as e:
                 warnings.warn(f'Failed to fetch post {check_post_ids[i]}: {e}')
@@ -360,21 +611,244 @@ class ForumMonitor(BotCore):
         return -1, None
 
 
-    def __check_posts_proc(self, recheck: bool = True, timeout: float = 60) -> tuple[int, requests.Response | None]:
+    def __wait_rate_slot(self):
+        """
+        Blocks until the next request start allowed by the post rate. Slots are handed
+        out in order across all probing threads, so concurrent probing makes requests no
+        faster than serial probing would; it only overlaps their network round trips.
+        """
+        with self.__rate_lock:
+            time_now  = time.time()
+            time_slot = max(time_now, self.__rate_next_start)
+            self.__rate_next_start = time_slot + self.__check_rate.get()
+
+        time.sleep(max(0, time_slot - time_now))
+
+
+    def __probe_post(self, post_id: int) -> requests.Response | None:
+        """
+        Fetches a single post id for the windowed post check. Fetch errors
+        are reported and returned as `None` so the caller can retry the id.
+        """
+        self.__wait_rate_slot()
+        self.__probe_count += 1
+
+        try: return self.fetch_post(post_id)
+        except BotException as e:
+            warnings.warn(f'Failed to fetch post {post_id}: {e}')
+            return None
+
+
+    def __check_posts_window(self, check_post_ids: list[int], timeout: float = 60) -> list[tuple[int, requests.Response]]:
+        """
+        Concurrent counterpart of `__check_posts`. Fetches the given post ids, plus
+        speculative ids following them to fill the check window, with up to
+        `check_window` requests in flight at once.
+
+        Results are put back in ascending post id order. Valid posts are returned up
+        to the first id that could not be resolved (fetch error, too many requests, or
+        not done in time), since a post there may still exist and must not be skipped over.
+
+        Cases:
+        - Too many requests: Increase time between requests +10 ms. Ids from this
+            one onward are discarded and checked again on the next run.
+
+        - Not done in time: Ids from this one onward are discarded and checked again
+            on the next run. Those not started yet are cancelled.
+
+        - Found / OK: Decrease time between requests -10 ms if some time has
+            passed since the last too many requests encounter.
+
+        Parameters
+        ----------
+        check_post_ids : list[int]
+            List of post ids to check
+
+        timeout : int
+            Seconds allowed for a request on top of the wait for its start, which is
+            spaced by the post rate
+
+        Returns
+        -------
+        list[tuple[int, requests.Response]]
+            Ids and web pages of the valid posts found, in ascending post id order.
+            Empty if none were found.
+        """
+        rate_post_max  = BotConfig['Core']['rate_post_max']
+        rate_post_min  = BotConfig['Core']['rate_post_min']
+        rate_gracetime = BotConfig['Core']['rate_gracetime']
+
+        probe_ids = list(check_post_ids)
+        while len(probe_ids) < self.__check_window:
+            probe_ids.append(probe_ids[-1] + 1)
+
+        if self.__check_pool is None:
+            self.__check_pool = concurrent.futures.ThreadPoolExecutor(self.__check_window, thread_name_prefix='PostCheck')
+
+        self.__logger.debug(f'Starting windowed post check run for: {probe_ids}')
+        futures = { post_id : self.__check_pool.submit(self.__probe_post, post_id) for post_id in probe_ids }
+
+        # Request starts are spaced by the post rate, so the last one can't start any sooner than this
+        time_deadline = time.time() + len(probe_ids)*self.__check_rate.get() + timeout
+
+        last_rate_limit = 0
+        found = []
+
+        for i, post_id in enumerate(probe_ids):
+            try: page = futures[post_id].result(timeout=max(0, time_deadline - time.time()))
+            except concurrent.futures.TimeoutError:
+                self.__logger.warning(f'Post check run for {probe_ids} timed out at post id {post_id}')
+                for later_post_id in probe_ids[i:]:
+                    futures[later_post_id].cancel()
+                break
+
+            if page is None:
+                break
+
+            self.__logger.debug(f'Checking post id: {post_id}    Status: {page.status_code}   Post rate: {self.__check_rate}')
+
+            # Too many requests -> this and later ids need to be checked again
+            if page.status_code == 429:
+                last_rate_limit = time.time()
+                self.__check_rate.set(min(rate_post_max, self.__check_rate + 0.1))
+                break
+
+            if page.status_code == 200:
+                rate_limit_period = time.time() - last_rate_limit
+                if rate_limit_period > rate_gracetime * self.__check_rate:
+                    self.__check_rate.set(max(rate_post_min, self.__check_rate - 0.1))
+
+                self.__logger.debug(f'Found new post ID: {post_id}')
+                found.append(( post_id, page ))
+
+        if len(found) == 0:
+            self.__logger.debug(f'No new posts found: {probe_ids}')
+
+        return found
+
+
+    def __check_posts_proc_window(self, timeout: float = 60) -> list[tuple[int, requests.Response]]:
+        """
+        Windowed counterpart of `__check_posts_proc`. Searches for valid posts using
+        concurrent requests.
+
+        Cases:
+        - Found: Returns all found posts in ascending post id order, along with the
+            posts following the last one on its page (see `__batch_found_posts`). Ids
+            in between that were not available are tracked as unresolved. Resets list
+            of post ids to check with the id after the highest one found. Updates latest
+            post id in DB.
+
+        - Not found: Appends next post id to list of post ids to check.
+            Returns an empty list
+
+        Parameters
+        ----------
+        timeout : int
+            Seconds allowed for a request on top of the wait for its start
+
+        Returns
+        -------
+        list[tuple[int, requests.Response]]
+            Ids and web pages of the valid posts found, in ascending post id order
+        """
+        check_post_ids = self.__check_post_ids.get().copy()
+
+        found = self.__check_posts_window(check_post_ids, timeout)
+        if len(found) == 0:
+            if ( check_post_ids[-1] + 1 ) not in self.__check_post_ids.get():
+                self.__check_post_ids.append(check_post_ids[-1] + 1)
+            return []
+
+        found = self.__batch_found_posts(found)
+
+        self.__track_unresolved(check_post_ids[0], [ post_id for post_id, page in found ])
+        self.set_latest_post(found[-1][0])
+        return found
+
+
+    def __check_unresolved_proc(self, limit: int = 1) -> list[tuple[int, requests.Response]]:
+        """
+        Checks again post ids that were skipped over and whose retry is due.
+
+        Cases:
+        - Found: The post id is no longer tracked and the post is returned so it is
+            delivered late rather than never.
+
+        - Not found: The next retry is scheduled with twice the delay. Post ids
+            that run out of retries are dropped.
+
+        - Too many requests / fetch error: Stops and leaves the remaining post ids
+            due for the next run.
+
+        Parameters
+        ----------
+        limit : int
+            Maximum number of post ids to check in this run. Kept low so
+            rechecks do not hold up looking for new posts.
+
+        Returns
+        -------
+        list[tuple[int, requests.Response]]
+            Ids and web pages of the posts found, in ascending post id order
+        """
+        rate_post_max = BotConfig['Core']['rate_post_max']
+
+        due_post_ids = self.__unresolved.get_due(time.time(), limit)
+        if len(due_post_ids) == 0:
+            return []
+
+        self.__logger.debug(f'Rechecking unresolved post ids: {due_post_ids}')
+
+        found   = []
+        missing = []
+
+        for post_id in due_post_ids:
+            time.sleep(self.__check_rate.get())
+            self.__probe_count += 1
+
+            try: page = self.fetch_post(post_id)
+            except BotException as e:
+                warnings.warn(f'Failed to fetch post {post_id}: {e}')
+                break
+
+            if page.status_code == 429:
+                self.__check_rate.set(min(rate_post_max, self.__check_rate + 0.1))
+                break
+
+            if page.status_code == 200:
+                self.__logger.debug(f'Found unresolved post ID: {post_id}')
+                self.__unresolved.resolve(post_id)
+                found.append(( post_id, page ))
+                continue
+
+            missing.append(post_id)
+
+        # Saved with the rest of the state, see `__save_state`
+        self.__unresolved.retry_later(missing, time.time())
+
+        return found
+
+
+    def __check_posts_proc(self, recheck: bool = True, timeout: float = 60) -> list[tuple[int, requests.Response]]:
         """
         Searches for a valid post of the lowest id
 
         Cases:
-        - Found: Rechecks lower ids again to make sure a previous one
-            that was not available wasnt missed. Returns the post id and
-            page. Resets list of post ids to check with the next post id.
-            Updates latest post id in DB.
+        - Found: Lower ids that were not available are tracked as unresolved
+            so they can be checked again later (see `__check_unresolved_proc`).
+            Returns the post along with the posts following it on its page (see
+            `__batch_found_posts`). Resets list of post ids to check with the id
+            after the last of those. Updates latest post id in DB.
 
         - Not found: Appends next post id to list of post ids to check.
-            Returns (-1, None)
+            Returns an empty list
 
         Parameters
         ----------
+        recheck : bool
+            Whether to track lower post ids that were not available as unresolved
+
         timeout : int
             Timeout in seconds
 
@@ -385,38 +859,71 @@ class ForumMonitor(BotCore):
 
         Returns
         -------
-        tuple[int, requests.Response | None]
-            - If found: Returns the id of the first valid post id and the web page
-            - If not found: Returns (-1, None)
+        list[tuple[int, requests.Response]]
+            Ids and web pages of the found post and the posts following it on its page, in ascending post id order
         """
         check_post_ids = self.__check_post_ids.get().copy()
 
         # Check for new posts
-        post_id0, page0 = self.__check_posts(check_post_ids, timeout)
-        if isinstance(page0, type(None)) and post_id0 == -1:
+        post_id, page = self.__check_posts(check_post_ids, timeout)
+        if isinstance(page, type(None)) and post_id == -1:
             if ( check_post_ids[-1] + 1 ) not in self.__check_post_ids.get():
                 self.__check_post_ids.append(check_post_ids[-1] + 1)
-            return -1, None
+            return []
 
-        assert isinstance(page0, requests.Response) and post_id0 >= 0
-
-        page    = page0
-        post_id = post_id0
+        assert isinstance(page, requests.Response) and post_id >= 0
 
         if recheck:
-            # re-look over prev ids to make sure a previous one that was not available wasnt missed
-            post_id1, page1 = self.__check_posts(list(range(check_post_ids[0], post_id0)), timeout)
-            if isinstance(page1, requests.Response) and post_id1 >= 0:
-                page    = page1
-                post_id = post_id1
+            # Prev ids that were not available may still show up later
+            self.__track_unresolved(check_post_ids[0], [ post_id ])
+
+        # That is our latest post id and no need to check for any other but the next one.
+        # Posts right after it that are on the same page are already found too
+        found = self.__batch_found_posts([ ( post_id, page ) ])
 
-        # That is our latest post id and no need to check for any other but the next one
-        self.set_latest_post(post_id)
+        latest_post_id = found[-1][0]
+        self.set_latest_post(latest_post_id)
 
-        assert self.__latest_post_id == post_id, f'latest_post_id: {self.__latest_post_id} != post_id: {post_id}'
+        assert self.__latest_post_id == latest_post_id, f'latest_post_id: {self.__latest_post_id} != post_id: {latest_post_id}'
         assert len(self.__check_post_ids.get()) == 1, f'check_post_ids: {self.__check_post_ids.get()}'
 
-        return post_id, page
+        return found
+
+
+    def __batch_found_posts(self, found: list[tuple[int, requests.Response]]) -> list[tuple[int, requests.Response]]:
+        """
+        Adds the posts that directly follow the last found post and are on the same topic page.
+
+        A post's page shows the posts after it in the topic, so when several replies land in
+        one topic in a row, the page of the first one already has the rest. Post ids are
+        taken in order for as long as the next expected id is on the page; those posts share
+        the page instead of being fetched on their own.
+
+        Parameters
+        ----------
+        found : list[tuple[int, requests.Response]]
+            Ids and web pages of the found posts, in ascending post id order
+
+        Returns
+        -------
+        list[tuple[int, requests.Response]]
+            `found` followed by the ids of the posts after the last one on its page, with that page
+        """
+        if not self.__batch_posts or len(found) == 0:
+            return found
+
+        post_id, page = found[-1]
+        page_post_ids = { int(page_post_id) for page_post_id in self.__RE_POST_ID.findall(page.content) }
+
+        batch = []
+        while post_id + 1 in page_post_ids:
+            post_id += 1
+            batch.append(( post_id, page ))
+
+        if len(batch) > 0:
+            self.__logger.debug(f'Found new post IDs on page of post ID {found[-1][0]}: {[ post_id for post_id, _ in batch ]}')
+
+        return found + batch
 
 
     def __check_posts_loop(self, thread_event: threading.Event, target_event: threading.Event):
@@ -433,13 +940,30 @@ class ForumMonitor(BotCore):
                 return
 
             try:
-                post_id, page = self.__check_posts_proc()
-                if isinstance(page, type(None)) and post_id == -1:
+                if self.__check_window > 1:
+                    found = self.__check_posts_proc_window()
+                else:
+                    found = self.__check_posts_proc()
+
+                if len(found) > 0:
+                    self.__arrivals.record(time.time(), len(found))
+
+                # Posts that showed up late are older than the new ones, and bots expect posts in id order
+                found += self.__check_unresolved_proc()
+                found.sort(key=lambda found_post: found_post[0])
+                self.__found_count += len(found)
+
+                self.__save_state()
+
+                if len(found) == 0:
+                    # Nothing new; ease off probing if posts are not expected for a while
+                    thread_event.wait(self.__get_idle_delay())
                     continue
 
-                # Send post to forum bots
-                self.__logger.debug(f'Queuing post id: {post_id}')
-                self.__post_queue.put( ( post_id, page ) )
+                # Send posts to forum bots
+                for post_id, page in found:
+                    self.__logger.debug(f'Queuing post id: {post_id}')
+                    self.__post_queue.put( ( post_id, page ) )
 
                 # Process warnings for post rate
                 if not warned and self.__check_rate >= rate_post_warn:
@@ -458,9 +982,33 @@ class ForumMonitor(BotCore):
                     pass
 
 
+    def __is_subscribed_page(self, page: requests.Response) -> bool:
+        """
+        Whether any bot subscribes to the topic on the page, going by the subforum and topic ids in
+        its header. Pages whose ids can't be read are assumed to be subscribed to, so they are parsed
+        and handed to the bots as usual.
+        """
+        if not self.__prefilter_posts:
+            return True
+
+        ids = extract_topic_ids(page.content)
+        if ids is None:
+            return True
+
+        subforum_id, topic_id = ids
+        return self.has_subscriber(subforum_id, topic_id)
+
+
     def __handle_posts_loop(self, thread_event: threading.Event, target_event: threading.Event):
         target_event.set()
 
+        # Topic parsed from the last page handled, for posts that were found on the same page
+        batch_page  = None
+        batch_topic = None
+
+        # Last page dropped unparsed, for posts that were found on the same page
+        skipped_page = None
+
         while True:
             if thread_event.is_set():
                 while not self.__post_queue.empty():
@@ -477,7 +1025,23 @@ class ForumMonitor(BotCore):
             post_id, page = data
 
             try:
-                post = SessionMgrV2.get_post(post_id, page)
+                post = None
+                if page is batch_page:
+                    post = next(( topic_post for topic_post in batch_topic.posts if int(topic_post.id) == post_id ), None)
+
+                if post is None:
+                    if page is skipped_page or not self.__is_subscribed_page(page):
+                        self.__logger.debug(f'Skipping post ID: {post_id}; no bot subscribes to its topic')
+                        self.__skipped_count += 1
+                        skipped_page = page
+                        continue
+
+                    post = SessionMgrV2.get_post(post_id, page)
+                    batch_page  = page
+                    batch_topic = post.topic
+
+                self.__parsed_count += 1
+
                 self.__logger.debug(f'Processing post ID: {post_id} | date: {post.date} | subforum: {post.topic.subforum_name}')
 
                 # Send off the post data to the bots
@@ -489,6 +1053,112 @@ class ForumMonitor(BotCore):
                     pass
 
 
+    def __handle_posts_pool_loop(self, thread_event: threading.Event, target_event: threading.Event):
+        """
+        Same as `__handle_posts_loop`, but the pages are parsed in `parse_processes` worker processes,
+        so parsing does not hold the GIL the probing and bot threads need. The workers send back the
+        topic and its posts as a `TopicRecord`, which the bots are given as `RecordPost`s.
+
+        Several pages are parsed at once, but posts are handed to the bots in the order they were
+        found; a post waits for the posts found before it. A worker finishing wakes the loop up by
+        putting None in the post queue.
+        """
+        target_event.set()
+
+        backend = BotConfig['Core'].get('parser_backend', 'bs4')
+
+        # Workers are spawned rather than forked, since this process has threads running
+        context = multiprocessing.get_context('spawn')
+        pool    = concurrent.futures.ProcessPoolExecutor(self.__parse_processes, mp_context=context)
+
+        # Posts waiting to be handed to the bots, in the order they were found, with the parse of their page
+        parsing: collections.deque[tuple[int, concurrent.futures.Future]] = collections.deque()
+        max_parsing = 4*self.__parse_processes
+
+        # Last page sent to be parsed and the parse, for posts that were found on the same page
+        parse_page   = None
+        parse_future = None
+
+        # Topic read from the last parse handed out, for posts that were found on the same page
+        batch_future = None
+        batch_topic  = None
+
+        # Last page dropped unparsed, for posts that were found on the same page
+        skipped_page = None
+
+        try:
+            while True:
+                if thread_event.is_set():
+                    while not self.__post_queue.empty():
+                        self.__post_queue.get()
+
+                    self.__logger.debug(f'Got stop signal for thread {threading.current_thread().name}')
+                    target_event.set()
+                    return
+
+                # Hand out parsed posts up to the first one still being parsed, or wait on it if too many are waiting
+                while len(parsing) > 0 and ( parsing[0][1].done() or len(parsing) >= max_parsing ):
+                    post_id, future = parsing.popleft()
+
+                    try:
+                        if future is not batch_future:
+                            batch_topic  = RecordTopic(future.result())
+                            batch_future = future
+
+                        post = next(( topic_post for topic_post in batch_topic.posts if topic_post.id == post_id ), None)
+                        if post is None:
+                            raise BotException(f'Unable to find post id {post_id} in thread id {batch_topic.id}')
+
+                        self.__parsed_count += 1
+
+                        self.__logger.debug(f'Processing post ID: {post_id} | date: {post.date} | subforum: {post.topic.subforum_name}')
+
+                        # Send off the post data to the bots
+                        self.forum_driver(post)
+                    except Exception as e:
+                        self.__logger.error(f'Error handling new post: {e}')
+                        try: raise BotException(f'Warning: {e}') from e
+                        except:
+                            pass
+
+                try: data: tuple[int, requests.Response] | None = self.__post_queue.get(block=True, timeout=1)
+                except queue.Empty:
+                    continue
+
+                # A parse finished
+                if data is None:
+                    continue
+
+                post_id, page = data
+
+                try:
+                    if page is not parse_page:
+                        if page is skipped_page or not self.__is_subscribed_page(page):
+                            self.__logger.debug(f'Skipping post ID: {post_id}; no bot subscribes to its topic')
+                            self.__skipped_count += 1
+                            skipped_page = page
+                            continue
+
+                        try: parse_future = pool.submit(parse_topic_record, page.content, backend)
+                        except concurrent.futures.process.BrokenProcessPool:
+                            self.__logger.warning('Parsing workers died; starting new ones')
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            pool = concurrent.futures.ProcessPoolExecutor(self.__parse_processes, mp_context=context)
+                            parse_future = pool.submit(parse_topic_record, page.content, backend)
+
+                        parse_future.add_done_callback(lambda _: self.__post_queue.put(None))
+                        parse_page = page
+
+                    parsing.append(( post_id, parse_future ))
+                except Exception as e:
+                    self.__logger.error(f'Error handling new post: {e}')
+                    try: raise BotException(f'Warning: {e}') from e
+                    except:
+                        pass
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
 # NOTE: For this to work for the bots it must be imported
 #   from within the functions that depends on this. Otherwise,
 #   if the imported from top of file, the import chain will
@@ -0,0 +1,132 @@
+import time
+import threading
+
+
+
+class PostArrivalPredictor():
+    """
+    Online estimate of the time between new forum posts.
+
+    Keeps an exponentially weighted moving average (EWMA) of the post inter-arrival
+    time for each hour of the week (UTC), along with an overall one used for hours
+    that have no data yet. This captures the daily and weekly activity cycle of the
+    forums: a quiet 4am hour predicts long gaps while a busy evening predicts short ones.
+
+    Parameters
+    ----------
+    alpha : float
+        Weight given to each new inter-arrival time, between 0 and 1
+
+    max_interval : float
+        Inter-arrival times longer than this (in seconds) are clamped to it so
+        downtime of the monitor does not skew the estimate
+    """
+
+    HOURS_PER_WEEK = 7*24
+
+    def __init__(self, alpha: float, max_interval: float):
+        self.__alpha        = alpha
+        self.__max_interval = max_interval
+
+        self.__lock         = threading.Lock()
+        self.__avg_global   = None
+        self.__avg_hourly: list[float | None] = [ None ]*self.HOURS_PER_WEEK
+        self.__last_arrival = None
+
+
+    def record(self, time_arrival: float, count: int = 1):
+        """
+        Records the arrival of new posts.
+
+        Parameters
+        ----------
+        time_arrival : float
+            Time (unix timestamp) at which the posts were found
+
+        count : int
+            Number of posts found at that time. The time since the last arrival is
+            split evenly between them.
+        """
+        if count <= 0:
+            return
+
+        with self.__lock:
+            if self.__last_arrival is None:
+                self.__last_arrival = time_arrival
+                return
+
+            interval = min(self.__max_interval, max(0, time_arrival - self.__last_arrival)) / count
+            self.__last_arrival = time_arrival
+
+            hour = self.__hour_of_week(time_arrival)
+            for _ in range(count):
+                self.__avg_global       = self.__ewma(self.__avg_global, interval)
+                self.__avg_hourly[hour] = self.__ewma(self.__avg_hourly[hour], interval)
+
+
+    def predict(self, time_now: float) -> float | None:
+        """
+        Returns the expected time between posts at the given time.
+
+        Parameters
+        ----------
+        time_now : float
+            Time (unix timestamp) to predict for
+
+        Returns
+        -------
+        float | None
+            Expected number of seconds between posts, or None if nothing has been recorded yet
+        """
+        with self.__lock:
+            avg_hourly = self.__avg_hourly[self.__hour_of_week(time_now)]
+            return avg_hourly if avg_hourly is not None else self.__avg_global
+
+
+    def to_dict(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Estimates for saving to the db. Format:
+            {
+                "global" : (seconds between posts: float | None),
+                "hourly" : [ (seconds between posts: float | None), ... ]  # One per hour of the week, starting Monday 00:00 UTC
+            }
+        """
+        with self.__lock:
+            return {
+                'global' : self.__avg_global,
+                'hourly' : self.__avg_hourly.copy(),
+            }
+
+
+    def from_dict(self, data: dict):
+        """
+        Replaces estimates with ones previously returned by `to_dict`.
+
+        Parameters
+        ----------
+        data : dict
+            Estimates loaded from the db
+        """
+        hourly = data.get('hourly', [])
+        if len(hourly) != self.HOURS_PER_WEEK:
+            hourly = [ None ]*self.HOURS_PER_WEEK
+
+        with self.__lock:
+            self.__avg_global = data.get('global', None)
+            self.__avg_hourly = list(hourly)
+
+
+    def __ewma(self, avg: float | None, value: float) -> float:
+        if avg is None:
+            return value
+
+        return (1 - self.__alpha)*avg + self.__alpha*value
+
+
+    @staticmethod
+    def __hour_of_week(timestamp: float) -> int:
+        t = time.gmtime(timestamp)
+        return t.tm_wday*24 + t.tm_hour
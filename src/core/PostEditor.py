@@ -0,0 +1,210 @@
+import time
+import hashlib
+import logging
+import threading
+
+from .BotConfig import BotConfig
+from .SessionMgrV2 import SessionMgrV2
+
+
+
+class PostEditor():
+    """
+    Coalesces edits to osu!web posts and writes them out from a background thread.
+
+    Each post has a latest-wins slot: submitting new content for a post replaces whatever content
+    was waiting for it. A post is edited at most once every `interval` seconds, so a burst of
+    submissions turns into one edit with the last content, and the thread submitting does not wait
+    on the network. Content that is the same as what was last written to the post, or what is being
+    written to it, is dropped.
+
+    Edits that fail are tried again with the latest content after `interval` seconds.
+
+    Parameters
+    ----------
+    interval : float | None
+        Minimum number of seconds between edits of the same post. Read from BotConfig if not given.
+    """
+
+    __logger = logging.getLogger(__qualname__)
+
+    def __init__(self, interval: float | None = None):
+        self.__interval = float(interval if interval is not None else BotConfig['Core'].get('post_edit_interval', 10.0))
+
+        self.__cond   = threading.Condition()
+        self.__thread: threading.Thread | None = None
+
+        # post id -> content waiting to be written
+        self.__pending:   dict[int | str, str] = {}
+        self.__immediate: set[int | str]      = set()
+
+        # post id -> hash of the content being written to it right now; edits of the same post are never in flight together
+        self.__editing: dict[int | str, bytes] = {}
+
+        # post id -> hash of the content last written to it, time it was written
+        self.__hashes:     dict[int | str, bytes] = {}
+        self.__time_edits: dict[int | str, float] = {}
+
+        self.__stats = {
+            'submitted' : 0,
+            'edits'     : 0,
+            'coalesced' : 0,
+            'unchanged' : 0,
+            'failed'    : 0,
+        }
+
+
+    def submit(self, post_id: int | str, content: str, immediate: bool = False):
+        """
+        Queues an edit replacing the post's content
+
+        Parameters
+        ----------
+        post_id : int | str
+            The post to edit
+
+        content : str
+            The new bbcode of the post
+
+        immediate : bool
+            Write it out without waiting for `interval` seconds since the last edit of the post
+        """
+        digest  = hashlib.sha1(content.encode('utf-8')).digest()
+
+        with self.__cond:
+            self.__stats['submitted'] += 1
+
+            # Replaces an edit that was not written yet
+            if self.__pending.pop(post_id, None) is not None:
+                self.__stats['coalesced'] += 1
+
+            # What the post will be once an edit in flight is written
+            digest_current = self.__editing.get(post_id, None) or self.__hashes.get(post_id, None)
+            if digest == digest_current:
+                self.__stats['unchanged'] += 1
+                self.__immediate.discard(post_id)
+                return
+
+            self.__pending[post_id] = content
+            if immediate:
+                self.__immediate.add(post_id)
+
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(target=self.__run, name='PostEditor', daemon=True)
+                self.__thread.start()
+
+            self.__cond.notify_all()
+
+
+    def flush(self, post_id: int | str | None = None):
+        """
+        Writes out waiting edits now, in the calling thread
+
+        Parameters
+        ----------
+        post_id : int | str | None
+            The post whose edit to write out. All posts if None.
+        """
+        with self.__cond:
+            post_ids = self.__pending.keys() | self.__editing.keys()
+            if post_id is not None:
+                post_ids &= { post_id }
+
+            # Edits the worker is in the middle of go first, so they don't overwrite what is written here
+            self.__cond.wait_for(lambda: not ( post_ids & self.__editing.keys() ))
+
+            edits = [ ( pid, self.__pending.pop(pid) ) for pid in post_ids if pid in self.__pending ]
+            for pid, content in edits:
+                self.__immediate.discard(pid)
+                self.__editing[pid] = hashlib.sha1(content.encode('utf-8')).digest()
+
+        for pid, content in edits:
+            self.__edit(pid, content)
+
+
+    def get_stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Edit counters. Format:
+            {
+                "submitted" : (edits submitted: int),
+                "edits"     : (edits written to osu!web: int),
+                "coalesced" : (edits replaced by a later one before being written: int),
+                "unchanged" : (edits dropped for being the same as the post already is: int),
+                "failed"    : (edits osu!web did not take: int),
+                "pending"   : (posts waiting to be edited: int)
+            }
+        """
+        with self.__cond:
+            return { **self.__stats, 'pending' : len(self.__pending) }
+
+
+    def __run(self):
+        while True:
+            with self.__cond:
+                while True:
+                    post_id, time_wait = self.__next_due(time.monotonic())
+                    if post_id is not None:
+                        break
+
+                    self.__cond.wait(time_wait)
+
+                content = self.__pending.pop(post_id)
+                self.__immediate.discard(post_id)
+                self.__editing[post_id] = hashlib.sha1(content.encode('utf-8')).digest()
+
+            self.__edit(post_id, content)
+
+
+    def __next_due(self, time_now: float) -> tuple[int | str | None, float | None]:
+        """
+        Returns
+        -------
+        tuple[int | str | None, float | None]
+            The post to edit now, or None and the number of seconds until one is due (None if none are waiting)
+        """
+        time_due_min = None
+        for post_id in self.__pending:
+            if post_id in self.__editing:
+                continue
+
+            if post_id in self.__immediate:
+                return post_id, None
+
+            time_due = self.__time_edits.get(post_id, -self.__interval) + self.__interval
+            if time_due <= time_now:
+                return post_id, None
+
+            time_due_min = time_due if time_due_min is None else min(time_due_min, time_due)
+
+        return None, None if time_due_min is None else time_due_min - time_now
+
+
+    def __edit(self, post_id: int | str, content: str):
+        try: SessionMgrV2.edit_post(post_id, content, append=False)
+        except Exception as e:
+            self.__logger.error(f'Unable to edit post id: {post_id}; trying again in {self.__interval:.1f}s; {e}')
+
+            with self.__cond:
+                self.__stats['failed'] += 1
+                self.__time_edits[post_id] = time.monotonic()
+
+                # Unless something newer came in meanwhile
+                self.__pending.setdefault(post_id, content)
+
+                self.__editing.pop(post_id, None)
+                self.__cond.notify_all()
+            return
+
+        with self.__cond:
+            self.__stats['edits'] += 1
+            self.__hashes[post_id]     = self.__editing.pop(post_id)
+            self.__time_edits[post_id] = time.monotonic()
+
+            self.__cond.notify_all()
+
+
+
+PostEditor = PostEditor()
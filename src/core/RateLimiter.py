@@ -0,0 +1,225 @@
+import time
+import logging
+import threading
+import email.utils
+
+from .BotConfig import BotConfig
+
+
+
+class RateLimiter():
+    """
+    Token bucket shared by every outbound osu!web request.
+
+    Each request takes a token before it is sent. Tokens refill at the current
+    rate up to `burst` tokens. The rate itself is adjusted AIMD style from the
+    responses: every non rate limited response increases it by a fixed step,
+    every 429 multiplies it down. A `Retry-After` header on a 429 additionally
+    holds off all requests until it expires.
+
+    When several requests are waiting, tokens go to the highest priority class
+    first (monitor probing > post edits > ad-hoc lookups), so lookups and edits
+    do not eat into the budget the forum monitor needs.
+
+    Parameters
+    ----------
+    rate_max : float | None
+        Maximum (and starting) number of requests per second.
+
+    rate_min : float | None
+        Minimum number of requests per second the rate can be backed off to.
+
+    burst : int | None
+        Maximum number of tokens the bucket can hold.
+
+    increase : float | None
+        Requests per second added to the rate on each response that was not rate limited.
+
+    decrease : float | None
+        Factor the rate is multiplied by on each rate limited response.
+
+    Any parameter that is not given is read from BotConfig.
+    """
+
+    PRIORITY_MONITOR = 0
+    PRIORITY_EDIT    = 1
+    PRIORITY_LOOKUP  = 2
+
+    PRIORITY_NAMES = {
+        PRIORITY_MONITOR : 'monitor',
+        PRIORITY_EDIT    : 'edit',
+        PRIORITY_LOOKUP  : 'lookup',
+    }
+
+    __logger = logging.getLogger(__qualname__)
+
+    def __init__(self,
+        rate_max: float | None = None,
+        rate_min: float | None = None,
+        burst:    int   | None = None,
+        increase: float | None = None,
+        decrease: float | None = None,
+    ):
+        self.__rate_max = float(rate_max if rate_max is not None else BotConfig['Core'].get('rate_limit_max',      2.0))
+        self.__rate_min = float(rate_min if rate_min is not None else BotConfig['Core'].get('rate_limit_min',      0.1))
+        self.__burst    = int(burst      if burst    is not None else BotConfig['Core'].get('rate_limit_burst',    3))
+        self.__increase = float(increase if increase is not None else BotConfig['Core'].get('rate_limit_increase', 0.05))
+        self.__decrease = float(decrease if decrease is not None else BotConfig['Core'].get('rate_limit_decrease', 0.5))
+
+        self.__cond = threading.Condition()
+
+        self.__rate          = self.__rate_max
+        self.__tokens        = float(self.__burst)
+        self.__time_refill   = time.monotonic()
+        self.__blocked_until = 0.0
+        self.__waiting       = { priority : 0 for priority in self.PRIORITY_NAMES }
+
+        self.__stats = {
+            name : { 'requests' : 0, 'rate_limited' : 0, 'wait_time' : 0.0 }
+            for name in self.PRIORITY_NAMES.values()
+        }
+
+
+    def acquire(self, priority: int = PRIORITY_LOOKUP) -> float:
+        """
+        Blocks until a request of the given priority class is allowed to be sent.
+
+        Parameters
+        ----------
+        priority : int
+            One of `PRIORITY_MONITOR`, `PRIORITY_EDIT`, `PRIORITY_LOOKUP`
+
+        Returns
+        -------
+        float
+            Number of seconds spent waiting
+        """
+        if priority not in self.PRIORITY_NAMES:
+            raise ValueError(f'Invalid priority: {priority}')
+
+        time_start = time.monotonic()
+
+        with self.__cond:
+            self.__waiting[priority] += 1
+            try:
+                while True:
+                    time_now = time.monotonic()
+                    self.__refill(time_now)
+
+                    time_blocked = self.__blocked_until - time_now
+                    is_preceded  = any(self.__waiting[p] > 0 for p in self.PRIORITY_NAMES if p < priority)
+
+                    if time_blocked <= 0 and not is_preceded and self.__tokens >= 1:
+                        self.__tokens -= 1
+                        break
+
+                    if time_blocked > 0:
+                        self.__cond.wait(time_blocked)
+                    elif is_preceded:
+                        # Woken up once the higher priority request goes through
+                        self.__cond.wait()
+                    else:
+                        self.__cond.wait((1 - self.__tokens) / self.__rate)
+            finally:
+                self.__waiting[priority] -= 1
+                self.__cond.notify_all()
+
+            time_wait = time.monotonic() - time_start
+
+            stats = self.__stats[self.PRIORITY_NAMES[priority]]
+            stats['requests']  += 1
+            stats['wait_time'] += time_wait
+
+        return time_wait
+
+
+    def update(self, status_code: int, retry_after: str | float | None = None, priority: int = PRIORITY_LOOKUP):
+        """
+        Adjusts the rate according to the response of a request.
+
+        Parameters
+        ----------
+        status_code : int
+            Status code of the response
+
+        retry_after : str | float | None
+            Value of the `Retry-After` header of the response, if any. Either
+            a number of seconds or an HTTP date.
+
+        priority : int
+            Priority class the request was made under
+        """
+        with self.__cond:
+            if status_code != 429:
+                self.__rate = min(self.__rate_max, self.__rate + self.__increase)
+                return
+
+            self.__stats[self.PRIORITY_NAMES[priority]]['rate_limited'] += 1
+            self.__rate = max(self.__rate_min, self.__rate * self.__decrease)
+
+            delay = self.__parse_retry_after(retry_after)
+            if delay > 0:
+                self.__blocked_until = max(self.__blocked_until, time.monotonic() + delay)
+
+            self.__logger.debug(f'Rate limited; rate: {self.__rate:.3f} req/s   retry after: {delay:.1f}s')
+
+
+    def get_rate(self) -> float:
+        """
+        Returns
+        -------
+        float
+            The current number of requests per second allowed
+        """
+        return self.__rate
+
+
+    def get_stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Current rate and per priority class counters. Format:
+            {
+                "rate"    : (requests per second: float),
+                "tokens"  : (tokens available: float),
+                "classes" : {
+                    (class name: str) : {
+                        "requests"     : (requests sent: int),
+                        "rate_limited" : (429 responses: int),
+                        "wait_time"    : (seconds spent waiting for a token: float)
+                    }, ...
+                }
+            }
+        """
+        with self.__cond:
+            self.__refill(time.monotonic())
+            return {
+                'rate'    : self.__rate,
+                'tokens'  : self.__tokens,
+                'classes' : { name : stats.copy() for name, stats in self.__stats.items() }
+            }
+
+
+    def __refill(self, time_now: float):
+        self.__tokens = min(self.__burst, self.__tokens + (time_now - self.__time_refill) * self.__rate)
+        self.__time_refill = time_now
+
+
+    @staticmethod
+    def __parse_retry_after(retry_after: str | float | None) -> float:
+        if retry_after is None:
+            return 0
+
+        try: return max(0, float(retry_after))
+        except ValueError:
+            pass
+
+        try: date = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return 0
+
+        return max(0, date.timestamp() - time.time())
+
+
+RateLimiter = RateLimiter()
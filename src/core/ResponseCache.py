@@ -0,0 +1,231 @@
+from typing import Any, Optional
+
+import time
+import zlib
+import threading
+import collections
+
+import requests
+
+
+
+class ResponseCache():
+    """
+    Cache of osu!web pages for revalidating them with conditional requests.
+
+    Pages are stored with the validators (`ETag`, `Last-Modified`) the server sent
+    along with them and a zlib compressed copy of the body. The next request for
+    the same url sends the validators back with `If-None-Match` / `If-Modified-Since`,
+    and if the server answers 304 Not Modified the stored page is used instead. Pages
+    sent without validators are not stored, since they cannot be revalidated.
+
+    Something parsed from a page (a `Topic`) can be kept with its entry, so a page that
+    turns out not to have changed is not parsed again either. Parsed objects are not
+    counted towards `max_bytes`, and are dropped along with their entry.
+
+    Entries are evicted least recently used first once there are more than
+    `max_entries` of them or their bodies take more than `max_bytes`, and are
+    dropped once they are older than `ttl` seconds.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of pages kept. 0 disables the cache.
+
+    max_bytes : int
+        Maximum total size of the compressed bodies kept
+
+    ttl : float
+        Seconds a page is kept for after it was last downloaded
+    """
+
+    # Entry fields
+    __URL           = 0
+    __STATUS        = 1
+    __HEADERS       = 2
+    __BODY          = 3
+    __ENCODING      = 4
+    __SIZE          = 5
+    __TIME_STORED   = 6
+    __PARSED        = 7
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.__max_entries = max_entries
+        self.__max_bytes   = max_bytes
+        self.__ttl         = ttl
+
+        self.__lock    = threading.Lock()
+        self.__entries: collections.OrderedDict[str, list] = collections.OrderedDict()
+        self.__bytes   = 0
+
+        self.__hits        = 0
+        self.__misses      = 0
+        self.__bytes_saved = 0
+
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+
+    def get_request_headers(self, url: str, time_now: Optional[float] = None) -> dict:
+        """
+        Returns the conditional request headers to send for the given url.
+
+        Parameters
+        ----------
+        url : str
+            Requested url
+
+        time_now : Optional[float]
+            Current time. Defaults to `time.time()`.
+
+        Returns
+        -------
+        dict
+            `If-None-Match` and/or `If-Modified-Since` headers, or an empty dict if the page is not cached
+        """
+        time_now = time.time() if time_now is None else time_now
+
+        with self.__lock:
+            self.__evict_expired(time_now)
+
+            entry = self.__entries.get(url, None)
+            if entry is None:
+                return {}
+
+            headers = {}
+            if 'ETag' in entry[self.__HEADERS]:
+                headers['If-None-Match'] = entry[self.__HEADERS]['ETag']
+            if 'Last-Modified' in entry[self.__HEADERS]:
+                headers['If-Modified-Since'] = entry[self.__HEADERS]['Last-Modified']
+
+            return headers
+
+
+    def update(self, url: str, response: requests.Response, time_now: Optional[float] = None) -> requests.Response:
+        """
+        Updates the cache with the response to a request for the given url.
+
+        - 304 Not Modified: Returns a copy of the cached page in place of the response. If the page
+                            is no longer cached, the 304 is returned as is and the request has to
+                            be made again without conditional headers.
+        - 200 with validators: Stores the page, replacing the old one along with anything parsed from it
+        - Otherwise: The response is returned as is and any cached copy is dropped
+
+        Parameters
+        ----------
+        url : str
+            Requested url
+
+        response : requests.Response
+            The response, with its body read
+
+        time_now : Optional[float]
+            Current time. Defaults to `time.time()`.
+
+        Returns
+        -------
+        requests.Response
+            The response to use
+        """
+        time_now = time.time() if time_now is None else time_now
+
+        with self.__lock:
+            entry = self.__entries.get(url, None)
+
+            if response.status_code == 304 and entry is not None:
+                self.__entries.move_to_end(url)
+                entry[self.__TIME_STORED] = time_now
+
+                body = zlib.decompress(entry[self.__BODY])
+                self.__hits        += 1
+                self.__bytes_saved += len(body)
+                return self.__make_response(entry, body, response)
+
+            self.__remove(url)
+
+            # Only pages that could have been revalidated count as misses
+            has_validators = 'ETag' in response.headers or 'Last-Modified' in response.headers
+            if response.status_code != 200 or not has_validators or self.__max_entries <= 0:
+                return response
+
+            self.__misses += 1
+
+            headers = { name : response.headers[name] for name in ( 'ETag', 'Last-Modified', 'Content-Type' ) if name in response.headers }
+            body    = zlib.compress(response.content)
+
+            self.__entries[url] = [ response.url, response.status_code, headers, body, response.encoding, len(body), time_now, None ]
+            self.__bytes += len(body)
+
+            while len(self.__entries) > self.__max_entries or self.__bytes > self.__max_bytes:
+                self.__remove(next(iter(self.__entries)))
+
+            return response
+
+
+    def get_parsed(self, url: str) -> Optional[Any]:
+        """
+        Returns what was parsed from the cached page for the given url, or None if nothing was
+        """
+        with self.__lock:
+            entry = self.__entries.get(url, None)
+            return None if entry is None else entry[self.__PARSED]
+
+
+    def set_parsed(self, url: str, parsed: Any):
+        """
+        Keeps what was parsed from the cached page for the given url with it. Does nothing if the page is not cached.
+        """
+        with self.__lock:
+            entry = self.__entries.get(url, None)
+            if entry is not None:
+                entry[self.__PARSED] = parsed
+
+
+    def get_stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Format:
+            {
+                "entries"     : (number of pages cached: int),
+                "bytes"       : (compressed size of the pages cached: int),
+                "hits"        : (number of requests answered 304 Not Modified: int),
+                "misses"      : (number of requests that downloaded a page with validators: int),
+                "bytes_saved" : (size of the page bodies that did not have to be downloaded: int),
+            }
+        """
+        with self.__lock:
+            return {
+                'entries'     : len(self.__entries),
+                'bytes'       : self.__bytes,
+                'hits'        : self.__hits,
+                'misses'      : self.__misses,
+                'bytes_saved' : self.__bytes_saved,
+            }
+
+
+    def __make_response(self, entry: list, body: bytes, response: requests.Response) -> requests.Response:
+        cached = requests.Response()
+        cached.status_code = entry[self.__STATUS]
+        cached.url         = entry[self.__URL]
+        cached.encoding    = entry[self.__ENCODING]
+        cached.headers.update(entry[self.__HEADERS])
+        cached.history     = response.history
+        cached.request     = response.request
+        cached._content    = body
+        return cached
+
+
+    def __evict_expired(self, time_now: float):
+        expired = [ url for url, entry in self.__entries.items() if time_now - entry[self.__TIME_STORED] > self.__ttl ]
+        for url in expired:
+            self.__remove(url)
+
+
+    def __remove(self, url: str):
+        entry = self.__entries.pop(url, None)
+        if entry is not None:
+            self.__bytes -= entry[self.__SIZE]
@@ -2,11 +2,18 @@ from typing import Optional
 
 import logging
 import requests
+import urllib.parse
 
+import lxml.html
 from bs4 import BeautifulSoup
 
+from misc.threaded_obj import Threaded
+
+from .BotConfig import BotConfig
 from .BotException import BotException
-from .parser import Topic, Post
+from .RateLimiter import RateLimiter
+from .ResponseCache import ResponseCache
+from .parser import Topic, TopicBase, PostBase, LxmlTopic, ParserError, extract_post
 
 
 
@@ -14,10 +21,29 @@ class SessionMgrBase():
 
     _logger = logging.getLogger(__qualname__)
 
+    # Text osu!web puts on pages it serves instead of the requested one
+    ERROR_MARKERS = ( b'Page Missing', b'You shouldn&#039;t be here.', b'Account Verification' )
+
+    __STREAM_CHUNK_SIZE = 16384
+
     def __init__(self):
         self.__session = requests.Session()
         self.__last_status_code = -1
 
+        # Pages kept for conditional requests
+        self.__cache = ResponseCache(
+            max_entries = int(BotConfig['Core'].get('cache_max_entries', 16)),
+            max_bytes   = int(BotConfig['Core'].get('cache_max_bytes', 8*1024*1024)),
+            ttl         = float(BotConfig['Core'].get('cache_ttl', 600.0)),
+        )
+
+        # Response body bytes read over the network, per rate limiter priority
+        self.__bytes_read = {
+            RateLimiter.PRIORITY_MONITOR : Threaded(0),
+            RateLimiter.PRIORITY_EDIT    : Threaded(0),
+            RateLimiter.PRIORITY_LOOKUP  : Threaded(0),
+        }
+
 
     def login(self):
         """
@@ -59,15 +85,30 @@ class SessionMgrBase():
         raise NotImplementedError
 
 
-    def fetch_web_data(self, url: str) -> requests.Response:
+    def fetch_web_data(self, url: str, priority: int = RateLimiter.PRIORITY_LOOKUP, stream: bool = False, cache: bool = False) -> requests.Response:
         """
-        Fetches web data from the given url
+        Fetches web data from the given url. Waits for the shared rate limiter
+        before sending the request.
 
         Parameters
         ----------
         url : str
             The url to fetch
 
+        priority : int
+            Rate limiter priority class the request is made under
+
+        stream : bool
+            Read the body a chunk at a time and stop early when it is not needed. The body
+            is not read at all if the status is not 200 or the request was redirected to
+            another host, and reading stops at the chunk containing one of `ERROR_MARKERS`.
+            The returned response then holds only the part of the body that was read.
+
+        cache : bool
+            Revalidate a cached copy of the page with a conditional request, and cache the
+            page if the server sends validators for it. A page that was not modified is
+            returned from the cache as a 200 response. Ignored when streaming.
+
         Raises
         ------
         BotException
@@ -78,14 +119,92 @@ class SessionMgrBase():
         requests.Response
             The response containing the fetched web data
         """
-        try: response = self.__session.get(url, timeout=10)
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-            raise BotException(f'Timed out while fetching url: {url}', False)
+        cache   = cache and not stream
+        headers = self.__cache.get_request_headers(url) if cache else {}
+
+        response = self.__request(url, priority, stream, headers)
+        if cache:
+            response = self.__cache.update(url, response)
+
+            # The cached copy was dropped between making the conditional headers and the reply
+            if response.status_code == 304:
+                self._logger.debug(f'Not modified, but no longer cached: {url}; fetching again')
+                response = self.__cache.update(url, self.__request(url, priority, stream, {}))
 
         self.__validate_response(response)
         return response
 
 
+    def __request(self, url: str, priority: int, stream: bool, headers: dict) -> requests.Response:
+        RateLimiter.acquire(priority)
+
+        try:
+            response = self.__session.get(url, timeout=10, stream=stream, headers=headers)
+            if stream:
+                self.__read_streamed(url, response)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError):
+            raise BotException(f'Timed out while fetching url: {url}', False)
+
+        self.__bytes_read[priority] += response.raw.tell() if hasattr(response.raw, 'tell') else len(response.content)
+
+        RateLimiter.update(response.status_code, response.headers.get('Retry-After'), priority)
+        return response
+
+
+    def get_cache_stats(self) -> dict:
+        """
+        Returns the page cache's stats. See `ResponseCache.get_stats` for the format.
+        """
+        return self.__cache.get_stats()
+
+
+    def get_bytes_read(self, priority: Optional[int] = None) -> int:
+        """
+        Returns the number of response body bytes read over the network, as sent (before decompression).
+
+        Parameters
+        ----------
+        priority : Optional[int]
+            Rate limiter priority class to count the bytes of. If None, counts all requests.
+
+        Returns
+        -------
+        int
+            Number of bytes read
+        """
+        if priority is None:
+            return sum(bytes_read.get() for bytes_read in self.__bytes_read.values())
+
+        return self.__bytes_read[priority].get()
+
+
+    def __read_streamed(self, url: str, response: requests.Response):
+        """
+        Reads as much of a streamed response's body as is needed, then closes the connection.
+        """
+        if response.status_code != 200 or urllib.parse.urlsplit(response.url).netloc != urllib.parse.urlsplit(url).netloc:
+            response._content = b''
+            response.close()
+            return
+
+        # Keep the end of the previous chunk around so markers split between chunks are still found
+        overlap = max(len(marker) for marker in self.ERROR_MARKERS) - 1
+        chunks  = []
+        tail    = b''
+
+        for chunk in response.iter_content(self.__STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+
+            window = tail + chunk
+            if any(marker in window for marker in self.ERROR_MARKERS):
+                break
+
+            tail = window[-overlap:]
+
+        response._content = b''.join(chunks)
+        response.close()
+
+
     def get_last_status_code(self) -> int:
         """
         Returns the status code of the last request made.
@@ -179,7 +298,7 @@ class SessionMgrBase():
         return data
 
 
-    def get_thread(self, thread_id: int | str, page: Optional[requests.Response] = None, post_num: int = 0) -> Topic:
+    def get_thread(self, thread_id: int | str, page: Optional[requests.Response] = None, post_num: int = 0) -> TopicBase:
         """
         Retrieves a thread with the given thread id.
 
@@ -199,12 +318,14 @@ class SessionMgrBase():
 
         Returns
         -------
-        Topic
+        TopicBase
             The retrieved thread.
         """
         thread_url = f'https://osu.ppy.sh/community/forums/topics/{thread_id}/?n={post_num}'
+        cache_url  = None
         if not page:
-            page = self.fetch_web_data(thread_url)
+            page = self.fetch_web_data(thread_url, cache=True)
+            cache_url = thread_url
 
         # Error checking
         if page.text.find('Page Missing') != -1:
@@ -212,10 +333,44 @@ class SessionMgrBase():
         if page.text.find('You shouldn&#039;t be here.') != -1:
             raise BotException(f'Cannot access topic with url {thread_url}!')
 
-        return Topic(BeautifulSoup(page.text, 'lxml'))
+        return self.parse_topic(page, cache_url)
+
+
+    def parse_topic(self, page: requests.Response, cache_url: Optional[str] = None) -> TopicBase:
+        """
+        Parses a topic page with the parser backend set by `parser_backend` in BotConfig.
+
+        Parameters
+        ----------
+        page : requests.Response
+            The fetched topic page
 
+        cache_url : Optional[str]
+            The url the page was fetched from with `cache=True`. If given, the topic parsed from the
+            page is kept with the cached page and reused for as long as the page is not modified.
 
-    def get_post(self, post_id: int | str, page: Optional[requests.Response] = None) -> Post:
+        Returns
+        -------
+        TopicBase
+            The parsed topic. A `LxmlTopic` if the backend is "lxml".
+        """
+        if cache_url is not None:
+            topic = self.__cache.get_parsed(cache_url)
+            if topic is not None:
+                return topic
+
+        if BotConfig['Core'].get('parser_backend', 'bs4') == 'lxml':
+            topic = LxmlTopic(lxml.html.document_fromstring(page.content))
+        else:
+            topic = Topic(BeautifulSoup(page.text, 'lxml'))
+
+        if cache_url is not None:
+            self.__cache.set_parsed(cache_url, topic)
+
+        return topic
+
+
+    def get_post(self, post_id: int | str, page: Optional[requests.Response] = None) -> PostBase:
         """
         Retrieves a post with the given post id.
 
@@ -234,12 +389,14 @@ class SessionMgrBase():
 
         Returns
         -------
-        Post
+        PostBase
             The retrieved post.
         """
-        post_url = f'https://osu.ppy.sh/community/forums/posts/{post_id}'
+        post_url  = f'https://osu.ppy.sh/community/forums/posts/{post_id}'
+        cache_url = None
         if not page:
-            page = self.fetch_web_data(post_url)
+            page = self.fetch_web_data(post_url, cache=True)
+            cache_url = post_url
 
         if page.url != post_url:
             self._logger.debug(f'redirected from {post_url} to {page.url}')
@@ -255,7 +412,17 @@ class SessionMgrBase():
         if page.text.find('Account Verification') != -1:
             raise BotException(f'Cannot access topic with url {post_url} until logged in!')
 
-        topic = Topic(BeautifulSoup(page.text, 'lxml'))
+        if BotConfig['Core'].get('targeted_post_parsing', False) and (cache_url is None or self.__cache.get_parsed(cache_url) is None):
+            try: post = extract_post(page.content, post_id)
+            except ParserError as e:
+                raise BotException(f'Unable to find post id {post_id} in page {page.url}') from e
+
+            if cache_url is not None:
+                self.__cache.set_parsed(cache_url, post.topic)
+
+            return post
+
+        topic = self.parse_topic(page, cache_url)
         for topic_post in topic.posts:
             if topic_post.url == post_url:
                 return topic_post
@@ -263,18 +430,18 @@ class SessionMgrBase():
         raise BotException(f'Unable to find post id {post_id} in thread id {topic.id}')
 
 
-    def get_prev_post(self, ref_post: Post) -> Optional[Post]:
+    def get_prev_post(self, ref_post: PostBase) -> Optional[PostBase]:
         """
         Returns the post before the given reference post in the topic.
 
         Parameters
         ----------
-        ref_post: Post
+        ref_post: PostBase
             The reference post to find the previous post of.
 
         Returns
         -------
-        Post | None
+        PostBase | None
             The post before the reference post, or None if it is the first post in the topic.
         """
         posts = ref_post.topic.posts
@@ -287,18 +454,18 @@ class SessionMgrBase():
         return ref_post.prev_post
 
 
-    def get_next_post(self, ref_post: Post) -> Optional[Post]:
+    def get_next_post(self, ref_post: PostBase) -> Optional[PostBase]:
         """
         Returns the post after the given reference post in the topic.
 
         Parameters
         ----------
-        ref_post: Post
+        ref_post: PostBase
             The reference post to find the next post of.
 
         Returns
         -------
-        Post | None
+        PostBase | None
             The post that comes after the given post, or None if there is no next post.
         """
         posts = ref_post.topic.posts
@@ -314,6 +481,7 @@ class SessionMgrBase():
         self.__last_status_code = response.status_code
 
         if response.status_code == 200: return 200  # Ok
+        if response.status_code == 304: return 304  # Not modified
         if response.status_code == 400: raise BotException('Error 400: Unable to process request')
         if response.status_code == 401: return 401  # Need to log in
         if response.status_code == 403: return 403  # Forbidden
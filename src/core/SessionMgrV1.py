@@ -6,6 +6,7 @@ from bs4 import BeautifulSoup
 
 from .BotConfig import BotConfig
 from .SessionMgrBase import SessionMgrBase
+from .RateLimiter import RateLimiter
 from .BotException import BotException
 
 
@@ -184,7 +185,9 @@ class SessionMgrV1(SessionMgrBase):
                 #'_token'  : response.cookies['XSRF-TOKEN']
             }
 
+            RateLimiter.acquire(RateLimiter.PRIORITY_EDIT)
             response = self.__session.post(f'https://osu.ppy.sh/community/forums/posts/{post_id}', data=data)
+            RateLimiter.update(response.status_code, response.headers.get('Retry-After'), RateLimiter.PRIORITY_EDIT)
             self.__validate_response(response)  # TODO: Log in if not logged in?
 
             try:
@@ -1,9 +1,11 @@
 import socket
 import ossapi
+import requests
 import requests_oauthlib
 
 from .BotConfig import BotConfig
 from .SessionMgrBase import SessionMgrBase
+from .RateLimiter import RateLimiter
 from .DiscordClient import DiscordClient
 from .BotException import BotException
 
@@ -248,9 +250,18 @@ class SessionMgrV2(SessionMgrBase):
         # [2024.09.15] TODO: If client grant expires, this will throw an error
         #   this should be handled via a login and a retry
         self._logger.debug(f'Editing post id: {post_id}...')
+        RateLimiter.acquire(RateLimiter.PRIORITY_EDIT)
+
         try: self.__osu_apiv2.forum_edit_post(post_id, new_content)
         except Exception as e:
+            # Let the rate limiter know if the api refused the edit due to too many requests
+            response = getattr(e, 'response', None)
+            if isinstance(response, requests.Response):
+                RateLimiter.update(response.status_code, response.headers.get('Retry-After'), RateLimiter.PRIORITY_EDIT)
+
             raise BotException(f'Unable to edit post id: {post_id}; {e}') from e
 
+        RateLimiter.update(200, priority=RateLimiter.PRIORITY_EDIT)
+
 
 SessionMgrV2 = SessionMgrV2()
@@ -0,0 +1,233 @@
+import bisect
+import threading
+
+
+
+class UnresolvedPosts():
+    """
+    Sparse set of post ids that were skipped over by the forum monitor because they
+    were not available at the time (deleted, hidden, in a private subforum, or not
+    visible yet).
+
+    Ids are stored as intervals of consecutive ids that share a retry schedule, so
+    memory scales with the number of gaps rather than the number of ids. Each retry
+    that still turns up nothing doubles the delay until the next one. Ids that are
+    still unavailable after `max_attempts` retries are assumed to be permanently gone
+    and are dropped, as are the lowest ids once more than `max_ids` are tracked.
+
+    Parameters
+    ----------
+    max_ids : int
+        Maximum number of ids tracked at once
+
+    max_attempts : int
+        Number of retries before an id is dropped
+
+    retry_delay : float
+        Seconds to wait before the first retry
+    """
+
+    # Interval entry fields
+    __START      = 0
+    __END        = 1  # Exclusive
+    __ATTEMPTS   = 2
+    __NEXT_RETRY = 3
+
+    def __init__(self, max_ids: int, max_attempts: int, retry_delay: float):
+        self.__max_ids      = max_ids
+        self.__max_attempts = max_attempts
+        self.__retry_delay  = retry_delay
+
+        self.__lock      = threading.Lock()
+        self.__intervals: list[list] = []
+
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return sum(entry[self.__END] - entry[self.__START] for entry in self.__intervals)
+
+
+    def __contains__(self, post_id: int) -> bool:
+        with self.__lock:
+            idx = self.__find(post_id)
+            return idx is not None
+
+
+    def add(self, start: int, end: int, time_now: float):
+        """
+        Starts tracking post ids in the range [start, end).
+
+        Parameters
+        ----------
+        start : int
+            First post id of the range
+
+        end : int
+            Post id after the last one of the range
+
+        time_now : float
+            Current time; the first retry is scheduled relative to it
+        """
+        if end <= start:
+            return
+
+        with self.__lock:
+            self.__remove(start, end)
+            bisect.insort(self.__intervals, [ start, end, 0, time_now + self.__retry_delay ])
+
+            # Keep memory bounded by dropping the oldest ids
+            excess = sum(entry[self.__END] - entry[self.__START] for entry in self.__intervals) - self.__max_ids
+            while excess > 0:
+                entry = self.__intervals[0]
+                size  = entry[self.__END] - entry[self.__START]
+                if size <= excess:
+                    self.__intervals.pop(0)
+                    excess -= size
+                else:
+                    entry[self.__START] += excess
+                    excess = 0
+
+
+    def resolve(self, post_id: int):
+        """
+        Stops tracking a post id, because it was found.
+
+        Parameters
+        ----------
+        post_id : int
+            The post id to stop tracking
+        """
+        with self.__lock:
+            self.__remove(post_id, post_id + 1)
+
+
+    def get_due(self, time_now: float, limit: int | None = None) -> list[int]:
+        """
+        Returns post ids whose next retry is due, in ascending order.
+
+        Parameters
+        ----------
+        time_now : float
+            Current time
+
+        limit : int | None
+            Maximum number of post ids to return
+
+        Returns
+        -------
+        list[int]
+            Post ids to check again
+        """
+        due = []
+
+        with self.__lock:
+            for entry in self.__intervals:
+                if entry[self.__NEXT_RETRY] > time_now:
+                    continue
+
+                for post_id in range(entry[self.__START], entry[self.__END]):
+                    if limit is not None and len(due) >= limit:
+                        return due
+
+                    due.append(post_id)
+
+        return due
+
+
+    def retry_later(self, post_ids: list[int], time_now: float):
+        """
+        Schedules the next retry for post ids that are still unavailable. Post ids that
+        have run out of retries are dropped.
+
+        Parameters
+        ----------
+        post_ids : list[int]
+            Post ids that were checked and still not found
+
+        time_now : float
+            Current time; the next retry is scheduled relative to it
+        """
+        with self.__lock:
+            for post_id in post_ids:
+                idx = self.__find(post_id)
+                if idx is None:
+                    continue
+
+                attempts = self.__intervals[idx][self.__ATTEMPTS] + 1
+                self.__remove(post_id, post_id + 1)
+
+                if attempts >= self.__max_attempts:
+                    continue
+
+                next_retry = time_now + self.__retry_delay * 2**attempts
+                bisect.insort(self.__intervals, [ post_id, post_id + 1, attempts, next_retry ])
+
+            self.__merge()
+
+
+    def to_list(self) -> list[list]:
+        """
+        Returns
+        -------
+        list[list]
+            Tracked intervals for saving to the db. Format:
+            [ [ (start: int), (end: int), (attempts: int), (next_retry: float) ], ... ]
+        """
+        with self.__lock:
+            return [ entry.copy() for entry in self.__intervals ]
+
+
+    def from_list(self, intervals: list[list]):
+        """
+        Replaces tracked intervals with ones previously returned by `to_list`.
+
+        Parameters
+        ----------
+        intervals : list[list]
+            Intervals loaded from the db
+        """
+        with self.__lock:
+            self.__intervals = sorted([ int(start), int(end), int(attempts), float(next_retry) ] for start, end, attempts, next_retry in intervals)
+
+
+    def __find(self, post_id: int) -> int | None:
+        idx = bisect.bisect_right(self.__intervals, [ post_id, float('inf') ]) - 1
+        if idx < 0 or self.__intervals[idx][self.__END] <= post_id:
+            return None
+
+        return idx
+
+
+    def __remove(self, start: int, end: int):
+        """
+        Removes the range [start, end) from all intervals, splitting them where needed.
+        """
+        intervals = []
+        for entry in self.__intervals:
+            if entry[self.__END] <= start or end <= entry[self.__START]:
+                intervals.append(entry)
+                continue
+
+            if entry[self.__START] < start:
+                intervals.append([ entry[self.__START], start, entry[self.__ATTEMPTS], entry[self.__NEXT_RETRY] ])
+            if end < entry[self.__END]:
+                intervals.append([ end, entry[self.__END], entry[self.__ATTEMPTS], entry[self.__NEXT_RETRY] ])
+
+        self.__intervals = intervals
+
+
+    def __merge(self):
+        """
+        Joins adjacent intervals that share the same retry schedule.
+        """
+        intervals = []
+        for entry in self.__intervals:
+            if len(intervals) > 0:
+                prev = intervals[-1]
+                if prev[self.__END] == entry[self.__START] and prev[self.__ATTEMPTS:] == entry[self.__ATTEMPTS:]:
+                    prev[self.__END] = entry[self.__END]
+                    continue
+
+            intervals.append(entry)
+
+        self.__intervals = intervals
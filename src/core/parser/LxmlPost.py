@@ -0,0 +1,103 @@
+from typing import Optional
+from functools import cached_property
+
+import datetime
+
+from dateutil.parser import parse
+from lxml import html
+
+from .PostBase import PostBase
+from .LxmlUser import LxmlUser
+from .markdown import html_to_markdown
+from .lxml_selectors import class_selector
+from .parser_error import ParserError
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .LxmlTopic import LxmlTopic
+
+
+
+class LxmlPost(PostBase):
+    """
+    `PostBase` that reads from an lxml element tree instead of a BeautifulSoup one.
+
+    `body_root` and `contents_root` are lxml elements, and `contents_HTML` is serialized by
+    lxml, so it may differ from the BeautifulSoup backend in formatting but not in content.
+    """
+
+    __SELECT_DATE     = class_selector('js-timeago')
+    __SELECT_BODY     = class_selector('forum-post__body js-forum-post-edit--container')
+    __SELECT_CONTENTS = class_selector('forum-post-content')
+    __SELECT_URL      = class_selector('js-post-url')
+
+    def __init__(self, topic: "LxmlTopic", root: html.HtmlElement):
+        PostBase.__init__(self, topic)
+        self.__topic = topic
+        self.__root  = root
+
+
+    @cached_property
+    def creator(self) -> LxmlUser:
+        return LxmlUser(self.__root)
+
+
+    @cached_property
+    def date(self) -> datetime.datetime:
+        try:
+            time = str(self.__SELECT_DATE(self.__root)[0].get('datetime')).strip()
+            return parse(time)
+        except Exception as e:
+            raise ParserError(f'Unable to parse post date; {self.url}') from e
+
+
+    @cached_property
+    def post_num(self) -> int:
+        try: return int(self.__root.get('data-post-position'))
+        except Exception as e:
+            raise ParserError(f'Unable to parse post number; {self.url}') from e
+
+
+    @cached_property
+    def body_root(self) -> html.HtmlElement:
+        try: return self.__SELECT_BODY(self.__root)[0]
+        except Exception as e:
+            raise ParserError(f'Unable to parse post body; {self.url}') from e
+
+
+    @cached_property
+    def contents_root(self) -> html.HtmlElement:
+        try: return self.__SELECT_CONTENTS(self.__root)[0]
+        except Exception as e:
+            raise ParserError(f'Unable to parse post contents; {self.url}') from e
+
+
+    @cached_property
+    def contents_HTML(self) -> str:
+        return html.tostring(self.contents_root, encoding='unicode', with_tail=False).strip()
+
+
+    @cached_property
+    def contents_text(self) -> str:
+        return str(self.contents_root.text_content()).strip()
+
+
+    @cached_property
+    def content_markdown(self) -> str:
+        return html_to_markdown(self.contents_HTML)
+
+
+    @cached_property
+    def url(self) -> str:
+        try: return str(self.__SELECT_URL(self.__root)[0].get('href')).strip()
+        except Exception as e:
+            raise ParserError('Unable to parse post url') from e
+
+
+    @cached_property
+    def prev_post(self) -> "Optional[LxmlPost]":
+        position = self.__topic.get_post_position(self.__root)
+        if position is None or position == 0:
+            return None
+
+        return LxmlPost(self.__topic, self.__topic.post_roots[position - 1])
@@ -0,0 +1,113 @@
+from functools import cached_property
+
+import logging
+from lxml import html
+
+from .TopicBase import TopicBase
+from .LxmlPost import LxmlPost
+from .lxml_selectors import class_selector
+from .parser_error import ParserError
+
+
+class LxmlTopic(TopicBase):
+    """
+    `TopicBase` that reads from an lxml element tree instead of a BeautifulSoup one. Fields are
+    looked up with compiled XPath selectors, which skips building BeautifulSoup's Python
+    object tree for the whole page.
+
+    Parameters
+    ----------
+    root : html.HtmlElement
+        The parsed page, e.g. from `lxml.html.document_fromstring`
+    """
+
+    __logger = logging.getLogger(__qualname__)
+
+    __SELECT_SUBFORUM_PATH = class_selector('header-v4__row header-v4__row--bar')
+    __SELECT_SUBFORUM_LINK = class_selector('header-nav-v4__link')
+    __SELECT_SUBFORUM_ITEM = class_selector('header-nav-v4__item')
+    __SELECT_NAME          = class_selector('forum-topic-title__title forum-topic-title__title--display')
+    __SELECT_URL           = class_selector('forum-topic-floating-header__title-link')
+    __SELECT_POST_COUNT    = class_selector('js-forum__total-count')
+    __SELECT_POSTS         = class_selector('js-forum-post')
+
+    def __init__(self, root: html.HtmlElement):
+        self.__root = root
+
+
+    @cached_property
+    def subforum_id(self) -> int:
+        try:
+            subforum_path_root = self.__SELECT_SUBFORUM_PATH(self.__root)[0]
+            subforum_url = self.__SELECT_SUBFORUM_LINK(subforum_path_root)[-1].get('href')
+            return int(subforum_url[subforum_url.rfind('/') + 1:])
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic subforum id; {self.url}: {e}') from e
+
+
+    @cached_property
+    def subforum_name(self) -> str:
+        try:
+            subforum_path_root = self.__SELECT_SUBFORUM_PATH(self.__root)[0]
+            return self.__SELECT_SUBFORUM_ITEM(subforum_path_root)[-1].text_content().strip()
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic subforum name; {self.url}: {e}') from e
+
+
+    @cached_property
+    def name(self) -> str:
+        try: return self.__SELECT_NAME(self.__root)[0].text_content().strip()
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic name; {self.url}: {e}') from e
+
+
+    @cached_property
+    def url(self) -> str:
+        try: return self.__SELECT_URL(self.__root)[0].get('href').strip()
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic url: {e}') from e
+
+
+    @cached_property
+    def post_count(self) -> int:
+        try: return int(self.__SELECT_POST_COUNT(self.__root)[0].text_content().strip().replace(',', ''))
+        except Exception as e:
+            raise ParserError(f'Unable to parse post count; {self.url}') from e
+
+
+    @cached_property
+    def post_roots(self) -> "list[html.HtmlElement]":
+        try: return self.__SELECT_POSTS(self.__root)
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic posts; {self.url}: {e}') from e
+
+
+    def get_post_position(self, post_root: html.HtmlElement) -> int | None:
+        """
+        Returns the position of the given post among the posts on the page, or None if the
+        post is not from this page.
+        """
+        return self.__post_positions.get(post_root, None)
+
+
+    @cached_property
+    def __post_positions(self) -> "dict[html.HtmlElement, int]":
+        return { post_root : i for i, post_root in enumerate(self.post_roots) }
+
+
+    @cached_property
+    def first_post(self) -> LxmlPost:
+        if len(self.post_roots) == 0:
+            raise ParserError(f'No posts found in thread; {self.url}')
+
+        return LxmlPost(self, self.post_roots[0])
+
+
+    @cached_property
+    def posts(self) -> "list[LxmlPost]":
+        posts = [ self.first_post ]
+        if len(posts) < min(int(self.post_count), 20):
+            for post in self.post_roots[1:]:
+                posts.append(LxmlPost(self, post))
+
+        return posts
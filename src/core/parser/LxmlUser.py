@@ -0,0 +1,55 @@
+from functools import cached_property
+
+import re
+from lxml import html
+
+from .User import User
+from .lxml_selectors import class_selector
+
+
+class LxmlUser(User):
+    """
+    `User` that reads from an lxml element tree instead of a BeautifulSoup one.
+    """
+
+    __SELECT_NAME   = class_selector('forum-post-info__row forum-post-info__row--username js-usercard')
+    __SELECT_AVATAR = class_selector('avatar avatar--forum')
+
+    def __init__(self, root: html.HtmlElement):
+        User.__init__(self, None)
+        self.__root = root
+
+
+    @cached_property
+    def name(self) -> str:
+        try: return self.__SELECT_NAME(self.__root)[0].text_content().strip()
+        except:
+            return ''
+
+
+    @cached_property
+    def avatar(self) -> str:
+        try:
+            post_user_avatar = self.__SELECT_AVATAR(self.__root)[0].get('style')
+            if not post_user_avatar:
+                post_user_avatar = "background-image: url('');"
+        except:
+            post_user_avatar = "background-image: url('');"
+
+        avatar = re.findall(r'background-image: url\(\'(.*?)\'\);', post_user_avatar)[0]
+        if avatar == '/images/layout/avatar-guest.png':
+            return 'https://osu.ppy.sh/images/layout/avatar-guest.png'
+        else:
+            return avatar
+
+
+    @cached_property
+    def url(self) -> str:
+        try:
+            url = self.__SELECT_AVATAR(self.__root)[0].get('href')
+            if not url:
+                return "https://osu.ppy.sh/users/-1"
+        except:
+            return "https://osu.ppy.sh/users/-1"
+
+        return url
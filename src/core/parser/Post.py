@@ -7,7 +7,9 @@ import datetime
 from dateutil.parser import parse
 from bs4 import BeautifulSoup
 
+from .PostBase import PostBase
 from .User import User
+from .markdown import html_to_markdown
 from .parser_error import ParserError
 
 from typing import TYPE_CHECKING
@@ -16,30 +18,53 @@ if TYPE_CHECKING:
 
 
 
-class Post():
+class Post(PostBase):
+    """
+    `PostBase` that reads from a BeautifulSoup tree. Fields are looked up from the class index of
+    the topic page the post is on, see `Topic.index`.
+    """
 
     __logger = logging.getLogger(__qualname__)
 
+    # Classes looked up within the post
+    INDEX_CLASSES = {
+        'js-timeago',
+        'forum-post__body js-forum-post-edit--container',
+        'forum-post-content',
+        'js-post-url',
+    }
+
     def __init__(self, topic: "Topic", root: BeautifulSoup):
+        PostBase.__init__(self, topic)
         self.__topic  = topic
         self.__root   = root
 
 
-    # Overload with the Topic object to ensure getTopic works for either objects
     @cached_property
-    def topic(self) -> "Topic":
-        return self.__topic
+    def __index(self) -> "dict[str, list[BeautifulSoup]] | None":
+        # Class index of the post's elements from the topic page, if the post is from one
+        if self.__topic is None:
+            return None
+
+        return self.__topic.index.get_post_index(self.__root)
+
+
+    def __find(self, class_name: str) -> "list[BeautifulSoup]":
+        if self.__index is None:
+            return self.__root.find_all(class_=class_name)
+
+        return self.__index.get(class_name, [])
 
 
     @cached_property
     def creator(self) -> User:
-        return User(self.__root)
+        return User(self.__root, self.__index)
 
 
     @cached_property
     def date(self) -> datetime.datetime:
         try:
-            time = str(self.__root.find_all(class_='js-timeago')[0]['datetime']).strip()
+            time = str(self.__find('js-timeago')[0]['datetime']).strip()
             return parse(time)
         except Exception as e:
             raise ParserError(f'Unable to parse post date; {self.url}') from e
@@ -54,14 +79,14 @@ class Post():
 
     @cached_property
     def body_root(self) -> BeautifulSoup:
-        try: return self.__root.find_all(class_='forum-post__body js-forum-post-edit--container')[0]
+        try: return self.__find('forum-post__body js-forum-post-edit--container')[0]
         except Exception as e:
             raise ParserError(f'Unable to parse post body; {self.url}') from e
 
 
     @cached_property
     def contents_root(self) -> BeautifulSoup:
-        try: return self.__root.find_all(class_='forum-post-content')[0]
+        try: return self.__find('forum-post-content')[0]
         except Exception as e:
             raise ParserError(f'Unable to parse post contents; {self.url}') from e
 
@@ -78,93 +103,21 @@ class Post():
 
     @cached_property
     def content_markdown(self) -> str:
-        html_str = str(self.contents_root).replace('\n', '')
-        root = BeautifulSoup(html_str, 'lxml')
-
-        for tag in root.find_all(True):
-            if tag.name == 'iframe':
-                tag.replace_with(f'{tag["src"]}')
-
-            if tag.name == 'li':
-                tag.insert_before('    • ')
-                continue
-
-            if tag.name == 'a':
-                tag.replace_with(f'[{tag.text}]({tag["href"]})')
-                continue
-
-            if tag.name == 'img':
-                try:
-                    if 'smiley' in tag['class']:
-                        tag.replace_with(':smile:')
-                    else:
-                        tag.replace_with(f'\n> [img]({tag["src"]})\n')
-                        continue
-                except:
-                    continue
-
-            if tag.name == 'br':
-                tag.replace_with('\n')
-                continue
-
-            if tag.name == 'del':
-                tag.insert_before('~~')
-                tag.insert_after('~~')
-                continue
-
-            if tag.name == 'strong':
-                tag.insert_before('**')
-                tag.insert_after('**')
-                continue
-
-            if tag.name == 'em':
-                tag.insert_before('*')
-                tag.insert_after('*')
-                continue
-
-            if tag.name == 'h2':
-                tag.insert_before('**')
-                tag.insert_after('**\n')
-                continue
-
-            if tag.name == 'pre':
-                tag.insert_before('```')
-                tag.insert_after('```')
-                continue
-
-        # Keeps just the "<username> wrote:" part
-        for tag in root.find_all(True):
-            if tag.name == 'blockquote':
-                try:
-                    for tag_h4 in tag.find('h4'):
-                        tag.replace_with(f'> **{tag_h4.string}** [...]\n\n')
-                except TypeError:
-                    tag.replace_with(f'> {tag.text}\n\n')
-
-        return str(root.text).strip()
+        return html_to_markdown(str(self.contents_root))
 
 
     @cached_property
     def url(self) -> str:
-        try: return str(self.__root.find_all(class_='js-post-url')[0]['href']).strip()
+        try: return str(self.__find('js-post-url')[0]['href']).strip()
         except Exception as e:
             raise ParserError('Unable to parse post url') from e
 
 
     @cached_property
     def prev_post(self) -> "Optional[Post]":
-        post_roots = self.__topic.post_roots
+        # Position of this post on the page; the post before it is the previous one
+        position = self.__topic.index.get_post_position(self.__root)
+        if position is None or position == 0:
+            return None
 
-        for i in range(len(post_roots) - 1, -1, -1):
-            # Locate this post in the list and then get the post before this one
-            post_id = Post(self.__topic, post_roots[i]).id
-            if post_id == self.id:
-                return Post(self.__topic, post_roots[i - 1])
-
-        return None
-
-
-    @cached_property
-    def id(self) -> int:
-        url = self.url
-        return int(url[url.rfind('/') + 1:])
+        return Post(self.__topic, self.__topic.post_roots[position - 1])
@@ -0,0 +1,133 @@
+from typing import Optional
+from functools import cached_property
+
+import datetime
+
+from .User import User
+from .records import PostRecord
+from .parser_error import ParserError
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .TopicBase import TopicBase
+    from .RecordPost import RecordPost
+
+
+
+class PostBase():
+    """
+    Fields of a forum post shared by the parser backends. Meant to be overridden; `Post` reads them
+    from a BeautifulSoup tree, `LxmlPost` from an lxml one, and `RecordPost` from a `PostRecord`.
+
+    Parameters
+    ----------
+    topic : TopicBase
+        The topic the post is on
+    """
+
+    def __init__(self, topic: "TopicBase"):
+        self.__topic = topic
+
+
+    # Overload with the Topic object to ensure getTopic works for either objects
+    @cached_property
+    def topic(self) -> "TopicBase":
+        return self.__topic
+
+
+    @cached_property
+    def creator(self) -> User:
+        raise NotImplementedError
+
+
+    @cached_property
+    def date(self) -> datetime.datetime:
+        raise NotImplementedError
+
+
+    @cached_property
+    def post_num(self) -> int:
+        raise NotImplementedError
+
+
+    @cached_property
+    def contents_HTML(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def contents_text(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def content_markdown(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def url(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def prev_post(self) -> "Optional[PostBase]":
+        raise NotImplementedError
+
+
+    @cached_property
+    def id(self) -> int:
+        url = self.url
+        return int(url[url.rfind('/') + 1:])
+
+
+    def to_record(self) -> PostRecord:
+        """
+        Extracts the post's fields into an immutable record that does not hold on to the parsed page.
+
+        Raises
+        ------
+        ParserError
+            If any of the fields cannot be parsed
+
+        Returns
+        -------
+        PostRecord
+            The extracted post
+        """
+        return PostRecord(
+            id             = self.id,
+            url            = self.url,
+            post_num       = self.post_num,
+            date           = self.date,
+            creator_id     = self.creator.id,
+            creator_name   = self.creator.name,
+            creator_avatar = self.creator.avatar,
+            creator_url    = self.creator.url,
+            contents_html  = self.contents_HTML,
+            contents_text  = self.contents_text,
+        )
+
+
+    def detach(self) -> "RecordPost":
+        """
+        Gives a copy of the post read from its topic's record, see `TopicBase.detach`. Once every
+        reference to the original post and topic is dropped, so is the parsed page; the copy only
+        holds the fields of the page's posts, kilobytes instead of the page's megabytes.
+
+        Raises
+        ------
+        ParserError
+            If any of the fields cannot be parsed, or the post is not among the posts read from its topic's page
+
+        Returns
+        -------
+        RecordPost
+            The detached post
+        """
+        post_id  = self.id
+        detached = next((post for post in self.topic.detach().posts if post.id == post_id), None)
+        if detached is None:
+            raise ParserError(f'Post {post_id} is not among the posts of its topic page; {self.topic.url}')
+
+        return detached
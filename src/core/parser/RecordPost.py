@@ -0,0 +1,93 @@
+from typing import Optional
+from functools import cached_property
+
+import datetime
+
+from .PostBase import PostBase
+from .RecordUser import RecordUser
+from .records import PostRecord
+from .markdown import html_to_markdown
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .RecordTopic import RecordTopic
+
+
+
+class RecordPost(PostBase):
+    """
+    `PostBase` that reads from a `PostRecord` instead of a parsed page, for posts parsed in another
+    process or detached from their page. There is no page, so there are no page elements
+    (`body_root`, `contents_root`) to look up.
+
+    Parameters
+    ----------
+    topic : RecordTopic
+        The topic the post is on
+    record : PostRecord
+        The post's fields
+    position : int
+        Position of the post among the posts of the topic's record
+    """
+
+    def __init__(self, topic: "RecordTopic", record: PostRecord, position: int):
+        PostBase.__init__(self, topic)
+        self.__topic    = topic
+        self.__record   = record
+        self.__position = position
+
+
+    @cached_property
+    def creator(self) -> RecordUser:
+        return RecordUser(self.__record)
+
+
+    @cached_property
+    def date(self) -> datetime.datetime:
+        return self.__record.date
+
+
+    @cached_property
+    def post_num(self) -> int:
+        return self.__record.post_num
+
+
+    @cached_property
+    def contents_HTML(self) -> str:
+        return self.__record.contents_html
+
+
+    @cached_property
+    def contents_text(self) -> str:
+        return self.__record.contents_text
+
+
+    @cached_property
+    def content_markdown(self) -> str:
+        return html_to_markdown(self.__record.contents_html)
+
+
+    @cached_property
+    def url(self) -> str:
+        return self.__record.url
+
+
+    @cached_property
+    def prev_post(self) -> "Optional[RecordPost]":
+        if self.__position == 0:
+            return None
+
+        return self.__topic.posts[self.__position - 1]
+
+
+    @cached_property
+    def id(self) -> int:
+        return self.__record.id
+
+
+    def to_record(self) -> PostRecord:
+        return self.__record
+
+
+    def detach(self) -> "RecordPost":
+        return self
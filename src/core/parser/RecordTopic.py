@@ -0,0 +1,102 @@
+from functools import cached_property
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+from .Topic import Topic
+from .TopicBase import TopicBase
+from .LxmlTopic import LxmlTopic
+from .RecordPost import RecordPost
+from .records import TopicRecord
+from .parser_error import ParserError
+
+
+
+class RecordTopic(TopicBase):
+    """
+    `TopicBase` that reads from a `TopicRecord` instead of a parsed page, for pages parsed in another
+    process. Its posts are the posts in the record.
+    """
+
+    def __init__(self, record: TopicRecord):
+        self.__record = record
+
+
+    @cached_property
+    def subforum_id(self) -> int:
+        return self.__record.subforum_id
+
+
+    @cached_property
+    def subforum_name(self) -> str:
+        return self.__record.subforum_name
+
+
+    @cached_property
+    def name(self) -> str:
+        return self.__record.name
+
+
+    @cached_property
+    def url(self) -> str:
+        return self.__record.url
+
+
+    @cached_property
+    def id(self) -> int:
+        return self.__record.id
+
+
+    @cached_property
+    def post_count(self) -> int:
+        return self.__record.post_count
+
+
+    @cached_property
+    def first_post(self) -> RecordPost:
+        if len(self.posts) == 0:
+            raise ParserError(f'No posts found in thread; {self.url}')
+
+        return self.posts[0]
+
+
+    @cached_property
+    def posts(self) -> "list[RecordPost]":
+        return [ RecordPost(self, post, i) for i, post in enumerate(self.__record.posts) ]
+
+
+    def to_record(self) -> TopicRecord:
+        return self.__record
+
+
+    def detach(self) -> "RecordTopic":
+        return self
+
+
+
+def parse_topic_record(content: bytes, backend: str = 'bs4') -> TopicRecord:
+    """
+    Parses a topic page into a record. Made to be run in a worker process; the record holds no
+    reference to the parsed page, so it can be sent back to be read with `RecordTopic`.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw topic page
+    backend : str
+        Parser backend, 'bs4' or 'lxml'
+
+    Raises
+    ------
+    ParserError
+        If any of the fields cannot be parsed
+
+    Returns
+    -------
+    TopicRecord
+        The topic and the posts on the page
+    """
+    if backend == 'lxml':
+        return LxmlTopic(lxml.html.document_fromstring(content)).to_record()
+
+    return Topic(BeautifulSoup(content, 'lxml')).to_record()
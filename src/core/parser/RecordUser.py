@@ -0,0 +1,34 @@
+from functools import cached_property
+
+from .User import User
+from .records import PostRecord
+
+
+class RecordUser(User):
+    """
+    `User` that reads the poster's fields from a `PostRecord` instead of a parsed page.
+    """
+
+    def __init__(self, record: PostRecord):
+        User.__init__(self, None)
+        self.__record = record
+
+
+    @cached_property
+    def id(self) -> str:
+        return self.__record.creator_id
+
+
+    @cached_property
+    def name(self) -> str:
+        return self.__record.creator_name
+
+
+    @cached_property
+    def avatar(self) -> str:
+        return self.__record.creator_avatar
+
+
+    @cached_property
+    def url(self) -> str:
+        return self.__record.creator_url
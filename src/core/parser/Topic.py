@@ -1,32 +1,49 @@
 from typing import Optional
 from functools import cached_property
 
-import datetime
 import logging
 from bs4 import BeautifulSoup
 
+from .TopicBase import TopicBase
 from .Post import Post
+from .User import User
+from .page_index import PageIndex
 from .parser_error import ParserError
 
 
-class Topic():
+class Topic(TopicBase):
+    """
+    `TopicBase` that reads from a BeautifulSoup tree. Fields are looked up from a class index of
+    the page, see `index`.
+    """
 
     __logger = logging.getLogger(__qualname__)
 
+    # Classes looked up page wide by the topic
+    INDEX_CLASSES = {
+        'header-v4__row header-v4__row--bar',
+        'forum-topic-title__title forum-topic-title__title--display',
+        'forum-topic-floating-header__title-link',
+        'js-forum__total-count',
+    }
+
     def __init__(self, root: BeautifulSoup):
         self.__root = root
 
 
-    # Overload with the Post object to ensure getTopic works for either objects
     @cached_property
-    def topic(self):
-        return self
+    def index(self) -> PageIndex:
+        """
+        Class index of the page's elements. Built on first access by a single walk over the page,
+        after which topic and post fields are looked up from it instead of searching the page.
+        """
+        return PageIndex(self.__root, Topic.INDEX_CLASSES | Post.INDEX_CLASSES | User.INDEX_CLASSES)
 
 
     @cached_property
     def subforum_id(self) -> int:
         try:
-            subforum_path_root = self.__root.find_all(class_='header-v4__row header-v4__row--bar')[0]
+            subforum_path_root = self.index.find('header-v4__row header-v4__row--bar')[0]
             subforum_url = subforum_path_root.find_all(class_='header-nav-v4__link')[-1].get('href')
             return int(subforum_url[subforum_url.rfind('/') + 1:])
         except Exception as e:
@@ -36,65 +53,30 @@ class Topic():
     @cached_property
     def subforum_name(self) -> str:
         try:
-            subforum_path_root = self.__root.find_all(class_='header-v4__row header-v4__row--bar')[0]
+            subforum_path_root = self.index.find('header-v4__row header-v4__row--bar')[0]
             return subforum_path_root.find_all(class_='header-nav-v4__item')[-1].text.strip()
         except Exception as e:
             raise ParserError(f'Unable to parse topic subforum name; {self.url}: {e}') from e
 
 
-    @cached_property
-    def date(self) -> datetime.datetime:
-        try: return self.first_post.date
-        except Exception as e:
-            raise ParserError(f'Unable to parse topic date; {self.url}: {e}') from e
-
-
-    @cached_property
-    def creator(self) -> str:
-        try: return self.first_post.creator
-        except Exception as e:
-            raise ParserError(f'Unable to parse topic creator; {self.url}: {e}') from e
-
-
     # \FIXME: Apperently some threads can have no title like this one: https://osu.ppy.sh/forum/t/751805
     @cached_property
     def name(self) -> str:
-        try: return self.__root.find_all(class_='forum-topic-title__title forum-topic-title__title--display')[0].text.strip()
+        try: return self.index.find('forum-topic-title__title forum-topic-title__title--display')[0].text.strip()
         except Exception as e:
             raise ParserError(f'Unable to parse topic name; {self.url}: {e}') from e
 
 
     @cached_property
     def url(self) -> str:
-        try: return self.__root.find_all(class_='forum-topic-floating-header__title-link')[0]['href'].strip()
+        try: return self.index.find('forum-topic-floating-header__title-link')[0]['href'].strip()
         except Exception as e:
-            raise ParserError(f'Unable to parse topic url; {self.url}: {e}') from e
-
-
-    @cached_property
-    def id(self) -> int:
-        url = self.url
-        return int(url[url.rfind('/') + 1:])
-
-
-    # \TODO: Finish implementation
-    @cached_property
-    def status(self):
-        # \TODO
-        '''
-        status = root.find_all(class_='js-forum-topic-reply--container')[0].text.strip()
-        if status == 'Can not reply to a locked thread.':
-            self.status = 'locked'
-        else:
-            self.status = 'open'
-        '''
-
-        raise NotImplementedError
+            raise ParserError(f'Unable to parse topic url: {e}') from e
 
 
     @cached_property
     def post_count(self) -> int:
-        try: return int(self.__root.find_all(class_='js-forum__total-count')[0].text.strip().replace(',', ''))
+        try: return int(self.index.find('js-forum__total-count')[0].text.strip().replace(',', ''))
         except Exception as e:
             raise ParserError(f'Unable to parse post count; {self.url}') from e
 
@@ -108,8 +90,8 @@ class Topic():
 
 
     @cached_property
-    def post_roots(self) -> BeautifulSoup:
-        try: return self.__root.find_all(class_='js-forum-post')
+    def post_roots(self) -> "list[BeautifulSoup]":
+        try: return self.index.post_roots
         except Exception as e:
             raise ParserError(f'Unable to parse topic posts; {self.url}: {e}') from e
 
@@ -0,0 +1,145 @@
+from functools import cached_property
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .RecordTopic import RecordTopic
+
+import datetime
+
+from .PostBase import PostBase
+from .records import TopicRecord
+from .parser_error import ParserError
+
+
+class TopicBase():
+    """
+    Fields of a forum topic page shared by the parser backends. Meant to be overridden; `Topic`
+    reads them from a BeautifulSoup tree, `LxmlTopic` from an lxml one, and `RecordTopic` from a
+    `TopicRecord`.
+    """
+
+    # Overload with the Post object to ensure getTopic works for either objects
+    @cached_property
+    def topic(self):
+        return self
+
+
+    @cached_property
+    def subforum_id(self) -> int:
+        raise NotImplementedError
+
+
+    @cached_property
+    def subforum_name(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def date(self) -> datetime.datetime:
+        try: return self.first_post.date
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic date; {self.url}: {e}') from e
+
+
+    @cached_property
+    def creator(self) -> str:
+        try: return self.first_post.creator
+        except Exception as e:
+            raise ParserError(f'Unable to parse topic creator; {self.url}: {e}') from e
+
+
+    @cached_property
+    def name(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def url(self) -> str:
+        raise NotImplementedError
+
+
+    @cached_property
+    def id(self) -> int:
+        url = self.url
+        return int(url[url.rfind('/') + 1:])
+
+
+    # \TODO: Finish implementation
+    @cached_property
+    def status(self):
+        # \TODO
+        '''
+        status = root.find_all(class_='js-forum-topic-reply--container')[0].text.strip()
+        if status == 'Can not reply to a locked thread.':
+            self.status = 'locked'
+        else:
+            self.status = 'open'
+        '''
+
+        raise NotImplementedError
+
+
+    @cached_property
+    def post_count(self) -> int:
+        raise NotImplementedError
+
+
+    @cached_property
+    def first_post(self) -> PostBase:
+        raise NotImplementedError
+
+
+    # Only gets visible posts (max 20)
+    @cached_property
+    def posts(self) -> "list[PostBase]":
+        raise NotImplementedError
+
+
+    def to_record(self) -> TopicRecord:
+        """
+        Extracts the topic's fields and all of the posts on the page into an immutable record
+        that does not hold on to the parsed page.
+
+        Raises
+        ------
+        ParserError
+            If any of the fields cannot be parsed
+
+        Returns
+        -------
+        TopicRecord
+            The extracted topic
+        """
+        return TopicRecord(
+            id            = self.id,
+            url           = self.url,
+            name          = self.name,
+            subforum_id   = self.subforum_id,
+            subforum_name = self.subforum_name,
+            post_count    = self.post_count,
+            posts         = tuple(post.to_record() for post in self.posts),
+        )
+
+
+    def detach(self) -> "RecordTopic":
+        """
+        Gives a copy of the topic read from its record, which does not hold on to the parsed page.
+        The copy is made once; posts on the same page detached after share it.
+
+        Raises
+        ------
+        ParserError
+            If any of the fields cannot be parsed
+
+        Returns
+        -------
+        RecordTopic
+            The detached topic
+        """
+        return self.__detached
+
+
+    @cached_property
+    def __detached(self) -> "RecordTopic":
+        from .RecordTopic import RecordTopic
+        return RecordTopic(self.to_record())
@@ -6,8 +6,22 @@ from bs4 import BeautifulSoup
 
 class User():
 
-    def __init__(self, root: BeautifulSoup):
-        self.__root = root
+    # Classes looked up within the post the user is from
+    INDEX_CLASSES = {
+        'forum-post-info__row forum-post-info__row--username js-usercard',
+        'avatar avatar--forum',
+    }
+
+    def __init__(self, root: BeautifulSoup, index: "dict[str, list[BeautifulSoup]] | None" = None):
+        self.__root  = root
+        self.__index = index
+
+
+    def __find(self, class_name: str) -> "list[BeautifulSoup]":
+        if self.__index is None:
+            return self.__root.find_all(class_=class_name)
+
+        return self.__index.get(class_name, [])
 
 
     @cached_property
@@ -18,7 +32,7 @@ class User():
 
     @cached_property
     def name(self) -> str:
-        try: return self.__root.find_all(class_='forum-post-info__row forum-post-info__row--username js-usercard')[0].text.strip()
+        try: return self.__find('forum-post-info__row forum-post-info__row--username js-usercard')[0].text.strip()
         except:
             return ''
 
@@ -26,7 +40,7 @@ class User():
     @cached_property
     def avatar(self) -> str:
         try:
-            post_user_avatar = self.__root.find_all(class_='avatar avatar--forum')[0].get('style')
+            post_user_avatar = self.__find('avatar avatar--forum')[0].get('style')
             if not post_user_avatar:
                 post_user_avatar = "background-image: url('');"
         except:
@@ -42,7 +56,7 @@ class User():
     @cached_property
     def url(self) -> str:
         try:
-            url = self.__root.find_all(class_='avatar avatar--forum')[0].get('href')
+            url = self.__find('avatar avatar--forum')[0].get('href')
             if not url:
                 return "https://osu.ppy.sh/users/-1"
         except:
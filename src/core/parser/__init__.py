@@ -1,4 +1,13 @@
+from .PostBase import PostBase
+from .TopicBase import TopicBase
 from .Post import Post
 from .Topic import Topic
 from .User import User
+from .LxmlPost import LxmlPost
+from .LxmlTopic import LxmlTopic
+from .LxmlUser import LxmlUser
+from .RecordPost import RecordPost
+from .RecordTopic import RecordTopic, parse_topic_record
+from .RecordUser import RecordUser
+from .post_extractor import extract_post, extract_topic_ids
 from .parser_error import ParserError
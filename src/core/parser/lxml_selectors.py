@@ -0,0 +1,29 @@
+from functools import cache
+
+from lxml import etree
+
+
+
+@cache
+def class_selector(class_name: str) -> etree.XPath:
+    """
+    Returns a compiled XPath selecting descendants of an element by css class, the same way
+    BeautifulSoup's `find_all(class_=...)` matches them: a single class name matches any element
+    that has that class, while a space separated list must match the element's full class attribute.
+
+    Parameters
+    ----------
+    class_name : str
+        Class name, or space separated class names
+
+    Returns
+    -------
+    etree.XPath
+        Selector to call with the element to search under. Returns matches in document order.
+    """
+    if ' ' in class_name:
+        condition = f"normalize-space(@class)='{class_name}'"
+    else:
+        condition = f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+    return etree.XPath(f'.//*[{condition}]')
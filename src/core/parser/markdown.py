@@ -0,0 +1,82 @@
+from bs4 import BeautifulSoup
+
+
+
+def html_to_markdown(html_str: str) -> str:
+    """
+    Converts the html of a post's contents to discord flavored markdown.
+
+    Parameters
+    ----------
+    html_str : str
+        The html of the post contents
+
+    Returns
+    -------
+    str
+        The post contents as markdown
+    """
+    html_str = html_str.replace('\n', '')
+    root = BeautifulSoup(html_str, 'lxml')
+
+    for tag in root.find_all(True):
+        if tag.name == 'iframe':
+            tag.replace_with(f'{tag["src"]}')
+
+        if tag.name == 'li':
+            tag.insert_before('    • ')
+            continue
+
+        if tag.name == 'a':
+            tag.replace_with(f'[{tag.text}]({tag["href"]})')
+            continue
+
+        if tag.name == 'img':
+            try:
+                if 'smiley' in tag['class']:
+                    tag.replace_with(':smile:')
+                else:
+                    tag.replace_with(f'\n> [img]({tag["src"]})\n')
+                    continue
+            except:
+                continue
+
+        if tag.name == 'br':
+            tag.replace_with('\n')
+            continue
+
+        if tag.name == 'del':
+            tag.insert_before('~~')
+            tag.insert_after('~~')
+            continue
+
+        if tag.name == 'strong':
+            tag.insert_before('**')
+            tag.insert_after('**')
+            continue
+
+        if tag.name == 'em':
+            tag.insert_before('*')
+            tag.insert_after('*')
+            continue
+
+        if tag.name == 'h2':
+            tag.insert_before('**')
+            tag.insert_after('**\n')
+            continue
+
+        if tag.name == 'pre':
+            tag.insert_before('```')
+            tag.insert_after('```')
+            continue
+
+    # Keeps just the "<username> wrote:" part
+    for tag in root.find_all(True):
+        if tag.name == 'blockquote':
+            try:
+                for tag_h4 in tag.find('h4'):
+                    tag.replace_with(f'> **{tag_h4.string}** [...]\n\n')
+            except TypeError:
+                tag.replace_with(f'> {tag.text}\n\n')
+
+    return str(root.text).strip()
@@ -0,0 +1,98 @@
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+
+
+class PageIndex():
+    """
+    Index of a parsed forum page's elements by css class, built in a single walk over the tree.
+
+    Elements are indexed both by each of their classes and by their full class attribute, matching
+    how `find_all(class_=...)` looks them up. Elements inside a post (`js-forum-post`) are also indexed
+    per post so post fields can be looked up without searching the rest of the page.
+
+    Parameters
+    ----------
+    root : BeautifulSoup
+        The parsed page
+
+    classes : set[str]
+        Class names to index. Elements with none of these are skipped.
+    """
+
+    POST_CLASS = 'js-forum-post'
+
+    def __init__(self, root: BeautifulSoup, classes: set[str]):
+        self.__classes = set(classes) | { self.POST_CLASS }
+
+        self.__page_index: dict[str, list[Tag]] = {}
+        self.__post_roots: list[Tag] = []
+        self.__post_indexes: list[dict[str, list[Tag]]] = []
+
+        # id(post root) -> position of the post on the page
+        self.__post_positions: dict[int, int] = {}
+
+        self.__build(root)
+
+
+    @property
+    def post_roots(self) -> list[Tag]:
+        return self.__post_roots
+
+
+    def find(self, class_name: str) -> list[Tag]:
+        """
+        Returns elements on the page with the given class, in document order.
+        """
+        return self.__page_index.get(class_name, [])
+
+
+    def get_post_index(self, post_root: Tag) -> dict[str, list[Tag]] | None:
+        """
+        Returns the class index of elements inside the given post, or None if the post
+        is not from this page.
+        """
+        position = self.get_post_position(post_root)
+        if position is None:
+            return None
+
+        return self.__post_indexes[position]
+
+
+    def get_post_position(self, post_root: Tag) -> int | None:
+        """
+        Returns the position of the given post among the posts on the page, or None if the
+        post is not from this page.
+        """
+        return self.__post_positions.get(id(post_root), None)
+
+
+    def __build(self, root: BeautifulSoup):
+        # Depth first walk in document order. Each entry carries the index of the post it is in, if any
+        stack: list[tuple[Tag, dict | None]] = [ ( root, None ) ]
+
+        while len(stack) > 0:
+            element, post_index = stack.pop()
+
+            classes = element.get('class')
+            if classes:
+                keys = [ name for name in classes if name in self.__classes ]
+
+                full_class = ' '.join(classes)
+                if len(classes) > 1 and full_class in self.__classes:
+                    keys.append(full_class)
+
+                for key in keys:
+                    self.__page_index.setdefault(key, []).append(element)
+                    if post_index is not None:
+                        post_index.setdefault(key, []).append(element)
+
+                if self.POST_CLASS in classes:
+                    post_index = {}
+                    self.__post_positions[id(element)] = len(self.__post_roots)
+                    self.__post_roots.append(element)
+                    self.__post_indexes.append(post_index)
+
+            children = [ child for child in element.contents if isinstance(child, Tag) ]
+            for child in reversed(children):
+                stack.append(( child, post_index ))
@@ -0,0 +1,156 @@
+import re
+
+from functools import cached_property
+
+from lxml import etree, html
+
+from .LxmlPost import LxmlPost
+from .LxmlTopic import LxmlTopic
+from .lxml_selectors import class_selector
+from .parser_error import ParserError
+
+
+# Links in the header of a topic page; the last subforum link is the topic's subforum
+_RE_SUBFORUM_LINK = re.compile(rb'href="[^"]*/community/forums/(\d+)"')
+_RE_TOPIC_LINK    = re.compile(rb'href="[^"]*/community/forums/topics/(\d+)"\s*class="forum-topic-floating-header__title-link"')
+
+
+
+class PartialTopic(LxmlTopic):
+    """
+    `LxmlTopic` over a page that was only parsed up to some post. The rest of the page is
+    parsed the first time `posts` is accessed, or when `parse_rest` is called.
+
+    Parameters
+    ----------
+    root : html.HtmlElement
+        Root of the partially built tree
+    parser : etree.HTMLPullParser
+        The parser building the tree
+    rest : bytes
+        The part of the page not fed to the parser yet
+    """
+
+    __SELECT_POSTS = class_selector('js-forum-post')
+
+    def __init__(self, root: html.HtmlElement, parser: etree.HTMLPullParser, rest: bytes):
+        LxmlTopic.__init__(self, root)
+        self.__root   = root
+        self.__parser = parser
+        self.__rest   = rest
+        self.__post_roots = None
+
+
+    def parse_rest(self):
+        """
+        Feeds the rest of the page to the parser, completing the tree. Does nothing if it is already complete.
+        """
+        if self.__parser is None:
+            return
+
+        self.__parser.feed(self.__rest)
+        self.__parser.close()
+
+        self.__parser = None
+        self.__rest   = b''
+
+
+    @property
+    def post_roots(self) -> "list[html.HtmlElement]":
+        # Posts parsed so far keep their position as the rest of the page is parsed
+        if self.__parser is not None:
+            return self.__SELECT_POSTS(self.__root)
+
+        if self.__post_roots is None:
+            self.__post_roots = self.__SELECT_POSTS(self.__root)
+
+        return self.__post_roots
+
+
+    def get_post_position(self, post_root: html.HtmlElement) -> int | None:
+        try: return self.post_roots.index(post_root)
+        except ValueError:
+            return None
+
+
+    @cached_property
+    def posts(self) -> "list[LxmlPost]":
+        self.parse_rest()
+        return super().posts
+
+
+
+def extract_post(content: bytes, post_id: int | str, chunk_size: int = 16384) -> LxmlPost:
+    """
+    Parses a topic page only as far as the post with the given id.
+
+    The page is fed to an incremental lxml parser a chunk at a time, and parsing stops once the
+    element with the matching `data-post-id` is closed. The topic header comes before the posts on
+    osu!web pages, so the partial tree already holds the header, the first post on the page, the
+    target post and the post before it. Fields of the posts are only read out when accessed.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw topic page
+    post_id : int | str
+        Id of the post to extract
+    chunk_size : int
+        Number of bytes fed to the parser at a time
+
+    Raises
+    ------
+    ParserError
+        If the post is not on the page
+
+    Returns
+    -------
+    LxmlPost
+        The target post. Its `topic` is a `PartialTopic`, which parses the posts after the target
+        only once `topic.posts` is needed.
+    """
+    post_id = str(post_id)
+    parser  = etree.HTMLPullParser(events=('end',), tag='div')
+    parser.set_element_class_lookup(html.HtmlElementClassLookup())
+
+    for i in range(0, len(content), chunk_size):
+        parser.feed(content[i:i + chunk_size])
+
+        for _, elem in parser.read_events():
+            if elem.get('data-post-id') != post_id:
+                continue
+
+            topic = PartialTopic(elem.getroottree().getroot(), parser, content[i + chunk_size:])
+            if topic.get_post_position(elem) is None:
+                raise ParserError(f'Post id {post_id} is not a topic post')
+
+            return LxmlPost(topic, elem)
+
+    raise ParserError(f'Unable to find post id {post_id} on page')
+
+
+def extract_topic_ids(content: bytes) -> tuple[int, int] | None:
+    """
+    Reads the subforum and topic ids of a topic page from the links in its header, without parsing
+    the page. Only the part of the page before the first post is searched.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw topic page
+
+    Returns
+    -------
+    tuple[int, int] | None
+        The subforum id and topic id, or None if the page has no posts or the links are not found
+    """
+    end = content.find(b'data-post-id=')
+    if end == -1:
+        return None
+
+    subforum_ids = _RE_SUBFORUM_LINK.findall(content, 0, end)
+    topic_link   = _RE_TOPIC_LINK.search(content, 0, end)
+    if len(subforum_ids) == 0 or topic_link is None:
+        return None
+
+    return int(subforum_ids[-1]), int(topic_link.group(1))
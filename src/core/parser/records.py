@@ -0,0 +1,35 @@
+import dataclasses
+import datetime
+
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PostRecord():
+    """
+    Compact immutable copy of a post's fields. Holds no reference to the parsed page.
+    """
+    id:             int
+    url:            str
+    post_num:       int
+    date:           datetime.datetime
+    creator_id:     str
+    creator_name:   str
+    creator_avatar: str
+    creator_url:    str
+    contents_html:  str
+    contents_text:  str
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TopicRecord():
+    """
+    Compact immutable copy of a topic page's fields and all of the posts on it. Holds no
+    reference to the parsed page.
+    """
+    id:            int
+    url:           str
+    name:          str
+    subforum_id:   int
+    subforum_name: str
+    post_count:    int
+    posts:         tuple[PostRecord, ...]
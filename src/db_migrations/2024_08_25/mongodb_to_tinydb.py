@@ -26,7 +26,7 @@ sys.path.append(f'{os.getcwd()}')
 sys.path.append(f'{os.getcwd()}\\src')
 
 from src.core.ForumMonitor import ForumMonitor
-from src.bots.ThreadNecroBot import ThreadNecroBot
+from src.bots.ThreadNecroBotCore import ThreadNecroBotCore
 
 
 
@@ -100,9 +100,9 @@ def migrate_bot_threadnecrobot_logdata(db_path: str, output: str):
     """
     print('Processing threadnecrobot_logdata...')
 
-    TABLE_LOG        = ThreadNecroBot._ThreadNecroBotCore__TABLE_LOGS
-    TABLE_LOG_META   = ThreadNecroBot._ThreadNecroBotCore__TABLE_LOGS_META
-    MAX_ENTRIES_LOGS = ThreadNecroBot._ThreadNecroBotCore__MAX_ENTRIES_LOGS
+    TABLE_LOG        = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_LOGS
+    TABLE_LOG_META   = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_LOGS_META
+    MAX_ENTRIES_LOGS = ThreadNecroBotCore._ThreadNecroBotCore__MAX_ENTRIES_LOGS
 
     data_out = {}
 
@@ -175,7 +175,7 @@ def migrate_bot_threadnecrobot_winners(db_path: str, output: str):
     """
     print('Processing threadnecrobot_winners...')
 
-    TABLE_WINNERS = ThreadNecroBot._ThreadNecroBotCore__TABLE_WINNERS
+    TABLE_WINNERS = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_WINNERS
 
     db_dst = pathlib.Path(f'{output}/ThreadNecroBot_DataWinners.json')
 
@@ -213,8 +213,8 @@ def migrate_bot_threadnecrobot_topscores(db_path: str, output: str):
     """
     print('Processing threadnecrobot_topscores...')
 
-    TABLE_SCORES_ALLTIME  = ThreadNecroBot._ThreadNecroBotCore__TABLE_SCORES_ALLTIME
-    TABLE_SCORES_MONTHLY  = ThreadNecroBot._ThreadNecroBotCore__TABLE_SCORES_MONTHLY
+    TABLE_SCORES_ALLTIME  = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_SCORES_ALLTIME
+    TABLE_SCORES_MONTHLY  = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_SCORES_MONTHLY
 
     db_dst = pathlib.Path(f'{output}/ThreadNecroBot_DataScores.json')
 
@@ -276,9 +276,9 @@ def migrate_bot_threadnecrobot_users(db_path: str, output: str):
         }
     """
     print('Processing threadnecrobot_users...')
-    TABLE_USERS_DATA    = ThreadNecroBot._ThreadNecroBotCore__TABLE_USERS_DATA
-    TABLE_USERS_ALLTIME = ThreadNecroBot._ThreadNecroBotCore__TABLE_USERS_ALLTIME
-    TABLE_USERS_MONTHLY = ThreadNecroBot._ThreadNecroBotCore__TABLE_USERS_MONTHLY
+    TABLE_USERS_DATA    = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_USERS_DATA
+    TABLE_USERS_ALLTIME = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_USERS_ALLTIME
+    TABLE_USERS_MONTHLY = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_USERS_MONTHLY
 
     data_out_data    = {}
     data_out_alltime = {}
@@ -357,7 +357,7 @@ def migrate_bot_threadnecrobot_metadata(db_path: str, output: str):
     """
     print('Processing threadnecrobot_metadata...')
 
-    TABLE_META_PREV_POST = ThreadNecroBot._ThreadNecroBotCore__TABLE_META_PREV_POST
+    TABLE_META_PREV_POST = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_META_PREV_POST
 
     db_dst = pathlib.Path(f'{output}/ThreadNecroBot_DataMeta.json')
 
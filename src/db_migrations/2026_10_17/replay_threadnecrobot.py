@@ -0,0 +1,97 @@
+"""
+Rebuilds ThreadNecroBot's database by replaying the necro thread's posts offline, then lists how it
+differs from the live database. For recovering from an outage or a scoring bug without waiting for
+the bot to see every post live.
+
+Posts are read from a directory of saved topic pages (*.htm, *.html) of the necro thread, or
+downloaded for a range of post ids. Pages are parsed across processes and the posts are scored in
+order with ThreadNecroBot's scoring, see `ThreadNecroReplay`. The rebuilt database is written out
+once at the end. The live database is only read.
+
+The topic id, database backend, and parser backend are taken from config.yaml.
+
+1. Run the replay
+    > python src/db_migrations/2026_10_17/replay_threadnecrobot.py pages <pages_dir> <output_path> [live_db_path]
+    > python src/db_migrations/2026_10_17/replay_threadnecrobot.py posts <post_id_start> <post_id_end> <output_path> [live_db_path]
+2. Check the differences printed, also saved to <output_path>/replay_diff.txt
+3. To use the rebuilt database, stop the bot and replace the files in `db_path` with the ones in <output_path>
+"""
+import os
+import sys
+import time
+import logging
+
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from core.BotConfig import BotConfig
+from bots.ThreadNecroBotCore import ThreadNecroBotCoreBase
+from bots.ThreadNecroBotCore.ThreadNecroReplay import ThreadNecroReplay
+
+
+
+def replay_threadnecrobot(pages, output_path: str, live_db_path: str, post_id_start: int | None = None, post_id_end: int | None = None):
+    topic_id   = int(BotConfig['ThreadNecroBot']['topic_id'])
+    db_backend = BotConfig['ThreadNecroBot'].get('db_backend', 'tinydb')
+    parser     = BotConfig['Core'].get('parser_backend', 'bs4')
+
+    if os.path.exists(output_path) and os.listdir(output_path):
+        print(f'{output_path} is not empty')
+        exit(1)
+
+    print('Parsing pages...')
+    time_start = time.perf_counter()
+    posts = ThreadNecroReplay.parse_pages(pages, topic_id, parser, post_id_start=post_id_start, post_id_end=post_id_end)
+    print(f'    {len(posts)} posts in {time.perf_counter() - time_start:.1f}s')
+
+    print('Replaying posts...')
+    time_start = time.perf_counter()
+    rebuilt  = ThreadNecroReplay(output_path, db_backend)
+    warnings = rebuilt.replay(posts)
+    print(f'    {max(len(posts) - 1, 0)} posts scored in {time.perf_counter() - time_start:.1f}s')
+
+    for warning in warnings:
+        print(f'    {warning}')
+
+    print('Comparing with live database...')
+    live  = ThreadNecroBotCoreBase.create(db_backend, live_db_path)
+    lines = ThreadNecroReplay.diff(live, rebuilt.core)
+
+    with open(f'{output_path}/replay_diff.txt', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(warnings + lines) + '\n')
+
+    for line in lines:
+        print(f'    {line}')
+
+    print(f'    {len(lines)} differences')
+
+    live.close_db()
+    rebuilt.core.close_db()
+
+
+if __name__ == "__main__":
+    # Each post is logged as it is scored otherwise
+    logging.getLogger('ThreadNecroBot').setLevel(logging.WARNING)
+    logging.getLogger('bots.ThreadNecroReplay').setLevel(logging.WARNING)
+
+    is_dbg  = BotConfig['Core']['is_dbg']
+    db_path = BotConfig['Core']['db_path_dbg'] if is_dbg else BotConfig['Core']['db_path']
+
+    if len(sys.argv) in [ 4, 5 ] and sys.argv[1] == 'pages':
+        replay_threadnecrobot(
+            ThreadNecroReplay.read_pages(sys.argv[2]), sys.argv[3],
+            sys.argv[4] if len(sys.argv) == 5 else db_path
+        )
+    elif len(sys.argv) in [ 5, 6 ] and sys.argv[1] == 'posts':
+        post_id_start = int(sys.argv[2])
+        post_id_end   = int(sys.argv[3])
+
+        replay_threadnecrobot(
+            ThreadNecroReplay.fetch_pages(int(BotConfig['ThreadNecroBot']['topic_id']), post_id_start, post_id_end), sys.argv[4],
+            sys.argv[5] if len(sys.argv) == 6 else db_path,
+            post_id_start, post_id_end
+        )
+    else:
+        print(f'Usage: {sys.argv[0]} pages <pages_dir> <output_path> [live_db_path]')
+        print(f'       {sys.argv[0]} posts <post_id_start> <post_id_end> <output_path> [live_db_path]')
+        exit(1)
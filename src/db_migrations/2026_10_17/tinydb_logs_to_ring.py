@@ -0,0 +1,96 @@
+"""
+Moves ThreadNecroBot's score log out of ThreadNecroBot_DataLogs.json into the `LogRing` log
+file the 'tinydb' backend keeps it in now.
+
+Entries keep their doc ids and order. Entries beyond `log_capacity` go to the compressed archive
+next to the log file, same as they would have if logged with the ring. The monthly cursor is set
+from the monthly entry count in `log_data_meta`. ThreadNecroBot_DataLogs.json is left as is.
+
+1. Stop the bot so the json file is not being written to
+2. Run db migration
+    > python src/db_migrations/2026_10_17/tinydb_logs_to_ring.py <db_path> [log_capacity]
+3. Start the bot
+"""
+import os
+import sys
+import pathlib
+
+import tinydb
+
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from bots.ThreadNecroBotCore import ThreadNecroBotCore, LogRing
+
+
+
+def migrate_bot_threadnecrobot_logdata(db_path: str, log_capacity: int):
+    """
+    in fmt DB:
+        "log_data" : {
+            [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
+            ...
+        },
+        "log_data_meta : {
+            [type:int] : { 'num' : int },
+        }
+
+    out fmt DB (`LogRing`, one fixed size record per entry):
+        [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float }
+    """
+    print('Processing threadnecrobot_logdata...')
+
+    TABLE_LOG        = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_LOGS
+    TABLE_LOG_META   = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_LOGS_META
+    DB_FILE          = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOGS
+    DB_FILE_RING     = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOG_RING
+    DB_FILE_ARCHIVE  = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOG_ARCHIVE
+
+    db_src = pathlib.Path(f'{db_path}/{DB_FILE}')
+    if not db_src.exists():
+        print(f'    {db_src} not found, skipping')
+        return
+
+    if os.path.exists(f'{db_path}/{DB_FILE_RING}'):
+        print(f'    {db_path}/{DB_FILE_RING} already exists, skipping')
+        return
+
+    with tinydb.TinyDB(db_src, access_mode='r') as db:
+        entries = { entry.doc_id : dict(entry) for entry in db.table(TABLE_LOG).all() }
+        meta    = db.table(TABLE_LOG_META).get(doc_id=ThreadNecroBotCore.DB_TYPE_MONTHLY)
+
+    log = LogRing(f'{db_path}/{DB_FILE_RING}', f'{db_path}/{DB_FILE_ARCHIVE}', capacity=log_capacity)
+
+    # The month started this many entries before the end
+    num_monthly = None
+    if isinstance(meta, tinydb.table.Document) and meta.get('num') is not None:
+        num_monthly = int(meta['num'])
+
+    last_doc_id = max(entries, default=0)
+
+    # Doc ids are the order entries were logged in; gaps are filled so they keep their doc ids
+    log.begin()
+    for doc_id in range(1, last_doc_id + 1):
+        if num_monthly is not None and doc_id == last_doc_id - num_monthly + 1:
+            log.reset_monthly()
+
+        log.append(entries.get(doc_id, { 'time' : '', 'user_name' : '' }))
+
+    if num_monthly == 0:
+        log.reset_monthly()
+
+    log.commit()
+    print(f'    {len(entries)} entries, {log.get_num(monthly=True)} this month')
+
+    log.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in [ 2, 3 ]:
+        print(f'Usage: {sys.argv[0]} <db_path> [log_capacity]')
+        exit(1)
+
+    db_path      = sys.argv[1]
+    log_capacity = int(sys.argv[2]) if len(sys.argv) == 3 else 4096
+
+    migrate_bot_threadnecrobot_logdata(db_path, log_capacity)
@@ -0,0 +1,251 @@
+"""
+Converts ThreadNecroBot's TinyDB json files to the SQLite database used when
+`ThreadNecroBot: db_backend` is set to 'sqlite'.
+
+Doc ids and the order of entries are kept, so the bot reads back the same data
+with either backend. BotCore.json is not converted; ForumMonitor keeps using it.
+
+1. Stop the bot so the json files are not being written to
+2. Run db migration
+    > python src/db_migrations/2026_10_17/tinydb_to_sqlite.py <db_path> <output_path>
+3. Set `db_backend: 'sqlite'` under `ThreadNecroBot` in config.yaml, and
+   `db_path` to <output_path> if it is a different directory
+"""
+import os
+import sys
+import pathlib
+
+import tinydb
+
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from bots.ThreadNecroBotCore import ThreadNecroBotCore, ThreadNecroBotCoreSqlite, LogRing
+
+
+
+def read_tables(db_src: pathlib.Path) -> dict[str, list[tinydb.table.Document]]:
+    """
+    Returns the entries of every table in a TinyDB json file, in the order they are stored
+    """
+    if not db_src.exists():
+        print(f'    {db_src} not found, skipping')
+        return {}
+
+    with tinydb.TinyDB(db_src, access_mode='r') as db:
+        return { name : db.table(name).all() for name in db.tables() }
+
+
+def monthly_tables(tables: dict[str, list[tinydb.table.Document]], table_name: str) -> list[str]:
+    """
+    Returns the names of the monthly tables of every epoch, see `ThreadNecroBotCore.start_epoch`
+    """
+    return [ name for name in tables if name == table_name or name.startswith(f'{table_name}_') ]
+
+
+def create_monthly_table(db, table_name: str, name: str):
+    for statement in ThreadNecroBotCoreSqlite._ThreadNecroBotCoreSqlite__SCHEMA_MONTHLY[table_name]:
+        db.execute(statement.format(name))
+
+
+def migrate_bot_threadnecrobot_logdata(db_path: str, core: ThreadNecroBotCoreSqlite):
+    """
+    in fmt DB:
+        "log_data" : {
+            [idx:int] : { 'time' : str, 'user_name' : str, 'user_id' : int, 'post_id' : int, 'added_score' : float, 'score_alltime' : float, 'score_monthly' : float },
+            ...
+        },
+        "log_data_meta : {
+            [type:int] : { 'num' : int },
+        }
+
+    out fmt DB:
+        log_data      ( id, time, user_name, user_id, post_id, added_score, score_alltime, score_monthly )
+        log_data_meta ( type, num )
+    """
+    print('Processing threadnecrobot_logdata...')
+
+    TABLE_LOG      = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_LOGS
+    TABLE_LOG_META = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_LOGS_META
+    DB_FILE        = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOGS
+
+    tables = read_tables(pathlib.Path(f'{db_path}/{DB_FILE}'))
+
+    # The log is in a `LogRing` once converted with tinydb_logs_to_ring.py
+    ring_path = f'{db_path}/{ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOG_RING}'
+    if os.path.exists(ring_path):
+        log = LogRing(ring_path, f'{db_path}/{ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOG_ARCHIVE}')
+        tables[TABLE_LOG]      = list(log.read_archive()) + log.get_range()[::-1]
+        tables[TABLE_LOG_META] = [ tinydb.table.Document({ 'num' : log.get_num(monthly=True) }, doc_id=ThreadNecroBotCore.DB_TYPE_MONTHLY) ]
+        log.close()
+
+    with core._ThreadNecroBotCoreSqlite__open_db() as db:
+        for entry in tables.get(TABLE_LOG, []):
+            db.execute(
+                f'INSERT OR REPLACE INTO {TABLE_LOG} (id, time, user_name, user_id, post_id, added_score, score_alltime, score_monthly) '
+                f'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    entry.doc_id, entry.get('time'), entry.get('user_name'), entry.get('user_id'), entry.get('post_id'),
+                    entry.get('added_score'), entry.get('score_alltime'), entry.get('score_monthly')
+                )
+            )
+
+        for entry in tables.get(TABLE_LOG_META, []):
+            db.execute(f'INSERT OR REPLACE INTO {TABLE_LOG_META} (type, num) VALUES (?, ?)', ( entry.doc_id, entry.get('num') ))
+
+
+def migrate_bot_threadnecrobot_winners(db_path: str, core: ThreadNecroBotCoreSqlite):
+    """
+    in fmt DB:
+        'monthly_winners' : {
+            [idx:int] : { 'time' : str, 'user_id' : int, 'user_name' : str, 'points' : float },
+            ...
+        }
+
+    out fmt DB:
+        monthly_winners ( idx, time, user_id, user_name, points )
+    """
+    print('Processing threadnecrobot_winners...')
+
+    TABLE_WINNERS = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_WINNERS
+    DB_FILE       = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_WINNERS
+
+    tables = read_tables(pathlib.Path(f'{db_path}/{DB_FILE}'))
+
+    with core._ThreadNecroBotCoreSqlite__open_db() as db:
+        for entry in tables.get(TABLE_WINNERS, []):
+            db.execute(
+                f'INSERT OR REPLACE INTO {TABLE_WINNERS} (idx, time, user_id, user_name, points) VALUES (?, ?, ?, ?, ?)',
+                ( entry.doc_id, entry.get('time'), entry.get('user_id'), entry.get('user_name'), entry.get('points') )
+            )
+
+
+def migrate_bot_threadnecrobot_topscores(db_path: str, core: ThreadNecroBotCoreSqlite):
+    """
+    in fmt DB:
+        "top_scores", "top_scores_monthly[_<epoch>]" : {
+            [idx:int] : { 'time' : str, 'user_id' : int, 'user_name' : str, 'post_id' : int, 'added_score' : float },
+            ...
+        }
+
+    out fmt DB:
+        top_scores, top_scores_monthly[_<epoch>] ( idx, time, user_id, user_name, post_id, added_score )
+    """
+    print('Processing threadnecrobot_topscores...')
+
+    TABLE_SCORES_ALLTIME = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_SCORES_ALLTIME
+    TABLE_SCORES_MONTHLY = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_SCORES_MONTHLY
+    DB_FILE              = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_SCORES
+
+    tables = read_tables(pathlib.Path(f'{db_path}/{DB_FILE}'))
+
+    with core._ThreadNecroBotCoreSqlite__open_db() as db:
+        for table_name in [ TABLE_SCORES_ALLTIME ] + monthly_tables(tables, TABLE_SCORES_MONTHLY):
+            if table_name != TABLE_SCORES_ALLTIME:
+                create_monthly_table(db, TABLE_SCORES_MONTHLY, table_name)
+
+            for entry in tables.get(table_name, []):
+                db.execute(
+                    f'INSERT OR REPLACE INTO "{table_name}" (idx, time, user_id, user_name, post_id, added_score) VALUES (?, ?, ?, ?, ?, ?)',
+                    ( entry.doc_id, entry.get('time'), entry.get('user_id'), entry.get('user_name'), entry.get('post_id'), entry.get('added_score') )
+                )
+
+
+def migrate_bot_threadnecrobot_users(db_path: str, core: ThreadNecroBotCoreSqlite):
+    """
+    in fmt DB:
+        "user_data" : {
+            [user_id:int] : { 'user_name' : str, 'post_id' : int },
+            ...
+        },
+        "user_points_alltime", "user_points_monthly[_<epoch>]" : {
+            [user_id:int] : { 'points' : float },
+            ...
+        }
+
+    out fmt DB:
+        user_data                                           ( user_id, user_name, post_id )
+        user_points_alltime, user_points_monthly[_<epoch>]  ( user_id, points )
+
+    Users are inserted in the order they are stored, which is the order ties in points are ranked in.
+    """
+    print('Processing threadnecrobot_users...')
+
+    TABLE_USERS_DATA    = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_USERS_DATA
+    TABLE_USERS_ALLTIME = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_USERS_ALLTIME
+    TABLE_USERS_MONTHLY = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_USERS_MONTHLY
+    DB_FILE             = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_USERS
+
+    tables = read_tables(pathlib.Path(f'{db_path}/{DB_FILE}'))
+
+    with core._ThreadNecroBotCoreSqlite__open_db() as db:
+        for entry in tables.get(TABLE_USERS_DATA, []):
+            db.execute(
+                f'INSERT OR REPLACE INTO {TABLE_USERS_DATA} (user_id, user_name, post_id) VALUES (?, ?, ?)',
+                ( entry.doc_id, entry.get('user_name'), entry.get('post_id') )
+            )
+
+        for table_name in [ TABLE_USERS_ALLTIME ] + monthly_tables(tables, TABLE_USERS_MONTHLY):
+            if table_name != TABLE_USERS_ALLTIME:
+                create_monthly_table(db, TABLE_USERS_MONTHLY, table_name)
+
+            for entry in tables.get(table_name, []):
+                db.execute(
+                    f'INSERT OR REPLACE INTO "{table_name}" (user_id, points) VALUES (?, ?)',
+                    ( entry.doc_id, float(entry['points']) )
+                )
+
+
+def migrate_bot_threadnecrobot_metadata(db_path: str, core: ThreadNecroBotCoreSqlite):
+    """
+    in fmt DB:
+        "prevpost" : {
+            [id:int] : { 'prev_post_id' : int, 'prev_post_time' : str, 'prev_post_user_id' : int, 'prev_post_user_name' : str },
+        },
+        "epoch" : {
+            [id:int] : { 'epoch' : str, 'rollover_time' : int },
+        }
+
+    out fmt DB:
+        prevpost ( id, prev_post_id, prev_post_time, prev_post_user_id, prev_post_user_name )
+        epoch    ( id, epoch, rollover_time )
+    """
+    print('Processing threadnecrobot_metadata...')
+
+    TABLE_META_PREV_POST = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_META_PREV_POST
+    TABLE_META_EPOCH     = ThreadNecroBotCore._ThreadNecroBotCore__TABLE_META_EPOCH
+    DB_FILE              = ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_META
+
+    tables = read_tables(pathlib.Path(f'{db_path}/{DB_FILE}'))
+
+    with core._ThreadNecroBotCoreSqlite__open_db() as db:
+        for entry in tables.get(TABLE_META_PREV_POST, []):
+            db.execute(
+                f'INSERT OR REPLACE INTO {TABLE_META_PREV_POST} (id, prev_post_id, prev_post_time, prev_post_user_id, prev_post_user_name) VALUES (?, ?, ?, ?, ?)',
+                ( entry.doc_id, entry.get('prev_post_id'), entry.get('prev_post_time'), entry.get('prev_post_user_id'), entry.get('prev_post_user_name') )
+            )
+
+        for entry in tables.get(TABLE_META_EPOCH, []):
+            db.execute(
+                f'INSERT OR REPLACE INTO {TABLE_META_EPOCH} (id, epoch, rollover_time) VALUES (?, ?, ?)',
+                ( entry.doc_id, entry.get('epoch'), entry.get('rollover_time') )
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f'Usage: {sys.argv[0]} <db_path> <output_path>')
+        exit(1)
+
+    db_path = sys.argv[1]
+    output  = sys.argv[2]
+
+    core = ThreadNecroBotCoreSqlite(output)
+
+    migrate_bot_threadnecrobot_logdata(db_path, core)
+    migrate_bot_threadnecrobot_winners(db_path, core)
+    migrate_bot_threadnecrobot_topscores(db_path, core)
+    migrate_bot_threadnecrobot_users(db_path, core)
+    migrate_bot_threadnecrobot_metadata(db_path, core)
+
+    core.close_db()
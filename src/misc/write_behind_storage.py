@@ -0,0 +1,186 @@
+import os
+import json
+import logging
+import threading
+import contextlib
+
+from typing import Iterator, Optional
+
+from tinydb.storages import Storage, touch
+
+
+
+class WriteBehindStorage(Storage):
+    """
+    TinyDB storage that keeps the whole database in memory and writes it to disk in the background.
+
+    The json file is read once when the storage is opened. After that, reads come from memory and
+    writes only update memory and schedule a flush `flush_delay` seconds later; writes made before
+    the flush runs go out with it. A flush writes to a temporary file next to the database and
+    atomically renames it over the database, so the file on disk is always either the old or the
+    new version. If the process died after writing the temporary file but before renaming it, the
+    temporary file is used when the database is next opened.
+
+    Parameters
+    ----------
+    path : str
+        Path to the json file
+
+    flush_delay : float
+        Seconds to wait after a write before flushing to disk. 0 flushes on every write.
+
+    fsync : bool
+        Whether to fsync the file before renaming it into place. Makes flushes survive power
+        loss, at the cost of a slower flush.
+
+    encoding : Optional[str]
+        Encoding of the json file
+    """
+
+    __logger = logging.getLogger(__qualname__)
+
+    def __init__(self, path: str, flush_delay: float = 1.0, fsync: bool = False, encoding: Optional[str] = None):
+        super().__init__()
+
+        self.__path        = path
+        self.__path_tmp    = f'{path}.tmp'
+        self.__flush_delay = flush_delay
+        self.__fsync       = fsync
+        self.__encoding    = encoding
+
+        self.__lock  = threading.RLock()
+        self.__timer: Optional[threading.Timer] = None
+        self.__dirty = False
+        self.__batch_depth = 0
+
+        touch(path, create_dirs=True)
+        self.__data = self.__recover()
+
+
+    @property
+    def lock(self) -> threading.RLock:
+        """
+        Lock held while reading, writing, or flushing. TinyDB updates the dict returned by `read`
+        in place before writing it back, so hold this across whole TinyDB operations when the
+        database is shared between threads.
+        """
+        return self.__lock
+
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether there are writes that were not flushed to disk yet
+        """
+        return self.__dirty
+
+
+    def read(self) -> Optional[dict]:
+        with self.__lock:
+            return self.__data
+
+
+    def write(self, data: dict):
+        with self.__lock:
+            self.__data  = data
+            self.__dirty = True
+
+            if self.__batch_depth == 0:
+                self.__schedule_flush()
+
+
+    @contextlib.contextmanager
+    def batch(self, flush: bool = True) -> Iterator[None]:
+        """
+        Holds the lock and defers flushing for the duration of the `with` block, so the writes made
+        in it reach the disk together in one flush even when `flush_delay` is 0.
+
+        Parameters
+        ----------
+        flush : bool
+            Whether to flush (or schedule a flush) at the end of the block. If False, the caller
+            is expected to call `flush` itself.
+        """
+        with self.__lock:
+            self.__batch_depth += 1
+            try:
+                yield
+            finally:
+                self.__batch_depth -= 1
+                if flush and self.__batch_depth == 0 and self.__dirty:
+                    self.__schedule_flush()
+
+
+    def __schedule_flush(self):
+        if self.__flush_delay <= 0:
+            self.flush()
+            return
+
+        if self.__timer is None:
+            self.__timer = threading.Timer(self.__flush_delay, self.flush)
+            self.__timer.daemon = True
+            self.__timer.start()
+
+
+    def flush(self):
+        """
+        Writes the database to disk now if there are writes that were not flushed yet.
+        """
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+
+            if not self.__dirty:
+                return
+
+            with open(self.__path_tmp, 'w', encoding=self.__encoding) as f:
+                json.dump(self.__data, f)
+                f.flush()
+                if self.__fsync:
+                    os.fsync(f.fileno())
+
+            os.replace(self.__path_tmp, self.__path)
+            self.__dirty = False
+
+
+    def reload(self):
+        """
+        Drops writes that were not flushed yet and reads the database from disk again.
+        """
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+
+            self.__data  = self.__recover()
+            self.__dirty = False
+
+
+    def close(self):
+        self.flush()
+
+
+    def __recover(self) -> Optional[dict]:
+        """
+        Loads the database, preferring a temporary file that was fully written but not renamed into place.
+        """
+        if os.path.exists(self.__path_tmp):
+            try:
+                with open(self.__path_tmp, 'r', encoding=self.__encoding) as f:
+                    data = json.load(f)
+
+                self.__logger.warning(f'Recovering {self.__path} from unfinished write')
+                os.replace(self.__path_tmp, self.__path)
+                return data
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # The process died while writing it; the database itself is still intact
+                os.remove(self.__path_tmp)
+
+        with open(self.__path, 'r', encoding=self.__encoding) as f:
+            contents = f.read()
+
+        if contents.strip() == '':
+            return None
+
+        return json.loads(contents)
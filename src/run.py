@@ -10,7 +10,6 @@ import os
 import pathlib
 
 import misc.warning_handler
-from core.ForumMonitor import ForumMonitor
 from core.BotConfig import BotConfig
 
 
@@ -23,6 +22,9 @@ sys.excepthook = exception_hook
 
 
 if __name__ == '__main__':
+    # Imported here since parsing worker processes import this module too; see `parse_processes`
+    from core.ForumMonitor import ForumMonitor
+
     root = os.path.abspath(os.getcwd())
     log_path      = BotConfig['Core']['log_path']      = pathlib.Path(f'{root}{os.sep}{BotConfig["Core"]["log_path"]}')
     bots_log_path = BotConfig['Core']['bots_log_path'] = pathlib.Path(f'{root}{os.sep}{BotConfig["Core"]["bots_log_path"]}')
@@ -0,0 +1,116 @@
+"""
+Benchmarks the memory held by the posts queued for a stalled bot, for each queue policy.
+
+A bot that never finishes processing a post is handed posts, each on its own parse of
+"src/tests/unit_tests/forum_test_page.htm" like posts found live. Each policy runs in its own
+process, and the resident memory is read once the posts are handed over, or once handing them over
+is blocked. The growth from before the posts were parsed is reported.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_bot_queue_memory.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from bs4 import BeautifulSoup
+
+from core.BotConfig import BotConfig
+
+BotConfig['Core'].update({
+    'is_dbg' : True,
+})
+
+from core.BotBase import BotBase
+from core.BotQueue import BotQueue
+from core.parser import Topic, Post
+
+from bots.TestBot import TestBot
+
+
+NUM_POSTS  = 40
+QUEUE_SIZE = 4
+
+RUNS = [
+    ( 'unbounded',   0,          BotQueue.POLICY_BLOCK ),
+    ( 'block',       QUEUE_SIZE, BotQueue.POLICY_BLOCK ),
+    ( 'drop_oldest', QUEUE_SIZE, BotQueue.POLICY_DROP_OLDEST ),
+    ( 'spill',       QUEUE_SIZE, BotQueue.POLICY_SPILL ),
+]
+
+
+class StalledBot(BotBase):
+
+    def __init__(self):
+        self.stalled = threading.Event()
+        BotBase.__init__(self, TestBot.BotCmd, 'StalledBot', enable=True)
+
+
+    def process_data(self, forum_data: Post):
+        # Holds the first post forever, like a bot stuck on a request
+        self.stalled.set()
+        threading.Event().wait()
+
+
+def get_rss() -> int:
+    """
+    Resident memory of this process, in bytes
+    """
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def run(size: int, policy: str):
+    BotConfig['StalledBot'] = { 'queue_size' : size, 'queue_policy' : policy }
+
+    with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+        page = f.read()
+
+    bot = StalledBot()
+    rss_start = get_rss()
+
+    def hand_over():
+        for _ in range(NUM_POSTS):
+            bot.event(Topic(BeautifulSoup(page, 'lxml')).first_post)
+
+    thread = threading.Thread(target=hand_over, daemon=True)
+    thread.start()
+
+    # With the 'block' policy, handing over stops once the queue is full
+    while thread.is_alive():
+        thread.join(0.5)
+
+        if policy == BotQueue.POLICY_BLOCK and size > 0 and bot.get_queue_stats()['depth'] >= size:
+            thread.join(1)
+            break
+
+    rss_end = get_rss()
+    stats   = bot.get_queue_stats()
+
+    print(
+        f'{sys.argv[1]:<12} '
+        f'RSS +{(rss_end - rss_start)/2**20:>7.1f} MiB   '
+        f'handed over {stats["posts"]:>3}   waiting {stats["depth"]:>3} ({stats["spilled"]:>3} spilled)   dropped {stats["dropped"]:>3}'
+    )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4:
+        # Where the 'spill' policy writes posts to
+        db_dir = tempfile.mkdtemp(prefix='bench_bot_queue_memory_')
+        BotConfig['Core']['db_path_dbg'] = db_dir
+
+        run(int(sys.argv[2]), sys.argv[3])
+
+        shutil.rmtree(db_dir, ignore_errors=True)
+        os._exit(0)
+
+    print(f'posts: {NUM_POSTS}   queue size: {QUEUE_SIZE}')
+    for name, size, policy in RUNS:
+        subprocess.run([ sys.executable, __file__, name, str(size), policy ], check=True)
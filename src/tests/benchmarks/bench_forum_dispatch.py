@@ -0,0 +1,130 @@
+"""
+Benchmarks the cost of handing a post to the bots in `BotCore.forum_driver` with 50 bots registered.
+
+Of the bots, 40 watch a subforum each and 10 watch a topic each; 5 of the subforum bots watch the
+subforum of the post used. Compared are bots that pick their posts in `filter_data`, which every
+bot is called with for every post, and bots that declare the same as subscriptions, which
+`BotCore` indexes so only the bots subscribed to the post are called.
+
+Uses the first post of "src/tests/unit_tests/forum_test_page.htm". The post's fields are parsed
+before timing, so only the dispatch is measured.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_forum_dispatch.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from bs4 import BeautifulSoup
+
+from core.BotConfig import BotConfig
+
+DB_DIR = tempfile.mkdtemp(prefix='bench_forum_dispatch_')
+
+BotConfig['Core'].update({
+    'is_dbg'      : True,
+    'bots_path'   : 'src/bots',
+    'db_path_dbg' : DB_DIR,
+    'api_port'    : 0,
+})
+
+from core.BotBase import BotBase
+from core.BotCore import BotCore
+from core.parser import Topic, Post
+
+from bots.TestBot import TestBot
+
+
+RUNS = 20000
+
+NUM_SUBFORUM_BOTS = 40
+NUM_TOPIC_BOTS    = 10
+NUM_MATCHING      = 5
+
+
+with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+    POST = Topic(BeautifulSoup(f.read(), 'lxml')).first_post
+
+# Parse what the bots filter on up front
+POST.topic.id, POST.topic.subforum_id, POST.topic.subforum_name
+
+
+class BenchBot(BotBase):
+
+    def __init__(self, name: str, subforum_id: int | None, topic_id: int | None, declared: bool):
+        self.__subforum_id = subforum_id
+        self.__topic_id    = topic_id
+        self.__declared    = declared
+
+        if declared:
+            self.subforum_ids = None if subforum_id is None else frozenset({ subforum_id })
+            self.topic_ids    = None if topic_id    is None else frozenset({ topic_id })
+
+        BotBase.__init__(self, TestBot.BotCmd, name, enable=True)
+
+
+    def start(self):
+        # Posts are left in the queue; only handing them over is measured
+        pass
+
+
+    def filter_data(self, post: Post) -> bool:
+        if self.__declared:
+            return True
+
+        if self.__subforum_id is not None and int(post.topic.subforum_id) != self.__subforum_id:
+            return False
+
+        if self.__topic_id is not None and int(post.topic.id) != self.__topic_id:
+            return False
+
+        return True
+
+
+class BenchBotCore(BotCore):
+
+    def __init__(self, declared: bool):
+        self.__declared = declared
+        BotCore.__init__(self)
+
+
+    def check_db(self):
+        pass
+
+
+    def _BotCore__init_bots(self):
+        bots = self._BotCore__bots
+
+        for i in range(NUM_SUBFORUM_BOTS):
+            subforum_id = POST.topic.subforum_id if i < NUM_MATCHING else 1000 + i
+            bots[f'subforum{i}'] = BenchBot(f'subforum{i}', subforum_id, None, self.__declared)
+
+        for i in range(NUM_TOPIC_BOTS):
+            bots[f'topic{i}'] = BenchBot(f'topic{i}', None, 1000 + i, self.__declared)
+
+        self.update_routes()
+
+
+def bench(name: str, declared: bool):
+    core = BenchBotCore(declared)
+    core.forum_driver(POST)  # Warm up
+
+    time_start = time.perf_counter()
+    for _ in range(RUNS):
+        core.forum_driver(POST)
+    time_per_post = (time.perf_counter() - time_start) / RUNS
+
+    print(f'{name:<12} {time_per_post*1e6:>8.2f} us/post')
+
+
+if __name__ == '__main__':
+    print(f'bots: {NUM_SUBFORUM_BOTS + NUM_TOPIC_BOTS}   subscribed to the post: {NUM_MATCHING}   runs: {RUNS}')
+    bench('filter_data', False)
+    bench('routed',      True)
+
+    shutil.rmtree(DB_DIR, ignore_errors=True)
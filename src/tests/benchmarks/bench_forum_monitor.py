@@ -0,0 +1,114 @@
+"""
+Benchmarks forum monitor catch-up throughput for serial vs windowed post probing.
+
+A local stand-in for osu!web serves "src/tests/unit_tests/forum_test_page.htm" for post ids
+up to the end of a simulated backlog and 404s past it, with an artificial response delay
+to mimic the network round trip.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_forum_monitor.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import http.server
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from core.BotConfig import BotConfig
+
+DB_DIR = tempfile.mkdtemp(prefix='bench_forum_monitor_')
+
+BotConfig['Core'].update({
+    'is_dbg'          : True,
+    'bots_path'       : 'src/bots',
+    'db_path_dbg'     : DB_DIR,
+    'api_port'        : 0,
+
+    'latest_post_id'  : 0,
+    'rate_post_max'   : 5.0,
+    'rate_post_warn'  : 2.0,
+    'rate_post_min'   : 0.05,
+
+    # Keep the shared rate limiter out of the way; the post rate is what is being measured
+    'rate_limit_max'   : 1000.0,
+    'rate_limit_burst' : 100,
+})
+
+from core.SessionMgrV2 import SessionMgrV2
+
+# No osu!api access is needed to probe the local server
+SessionMgrV2.login = lambda: None
+
+from core.BotCore import BotCore
+BotCore._BotCore__init_bots = lambda self: None
+
+from core.ForumMonitor import ForumMonitor
+from core.RateLimiter import RateLimiter
+from misc.threaded_obj import Threaded
+
+
+BACKLOG       = 40    # Number of new posts the monitor has to catch up on
+RATE          = 0.05  # Seconds between request starts
+SERVER_DELAY  = 0.2   # Simulated response latency in seconds
+WINDOWS       = [ 1, 2, 4, 8 ]
+
+
+with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+    PAGE = f.read()
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        time.sleep(SERVER_DELAY)
+
+        post_id = int(self.path[self.path.rfind('/') + 1:])
+        if not ( 1 <= post_id <= BACKLOG ):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+
+    def log_message(self, *args):
+        pass
+
+
+def run(window: int, port: int) -> float:
+    ForumMonitor.set_latest_post(0)
+    ForumMonitor._ForumMonitor__check_post_ids.set([ 1 ])
+    ForumMonitor._ForumMonitor__check_rate   = Threaded(RATE)
+    ForumMonitor._ForumMonitor__check_window = window
+    ForumMonitor.fetch_post = lambda post_id: SessionMgrV2.fetch_web_data(f'http://127.0.0.1:{port}/posts/{post_id}', RateLimiter.PRIORITY_MONITOR)
+
+    time_start = time.time()
+    while ForumMonitor.get_latest_post() < BACKLOG:
+        if window > 1:
+            ForumMonitor._ForumMonitor__check_posts_proc_window()
+        else:
+            ForumMonitor._ForumMonitor__check_posts_proc(recheck=False)
+
+    return time.time() - time_start
+
+
+if __name__ == '__main__':
+    server = http.server.ThreadingHTTPServer(( '127.0.0.1', 0 ), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    print(f'backlog: {BACKLOG} posts   rate: {RATE}s   server delay: {SERVER_DELAY}s')
+    for window in WINDOWS:
+        duration = run(window, port)
+        print(f'window {window:>2}: {duration:>6.2f}s   {BACKLOG/duration:>6.2f} posts/s')
+
+    server.shutdown()
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,80 @@
+"""
+Benchmarks ThreadNecroBot rank lookups as the number of users grows.
+
+Compares finding a user's rank the way `ThreadNecroBotCore.get_user_rank` used to, sorting
+every user by points on each lookup, against the `Leaderboard` the cores keep now. Also times
+loading the `Leaderboard` from the database's users, updating a user's points in it, and
+reading the users around a rank.
+
+Works on synthetic users in memory, so it measures the ranking itself and not the database.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_leaderboard.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from bots.ThreadNecroBotCore import Leaderboard
+
+
+SIZES    = [ 10_000, 100_000, 1_000_000 ]
+LOOKUPS  = 1000
+UPDATES  = 10000
+
+
+def sorted_rank(entries: list[tuple[int, float]], user_id: int) -> int:
+    ranked_uids = [ uid for uid, _ in sorted(entries, key=lambda entry: entry[1], reverse=True) ]
+    return ranked_uids.index(user_id) + 1
+
+
+def bench(num_users: int):
+    random.seed(0)
+
+    entries = [ ( user_id, round(random.uniform(0, 100000), 3) ) for user_id in range(num_users) ]
+    user_ids = [ random.randrange(num_users) for _ in range(LOOKUPS) ]
+
+    time_start = time.perf_counter()
+    leaderboard = Leaderboard()
+    leaderboard.load(entries)
+    time_build = time.perf_counter() - time_start
+
+    # Sorting every user takes long enough at a million users that a few lookups are enough
+    sort_lookups = max(3, LOOKUPS*1000 // num_users // 10)
+    time_start = time.perf_counter()
+    for user_id in user_ids[:sort_lookups]:
+        sorted_rank(entries, user_id)
+    time_sort = (time.perf_counter() - time_start) / sort_lookups
+
+    time_start = time.perf_counter()
+    for user_id in user_ids:
+        leaderboard.get_rank(user_id)
+    time_rank = (time.perf_counter() - time_start) / LOOKUPS
+
+    time_start = time.perf_counter()
+    for _ in range(UPDATES):
+        leaderboard.update(random.randrange(num_users), round(random.uniform(0, 100000), 3))
+    time_update = (time.perf_counter() - time_start) / UPDATES
+
+    time_start = time.perf_counter()
+    for user_id in user_ids:
+        rank = leaderboard.get_rank(user_id)
+        leaderboard.get_range(max(rank - 6, 0), 11)
+    time_around = (time.perf_counter() - time_start) / LOOKUPS
+
+    for user_id in user_ids[:sort_lookups]:
+        assert leaderboard.get_rank(user_id) is not None
+
+    print(
+        f'{num_users:>9} users   build {time_build:>6.2f} s   '
+        f'rank (sort all) {time_sort*1000:>9.3f} ms   rank (leaderboard) {time_rank*1e6:>6.2f} us   '
+        f'update {time_update*1e6:>6.2f} us   rank + 10 around {time_around*1e6:>6.2f} us'
+    )
+
+
+if __name__ == '__main__':
+    for num_users in SIZES:
+        bench(num_users)
@@ -0,0 +1,110 @@
+"""
+Benchmarks ThreadNecroBot's score log as it grows.
+
+Compares the log kept as a TinyDB table, the way `ThreadNecroBotCore` used to, against the
+`LogRing` it is kept in now. Times appending an entry with the change written to disk right away,
+reading the 10 newest entries, and reading every entry the way rendering the forum post used to.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_necrobot_log.py
+"""
+import os
+import sys
+import time
+import shutil
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+import tinydb
+
+from misc.write_behind_storage import WriteBehindStorage
+from bots.ThreadNecroBotCore import LogRing
+
+
+SIZES   = [ 1_000, 10_000, 30_000 ]
+APPENDS = 10
+READS   = 200
+DB_DIR  = 'db/bench_necrobot_log'
+
+
+def entry(i: int) -> dict:
+    return {
+        'time'          : '2024-08-01 12:00:00',
+        'user_name'     : f'user {i}',
+        'user_id'       : i,
+        'post_id'       : 10000 + i,
+        'added_score'   : 12.345,
+        'score_alltime' : 1234.5,
+        'score_monthly' : 123.45,
+    }
+
+
+def table_read(table_log: tinydb.table.Table, num: int | None) -> list:
+    # What `ThreadNecroBotCore.get_log_list` used to do
+    lst_len = len(table_log)
+    if num is None:
+        num = lst_len
+
+    return [
+        entry
+        for i in range(lst_len, lst_len - num, -1)
+        if isinstance(entry := table_log.get(doc_id = i), tinydb.table.Document)
+    ]
+
+
+def bench(num_entries: int):
+    shutil.rmtree(DB_DIR, ignore_errors=True)
+    os.makedirs(DB_DIR)
+
+    db = tinydb.TinyDB(f'{DB_DIR}/log.json', storage=WriteBehindStorage, flush_delay=0)
+    table_log = db.table('log_data')
+    with db.storage.batch():
+        for i in range(num_entries):
+            table_log.insert(entry(i))
+
+    log = LogRing(f'{DB_DIR}/log.ring', f'{DB_DIR}/log.archive.jsonl.gz', capacity=4096)
+    log.begin()
+    for i in range(num_entries):
+        log.append(entry(i))
+    log.commit()
+
+    time_start = time.perf_counter()
+    for i in range(APPENDS):
+        table_log.insert(entry(i))
+    time_table_append = (time.perf_counter() - time_start) / APPENDS
+
+    time_start = time.perf_counter()
+    for i in range(APPENDS):
+        log.append(entry(i))
+    time_ring_append = (time.perf_counter() - time_start) / APPENDS
+
+    time_start = time.perf_counter()
+    for _ in range(READS):
+        table_read(table_log, 10)
+    time_table_read = (time.perf_counter() - time_start) / READS
+
+    time_start = time.perf_counter()
+    for _ in range(READS):
+        log.get_range(0, 10)
+    time_ring_read = (time.perf_counter() - time_start) / READS
+
+    time_start = time.perf_counter()
+    table_read(table_log, None)
+    time_table_all = time.perf_counter() - time_start
+
+    print(
+        f'{num_entries:>7} entries   append: table {time_table_append*1000:>8.3f} ms  ring {time_ring_append*1e6:>6.1f} us   '
+        f'last 10: table {time_table_read*1e6:>7.1f} us  ring {time_ring_read*1e6:>5.1f} us   '
+        f'all (old render): {time_table_all*1000:>8.2f} ms   '
+        f'file: json {os.path.getsize(f"{DB_DIR}/log.json")/1e6:>6.2f} MB  ring {os.path.getsize(f"{DB_DIR}/log.ring")/1e6:.2f} MB'
+    )
+
+    db.close()
+    log.close()
+
+
+if __name__ == '__main__':
+    for num_entries in SIZES:
+        bench(num_entries)
+
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,129 @@
+"""
+Benchmarks per-post latency of ThreadNecroBot's database work as the user table grows.
+
+Replays a month of necro posts against `ThreadNecroBotCore`: for each post, the database reads
+and writes `ThreadNecroBot.process_data` does, followed by the reads `write_post` does to render
+the scoreboards. Each new post comes from a new user half of the time, so the user table grows
+over the replay.
+
+Compares databases reopened on every call (how the bot used to work) against databases kept
+open with `WriteBehindStorage`, both writing through on every change and holding writes for
+the flush delay, and against the SQLite backend.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_necrobot_storage.py
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import datetime
+import contextlib
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+import tinydb
+
+from misc.write_behind_storage import WriteBehindStorage
+from bots.ThreadNecroBotCore import ThreadNecroBotCore, ThreadNecroBotCoreSqlite
+
+
+POSTS   = 1500
+BUCKETS = 6
+DB_DIR  = 'db/bench_necrobot'
+
+
+class ReopeningCore(ThreadNecroBotCore):
+    """
+    Opens the database file on every call, the way `ThreadNecroBotCore` used to.
+    """
+
+    def __init__(self, db_path: str):
+        ThreadNecroBotCore.__init__(self, db_path)
+        self.__db_path = db_path
+
+
+    @contextlib.contextmanager
+    def _ThreadNecroBotCore__open_db(self, db_file: str):
+        with tinydb.TinyDB(f'{self.__db_path}/{db_file}', storage=WriteBehindStorage, flush_delay=0) as db:
+            yield db
+
+
+def replay_post(core: ThreadNecroBotCore, post_id: int, user_id: int, time_post: datetime.datetime):
+    prev_post_info = core.get_prev_post_info()
+    added_score    = random.uniform(0, 2000) if prev_post_info else 0
+
+    core.get_user_points(user_id, core.DB_TYPE_ALLTIME)
+    core.get_user_points(user_id, core.DB_TYPE_MONTHLY)
+
+    data = {
+        'time'        : str(time_post),
+        'user_id'     : user_id,
+        'user_name'   : f'user {user_id}',
+        'post_id'     : post_id,
+        'added_score' : added_score,
+    }
+
+    core.update_user_data(data)
+    core.update_log_data(dict(data))
+    core.update_top_score_data(dict(data))
+    core.update_metadata(data)
+
+    # Scoreboard rendering
+    for db_type in [ core.DB_TYPE_ALLTIME, core.DB_TYPE_MONTHLY ]:
+        core.get_ranked_list(db_type, 0, 10)
+        core.get_top_scores_list(db_type)
+        core.get_log_list(db_type, 0, 10)
+
+    core.get_monthly_winners_list()
+
+
+def bench(name: str, core: ThreadNecroBotCore):
+    random.seed(0)
+
+    num_users  = 0
+    time_post  = datetime.datetime(2024, 8, 1)
+    latencies  = []
+
+    for post_id in range(POSTS):
+        if num_users == 0 or random.random() < 0.5:
+            num_users += 1
+
+        user_id   = random.randint(1, num_users)
+        time_post = time_post + datetime.timedelta(minutes=random.uniform(1, 60))
+
+        time_start = time.perf_counter()
+        replay_post(core, post_id, user_id, time_post)
+        latencies.append(time.perf_counter() - time_start)
+
+    core.close_db()
+
+    bucket_size = POSTS // BUCKETS
+    buckets = [
+        f'{sum(latencies[i:i + bucket_size])/bucket_size*1000:>7.2f}'
+        for i in range(0, bucket_size*BUCKETS, bucket_size)
+    ]
+
+    latencies.sort()
+    print(
+        f'{name:<14} p50 {latencies[len(latencies)//2]*1000:>7.2f} ms   p99 {latencies[int(len(latencies)*0.99)]*1000:>7.2f} ms   '
+        f'mean per {bucket_size} posts (ms): {" ".join(buckets)}'
+    )
+
+
+if __name__ == '__main__':
+    print(f'posts: {POSTS}   users at end: ~{POSTS//2}')
+
+    runs = [
+        ( 'reopen',        lambda path: ReopeningCore(path) ),
+        ( 'write-through', lambda path: ThreadNecroBotCore(path, flush_delay=0) ),
+        ( 'write-behind',  lambda path: ThreadNecroBotCore(path, flush_delay=1.0) ),
+        ( 'sqlite',        lambda path: ThreadNecroBotCoreSqlite(path) ),
+    ]
+
+    for name, make_core in runs:
+        shutil.rmtree(DB_DIR, ignore_errors=True)
+        bench(name, make_core(f'{DB_DIR}/{name}'))
+
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,115 @@
+"""
+Benchmarks the disk work ThreadNecroBot does per processed post with durable writes.
+
+Replays necro posts against `ThreadNecroBotCore` with `fsync` on and no flush delay, doing the
+database updates `ThreadNecroBot.process_data` does for a post. Counts the fsyncs and file
+replacements per post, and times each post, with every update written out on its own (how the
+bot used to work) against all of a post's updates made in one `transaction`. The SQLite backend
+is run with a transaction as well; SQLite syncs from C, so only its timings are comparable.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_necrobot_transaction.py
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import datetime
+import contextlib
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from bots.ThreadNecroBotCore import ThreadNecroBotCore, ThreadNecroBotCoreSqlite
+
+
+POSTS  = 300
+DB_DIR = tempfile.mkdtemp(prefix='bench_necrobot_transaction_')
+
+
+class Counter():
+
+    def __init__(self):
+        self.fsyncs   = 0
+        self.replaces = 0
+
+
+def replay_post(core: ThreadNecroBotCore, post_id: int, user_id: int, time_post: datetime.datetime):
+    prev_post_info = core.get_prev_post_info()
+    added_score    = random.uniform(0, 2000) if prev_post_info else 0
+
+    data = {
+        'time'        : str(time_post),
+        'user_id'     : user_id,
+        'user_name'   : f'user {user_id}',
+        'post_id'     : post_id,
+        'added_score' : added_score,
+    }
+
+    core.update_user_data(data)
+    core.update_log_data(dict(data))
+    core.update_top_score_data(dict(data))
+    core.update_metadata(data)
+
+
+def bench(name: str, core: ThreadNecroBotCore, use_transaction: bool, counter: Counter):
+    random.seed(0)
+
+    num_users  = 0
+    time_post  = datetime.datetime(2024, 8, 1)
+    latencies  = []
+
+    counter.fsyncs   = 0
+    counter.replaces = 0
+
+    for post_id in range(POSTS):
+        if num_users == 0 or random.random() < 0.5:
+            num_users += 1
+
+        user_id   = random.randint(1, num_users)
+        time_post = time_post + datetime.timedelta(minutes=random.uniform(1, 60))
+
+        time_start = time.perf_counter()
+        with core.transaction() if use_transaction else contextlib.nullcontext():
+            replay_post(core, post_id, user_id, time_post)
+        latencies.append(time.perf_counter() - time_start)
+
+    core.close_db()
+
+    latencies.sort()
+    print(
+        f'{name:<14} fsyncs/post {counter.fsyncs/POSTS:>5.2f}   file replaces/post {counter.replaces/POSTS:>5.2f}   '
+        f'p50 {latencies[len(latencies)//2]*1000:>7.2f} ms   p99 {latencies[int(len(latencies)*0.99)]*1000:>7.2f} ms'
+    )
+
+
+if __name__ == '__main__':
+    counter = Counter()
+
+    fsync   = os.fsync
+    replace = os.replace
+
+    def counting_fsync(fd: int):
+        counter.fsyncs += 1
+        fsync(fd)
+
+    def counting_replace(src: str, dst: str):
+        counter.replaces += 1
+        replace(src, dst)
+
+    os.fsync   = counting_fsync
+    os.replace = counting_replace
+
+    print(f'posts: {POSTS}')
+
+    runs = [
+        ( 'per update',  lambda path: ThreadNecroBotCore(path, flush_delay=0, fsync=True),  False ),
+        ( 'transaction', lambda path: ThreadNecroBotCore(path, flush_delay=0, fsync=True),  True  ),
+        ( 'sqlite',      lambda path: ThreadNecroBotCoreSqlite(path, fsync=True),           True  ),
+    ]
+
+    for name, make_core, use_transaction in runs:
+        bench(name, make_core(f'{DB_DIR}/{name}'), use_transaction, counter)
+
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,108 @@
+"""
+Benchmarks per-page parse time and peak memory of topic page parsing.
+
+Uses "src/tests/unit_tests/forum_test_page.htm" as the page. Each method parses the page and
+extracts the topic header and every post's fields.
+
+The peak memory of the lxml backend only counts Python objects; libxml2's own tree is
+allocated outside of what tracemalloc sees.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_parsing.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+from core.parser import Topic, LxmlTopic, extract_post
+
+
+RUNS = 20
+
+with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+    PAGE = f.read().decode('utf-8')
+
+
+def parse_find_all(html: str):
+    """
+    Extraction the way the parser used to do it: a separate `find_all` over the page or
+    post for every field.
+    """
+    root = BeautifulSoup(html, 'lxml')
+
+    header = root.find_all(class_='header-v4__row header-v4__row--bar')[0]
+    topic = (
+        header.find_all(class_='header-nav-v4__link')[-1].get('href'),
+        header.find_all(class_='header-nav-v4__item')[-1].text.strip(),
+        root.find_all(class_='forum-topic-title__title forum-topic-title__title--display')[0].text.strip(),
+        root.find_all(class_='forum-topic-floating-header__title-link')[0]['href'].strip(),
+        root.find_all(class_='js-forum__total-count')[0].text.strip(),
+    )
+
+    posts = []
+    for post_root in root.find_all(class_='js-forum-post'):
+        posts.append((
+            post_root.find_all(class_='js-post-url')[0]['href'],
+            post_root['data-post-position'],
+            post_root.find_all(class_='js-timeago')[0]['datetime'],
+            post_root.find_all(class_='forum-post-info__row forum-post-info__row--username js-usercard')[0].text.strip(),
+            post_root.find_all(class_='avatar avatar--forum')[0].get('href'),
+            post_root.find_all(class_='avatar avatar--forum')[0].get('style'),
+            str(post_root.find_all(class_='forum-post-content')[0]).strip(),
+            post_root.find_all(class_='forum-post-content')[0].text.strip(),
+        ))
+
+    return topic, posts
+
+
+def parse_indexed(html: str):
+    """
+    Extraction through `Topic`, which looks fields up from a class index built in one walk over the page.
+    """
+    return Topic(BeautifulSoup(html, 'lxml')).to_record()
+
+
+def parse_lxml(html: str):
+    """
+    Extraction through `LxmlTopic`, which looks fields up with compiled XPath selectors on an lxml tree.
+    """
+    return LxmlTopic(lxml.html.document_fromstring(html.encode('utf-8'))).to_record()
+
+
+def parse_targeted(html: str):
+    """
+    Extraction of only the last post on the page, its previous post and the topic header with
+    `extract_post`. The last post is the worst case, since parsing stops right after the target post.
+    """
+    post = extract_post(html.encode('utf-8'), 9191846)
+    return post.to_record(), post.prev_post.to_record(), post.topic.name, post.topic.subforum_id
+
+
+def bench(name: str, parse):
+    parse(PAGE)  # Warm up
+
+    time_start = time.perf_counter()
+    for _ in range(RUNS):
+        parse(PAGE)
+    time_per_page = (time.perf_counter() - time_start) / RUNS
+
+    tracemalloc.start()
+    parse(PAGE)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{name:<12} {time_per_page*1000:>8.2f} ms/page   {peak/1024/1024:>7.2f} MiB peak')
+
+
+if __name__ == '__main__':
+    print(f'page: {len(PAGE)/1024:.0f} KiB   runs: {RUNS}')
+    bench('find_all', parse_find_all)
+    bench('indexed',  parse_indexed)
+    bench('lxml',     parse_lxml)
+    bench('targeted', parse_targeted)
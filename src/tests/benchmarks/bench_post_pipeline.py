@@ -0,0 +1,144 @@
+"""
+Benchmarks the latency from a post being found to it being handed to the bots, for a burst of
+found posts, with pages parsed in the post handling thread and in parsing worker processes.
+
+Every post in the burst is on its own copy of "src/tests/unit_tests/forum_test_page.htm", so every
+page is parsed. Busy threads stand in for the probing and bot threads competing for the GIL.
+
+To be run from the repository root:
+    python src/tests/benchmarks/bench_post_pipeline.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import statistics
+
+sys.path.append(f'{os.getcwd()}{os.sep}src')
+
+from requests.models import Response
+
+
+BURST        = 40   # Number of posts found at once
+BUSY_THREADS = 2    # Threads competing for the GIL
+PROCESSES    = [ 0, 2, 4 ]
+
+POST_IDS = [ 9190565, 9190570, 9190767, 9191193, 9191447, 9191467, 9191475, 9191480, 9191620, 9191642, 9191846 ]
+
+with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+    PAGE = f.read()
+
+
+def new_page(post_id: int) -> Response:
+    page = Response()
+    page.status_code = 200
+    page.encoding    = 'utf-8'
+    page.url         = f'https://osu.ppy.sh/community/forums/posts/{post_id}'
+    page._content    = bytes(PAGE)
+    return page
+
+
+def busy(stop: threading.Event):
+    while not stop.is_set():
+        sum(i*i for i in range(1000))
+
+
+def setup():
+    """
+    Sets up the forum monitor. Not done on import, since parsing worker processes import this module.
+    """
+    global BotConfig, ForumMonitor, DB_DIR
+
+    from core.BotConfig import BotConfig
+
+    DB_DIR = tempfile.mkdtemp(prefix='bench_post_pipeline_')
+
+    BotConfig['Core'].update({
+        'is_dbg'          : True,
+        'bots_path'       : 'src/bots',
+        'db_path_dbg'     : DB_DIR,
+        'api_port'        : 0,
+        'latest_post_id'  : 0,
+        'rate_post_max'   : 5.0,
+        'rate_post_warn'  : 2.0,
+        'rate_post_min'   : 0.05,
+
+        # No bots are loaded, so nothing would be subscribed to
+        'prefilter_posts' : False,
+    })
+
+    from core.SessionMgrV2 import SessionMgrV2
+
+    # No osu!api access is needed
+    SessionMgrV2.login = lambda: None
+
+    from core.BotCore import BotCore
+    BotCore._BotCore__init_bots = lambda self: None
+
+    from core.ForumMonitor import ForumMonitor
+
+
+def run(processes: int) -> list[float]:
+    ForumMonitor._ForumMonitor__parse_processes = processes
+    loop = ForumMonitor._ForumMonitor__handle_posts_pool_loop if processes > 0 else ForumMonitor._ForumMonitor__handle_posts_loop
+
+    time_found   = []
+    time_handled = []
+    done = threading.Event()
+
+    def forum_driver(post):
+        time_handled.append(time.perf_counter())
+        if len(time_handled) == BURST:
+            done.set()
+
+    ForumMonitor.forum_driver = forum_driver
+
+    stop_loop = threading.Event()
+    thread = threading.Thread(target=loop, args=( stop_loop, threading.Event() ), daemon=True)
+    thread.start()
+
+    # Let the workers start before the burst
+    if processes > 0:
+        ForumMonitor._ForumMonitor__post_queue.put(( POST_IDS[0], new_page(POST_IDS[0]) ))
+        while len(time_handled) == 0:
+            time.sleep(0.01)
+        time_handled.clear()
+
+    stop_busy = threading.Event()
+    busy_threads = [ threading.Thread(target=busy, args=( stop_busy, ), daemon=True) for _ in range(BUSY_THREADS) ]
+    for busy_thread in busy_threads:
+        busy_thread.start()
+
+    posts = [ ( POST_IDS[i % len(POST_IDS)], new_page(POST_IDS[i % len(POST_IDS)]) ) for i in range(BURST) ]
+    for post in posts:
+        time_found.append(time.perf_counter())
+        ForumMonitor._ForumMonitor__post_queue.put(post)
+
+    if not done.wait(120):
+        raise TimeoutError(f'Only {len(time_handled)} of {BURST} posts were handled')
+
+    stop_busy.set()
+    stop_loop.set()
+    thread.join()
+    for busy_thread in busy_threads:
+        busy_thread.join()
+
+    return [ handled - found for found, handled in zip(time_found, time_handled) ]
+
+
+if __name__ == '__main__':
+    setup()
+
+    print(f'burst: {BURST} posts   busy threads: {BUSY_THREADS}   parser: {BotConfig["Core"].get("parser_backend", "bs4")}')
+    for processes in PROCESSES:
+        latencies = run(processes)
+        print(
+            f'processes {processes}:   '
+            f'mean {statistics.mean(latencies)*1000:>7.1f} ms   '
+            f'median {statistics.median(latencies)*1000:>7.1f} ms   '
+            f'max {max(latencies)*1000:>7.1f} ms'
+        )
+
+    shutil.rmtree(DB_DIR, ignore_errors=True)
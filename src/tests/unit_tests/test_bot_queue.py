@@ -0,0 +1,309 @@
+import os
+import dataclasses
+import queue
+import pickle
+import shutil
+import logging
+import threading
+import pytest
+
+from bs4 import BeautifulSoup
+
+from core.BotConfig import BotConfig
+from core.BotQueue import BotQueue
+from core.parser import Topic, Post, RecordTopic, RecordPost, ParserError
+from core.parser.records import TopicRecord
+
+
+
+class TestBotQueue:
+
+    __logger = logging.getLogger(__qualname__)
+
+    SPILL_PATH = 'db/test/queues/TestBot.spill'
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+        with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+            cls.posts: list[Post] = Topic(BeautifulSoup(f.read(), 'lxml')).posts
+
+
+    def setup_method(self, method):
+        shutil.rmtree(os.path.dirname(self.SPILL_PATH), ignore_errors=True)
+
+
+    def teardown_method(self, method):
+        shutil.rmtree(os.path.dirname(self.SPILL_PATH), ignore_errors=True)
+
+
+    def test_unbounded(self):
+        """
+        Tests that an unbounded queue keeps every post, in order
+        """
+        post_queue = BotQueue()
+
+        for post in self.posts:
+            post_queue.put(post)
+
+        assert post_queue.qsize() == len(self.posts)
+        assert [ post_queue.get(block=False) for _ in self.posts ] == self.posts
+        assert post_queue.empty()
+
+        with pytest.raises(queue.Empty):
+            post_queue.get(block=False)
+
+        with pytest.raises(queue.Empty):
+            post_queue.get(block=True, timeout=0.01)
+
+        stats = post_queue.get_stats()
+        assert stats['posts'] == len(self.posts) and stats['depth_max'] == len(self.posts)
+        assert stats['depth'] == 0 and stats['dropped'] == 0 and stats['spills'] == 0
+        assert stats['wait_avg'] is not None and stats['wait_max'] >= stats['wait_avg']
+
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            BotQueue(2, 'drop_newest')
+
+        with pytest.raises(ValueError):
+            BotQueue(2, BotQueue.POLICY_SPILL)
+
+
+    def test_drop_oldest(self):
+        """
+        Tests that a full queue with the 'drop_oldest' policy drops the oldest posts to make room
+        """
+        post_queue = BotQueue(3, BotQueue.POLICY_DROP_OLDEST)
+
+        for post in self.posts[:5]:
+            post_queue.put(post)
+
+        assert post_queue.qsize() == 3
+        assert [ post_queue.get(block=False) for _ in range(3) ] == self.posts[2:5]
+
+        stats = post_queue.get_stats()
+        assert stats['posts'] == 5 and stats['dropped'] == 2 and stats['depth_max'] == 3
+
+
+    def test_block(self):
+        """
+        Tests that a full queue with the 'block' policy holds up `put` until a post is taken
+        """
+        post_queue = BotQueue(2, BotQueue.POLICY_BLOCK)
+
+        post_queue.put(self.posts[0])
+        post_queue.put(self.posts[1])
+
+        thread = threading.Thread(target=post_queue.put, args=( self.posts[2], ), daemon=True)
+        thread.start()
+
+        thread.join(0.2)
+        assert thread.is_alive(), 'put should block while the queue is full'
+        assert post_queue.qsize() == 2
+
+        assert post_queue.get(block=False) == self.posts[0]
+        thread.join(1)
+        assert not thread.is_alive(), 'put should return once a post is taken'
+
+        assert [ post_queue.get(block=False) for _ in range(2) ] == self.posts[1:3]
+
+        stats = post_queue.get_stats()
+        assert stats['dropped'] == 0 and stats['depth_max'] == 2
+        assert stats['blocked_time'] >= 0.2
+
+
+    def test_block_closed(self):
+        """
+        Tests that closing a full queue with the 'block' policy wakes up a blocked `put`, and that
+        a closed queue drops the oldest post instead of blocking
+        """
+        post_queue = BotQueue(2, BotQueue.POLICY_BLOCK)
+
+        post_queue.put(self.posts[0])
+        post_queue.put(self.posts[1])
+
+        thread = threading.Thread(target=post_queue.put, args=( self.posts[2], ), daemon=True)
+        thread.start()
+
+        thread.join(0.2)
+        assert thread.is_alive(), 'put should block while the queue is full'
+
+        post_queue.close()
+        thread.join(1)
+        assert not thread.is_alive(), 'put should return once the queue is closed'
+
+        post_queue.put(self.posts[3])
+        assert [ post_queue.get(block=False) for _ in range(2) ] == self.posts[2:4]
+        assert post_queue.get_stats()['dropped'] == 2
+
+        # Blocks again once reopened
+        post_queue.open()
+        post_queue.put(self.posts[4])
+        post_queue.put(self.posts[5])
+
+        thread = threading.Thread(target=post_queue.put, args=( self.posts[6], ), daemon=True)
+        thread.start()
+
+        thread.join(0.2)
+        assert thread.is_alive(), 'put should block while the reopened queue is full'
+
+        post_queue.get(block=False)
+        thread.join(1)
+        assert not thread.is_alive(), 'put should return once a post is taken'
+
+
+    def test_bot_stopped(self):
+        """
+        Tests that a bot stopped while its 'block' queue is full does not hold up queuing posts for it
+        """
+        from bots.TestBot import TestBot
+
+        BotConfig['TestBot'] = { 'queue_size' : 1, 'queue_policy' : BotQueue.POLICY_BLOCK }
+        try:
+            bot = TestBot()
+            bot.enable()
+        finally:
+            del BotConfig['TestBot']
+
+        stalled = threading.Event()
+        bot.process_data = lambda post: stalled.wait(5)
+
+        # The first post is being processed, the second fills the queue
+        bot.event(self.posts[0])
+        bot.event(self.posts[1])
+
+        thread = threading.Thread(target=bot.event, args=( self.posts[2], ), daemon=True)
+        thread.start()
+
+        thread.join(0.2)
+        assert thread.is_alive(), 'Queuing should block while the bot is running and its queue is full'
+
+        threading.Thread(target=bot.stop, daemon=True).start()
+        thread.join(1)
+        assert not thread.is_alive(), 'Queuing should not block once the bot is stopped'
+
+        stalled.set()
+
+
+    def test_spill(self):
+        """
+        Tests that a full queue with the 'spill' policy writes posts to disk and reads them back in order,
+        as posts made from the topic records
+        """
+        post_queue = BotQueue(2, BotQueue.POLICY_SPILL, self.SPILL_PATH)
+
+        for post in self.posts[:5]:
+            post_queue.put(post)
+
+        stats = post_queue.get_stats()
+        assert stats['depth'] == 5 and stats['spilled'] == 3 and stats['spills'] == 3
+        assert os.path.getsize(self.SPILL_PATH) > 0
+
+        # Posts put while some are spilled are spilled too, to keep the order
+        assert post_queue.get(block=False) == self.posts[0]
+        post_queue.put(self.posts[5])
+        assert post_queue.get_stats()['spilled'] == 3
+
+        taken = [ post_queue.get(block=False) for _ in range(5) ]
+        assert [ post.id for post in taken ] == [ post.id for post in self.posts[1:6] ]
+
+        assert taken[0] is self.posts[1]
+        for post, orig in zip(taken[1:], self.posts[2:6]):
+            assert isinstance(post, RecordPost)
+            assert post.to_record() == orig.to_record()
+            assert post.topic.subforum_id == orig.topic.subforum_id
+
+        assert post_queue.empty()
+        assert os.path.getsize(self.SPILL_PATH) == 0, 'The spill file should be emptied once read back'
+
+        stats = post_queue.get_stats()
+        assert stats['posts'] == 6 and stats['spills'] == 4 and stats['dropped'] == 0 and stats['depth_max'] == 5
+
+
+    def test_spill_shared_topic(self):
+        """
+        Tests that posts from the same page spilled one after another share one copy of the topic record
+        """
+        post_queue = BotQueue(1, BotQueue.POLICY_SPILL, self.SPILL_PATH)
+
+        for post in self.posts[:5]:
+            post_queue.put(post)
+
+        entries = []
+        with open(self.SPILL_PATH, 'rb') as f:
+            while f.tell() < os.path.getsize(self.SPILL_PATH):
+                entries.append(pickle.load(f))
+
+        assert len([ entry for entry in entries if isinstance(entry, TopicRecord) ]) == 1
+        assert len(entries) == 5
+
+        taken = [ post_queue.get(block=False) for _ in range(5) ]
+        assert [ post.id for post in taken ] == [ post.id for post in self.posts[:5] ]
+        assert all(post.topic is taken[1].topic for post in taken[2:])
+
+
+    def test_spill_unreadable(self):
+        """
+        Tests that a post that cannot be spilled is kept in memory, and that a spilled post missing from its
+        topic record is dropped when read back
+        """
+        post_queue = BotQueue(1, BotQueue.POLICY_SPILL, self.SPILL_PATH)
+
+        # The record of its topic is missing the post
+        record = self.posts[0].topic.to_record()
+        topic  = RecordTopic(dataclasses.replace(record, posts=record.posts[:1]))
+        missing = RecordPost(topic, record.posts[3], 3)
+
+        post_queue.put(self.posts[0])
+        post_queue.put(missing)
+        post_queue.put(self.posts[4])
+        assert post_queue.get_stats()['spilled'] == 2
+
+        assert post_queue.get(block=False) == self.posts[0]
+        assert post_queue.get(block=False).id == self.posts[4].id
+        assert post_queue.get_stats()['dropped'] == 1
+        assert post_queue.empty()
+
+        # The topic of this one cannot be made into a record
+        with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as f:
+            unparsable = Topic(BeautifulSoup(f.read(), 'lxml')).posts[5]
+
+        def detach():
+            raise ParserError('Unable to parse')
+
+        unparsable.topic.detach = detach
+
+        post_queue.put(self.posts[0])
+        post_queue.put(unparsable)
+        assert post_queue.get_stats()['spilled'] == 0 and post_queue.qsize() == 2
+        assert [ post_queue.get(block=False) for _ in range(2) ] == [ self.posts[0], unparsable ]
+
+
+    def test_bot_config(self):
+        """
+        Tests that a bot's queue is set up from its config section, falling back to the defaults in Core
+        """
+        from bots.TestBot import TestBot
+
+        BotConfig['Core'].update({
+            'is_dbg'      : True,
+            'db_path_dbg' : 'db/test',
+        })
+
+        BotConfig['TestBot'] = { 'queue_size' : 1, 'queue_policy' : BotQueue.POLICY_SPILL }
+        try:
+            bot = TestBot()
+            bot.stop()
+        finally:
+            del BotConfig['TestBot']
+
+        stats = bot.get_queue_stats()
+        assert ( stats['maxsize'], stats['policy'] ) == ( 1, BotQueue.POLICY_SPILL )
+
+        bot = TestBot()
+        bot.stop()
+
+        stats = bot.get_queue_stats()
+        assert ( stats['maxsize'], stats['policy'] ) == ( BotConfig['Core'].get('bot_queue_size', 0), BotConfig['Core'].get('bot_queue_policy', BotQueue.POLICY_BLOCK) )
@@ -94,3 +94,67 @@ class TestBotCore:
     def test_forum_driver(self):
         # Just make sure it does not crash
         self.core.forum_driver(TestBotCore.__get_post())
+
+
+    def test_forum_driver_routes(self, monkeypatch):
+        """
+        Tests that posts are only handed to the bots subscribed to their subforum and topic
+        """
+        post   = TestBotCore.__get_post()
+        called = []
+
+        for bot in self.core.get_bot(None):
+            monkeypatch.setattr(bot, 'event', lambda post, bot=bot: called.append(bot.name))
+
+        # The test page is a topic in Off-Topic
+        self.core.forum_driver(post)
+        assert 'OTBot' in called and 'OTFeedBot' in called and 'TestBot' in called
+        assert 'ThreadNecroBot' not in called
+
+        test_bot = self.core.get_bot('TestBot')
+        monkeypatch.setattr(test_bot, 'topic_ids', frozenset({ post.topic.id }), raising=False)
+        self.core.update_routes()
+
+        called.clear()
+        self.core.forum_driver(post)
+        assert called.count('TestBot') == 1
+
+        monkeypatch.setattr(test_bot, 'topic_ids', frozenset({ post.topic.id + 1 }), raising=False)
+        self.core.update_routes()
+
+        called.clear()
+        self.core.forum_driver(post)
+        assert 'TestBot' not in called and 'OTBot' in called
+
+
+    def test_subscriptions(self):
+        """
+        Tests that bots ignore posts outside their subscriptions even when given them directly
+        """
+        post = TestBotCore.__get_post()
+        bot  = self.core.get_bot('TestBot')
+
+        assert bot.is_subscribed(post)
+
+        bot.user_ids = frozenset({ int(post.creator.id) })
+        assert bot.is_subscribed(post)
+
+        bot.user_ids = frozenset({ int(post.creator.id) + 1 })
+        assert not bot.is_subscribed(post)
+
+        bot.user_ids     = None
+        bot.topic_ids    = frozenset({ post.topic.id })
+        bot.subforum_ids = frozenset({ post.topic.subforum_id + 1 })
+        assert not bot.is_subscribed(post)
+
+
+    def test_has_subscriber(self):
+        """
+        Tests that only enabled bots count as subscribers of a subforum and topic
+        """
+        assert self.core.has_subscriber(52, 1790280), 'OTBot subscribes to Off-Topic'
+        assert not self.core.has_subscriber(1, 1)
+
+        # Subscribes to everything, but starts disabled
+        self.core.get_bot('TestBot').enable()
+        assert self.core.has_subscriber(1, 1)
@@ -0,0 +1,129 @@
+import logging
+import threading
+import http.server
+
+from core.SessionMgrBase import SessionMgrBase
+from core.RateLimiter import RateLimiter
+
+
+BODY_SIZE = 256*1024
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves large pages standing in for osu!web responses
+    """
+
+    def do_GET(self):
+        port = self.server.server_address[1]
+
+        if self.path == '/ok':
+            self.send_page(200, b'<html>' + b'x'*BODY_SIZE + b'</html>')
+        elif self.path == '/missing':
+            self.send_page(404, b'<html><title>Page Missing</title>' + b'x'*BODY_SIZE + b'</html>')
+        elif self.path == '/error':
+            self.send_page(200, b'<html>' + b'x'*40000 + b'You shouldn&#039;t be here.' + b'x'*BODY_SIZE + b'</html>')
+        elif self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', f'http://localhost:{port}/ok')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_page(404, b'')
+
+
+    def send_page(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        try: self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading
+            pass
+
+
+    def log_message(self, format, *args):
+        pass
+
+
+
+class TestFetchStream:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        cls.url    = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+    def test_stream_ok(self):
+        """
+        Tests that a streamed page that is fine is read fully
+        """
+        session = SessionMgrBase()
+        page = session.fetch_web_data(f'{self.url}/ok', RateLimiter.PRIORITY_MONITOR, stream=True)
+
+        assert page.status_code == 200
+        assert len(page.content) == BODY_SIZE + len(b'<html></html>')
+        assert session.get_bytes_read(RateLimiter.PRIORITY_MONITOR) == len(page.content)
+
+
+    def test_stream_missing(self):
+        """
+        Tests that the body of a missing page is not read
+        """
+        session = SessionMgrBase()
+        page = session.fetch_web_data(f'{self.url}/missing', RateLimiter.PRIORITY_MONITOR, stream=True)
+
+        assert page.status_code == 404
+        assert page.content == b''
+        assert session.get_bytes_read() < BODY_SIZE
+
+
+    def test_stream_error_marker(self):
+        """
+        Tests that reading stops at the error page text and that the text is kept for the error checks
+        """
+        session = SessionMgrBase()
+        page = session.fetch_web_data(f'{self.url}/error', RateLimiter.PRIORITY_MONITOR, stream=True)
+
+        assert page.status_code == 200
+        assert page.text.find('You shouldn&#039;t be here.') != -1
+        assert len(page.content) < BODY_SIZE
+        assert session.get_bytes_read(RateLimiter.PRIORITY_MONITOR) < BODY_SIZE
+
+
+    def test_stream_redirect(self):
+        """
+        Tests that the body of a page redirected to another host is not read
+        """
+        session = SessionMgrBase()
+        page = session.fetch_web_data(f'{self.url}/redirect', RateLimiter.PRIORITY_MONITOR, stream=True)
+
+        assert page.url.startswith('http://localhost')
+        assert page.content == b''
+
+
+    def test_no_stream(self):
+        """
+        Tests that without streaming the whole body is read and counted under the request's priority
+        """
+        session = SessionMgrBase()
+        page = session.fetch_web_data(f'{self.url}/missing', RateLimiter.PRIORITY_LOOKUP)
+
+        assert page.status_code == 404
+        assert len(page.content) > BODY_SIZE
+        assert session.get_bytes_read(RateLimiter.PRIORITY_LOOKUP) == len(page.content)
+        assert session.get_bytes_read(RateLimiter.PRIORITY_MONITOR) == 0
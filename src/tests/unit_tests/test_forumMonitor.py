@@ -4,13 +4,15 @@ import logging
 import time
 import requests
 import pytest
+import queue
 import threading
+import concurrent.futures
 
 from requests.models import Response
 
 from bs4 import BeautifulSoup
 
-from core.parser import Topic, Post
+from core.parser import Topic, Post, RecordPost
 from core.BotConfig import BotConfig
 
 from misc.threaded_obj import Threaded
@@ -33,6 +35,8 @@ BotConfig['Core'].update({
 #  so that they can capture the changed settings
 from core.ForumMonitor import ForumMonitor
 from core.SessionMgrV2 import SessionMgrV2
+from core.UnresolvedPosts import UnresolvedPosts
+from core.PostArrivalPredictor import PostArrivalPredictor
 
 
 
@@ -118,8 +122,20 @@ class TestForumMonitor:
         return ForumMonitor._ForumMonitor__check_posts(check_post_ids, timeout)
 
 
-    def check_posts_proc(self, timeout: float) -> tuple[int, requests.Response | None]:
-        return ForumMonitor._ForumMonitor__check_posts_proc(recheck = False, timeout = timeout)
+    def check_posts_proc(self, timeout: float, recheck: bool = False) -> tuple[int, requests.Response | None]:
+        """
+        Returns the first post found, or (-1, None) if none were found
+        """
+        found = ForumMonitor._ForumMonitor__check_posts_proc(recheck = recheck, timeout = timeout)
+        return found[0] if len(found) > 0 else ( -1, None )
+
+
+    def check_posts_proc_window(self, timeout: float) -> list[tuple[int, requests.Response]]:
+        return ForumMonitor._ForumMonitor__check_posts_proc_window(timeout = timeout)
+
+
+    def check_unresolved_proc(self, limit: int) -> list[tuple[int, requests.Response]]:
+        return ForumMonitor._ForumMonitor__check_unresolved_proc(limit = limit)
 
 
 
@@ -175,6 +191,24 @@ class TestForumMonitor:
         return page
 
 
+    @staticmethod
+    def fetch_ok_ids(ok_ids: set[int], limited_ids: set[int] = set()):
+        """
+        Makes a fetch function where post ids in `ok_ids` are ok, post ids in `limited_ids` are
+        too many requests, and the rest are not found
+        """
+        def fetch(post_id: int | str) -> requests.Response:
+            if int(post_id) in ok_ids:
+                return TestForumMonitor.fetch_ok(post_id)
+
+            if int(post_id) in limited_ids:
+                return TestForumMonitor.fetch_too_many_requests(post_id)
+
+            return TestForumMonitor.fetch_not_found(post_id)
+
+        return fetch
+
+
     def test_initial_conditions(self):
         """
         On start,
@@ -467,3 +501,392 @@ class TestForumMonitor:
 
         # Should be 3 as post id #2 is latest one checked before forum monitor restarted
         assert self.check_post_ids[0] == 3, f'Unexpected post id to check for | check_post_ids = {self.check_post_ids}'
+
+
+    def test_window_found_in_order(self):
+        """
+        With a check window, post ids are fetched concurrently
+        - All ok posts in the window are returned in ascending post id order
+        - The latest post is set to the highest ok post id and the next id is checked next
+        """
+        ForumMonitor._ForumMonitor__check_window = 4
+        ForumMonitor._ForumMonitor__check_rate   = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 1, 3, 4 })
+
+        found = self.check_posts_proc_window(5)
+        post_ids = [ post_id for post_id, page in found ]
+
+        assert post_ids == [ 1, 3, 4 ], f'Unexpected post ids returned | post_ids = {post_ids}'
+        assert self.latest_post == 4, f'Unexpected latest post | latest_post = {self.latest_post}'
+        assert self.check_post_ids == [ 5 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+
+
+    def test_window_not_found(self):
+        """
+        With a check window, when all posts 404
+        - Nothing is returned and the next post id is added to the list, same as without a window
+        """
+        ForumMonitor._ForumMonitor__check_window = 4
+        ForumMonitor._ForumMonitor__check_rate   = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_not_found
+
+        found = self.check_posts_proc_window(5)
+
+        assert found == [], f'Unexpected posts returned | found = {found}'
+        assert self.check_post_ids == [ 1, 2 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+
+
+    def test_window_too_many_requests(self):
+        """
+        With a check window, when a post in the middle of the window gets too many requests
+        - Posts after it are not returned even if ok so that no post id is skipped
+        - The check rate is increased
+        """
+        ForumMonitor._ForumMonitor__check_window = 4
+        ForumMonitor._ForumMonitor__check_rate   = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 1, 3, 4 }, { 2 })
+
+        found = self.check_posts_proc_window(5)
+        post_ids = [ post_id for post_id, page in found ]
+
+        assert post_ids == [ 1 ], f'Unexpected post ids returned | post_ids = {post_ids}'
+        assert self.latest_post == 1, f'Unexpected latest post | latest_post = {self.latest_post}'
+        assert self.check_post_ids == [ 2 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+        assert self.check_rate > 0.1, f'Unexpected check rate | check_rate = {self.check_rate}'
+
+
+    def test_window_slow_rate(self):
+        """
+        With a check window whose requests take longer than the timeout to all start at the post rate
+        - The run waits for the request starts instead of timing out, and all ok posts are returned
+        """
+        ForumMonitor._ForumMonitor__check_window    = 5
+        ForumMonitor._ForumMonitor__check_rate      = Threaded(0.3)
+        ForumMonitor._ForumMonitor__rate_next_start = 0.0
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 1, 2, 3, 4, 5 })
+
+        found = self.check_posts_proc_window(0.1)
+        post_ids = [ post_id for post_id, page in found ]
+
+        assert post_ids == [ 1, 2, 3, 4, 5 ], f'Unexpected post ids returned | post_ids = {post_ids}'
+        assert self.check_post_ids == [ 6 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+
+
+    def test_window_unfinished(self):
+        """
+        With a check window, when a request does not finish in time
+        - The ok posts before it are returned and it is checked again on the next run
+        """
+        fetch_ok_ids = TestForumMonitor.fetch_ok_ids({ 1, 2, 4 })
+
+        def fetch(post_id: int | str) -> requests.Response:
+            if int(post_id) == 3:
+                time.sleep(2)
+            return fetch_ok_ids(post_id)
+
+        ForumMonitor._ForumMonitor__check_window    = 4
+        ForumMonitor._ForumMonitor__check_rate      = Threaded(0.1)
+        ForumMonitor._ForumMonitor__rate_next_start = 0.0
+        ForumMonitor.fetch_post = fetch
+
+        found = self.check_posts_proc_window(0.2)
+        post_ids = [ post_id for post_id, page in found ]
+
+        assert post_ids == [ 1, 2 ], f'Unexpected post ids returned | post_ids = {post_ids}'
+        assert self.latest_post == 2, f'Unexpected latest post | latest_post = {self.latest_post}'
+        assert self.check_post_ids == [ 3 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+
+        # Let the request finish so it does not hold up the next test
+        time.sleep(2)
+
+
+    def test_unresolved_tracked(self):
+        """
+        When a post is found after some that were not available
+        - The skipped post ids are tracked as unresolved instead of being rechecked right away
+        - The unresolved post ids are recovered from Db when the forum monitor is restarted
+        """
+        ForumMonitor._ForumMonitor__check_rate = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 1, 4 })
+
+        post_id, page = self.check_posts_proc(5, recheck = True)
+        assert post_id == 1, f'Unexpected post id returned | post_id = {post_id}'
+
+        for i in range(2):
+            post_id, page = self.check_posts_proc(5, recheck = True)
+            assert post_id == -1, f'Unexpected post id returned | post_id = {post_id}'
+
+        post_id, page = self.check_posts_proc(5, recheck = True)
+        assert post_id == 4, f'Unexpected post id returned | post_id = {post_id}'
+        assert self.latest_post == 4, f'Unexpected latest post | latest_post = {self.latest_post}'
+
+        unresolved = ForumMonitor.get_unresolved_posts()
+        assert len(unresolved) == 2 and 2 in unresolved and 3 in unresolved, f'Unexpected unresolved posts | unresolved = {unresolved.to_list()}'
+
+        self.__logger.info(f'Creating new forum monitor...')
+        type(ForumMonitor)()
+
+        unresolved = ForumMonitor.get_unresolved_posts()
+        assert len(unresolved) == 2 and 2 in unresolved and 3 in unresolved, f'Unexpected unresolved posts | unresolved = {unresolved.to_list()}'
+
+
+    def test_unresolved_late_post(self):
+        """
+        When an unresolved post id shows up later
+        - It is returned so it is still delivered, and is no longer tracked
+        - Unresolved post ids that never show up are dropped after running out of retries
+        """
+        ForumMonitor._ForumMonitor__check_rate = Threaded(0.1)
+        ForumMonitor._ForumMonitor__unresolved = UnresolvedPosts(max_ids=100, max_attempts=2, retry_delay=0)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 1, 4 })
+
+        post_id, page = self.check_posts_proc(5, recheck = True)
+        assert post_id == 1
+
+        ForumMonitor._ForumMonitor__check_post_ids.set([ 2, 3, 4 ])
+        post_id, page = self.check_posts_proc(5, recheck = True)
+        assert post_id == 4
+
+        # Post id #3 shows up late
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 1, 3, 4 })
+
+        found = self.check_unresolved_proc(10)
+        post_ids = [ post_id for post_id, page in found ]
+
+        unresolved = ForumMonitor.get_unresolved_posts()
+        assert post_ids == [ 3 ], f'Unexpected post ids returned | post_ids = {post_ids}'
+        assert 3 not in unresolved and 2 in unresolved, f'Unexpected unresolved posts | unresolved = {unresolved.to_list()}'
+
+        # Post id #2 never shows up
+        found = self.check_unresolved_proc(10)
+        assert found == [], f'Unexpected posts returned | found = {found}'
+        assert len(unresolved) == 0, f'Unexpected unresolved posts | unresolved = {unresolved.to_list()}'
+
+
+    def test_probe_stats(self):
+        """
+        Tests that post fetches are counted and that the wait after finding no new posts follows the expected time between posts
+        - No wait on top of the post rate until there is an estimate
+        - The wait is capped by `rate_post_idle_max`
+        """
+        ForumMonitor._ForumMonitor__check_rate = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 2 })
+
+        self.check_posts_proc(5)
+        self.check_posts_proc(5)
+
+        stats = ForumMonitor.get_probe_stats()
+        assert stats['probes'] == 3, f'Unexpected number of probes | stats = {stats}'
+        assert stats['idle_delay'] == 0, f'Unexpected idle delay | stats = {stats}'
+
+        time_now = time.time()
+        ForumMonitor._ForumMonitor__arrivals = PostArrivalPredictor(alpha=1.0, max_interval=3600)
+        ForumMonitor._ForumMonitor__arrivals.record(time_now - 10)
+        ForumMonitor._ForumMonitor__arrivals.record(time_now)
+
+        stats = ForumMonitor.get_probe_stats()
+        assert stats['predicted_interval'] == 10, f'Unexpected predicted interval | stats = {stats}'
+        assert abs(stats['idle_delay'] - (0.5*10 - 0.1)) < 0.01, f'Unexpected idle delay | stats = {stats}'
+
+        ForumMonitor._ForumMonitor__arrivals = PostArrivalPredictor(alpha=1.0, max_interval=3600)
+        ForumMonitor._ForumMonitor__arrivals.record(time_now - 1000)
+        ForumMonitor._ForumMonitor__arrivals.record(time_now)
+
+        stats = ForumMonitor.get_probe_stats()
+        assert abs(stats['idle_delay'] - (BotConfig['Core'].get('rate_post_idle_max', 30.0) - 0.1)) < 0.01, f'Unexpected idle delay | stats = {stats}'
+
+
+    @staticmethod
+    def fetch_batch_page(ok_ids: set[int], page_ids: list[int]):
+        """
+        Makes a fetch function where post ids in `ok_ids` are ok and show the posts in `page_ids`
+        on their page, and the rest are not found
+        """
+        def fetch(post_id: int | str) -> requests.Response:
+            if int(post_id) not in ok_ids:
+                return TestForumMonitor.fetch_not_found(post_id)
+
+            page = Response()
+            page.status_code = 200
+            page._content = ''.join(f'<div class="js-forum-post" data-post-id="{page_id}"></div>' for page_id in page_ids).encode()
+
+            return page
+
+        return fetch
+
+
+    def test_state_saved(self):
+        """
+        The post arrival estimates are kept in memory
+        - They are not written to db for every post found, only once `state_save_interval` passed
+        - They are written to db when forced, such as when the forum monitor stops
+        """
+        time_now = time.time()
+        ForumMonitor._ForumMonitor__arrivals.record(time_now - 10)
+        ForumMonitor._ForumMonitor__arrivals.record(time_now)
+
+        ForumMonitor._ForumMonitor__save_state()
+        assert ForumMonitor._ForumMonitor__retrieve_post_rate() == {}, 'Post rate should not be saved before the save interval'
+
+        ForumMonitor._ForumMonitor__save_state(force=True)
+        saved = ForumMonitor._ForumMonitor__retrieve_post_rate()
+        assert saved == ForumMonitor._ForumMonitor__arrivals.to_dict(), f'Unexpected saved post rate | saved = {saved}'
+
+
+    def test_unresolved_order(self):
+        """
+        When an unresolved post id shows up late in the same run as a new post
+        - The posts are queued for the bots in ascending post id order
+        - Checking unresolved post ids again does not save them to db right away
+        """
+        ForumMonitor._ForumMonitor__check_rate = Threaded(0.1)
+        ForumMonitor._ForumMonitor__unresolved = UnresolvedPosts(max_ids=100, max_attempts=2, retry_delay=0)
+        ForumMonitor._ForumMonitor__unresolved.add(3, 4, time.time())
+        ForumMonitor._ForumMonitor__check_post_ids.set([ 5 ])
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_ok_ids({ 3, 5 })
+
+        stop = threading.Event()
+        thread = threading.Thread(target=ForumMonitor._ForumMonitor__check_posts_loop, args=( stop, threading.Event() ), daemon=True)
+        thread.start()
+
+        post_queue: queue.Queue = ForumMonitor._ForumMonitor__post_queue
+        queued = []
+
+        time_end = time.time() + 5
+        while len(queued) < 2 and time.time() < time_end:
+            try: queued.append(post_queue.get(timeout=0.1)[0])
+            except queue.Empty:
+                pass
+
+        stop.set()
+        thread.join(5)
+
+        assert queued == [ 3, 5 ], f'Unexpected order of queued posts | queued = {queued}'
+        assert ForumMonitor._ForumMonitor__retrieve_unresolved_posts() == [], 'Unresolved post ids should not be saved before the save interval'
+
+
+    def test_batch_posts(self):
+        """
+        When the page of a found post also shows the posts right after it
+        - Those posts are returned with the same page without being fetched
+        - Only post ids that directly follow are taken; a gap stops the batch
+        - The latest post is set to the last post taken
+        """
+        ForumMonitor._ForumMonitor__check_rate = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_batch_page({ 1 }, [ 1, 2, 3, 5 ])
+
+        found = ForumMonitor._ForumMonitor__check_posts_proc(recheck = False, timeout = 5)
+        page  = found[0][1]
+
+        assert [ post_id for post_id, _ in found ] == [ 1, 2, 3 ], f'Unexpected post ids returned | found = {found}'
+        assert all(found_page is page for _, found_page in found), 'Batched posts should share the page'
+        assert self.latest_post == 3, f'Unexpected latest post | latest_post = {self.latest_post}'
+        assert self.check_post_ids == [ 4 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+        assert ForumMonitor.get_probe_stats()['probes'] == 1, 'Batched posts should not be fetched'
+
+
+    def test_batch_posts_window(self):
+        """
+        With a check window, posts following the last found post on its page are added to the found posts
+        """
+        ForumMonitor._ForumMonitor__check_window = 2
+        ForumMonitor._ForumMonitor__check_rate   = Threaded(0.1)
+        ForumMonitor.fetch_post = TestForumMonitor.fetch_batch_page({ 2 }, [ 2, 3, 4 ])
+
+        found = self.check_posts_proc_window(5)
+        post_ids = [ post_id for post_id, page in found ]
+
+        assert post_ids == [ 2, 3, 4 ], f'Unexpected post ids returned | post_ids = {post_ids}'
+        assert self.latest_post == 4, f'Unexpected latest post | latest_post = {self.latest_post}'
+        assert self.check_post_ids == [ 5 ], f'Unexpected post ids to be checked | check_post_ids = {self.check_post_ids}'
+        assert 1 in ForumMonitor.get_unresolved_posts(), 'Skipped post id should be tracked'
+
+
+    def handle_posts(self, posts: list[tuple[int, requests.Response]], timeout: float = 5, pool: bool = False, num_handled: int | None = None) -> dict:
+        """
+        Runs the post handling loop until `num_handled` posts (all of them by default) are parsed or skipped, and returns the probe stats
+        """
+        loop = ForumMonitor._ForumMonitor__handle_posts_pool_loop if pool else ForumMonitor._ForumMonitor__handle_posts_loop
+
+        stop = threading.Event()
+        thread = threading.Thread(target=loop, args=( stop, threading.Event() ), daemon=True)
+        thread.start()
+
+        for post in posts:
+            ForumMonitor._ForumMonitor__post_queue.put(post)
+
+        time_end = time.time() + timeout
+        while time.time() < time_end:
+            stats = ForumMonitor.get_probe_stats()
+            if stats['parsed'] + stats['parses_skipped'] >= ( len(posts) if num_handled is None else num_handled ):
+                break
+
+            time.sleep(0.01)
+
+        stop.set()
+        thread.join()
+        return ForumMonitor.get_probe_stats()
+
+
+    def test_prefilter_posts(self, monkeypatch):
+        """
+        Pages of topics no bot subscribes to are dropped before they are parsed
+        - Posts sharing a dropped page are dropped without reading the page again
+        - Pages the subforum and topic ids can't be read from are parsed as usual
+        - Pages of subscribed topics are parsed and handed to the bots
+        """
+        handled = []
+        monkeypatch.setattr(ForumMonitor, 'forum_driver', lambda post: handled.append(post))
+
+        # No bots are loaded, so nothing subscribes to the test page
+        page = TestForumMonitor.fetch_ok(1)
+        stats = self.handle_posts([ ( 1, page ), ( 2, page ) ])
+        assert stats['parses_skipped'] == 2 and stats['parsed'] == 0, f'Unexpected stats | stats = {stats}'
+        assert handled == []
+
+        stats = self.handle_posts([ ( 3, TestForumMonitor.fetch_batch_page({ 3 }, [ 3 ])(3) ) ])
+        assert stats['parsed'] == 1, f'Unexpected stats | stats = {stats}'
+        assert len(handled) == 1
+
+        subscribed = []
+        monkeypatch.setattr(ForumMonitor, 'has_subscriber', lambda subforum_id, topic_id: subscribed.append(( subforum_id, topic_id )) or True)
+
+        stats = self.handle_posts([ ( 4, TestForumMonitor.fetch_ok(4) ) ])
+        assert stats['parsed'] == 2 and stats['parses_skipped'] == 2, f'Unexpected stats | stats = {stats}'
+        assert subscribed == [ ( 52, 1790280 ) ]
+        assert len(handled) == 2
+
+
+    def test_parse_processes(self, monkeypatch):
+        """
+        With parsing worker processes,
+        - Posts are handed to the bots in the order they were found, as the posts read back from the workers
+        - Posts sharing a page are read from one parse of it
+        - A post missing from its page does not hold up the posts after it
+        """
+        handled = []
+        monkeypatch.setattr(ForumMonitor, 'forum_driver', lambda post: handled.append(post))
+        monkeypatch.setattr(ForumMonitor, 'has_subscriber', lambda subforum_id, topic_id: True)
+        ForumMonitor._ForumMonitor__parse_processes = 2
+
+        post_ids = [ 9190565, 9190570, 9190767, 9191193, 9191447, 9191467 ]
+        pages    = [ TestForumMonitor.fetch_ok(post_id) for post_id in post_ids[:4] ]
+
+        # Post id 1 is on no page, and the last two posts are on the same page as the one before them
+        posts  = [ ( post_id, page ) for post_id, page in zip(post_ids[:3], pages) ]
+        posts += [ ( 1, TestForumMonitor.fetch_ok(1) ) ]
+        posts += [ ( post_id, pages[3] ) for post_id in post_ids[3:] ]
+
+        submitted = []
+        pool_submit = concurrent.futures.ProcessPoolExecutor.submit
+        monkeypatch.setattr(concurrent.futures.ProcessPoolExecutor, 'submit', lambda pool, fn, *args: submitted.append(fn) or pool_submit(pool, fn, *args))
+
+        stats = self.handle_posts(posts, timeout=60, pool=True, num_handled=len(post_ids))
+        assert stats['parsed'] == len(post_ids), f'Unexpected stats | stats = {stats}'
+        assert len(submitted) == 5, 'Posts sharing a page should be parsed once'
+
+        assert [ post.id for post in handled ] == post_ids
+        assert all(isinstance(post, RecordPost) for post in handled)
+        assert handled[4].topic is handled[5].topic
+        assert handled[1].prev_post.id == post_ids[0]
+        assert handled[0].topic.subforum_id == 52 and handled[0].creator.name == '- Marco -'
@@ -0,0 +1,75 @@
+import random
+import logging
+
+from bots.ThreadNecroBotCore import Leaderboard
+
+
+
+class TestLeaderboard:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def test_ties(self):
+        """
+        Tests that users with equal points are ranked in the order they were first added
+        """
+        leaderboard = Leaderboard()
+        leaderboard.update(1, 10.0)
+        leaderboard.update(2, 20.0)
+        leaderboard.update(3, 10.0)
+        leaderboard.update(1, 10.0)
+
+        assert leaderboard.get_range() == [ ( 2, 20.0 ), ( 1, 10.0 ), ( 3, 10.0 ) ]
+        assert leaderboard.get_rank(3) == 3
+        assert leaderboard.get_rank(4) is None
+
+
+    def test_random(self, monkeypatch):
+        """
+        Tests ranks and ranges against sorting every user, with sublists small enough to be split and emptied often
+        """
+        monkeypatch.setattr(Leaderboard, '_Leaderboard__LOAD', 4)
+        random.seed(0)
+
+        leaderboard = Leaderboard()
+        points = {}
+        order  = []
+
+        for step in range(5000):
+            user_id = random.randint(1, 200)
+
+            if random.random() < 0.05 and user_id in points:
+                leaderboard.remove(user_id)
+                del points[user_id]
+                order.remove(user_id)
+                continue
+
+            leaderboard.update(user_id, float(random.randint(0, 50)))
+            if user_id not in points:
+                order.append(user_id)
+            points[user_id] = leaderboard.get_points(user_id)
+
+            if step % 50 != 0:
+                continue
+
+            ranked = sorted(order, key=lambda user_id: -points[user_id])
+            assert [ user_id for user_id, _ in leaderboard.get_range() ] == ranked
+
+            for rank, user_id in enumerate(ranked, 1):
+                assert leaderboard.get_rank(user_id) == rank
+
+            idx = random.randint(0, len(ranked))
+            num = random.randint(0, 30)
+            assert [ user_id for user_id, _ in leaderboard.get_range(idx, num) ] == ranked[idx : idx + num]
+
+        loaded = Leaderboard()
+        loaded.load(( user_id, points[user_id] ) for user_id in order)
+        assert loaded.get_range() == leaderboard.get_range()
+
+        leaderboard.clear()
+        assert len(leaderboard) == 0 and leaderboard.get_range() == []
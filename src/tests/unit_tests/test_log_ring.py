@@ -0,0 +1,179 @@
+import os
+import gzip
+import shutil
+import logging
+
+from bots.ThreadNecroBotCore import LogRing
+
+
+
+class TestLogRing:
+
+    __logger = logging.getLogger(__qualname__)
+
+    __DB_DIR = 'db/test_log_ring'
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def setup_method(self, method):
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+        os.makedirs(self.__DB_DIR, exist_ok=True)
+
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+
+
+    def open_log(self, capacity: int = LogRing.ARCHIVE_CHUNK) -> LogRing:
+        return LogRing(f'{self.__DB_DIR}/log.ring', f'{self.__DB_DIR}/log.archive.jsonl.gz', capacity=capacity)
+
+
+    def entry(self, i: int) -> dict:
+        return {
+            'time'          : f'2018-07-19 22:00:{i%60:02}',
+            'user_name'     : f'test user {i}',
+            'user_id'       : i,
+            'post_id'       : 10000 + i*10,
+            'added_score'   : float(i),
+            'score_alltime' : float(i*2),
+            'score_monthly' : float(i*3),
+        }
+
+
+    def test_range(self):
+        """
+        Tests that the last entries are read back newest first from any offset, and survive reopening
+        """
+        log = self.open_log()
+        for i in range(1, 21):
+            assert log.append(self.entry(i)) == i
+
+        assert [ entry.doc_id for entry in log.get_range() ] == list(range(20, 0, -1))
+        assert [ entry.doc_id for entry in log.get_range(5, 3) ] == [ 15, 14, 13 ]
+        assert log.get_range(19, 5)[0] == self.entry(1)
+        assert log.get_range(20, 5) == []
+        log.close()
+
+        log = self.open_log()
+        assert [ entry['post_id'] for entry in log.get_range(0, 2) ] == [ 10200, 10190 ]
+        log.close()
+
+
+    def test_monthly(self):
+        """
+        Tests that monthly reads stop at the first entry logged after the monthly reset
+        """
+        log = self.open_log()
+        for i in range(1, 11):
+            log.append(self.entry(i))
+
+        log.reset_monthly()
+        assert log.get_range(monthly=True) == []
+
+        log.append(self.entry(11))
+        log.append(self.entry(12))
+
+        assert [ entry.doc_id for entry in log.get_range(monthly=True) ] == [ 12, 11 ]
+        assert [ entry.doc_id for entry in log.get_range(1, 5, monthly=True) ] == [ 11 ]
+        assert log.get_num(monthly=True) == 2 and log.get_num(monthly=False) == 12
+        log.close()
+
+
+    def test_archive(self):
+        """
+        Tests that entries rolled out of a full ring are moved to the archive in order, without the log file growing
+        """
+        log  = self.open_log(2*LogRing.ARCHIVE_CHUNK)
+        size = os.path.getsize(f'{self.__DB_DIR}/log.ring')
+        num  = log.capacity*2 + 10
+
+        for i in range(1, num + 1):
+            log.append(self.entry(i))
+
+        assert os.path.getsize(f'{self.__DB_DIR}/log.ring') == size
+        assert len(log) == log.capacity
+
+        ring    = log.get_range()
+        archive = list(log.read_archive())
+
+        assert [ entry.doc_id for entry in ring ] == list(range(num, num - log.capacity, -1))
+
+        # Whole chunks are archived as soon as their first entry is overwritten
+        assert [ entry.doc_id for entry in archive ] == list(range(1, 3*LogRing.ARCHIVE_CHUNK + 1))
+        assert archive[-1] == self.entry(archive[-1].doc_id)
+        log.close()
+
+
+    def test_archive_repeated(self):
+        """
+        Tests that a chunk archived again after dying before the header was updated is read back once
+        """
+        log = self.open_log()
+        for i in range(1, log.capacity + 2):
+            log.append(self.entry(i))
+
+        log.close()
+
+        path = f'{self.__DB_DIR}/log.archive.jsonl.gz'
+        with open(path, 'rb') as f:
+            chunk = f.read()
+
+        with open(path, 'ab') as f:
+            f.write(chunk)
+
+        with gzip.open(path, 'rt') as f:
+            assert len(f.readlines()) == 2*LogRing.ARCHIVE_CHUNK
+
+        log = self.open_log()
+        assert [ entry.doc_id for entry in log.read_archive() ] == list(range(1, LogRing.ARCHIVE_CHUNK + 1))
+        log.close()
+
+
+    def test_staging(self):
+        """
+        Tests that staged appends are seen right away but only written out on commit, and that
+        pending appends can be written out again later
+        """
+        log = self.open_log()
+        log.append(self.entry(1))
+
+        log.begin()
+        log.append(self.entry(2))
+        log.reset_monthly()
+        log.append(self.entry(3))
+        assert [ entry.doc_id for entry in log.get_range() ] == [ 3, 2, 1 ]
+
+        log.rollback()
+        assert [ entry.doc_id for entry in log.get_range() ] == [ 1 ]
+        assert log.pending() is None
+
+        log.begin()
+        log.append(self.entry(2))
+        log.reset_monthly()
+        log.append(self.entry(3))
+        pending = log.pending()
+        log.rollback()
+
+        # Written out after the process died, e.g. from a journal, and repeated
+        log.apply(pending)
+        log.apply(pending)
+        log.close()
+
+        log = self.open_log()
+        assert [ entry.doc_id for entry in log.get_range() ] == [ 3, 2, 1 ]
+        assert [ entry.doc_id for entry in log.get_range(monthly=True) ] == [ 3 ]
+        log.close()
+
+
+    def test_truncated_text(self):
+        """
+        Tests that text longer than its field is cut without breaking a character
+        """
+        log = self.open_log()
+        log.append({ **self.entry(1), 'user_name' : 'ü'*30 })
+
+        assert log.get_range()[0]['user_name'] == 'ü'*20
+        log.close()
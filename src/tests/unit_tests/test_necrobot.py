@@ -1,15 +1,24 @@
 import pytest
 
 import os
+import sys
 import time
+import calendar
+import shutil
 import logging
 import datetime
 import random
 
+from dateutil.relativedelta import relativedelta
+
 from core.BotConfig import BotConfig
+from core.SessionMgrV2 import SessionMgrV2
+from core.PostEditor import PostEditor
 from api.Cmd import Cmd
 
 from bots.ThreadNecroBot import ThreadNecroBot
+from bots.ThreadNecroBotCore import ThreadNecroBotCore, ThreadNecroBotCoreSqlite
+from misc.write_behind_storage import WriteBehindStorage
 
 
 # Override botconfig settings
@@ -124,11 +133,17 @@ class TestNecroBot:
         time_start = time.time()
 
         db_files = [
-            self.bot._ThreadNecroBotCore__DB_FILE_LOGS,
-            self.bot._ThreadNecroBotCore__DB_FILE_WINNERS,
-            self.bot._ThreadNecroBotCore__DB_FILE_SCORES,
-            self.bot._ThreadNecroBotCore__DB_FILE_USERS,
-            self.bot._ThreadNecroBotCore__DB_FILE_META,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOGS,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_WINNERS,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_SCORES,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_USERS,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_META,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOG_RING,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_LOG_ARCHIVE,
+            ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_JOURNAL,
+            ThreadNecroBotCoreSqlite._ThreadNecroBotCoreSqlite__DB_FILE,
+            f'{ThreadNecroBotCoreSqlite._ThreadNecroBotCoreSqlite__DB_FILE}-wal',
+            f'{ThreadNecroBotCoreSqlite._ThreadNecroBotCoreSqlite__DB_FILE}-shm',
         ]
 
         for db_file in db_files:
@@ -145,11 +160,24 @@ class TestNecroBot:
                     break
 
 
+    def start_next_epoch(self):
+        """
+        Rolls the monthly data over to the month after the current epoch's
+        """
+        epoch = self.bot.core.get_epoch()
+
+        try: month = datetime.datetime.strptime(epoch['epoch'], self.bot.EPOCH_FORMAT) + relativedelta(months=1)
+        except (TypeError, ValueError):
+            month = datetime.datetime(2024, 1, 1)
+
+        self.bot.core.start_epoch(month.strftime(self.bot.EPOCH_FORMAT), calendar.timegm((month + relativedelta(months=1)).timetuple()))
+
+
     def test_update_user_data_all_time(self):
         """
         Tests the data in all_time being written to and from correctly
         """
-        user_points = self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME)
         assert user_points == 0, 'user_points is wrong'
 
         data_1 = {
@@ -158,23 +186,23 @@ class TestNecroBot:
             'post_id'     : 123456,
             'user_name'   : 'test user 1'
         }
-        self.bot.update_user_data(data_1)
+        self.bot.core.update_user_data(data_1)
 
         # Check the user - should have 1111 pts, ranking #1 all time
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Add another post from same user
-        self.bot.update_user_data(data_1)
+        self.bot.core.update_user_data(data_1)
 
         # Check the user - should have 2222 pts, ranking #1 all time
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 2222, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Now lets do another user
@@ -184,20 +212,20 @@ class TestNecroBot:
             'post_id'     : 123456,
             'user_name'   : 'test user 2'
         }
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_2)
 
         # Check the new user - should have 9999 pts, ranking #1 all time
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 9999, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_rank = self.bot.core.get_user_rank(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Check the old user - should have 2222 pts, ranking #2 all time
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 2222, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_rank == 2, 'user_rank is wrong'
 
 
@@ -205,7 +233,7 @@ class TestNecroBot:
         """
         Tests the data in monthly being written to and from correctly
         """
-        user_points = self.bot.get_user_points(1, self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(1, self.bot.DB_TYPE_MONTHLY)
         assert user_points == 0, 'user_points is wrong'
 
         data_1 = {
@@ -214,23 +242,23 @@ class TestNecroBot:
             'post_id'     : 123456,
             'user_name'   : 'test user 1'
         }
-        self.bot.update_user_data(data_1)
+        self.bot.core.update_user_data(data_1)
 
         # Check the user - should have 1111 pts, ranking #1 monthly
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Add another post from same user
-        self.bot.update_user_data(data_1)
+        self.bot.core.update_user_data(data_1)
 
         # Check the user - should have 2222 pts, ranking #1 monthly
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 2222, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Now lets do another user
@@ -240,20 +268,20 @@ class TestNecroBot:
             'post_id'     : 123456,
             'user_name'   : 'test user 2'
         }
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_2)
 
         # Check the new user - should have 9999 pts, ranking #1 monthly (overtaking other player)
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 9999, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_rank = self.bot.core.get_user_rank(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Check the old user - should have 2222 pts (unchanged), ranking #2 monthly (being overtaken by the other player)
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 2222, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_rank == 2, 'user_rank is wrong'
 
 
@@ -270,24 +298,24 @@ class TestNecroBot:
             'post_id'     : 123456,
             'user_name'   : 'test user 1'
         }
-        self.bot.update_user_data(data_1)
+        self.bot.core.update_user_data(data_1)
 
         # Check user - should have 1111 pts, and rank #1 monthly
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Check user - should have 1111 pts (got applied to all time), and rank #1 all time (got applied to all time)
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Check user - user id 2 all time should be empty
-        user_points = self.bot.get_user_points(2, self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(2, self.bot.DB_TYPE_ALLTIME)
         assert user_points == 0, 'user_points is wrong'
 
         # Ranking:
@@ -300,24 +328,24 @@ class TestNecroBot:
             'post_id'     : 123456,
             'user_name'   : 'test user 2'
         }
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_2)
 
         # Check new user - should have 9999 pts, and rank #1 all time (overtaking the other player)
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 9999, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_rank = self.bot.core.get_user_rank(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_rank == 1, 'user_rank is wrong'
 
         # Check old user - should have 2222 pts (unchanged), and rank #1 monthly (unchanged)
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_rank = self.bot.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_rank = self.bot.core.get_user_rank(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_rank == 2, 'user_rank is wrong'
 
         # Check user - user id 2 monthly should be filled in
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 9999, 'user_points is wrong'
 
 
@@ -343,58 +371,58 @@ class TestNecroBot:
             'user_name'   : 'test user 2'
         }
 
-        self.bot.update_user_data(data_1)
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_1)
+        self.bot.core.update_user_data(data_2)
 
         # Check user 1 - should have 1111 pts monthly and all time
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 1111, 'user_points is wrong'
 
         # Check user 2 - should have 9999 pts monthly and all time
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 9999, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 9999, 'user_points is wrong'
 
-        self.bot.reset_monthly_data()
+        self.start_next_epoch()
 
         # Check user 1 - should have 0 pts monthly and 1111 all time
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 0, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 1111, 'user_points is wrong'
 
         # Check user 2 - should have 0 pts monthly and 9999 all time
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 0, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 9999, 'user_points is wrong'
 
         # Expected Ranking:
         #   uid    all time   monthly
         #   1          2222     1111
         #   2         19998     9999
-        self.bot.update_user_data(data_1)
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_1)
+        self.bot.core.update_user_data(data_2)
 
         # Check user 1 - should have 1111 pts monthly and 2222 all time
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 2222, 'user_points is wrong'
 
         # Check user 2 - should have 9999 pts monthly and 19998 all time
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 9999, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 19998, 'user_points is wrong'
 
 
@@ -420,13 +448,13 @@ class TestNecroBot:
         }
 
         # There should be no recorded monthly winners at this point
-        monthly_winners = self.bot.get_monthly_winners_list()
+        monthly_winners = self.bot.core.get_monthly_winners_list()
         assert len(monthly_winners) == 0
 
-        self.bot.update_monthly_winners()
+        self.bot.core.update_monthly_winners()
 
         # The monthly ranked list is empty, so a "no winner" entry should have been recorded
-        monthly_winners = self.bot.get_monthly_winners_list()
+        monthly_winners = self.bot.core.get_monthly_winners_list()
         assert len(monthly_winners) == 1
 
         assert monthly_winners[0]['user_id']   == -1
@@ -434,34 +462,34 @@ class TestNecroBot:
         assert monthly_winners[0]['points']    == 0
 
         # Construct the ranked list
-        self.bot.update_user_data(data_1)
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_1)
+        self.bot.core.update_user_data(data_2)
 
-        self.bot.reset_monthly_data()
+        self.start_next_epoch()
 
-        self.bot.update_user_data(data_1)
-        self.bot.update_user_data(data_2)
+        self.bot.core.update_user_data(data_1)
+        self.bot.core.update_user_data(data_2)
 
         # Make sure the pts are what they should be
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 1111, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_1['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 2222, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
         assert user_points == 9999, 'user_points is wrong'
 
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_ALLTIME)
         assert user_points == 19998, 'user_points is wrong'
 
-        self.bot.update_monthly_winners()
+        self.bot.core.update_monthly_winners()
 
         # Check to make sure #1 from leaderboard is recorded
-        monthly_winners = self.bot.get_monthly_winners_list()
+        monthly_winners = self.bot.core.get_monthly_winners_list()
         assert len(monthly_winners) == 2, 'monthly_winners is wrong'
 
-        user_points = self.bot.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
+        user_points = self.bot.core.get_user_points(data_2['user_id'], self.bot.DB_TYPE_MONTHLY)
 
         # First entry should remain
         assert monthly_winners[0]['user_id']   == -1
@@ -474,15 +502,111 @@ class TestNecroBot:
         assert monthly_winners[1]['points']    == user_points
 
         # Make sure the list appends
-        self.bot.update_monthly_winners()
+        self.bot.core.update_monthly_winners()
 
-        monthly_winners = self.bot.get_monthly_winners_list()
+        monthly_winners = self.bot.core.get_monthly_winners_list()
         assert len(monthly_winners) == 3
         assert monthly_winners[2]['user_id']   == data_2['user_id']
         assert monthly_winners[2]['user_name'] == data_2['user_name']
         assert monthly_winners[2]['points']    == user_points
 
 
+    def test_monthly_epochs(self):
+        """
+        Tests that the month rolls over to a new epoch on the first post past the rollover time, and
+        that past months can still be ranked
+        """
+        data = {
+            'added_score' : 100,
+            'user_id'     : 1,
+            'post_id'     : 123456,
+            'user_name'   : 'test user 1'
+        }
+
+        self.bot.core.start_epoch('2024-08', calendar.timegm(datetime.datetime(2024, 9, 1).timetuple()))
+        self.bot.core.update_user_data(data)
+
+        with pytest.raises(ValueError):
+            self.bot.core.start_epoch('2024-8', 0)
+
+        # Still in August
+        self.bot.process_monthly_winner_event({ 'curr_post_time' : datetime.datetime(2024, 8, 31, 23, 59, 59) })
+        assert self.bot.core.get_epoch()['epoch'] == '2024-08'
+        assert len(self.bot.core.get_monthly_winners_list()) == 0
+
+        self.bot.process_monthly_winner_event({ 'curr_post_time' : datetime.datetime(2024, 9, 1) })
+
+        winners = self.bot.core.get_monthly_winners_list()
+        assert len(winners) == 1 and winners[0]['user_id'] == 1
+
+        # The new month starts when the winner was recorded
+        start_date = datetime.datetime.strptime(winners[0]['time'], '%Y-%m-%d')
+        epoch      = self.bot.core.get_epoch()
+        assert epoch['epoch'] == start_date.strftime(self.bot.EPOCH_FORMAT)
+        assert epoch['rollover_time'] == calendar.timegm((start_date + relativedelta(months=1)).timetuple())
+
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == 0
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == 100
+        assert self.bot.core.get_ranked_list(self.bot.DB_TYPE_MONTHLY) == []
+
+        # August is still there
+        self.bot.core.update_user_data({ **data, 'user_id' : 2, 'user_name' : 'test user 2', 'added_score' : 50 })
+        assert self.bot.core.get_epochs() == [ '2024-08', epoch['epoch'] ]
+
+        ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_MONTHLY, epoch='2024-08')
+        assert [ ( user.doc_id, user['points'] ) for user in ranked_list ] == [ ( 1, 100 ) ]
+
+        ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_MONTHLY)
+        assert [ ( user.doc_id, user['points'] ) for user in ranked_list ] == [ ( 2, 50 ) ]
+
+        bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
+
+        reply = bot_cmd.cmd_get_month_top['exec'](bot_cmd, '2024-08')
+        assert reply['status'] == 0
+        assert reply['msg'].strip('`').splitlines() == [ '#1 test user 1   100.0 pts' ]
+
+        reply = bot_cmd.cmd_get_month_top['exec'](bot_cmd, '2024-07')
+        assert reply['status'] == -1 and '2024-08' in reply['msg']
+
+
+    def test_legacy_epoch(self):
+        """
+        Tests that monthly points kept before epochs were can be looked up under the month they were kept for
+        """
+        data = {
+            'added_score' : 100,
+            'user_id'     : 1,
+            'post_id'     : 123456,
+            'user_name'   : 'test user 1'
+        }
+
+        self.bot.core.start_epoch(self.bot.EPOCH_LEGACY, calendar.timegm(datetime.datetime(2024, 9, 1).timetuple()))
+        self.bot.core.update_user_data(data)
+
+        assert self.bot.core.get_epochs() == [ self.bot.EPOCH_LEGACY ]
+        assert self.bot.get_recorded_months() == { '2024-08' : self.bot.EPOCH_LEGACY }
+
+        self.bot.process_monthly_winner_event({ 'curr_post_time' : datetime.datetime(2024, 9, 1) })
+        epoch = self.bot.core.get_epoch()['epoch']
+        assert epoch != self.bot.EPOCH_LEGACY
+
+        self.bot.core.update_user_data({ **data, 'user_id' : 2, 'user_name' : 'test user 2', 'added_score' : 50 })
+        assert self.bot.core.get_epochs() == [ self.bot.EPOCH_LEGACY, epoch ]
+
+        month_legacy = ( datetime.datetime.strptime(epoch, self.bot.EPOCH_FORMAT) - relativedelta(months=1) ).strftime(self.bot.EPOCH_FORMAT)
+        assert self.bot.get_recorded_months() == { month_legacy : self.bot.EPOCH_LEGACY, epoch : epoch }
+
+        bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
+
+        reply = bot_cmd.cmd_get_month_top['exec'](bot_cmd, month_legacy)
+        assert reply['status'] == 0
+        assert reply['msg'].strip('`').splitlines() == [ '#1 test user 1   100.0 pts' ]
+
+        reply = bot_cmd.cmd_get_month_top['exec'](bot_cmd, epoch)
+        assert reply['status'] == 0
+        assert reply['msg'].strip('`').splitlines() == [ '#1 test user 2   50.0 pts' ]
+
+
     def test_multi_post_detection(self):
         """
         Tests multi post detection
@@ -678,14 +802,14 @@ class TestNecroBot:
         assert added_score == 0, 'added_score is wrong'
 
         # Test deleted post - score starts with 100 -> added_score should be -|100/2| = -50
-        self.bot.update_user_data({
-            'added_score' : 100 - self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
+        self.bot.core.update_user_data({
+            'added_score' : 100 - self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
             'user_id'     : 1,
             'user_name'   : 'test user 1',
             'post_id'     : 123455
         })
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == 100, 'user score is wrong'
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == 100, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == 100, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == 100, 'user score is wrong'
 
         prev_post = {
             'prev_post_user_id' : 1,
@@ -706,14 +830,14 @@ class TestNecroBot:
         assert added_score == -50, 'added_score is wrong'
 
         # Test deleted post - score starts with -100 -> added_score should be -|-100/2| = -50
-        self.bot.update_user_data({
-            'added_score' : -100 - self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
+        self.bot.core.update_user_data({
+            'added_score' : -100 - self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
             'user_id'     : 1,
             'user_name'   : 'test user 1',
             'post_id'     : 123455
         })
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == -100, 'user score is wrong'
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == -100, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == -100, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == -100, 'user score is wrong'
 
         prev_post = {
             'prev_post_user_id' : 1,
@@ -734,14 +858,14 @@ class TestNecroBot:
         assert added_score == -50, 'added_score is wrong'
 
         # Test deleted post - score starts with -2000000000 -> added_score should be -1
-        self.bot.update_user_data({
-            'added_score' : -2000000000 - self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
+        self.bot.core.update_user_data({
+            'added_score' : -2000000000 - self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
             'user_id'     : 1,
             'user_name'   : 'test user 1',
             'post_id'     : 123455
         })
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == -2000000000, 'user score is wrong'
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == -2000000000, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == -2000000000, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == -2000000000, 'user score is wrong'
 
         prev_post = {
             'prev_post_user_id' : 1,
@@ -762,14 +886,14 @@ class TestNecroBot:
         assert added_score == -1, 'added_score is wrong'
 
         # Test deleted post - score starts with 2000000000 -> added_score should be -1000000000
-        self.bot.update_user_data({
-            'added_score' : 2000000000 - self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
+        self.bot.core.update_user_data({
+            'added_score' : 2000000000 - self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME),
             'user_id'     : 1,
             'user_name'   : 'test user 1',
             'post_id'     : 123455
         })
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == 2000000000, 'user score is wrong'
-        assert self.bot.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == 2000000000, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == 2000000000, 'user score is wrong'
+        assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_MONTHLY) == 2000000000, 'user score is wrong'
 
         prev_post = {
             'prev_post_user_id' : 1,
@@ -821,9 +945,9 @@ class TestNecroBot:
                 'post_id'     : 10000 + i*10,
                 'user_name'   : 'test user ' + str(i)
             }
-            self.bot.update_user_data(data)
+            self.bot.core.update_user_data(data)
 
-            ranked_list = self.bot.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
+            ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
 
             assert len(ranked_list) ==  i + 1, 'Ranked list does not have the expected number of entries'
             for i in range(len(ranked_list) - 1):
@@ -839,9 +963,9 @@ class TestNecroBot:
                 'post_id'     : 10000 + i*10,
                 'user_name'   : 'test user ' + str(i)
             }
-            self.bot.update_user_data(data)
+            self.bot.core.update_user_data(data)
 
-            ranked_list = self.bot.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
+            ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
             for i in range(len(ranked_list) - 1):
                 assert ranked_list[i]['points'] >= ranked_list[i + 1]['points'], f'#{i} pts are less than #{i + 1}'
 
@@ -855,17 +979,52 @@ class TestNecroBot:
                 'post_id'     : 10000 + i*10,
                 'user_name'   : 'test user ' + str(i)
             }
-            self.bot.update_user_data(data)
+            self.bot.core.update_user_data(data)
 
-            ranked_list = self.bot.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
+            ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
             for i in range(len(ranked_list) - 1):
                 assert ranked_list[i]['points'] >= ranked_list[i + 1]['points'], f'#{i} pts are less than #{i + 1}'
 
 
+    def test_ranked_range(self):
+        """
+        Tests that ranks and parts of the ranked list agree with the full ranked list
+        """
+        for i in range(100):
+            data = {
+                'added_score' : float(random.randint(0, 20)),
+                'user_id'     : i,
+                'post_id'     : 10000 + i*10,
+                'user_name'   : 'test user ' + str(i)
+            }
+            self.bot.core.update_user_data(data)
+
+        for db_type in [ self.bot.DB_TYPE_ALLTIME, self.bot.DB_TYPE_MONTHLY ]:
+            ranked_list = self.bot.core.get_ranked_list(db_type)
+            assert len(ranked_list) == 100, 'Ranked list does not have the expected number of entries'
+
+            for i, entry in enumerate(ranked_list):
+                assert self.bot.core.get_user_rank(entry.doc_id, db_type) == i + 1, f'Rank of user {entry.doc_id} does not match the ranked list'
+
+            for idx, num in [ ( 0, 10 ), ( 45, 11 ), ( 95, 10 ), ( 100, 5 ) ]:
+                assert self.bot.core.get_ranked_list(db_type, idx, num) == ranked_list[idx : idx + num]
+
+        bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
+        user    = self.bot.core.get_ranked_list(self.bot.DB_TYPE_ALLTIME, 49, 1)[0]
+
+        reply = bot_cmd.cmd_get_user_rank['exec'](bot_cmd, user['user_name'], False, '2')
+        lines = reply['msg'].strip('`').splitlines()
+        assert lines[0] == 'User is ranked 50'
+        assert [ line.split()[0] for line in lines[1:] ] == [ '#48', '#49', '#50', '#51', '#52' ]
+
+
     def test_top_scores_all_time(self):
         """
         Tests top scores list
         """
+        # Seeded, since the list is checked to be strictly descending and equal random scores would tie
+        rng = random.Random(7)
+
         # Add a bunch of random scores
         for i in range(11):
             new_score_data = {
@@ -873,11 +1032,11 @@ class TestNecroBot:
                 'user_id'     : str(i),
                 'user_name'   : f'test user {i}',
                 'post_id'     : str(10000 + i*10),
-                'added_score' : '%.3f'%(100*random.random()),
+                'added_score' : '%.3f'%(100*rng.random()),
             }
-            self.bot.update_top_score_data(new_score_data)
+            self.bot.core.update_top_score_data(new_score_data)
 
-            top_scores_list = self.bot.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
+            top_scores_list = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
             for i in range(1, len(top_scores_list)):
                 assert float(top_scores_list[i - 1]['added_score']) > float(top_scores_list[i]['added_score']), f'#{i - 1} place is less than #{i} place'
 
@@ -890,11 +1049,11 @@ class TestNecroBot:
                 'user_id'     : f'{i}',
                 'user_name'   : f'test user {i}',
                 'post_id'     : f'{10000 + i*10}',
-                'added_score' : f'{10*random.random():.3f}',
+                'added_score' : f'{10*rng.random():.3f}',
                 }
-            self.bot.update_top_score_data(new_score_data)
+            self.bot.core.update_top_score_data(new_score_data)
 
-            top_scores_list = self.bot.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
+            top_scores_list = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
             for i in range(len(top_scores_list) - 1):
                 assert float(top_scores_list[i]['added_score']) > float(top_scores_list[i + 1]['added_score']), f'#{i} pts are less than #{i + 1}'
 
@@ -907,23 +1066,139 @@ class TestNecroBot:
                 'user_id'     : str(i),
                 'user_name'   : f'test user {i}',
                 'post_id'     : str(10000 + i*10),
-                'added_score' : '%.3f'%(1000*random.random()),
+                'added_score' : '%.3f'%(1000*rng.random()),
                 }
-            self.bot.update_top_score_data(new_score_data)
+            self.bot.core.update_top_score_data(new_score_data)
 
-            top_scores_list = self.bot.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
+            top_scores_list = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
             for i in range(len(top_scores_list) - 1):
                 assert float(top_scores_list[i]['added_score']) > float(top_scores_list[i + 1]['added_score']), f'#{i} pts are less than #{i + 1}'
 
         assert len(top_scores_list) == 100, 'Top score list does not have the expected number of entries'
 
 
+    def test_top_scores_monthly(self):
+        """
+        Tests that new scores go into both the all time and monthly top scores, and that the
+        monthly ones are kept separately after the monthly reset
+        """
+        def add_score(i: int, added_score: float):
+            self.bot.core.update_top_score_data({
+                'time'        : str(datetime.datetime(2018, 7, 19, 22, i%60, 25)),
+                'user_id'     : i,
+                'user_name'   : f'test user {i}',
+                'post_id'     : 10000 + i*10,
+                'added_score' : added_score,
+            })
+
+        for i in range(5):
+            add_score(i, 10.0*(i + 1))
+
+        all_time = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
+        monthly  = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_MONTHLY)
+        assert [ entry['added_score'] for entry in all_time ] == [ 50.0, 40.0, 30.0, 20.0, 10.0 ]
+        assert monthly == all_time, 'Monthly top scores should get the same scores as all time'
+
+        # Fill all time so low scores stop making it, then start a new month
+        for i in range(5, 100):
+            add_score(i, 1000.0 + i)
+
+        self.start_next_epoch()
+        add_score(100, 5.0)
+
+        all_time = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_ALLTIME)
+        monthly  = self.bot.core.get_top_scores_list(self.bot.DB_TYPE_MONTHLY)
+        assert len(all_time) == 100 and all_time[-1]['added_score'] == 10.0, 'Score too low for all time should not have been added'
+        assert [ entry['added_score'] for entry in monthly ] == [ 5.0 ]
+
+
+    def test_transaction_rollback(self):
+        """
+        Tests that updates made in a transaction that fails are all dropped, and that ones made in a
+        transaction that succeeds are kept
+        """
+        score_data = {
+            'time'        : str(datetime.datetime(2018, 7, 19, 22, 0, 25)),
+            'user_id'     : 1,
+            'user_name'   : 'test user 1',
+            'post_id'     : 10000,
+            'added_score' : 10.0,
+        }
+
+        def update(data: dict):
+            self.bot.core.update_user_data(data)
+            self.bot.core.update_log_data(dict(data))
+            self.bot.core.update_top_score_data(data)
+            self.bot.core.update_metadata(data)
+
+        with self.bot.core.transaction():
+            update(score_data)
+
+        with pytest.raises(RuntimeError):
+            with self.bot.core.transaction():
+                update({ **score_data, 'post_id' : 10010, 'added_score' : 20.0 })
+                update({ **score_data, 'user_id' : 2, 'user_name' : 'test user 2', 'post_id' : 10020 })
+
+                assert self.bot.core.get_user_points(1, self.bot.DB_TYPE_ALLTIME) == 30.0, 'Updates should be seen inside the transaction'
+                raise RuntimeError
+
+        for db_type in [ self.bot.DB_TYPE_ALLTIME, self.bot.DB_TYPE_MONTHLY ]:
+            assert self.bot.core.get_user_points(1, db_type) == 10.0
+            assert self.bot.core.get_user_rank(2, db_type) is None
+            assert [ entry['added_score'] for entry in self.bot.core.get_top_scores_list(db_type) ] == [ 10.0 ]
+            assert [ entry['post_id'] for entry in self.bot.core.get_log_list(db_type) ] == [ 10000 ]
+
+        assert self.bot.core.get_prev_post_info()['prev_post_id'] == 10000
+
+        # Doc ids handed out in the dropped transaction are handed out again
+        with self.bot.core.transaction():
+            update({ **score_data, 'post_id' : 10030 })
+
+        log_list = self.bot.core.get_log_list(self.bot.DB_TYPE_ALLTIME)
+        assert [ ( entry.doc_id, entry['post_id'] ) for entry in log_list ] == [ ( 2, 10030 ), ( 1, 10000 ) ]
+
+
+    def test_transaction_journal(self):
+        """
+        Tests that a transaction journaled but not fully written out is finished when the databases are next opened
+        """
+        db_path = f'{BotConfig["Core"]["db_path_dbg"]}/journal'
+        shutil.rmtree(db_path, ignore_errors=True)
+
+        core = ThreadNecroBotCore(db_path, flush_delay=0)
+        core.update_metadata({ 'post_id' : 10000, 'time' : 't0', 'user_id' : 1, 'user_name' : 'test user 1' })
+
+        def die(storage: WriteBehindStorage):
+            if storage.dirty:
+                raise SystemExit
+
+        # Die after writing the journal, before any database is written
+        with pytest.MonkeyPatch.context() as monkeypatch, pytest.raises(SystemExit):
+            monkeypatch.setattr(WriteBehindStorage, 'flush', die)
+
+            with core.transaction():
+                core.update_user_data({ 'added_score' : 10.0, 'user_id' : 1, 'user_name' : 'test user 1', 'post_id' : 10010 })
+                core.update_metadata({ 'post_id' : 10010, 'time' : 't1', 'user_id' : 1, 'user_name' : 'test user 1' })
+
+            core._ThreadNecroBotCore__dbs.clear()
+
+        assert os.path.exists(f'{db_path}/{ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_JOURNAL}')
+
+        core = ThreadNecroBotCore(db_path, flush_delay=0)
+        assert not os.path.exists(f'{db_path}/{ThreadNecroBotCore._ThreadNecroBotCore__DB_FILE_JOURNAL}')
+        assert core.get_user_points(1, core.DB_TYPE_ALLTIME) == 10.0
+        assert core.get_prev_post_info()['prev_post_id'] == 10010
+
+        core.close_db()
+        shutil.rmtree(db_path, ignore_errors=True)
+
+
     def test_log_all_time(self):
         """
         Tests db logging
         """
         for i in range(20):
-            user_score_all_time = self.bot.get_user_points(i, self.bot.DB_TYPE_ALLTIME)
+            user_score_all_time = self.bot.core.get_user_points(i, self.bot.DB_TYPE_ALLTIME)
 
             log_data = {
                 'time'        : str(datetime.datetime(2018, 7, 19, 22, i, 25)),
@@ -933,16 +1208,118 @@ class TestNecroBot:
                 'added_score' : '%.3f'%(100*random.random()),
                 'total_score' : str(user_score_all_time)
             }
-            self.bot.update_log_data(log_data)
+            self.bot.core.update_log_data(log_data)
 
         for i in range(20):
-            log_list = self.bot.get_log_list(self.bot.DB_TYPE_ALLTIME, num = i)
+            log_list = self.bot.core.get_log_list(self.bot.DB_TYPE_ALLTIME, num = i)
             assert len(log_list) == i, f'Unexpected number of log entries: {len(log_list)} != {i}'
 
             for i in range(len(log_list) - 1):
                 assert int(log_list[i]['post_id']) > int(log_list[i + 1]['post_id']), 'Log list should be sorted from oldest to newest'
 
 
+    def test_log_monthly(self):
+        """
+        Tests that monthly logs start over on the monthly reset while all time logs go on, and that
+        the log command reads the all time log from the offset given
+        """
+        def log(i: int):
+            self.bot.core.update_log_data({
+                'time'        : str(datetime.datetime(2018, 7, 19, 22, i, 25)),
+                'user_name'   : f'test user {i}',
+                'user_id'     : i,
+                'post_id'     : 10000 + i*10,
+                'added_score' : float(i),
+            })
+
+        for i in range(5):
+            log(i)
+
+        self.start_next_epoch()
+        assert self.bot.core.get_log_list(self.bot.DB_TYPE_MONTHLY) == []
+
+        for i in range(5, 8):
+            log(i)
+
+        all_time = self.bot.core.get_log_list(self.bot.DB_TYPE_ALLTIME)
+        monthly  = self.bot.core.get_log_list(self.bot.DB_TYPE_MONTHLY)
+        assert [ entry['post_id'] for entry in all_time ] == [ 10000 + i*10 for i in range(7, -1, -1) ]
+        assert monthly == all_time[:3]
+        assert self.bot.core.get_log_list(self.bot.DB_TYPE_MONTHLY, 2, 5) == all_time[2:3]
+
+        bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
+        reply = bot_cmd.cmd_get_log['exec'](bot_cmd, '2', '3')
+        lines = reply['msg'].strip('`').splitlines()
+        assert [ line.split()[0] for line in lines ] == [ '3:', '4:' ]
+        assert 'test user 4' in lines[0]
+
+
+    def test_render_cache(self, monkeypatch):
+        """
+        Tests that writing the post only renders the sections whose data changed, and does not edit
+        the post when nothing changed
+        """
+        posts    = []
+        rendered = []
+
+        monkeypatch.setattr(SessionMgrV2, 'edit_post', lambda post_id, content, append: posts.append(content))
+
+        # Own editor, so edits written by other tests don't count as the post's current content
+        editor = type(PostEditor)(interval=60)
+        monkeypatch.setattr(sys.modules[ThreadNecroBot.__module__], 'PostEditor', editor)
+
+        for name in [ 'get_top_10_text', 'get_top_scores_text', 'get_forum_log_text' ]:
+            render = getattr(self.bot, name)
+            monkeypatch.setattr(self.bot, name, lambda db_type, name=name, render=render: rendered.append(( name, db_type )) or render(db_type))
+
+        data = {
+            'time'        : str(datetime.datetime(2018, 7, 19, 22, 0, 25)),
+            'user_id'     : 1,
+            'user_name'   : 'test user 1',
+            'post_id'     : 10000,
+            'added_score' : 50.0,
+        }
+
+        self.bot.write_post()
+        editor.flush()
+        assert len(posts) == 1 and len(rendered) == 6
+
+        rendered.clear()
+        self.bot.write_post()
+        editor.flush()
+        assert len(posts) == 1 and rendered == [], 'Nothing changed, so nothing should be rendered or posted'
+
+        # A score too low for the top scores only changes the top 10 and log
+        for i in range(100):
+            self.bot.core.update_top_score_data({ **data, 'post_id' : 20000 + i, 'added_score' : 100.0 })
+
+        self.bot.write_post()
+        editor.flush()
+        rendered.clear()
+
+        self.bot.core.update_user_data(data)
+        self.bot.core.update_log_data(dict(data))
+        self.bot.core.update_top_score_data(data)
+        self.bot.write_post()
+        editor.flush()
+
+        assert len(posts) == 3
+        assert sorted(rendered) == sorted([
+            ( 'get_top_10_text', self.bot.DB_TYPE_ALLTIME ), ( 'get_forum_log_text', self.bot.DB_TYPE_ALLTIME ),
+            ( 'get_top_10_text', self.bot.DB_TYPE_MONTHLY ), ( 'get_forum_log_text', self.bot.DB_TYPE_MONTHLY ),
+        ])
+        assert 'test user 1' in posts[-1]
+
+        # The monthly reset only changes monthly sections
+        rendered.clear()
+        self.start_next_epoch()
+        self.bot.write_post()
+
+        assert sorted(rendered) == sorted([
+            ( 'get_top_10_text', self.bot.DB_TYPE_MONTHLY ), ( 'get_top_scores_text', self.bot.DB_TYPE_MONTHLY ), ( 'get_forum_log_text', self.bot.DB_TYPE_MONTHLY ),
+        ])
+
+
     def test_50__cmd_add_user_points__user_points(self):
         """
         Tests player's points after doing the add_user_points command
@@ -955,28 +1332,28 @@ class TestNecroBot:
                 'post_id'     : 10000 + i*10,
                 'user_name'   : 'test user ' + str(i)
             }
-            self.bot.update_user_data(data)
-            self.bot.update_log_data(data)
+            self.bot.core.update_user_data(data)
+            self.bot.core.update_log_data(data)
 
         # Test positive point addition to user
-        test_user_50_pts_before = self.bot.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
+        test_user_50_pts_before = self.bot.core.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
 
         bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
         print(bot_cmd.cmd_add_user_points['exec'](bot_cmd, 'test user 50', '123.456'))
 
-        test_user_50_pts_after = self.bot.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
+        test_user_50_pts_after = self.bot.core.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
 
         # Make sure the correct number of points got added - should be a 123.456 difference
         diff = test_user_50_pts_after - test_user_50_pts_before
         assert round(diff, 3) == 123.456, 'Score after does not match expected'
 
         # Test negative point addition to user
-        test_user_50_pts_before = self.bot.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
+        test_user_50_pts_before = self.bot.core.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
 
         bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
         print(bot_cmd.cmd_add_user_points['exec'](bot_cmd, 'test user 50', '-123.456'))
 
-        test_user_50_pts_after = self.bot.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
+        test_user_50_pts_after = self.bot.core.get_user_points(50, self.bot.DB_TYPE_ALLTIME)
 
         # Make sure the correct number of points got added - should be a -123.456 difference
         diff = test_user_50_pts_after - test_user_50_pts_before
@@ -994,19 +1371,19 @@ class TestNecroBot:
                 'post_id'     : 10000 + i*10,
                 'user_name'   : 'test user ' + str(i)
             }
-            self.bot.update_user_data(data)
+            self.bot.core.update_user_data(data)
 
         bot_cmd = ThreadNecroBotTest.BotCmd(self.bot)
         print(bot_cmd.cmd_add_user_points['exec'](bot_cmd, 'test user 50', '1.23456'))
 
         # Make sure the ranked list is returned sorted correctly after invoking the add_user_points command
-        ranked_list = self.bot.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
+        ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_ALLTIME)
         for i in range(len(ranked_list) - 1):
             assert ranked_list[i]['points'] >= ranked_list[i + 1]['points'], f'#{i} pts are less than #{i + 1}'
 
         assert len(ranked_list) == 100, 'Ranked list does not have the expected number of entries'
 
-        ranked_list = self.bot.get_ranked_list(self.bot.DB_TYPE_MONTHLY)
+        ranked_list = self.bot.core.get_ranked_list(self.bot.DB_TYPE_MONTHLY)
         for i in range(len(ranked_list) - 1):
             assert ranked_list[i]['points'] >= ranked_list[i + 1]['points'], f'#{i} pts are less than #{i + 1}'
 
@@ -0,0 +1,101 @@
+import shutil
+import logging
+import datetime
+
+from core.parser.records import PostRecord
+
+from bots.ThreadNecroBotCore import ThreadNecroBotCore
+from bots.ThreadNecroBotCore.ThreadNecroReplay import ThreadNecroReplay
+
+
+
+class TestNecroReplay:
+
+    __logger = logging.getLogger(__qualname__)
+
+    __DB_DIR   = 'db/test_replay'
+    __PAGE     = 'src/tests/unit_tests/forum_test_page.htm'
+    __TOPIC_ID = 1790280
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def setup_method(self, method):
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+
+
+    @staticmethod
+    def new_post(post_id: int, post_num: int, user_id: int, date: datetime.datetime) -> PostRecord:
+        return PostRecord(
+            id=post_id, url='', post_num=post_num, date=date, creator_id=str(user_id), creator_name=f'user {user_id}',
+            creator_avatar='', creator_url='', contents_html='', contents_text=''
+        )
+
+
+    def test_parse_pages(self):
+        """
+        Tests that pages are parsed across processes, posts on more than one page are kept once, and pages of other topics are skipped
+        """
+        with open(self.__PAGE, 'rb') as f:
+            page = f.read()
+
+        posts = ThreadNecroReplay.parse_pages([ page, page ], self.__TOPIC_ID, 'bs4', processes=2)
+        assert [ post.post_num for post in posts ] == list(range(1, 12))
+        assert [ post.id for post in posts ] == sorted(post.id for post in posts)
+
+        posts = ThreadNecroReplay.parse_pages([ page ], self.__TOPIC_ID, 'bs4', processes=1, post_id_start=9191193, post_id_end=9191475)
+        assert [ post.id for post in posts ] == [ 9191193, 9191447, 9191467, 9191475 ]
+
+        assert ThreadNecroReplay.parse_pages([ page ], self.__TOPIC_ID + 1, 'bs4', processes=1) == []
+
+
+    def test_replay(self):
+        """
+        Tests that replaying posts scores them the same as the bot does live, and that the TinyDB and SQLite rebuilds match
+        """
+        time_post = datetime.datetime(2024, 8, 1, tzinfo=datetime.timezone.utc)
+        posts = []
+        for post_num in range(1, 61):
+            time_post += datetime.timedelta(hours=post_num % 7 + 1)
+            posts.append(self.new_post(1000 + post_num, post_num, post_num % 5 + 1, time_post))
+
+        rebuilt_tinydb = ThreadNecroReplay(f'{self.__DB_DIR}/tinydb', 'tinydb')
+        rebuilt_sqlite = ThreadNecroReplay(f'{self.__DB_DIR}/sqlite', 'sqlite')
+
+        try:
+            assert rebuilt_tinydb.replay(posts) == []
+            assert rebuilt_sqlite.replay(posts) == []
+
+            # Same as scoring the posts one by one
+            live = ThreadNecroReplay(f'{self.__DB_DIR}/live', 'tinydb')
+            live.main_post = posts[0]
+            for post in posts[1:]:
+                live.replay([ posts[post.post_num - 2], post ])
+
+            assert ThreadNecroReplay.diff(live.core, rebuilt_tinydb.core) == []
+            assert ThreadNecroReplay.diff(rebuilt_sqlite.core, rebuilt_tinydb.core) == []
+
+            assert len(rebuilt_tinydb.core.get_ranked_list(ThreadNecroBotCore.DB_TYPE_ALLTIME)) == 5
+            assert rebuilt_tinydb.core.get_prev_post_info()['prev_post_id'] == posts[-1].id
+
+            # Differences are listed, all time and monthly
+            live.core.update_user_data({ 'added_score' : 10.0, 'user_id' : 1, 'user_name' : 'user 1', 'post_id' : posts[-1].id })
+            lines = ThreadNecroReplay.diff(live.core, rebuilt_tinydb.core)
+            assert len(lines) == 2 and all('user 1 (1)' in line and '-10.000' in line for line in lines)
+
+            # Gaps in the posts are warned about
+            rebuilt_gap = ThreadNecroReplay(f'{self.__DB_DIR}/gap', 'tinydb')
+            warnings = rebuilt_gap.replay(posts[:10] + posts[11:20])
+            assert len(warnings) == 1 and '#10' in warnings[0] and '#12' in warnings[0]
+
+            live.core.close_db()
+            rebuilt_gap.core.close_db()
+        finally:
+            rebuilt_tinydb.core.close_db()
+            rebuilt_sqlite.core.close_db()
@@ -0,0 +1,104 @@
+import shutil
+import random
+import datetime
+
+from core.BotConfig import BotConfig
+
+from bots.ThreadNecroBotCore import ThreadNecroBotCore, ThreadNecroBotCoreSqlite
+
+from . import test_necrobot
+
+
+
+class TestNecroBotSqlite(test_necrobot.TestNecroBot):
+    """
+    Runs the ThreadNecroBot tests with the SQLite backend
+    """
+
+    __DB_DIR = 'db/test_equivalence'
+
+    def setup_method(self, method):
+        BotConfig['ThreadNecroBot']['db_backend'] = 'sqlite'
+        super().setup_method(method)
+
+
+    def teardown_method(self, method):
+        super().teardown_method(method)
+        BotConfig['ThreadNecroBot']['db_backend'] = 'tinydb'
+
+
+    def test_backend(self):
+        """
+        Tests that the bot uses the SQLite backend when configured to
+        """
+        assert isinstance(self.bot.core, ThreadNecroBotCoreSqlite)
+        assert not isinstance(self.bot.core, ThreadNecroBotCore)
+        assert type(self.bot) is test_necrobot.ThreadNecroBotTest
+        assert self.bot.name == 'ThreadNecroBotTest'
+
+
+    def test_equivalence(self):
+        """
+        Tests that the TinyDB and SQLite backends return the same data for the same sequence of updates
+        """
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+
+        cores = [
+            ThreadNecroBotCore(f'{self.__DB_DIR}/tinydb'),
+            ThreadNecroBotCoreSqlite(f'{self.__DB_DIR}/sqlite'),
+        ]
+
+        def read_all(core: ThreadNecroBotCore) -> list:
+            data = [ core.get_prev_post_info(), core.get_monthly_winners_list(), core.get_epoch(), core.get_epochs() ]
+            data += [ core.get_ranked_list(core.DB_TYPE_MONTHLY, epoch=epoch) for epoch in core.get_epochs() ]
+            for db_type in [ core.DB_TYPE_ALLTIME, core.DB_TYPE_MONTHLY ]:
+                data += [
+                    core.get_ranked_list(db_type),
+                    core.get_top_scores_list(db_type),
+                    core.get_log_list(db_type),
+                    core.get_log_list(db_type, 2, 5),
+                    [ core.get_user_rank(user_id, db_type) for user_id in range(1, 22) ],
+                    [ core.get_user_points(user_id, db_type) for user_id in range(1, 22) ],
+                ]
+
+            data.append([ core.get_user(f'user {user_id}') for user_id in range(1, 22) ])
+
+            # Documents compare equal as dicts, so compare the doc ids too
+            return [ data, repr([ getattr(doc, 'doc_id', None) for lst in data if isinstance(lst, list) for doc in lst ]) ]
+
+        try:
+            random.seed(0)
+            time_post = datetime.datetime(2024, 8, 1)
+
+            for post_id in range(300):
+                user_id   = random.randint(1, 20)
+                time_post = time_post + datetime.timedelta(minutes=random.uniform(1, 60))
+
+                # Round scores so some users end up tied
+                data = {
+                    'time'        : str(time_post),
+                    'user_id'     : user_id,
+                    'user_name'   : f'user {user_id}',
+                    'post_id'     : post_id,
+                    'added_score' : float(random.randint(-2, 20)*10),
+                }
+
+                for core in cores:
+                    core.update_user_data(dict(data))
+                    core.update_log_data(dict(data))
+                    core.update_top_score_data(dict(data))
+                    core.update_metadata(dict(data))
+
+                    if post_id % 100 == 99:
+                        core.update_monthly_winners()
+                        core.start_epoch(f'2024-{9 + post_id//100:02d}', post_id)
+
+                if post_id % 25 == 0:
+                    assert read_all(cores[0]) == read_all(cores[1]), f'Backends differ after post {post_id}'
+
+            assert read_all(cores[0]) == read_all(cores[1])
+        finally:
+            for core in cores:
+                core.close_db()
+
+            shutil.rmtree(self.__DB_DIR, ignore_errors=True)
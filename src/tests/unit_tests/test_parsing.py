@@ -3,10 +3,14 @@ import pytest
 import logging
 import time
 
+from core.BotConfig import BotConfig
 from core.SessionMgrV2 import SessionMgrV2
 from core.parser import Post, Topic
 
 
+BACKENDS = [ 'bs4', 'lxml' ]
+
+
 class TestParsing:
 
     __logger = logging.getLogger(__qualname__)
@@ -17,10 +21,13 @@ class TestParsing:
 
     @classmethod
     def teardown_class(cls):
-        ...
+        BotConfig['Core']['parser_backend'] = 'bs4'
 
 
-    def test_topic_parsing(self):
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_topic_parsing(self, backend: str):
+        BotConfig['Core']['parser_backend'] = backend
+
         self.__logger.info('Getting topic...')
         start = time.time()
         topic: Topic = SessionMgrV2.get_thread(76484)
@@ -81,7 +88,10 @@ class TestParsing:
         self.__logger.info(f'\t\tread_topic_post_count_test in {(time.time() - start)*1000:.3f}ms')
 
 
-    def test_post_parsing(self):
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_post_parsing(self, backend: str):
+        BotConfig['Core']['parser_backend'] = backend
+
         self.__logger.info('\tGetting post...')
         start = time.time()
         post: Post = SessionMgrV2.get_post(6737014)
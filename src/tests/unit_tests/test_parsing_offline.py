@@ -0,0 +1,332 @@
+import pytest
+
+import gc
+import dataclasses
+import logging
+import tracemalloc
+
+import lxml.html
+from bs4 import BeautifulSoup
+from requests.models import Response
+
+from core.BotConfig import BotConfig
+from core.BotException import BotException
+from core.SessionMgrV2 import SessionMgrV2
+from core.parser import Topic, Post, TopicBase, PostBase, LxmlTopic, RecordTopic, RecordPost, ParserError, extract_post, extract_topic_ids, parse_topic_record
+from core.parser.records import TopicRecord, PostRecord
+
+
+BACKENDS = [ 'bs4', 'lxml' ]
+
+
+class TestParsingOffline:
+    """
+    Parsing tests that use "src/tests/unit_tests/forum_test_page.htm" instead of fetching pages
+    from the live site.
+    """
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+        with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as test_forum_page:
+            cls.page = test_forum_page.read().decode('utf-8')
+
+
+    def get_topic(self, backend: str = 'bs4') -> TopicBase:
+        if backend == 'lxml':
+            return LxmlTopic(lxml.html.document_fromstring(self.page))
+
+        return Topic(BeautifulSoup(self.page, 'lxml'))
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_topic_parsing(self, backend: str):
+        topic = self.get_topic(backend)
+
+        assert topic.id            == 1790280
+        assert topic.url           == 'https://osu.ppy.sh/community/forums/topics/1790280'
+        assert topic.name          == 'Do NOT Click on this thread'
+        assert topic.subforum_id   == 52
+        assert topic.subforum_name == 'Off-Topic'
+        assert topic.post_count    == 11
+        assert len(topic.posts)    == 11
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_post_parsing(self, backend: str):
+        post = self.get_topic(backend).posts[1]
+
+        assert post.id              == 9190570
+        assert post.url             == 'https://osu.ppy.sh/community/forums/posts/9190570'
+        assert post.post_num        == 2
+        assert str(post.date)       == '2023-07-09 00:41:56+00:00'
+        assert post.contents_text   == 'american miku??'
+        assert post.creator.id      == '24722891'
+        assert post.creator.name    == 'sametdze'
+        assert post.creator.avatar  == 'https://a.ppy.sh/24722891?1688883378.jpeg'
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_post_prev(self, backend: str):
+        """
+        Tests that the previous post is the one before on the page, and that the first post on the page has none
+        """
+        topic = self.get_topic(backend)
+
+        assert topic.posts[0].prev_post is None
+        for i in range(1, len(topic.posts)):
+            assert topic.posts[i].prev_post.id == topic.posts[i - 1].id
+
+
+    def test_post_without_topic(self):
+        """
+        Tests that a post parsed on its own, without the page's class index, gives the same fields
+        """
+        topic = self.get_topic()
+        post  = Post(None, topic.post_roots[3])
+
+        assert post.to_record() == topic.posts[3].to_record()
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_records(self, backend: str):
+        """
+        Tests that records hold the same fields as the topic and posts they were extracted from and cannot be modified
+        """
+        topic  = self.get_topic(backend)
+        record = topic.to_record()
+
+        assert isinstance(record, TopicRecord)
+        assert record.id == topic.id and record.name == topic.name and record.post_count == topic.post_count
+        assert [ post.id for post in record.posts ] == [ post.id for post in topic.posts ]
+
+        post = record.posts[0]
+        assert isinstance(post, PostRecord)
+        assert post.creator_name == '- Marco -'
+        assert post.contents_text == topic.first_post.contents_text
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            post.id = 0
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_record_topic(self, backend: str):
+        """
+        Tests that a topic read back from a record gives the same fields, posts, and previous posts as the parsed page
+        """
+        topic  = self.get_topic(backend)
+        record = parse_topic_record(self.page.encode('utf-8'), backend)
+        assert record == topic.to_record()
+
+        record_topic = RecordTopic(record)
+        assert isinstance(record_topic, TopicBase) and not isinstance(record_topic, Topic)
+        assert not hasattr(record_topic, 'index') and not hasattr(record_topic, 'post_roots'), 'Only parsed pages have elements to look up'
+        assert record_topic.to_record() == record
+        assert ( record_topic.subforum_id, record_topic.subforum_name ) == ( topic.subforum_id, topic.subforum_name )
+
+        for post, record_post in zip(topic.posts, record_topic.posts, strict=True):
+            assert isinstance(record_post, PostBase) and not isinstance(record_post, Post)
+            assert not hasattr(record_post, 'body_root') and not hasattr(record_post, 'contents_root'), 'Only parsed pages have elements to look up'
+            assert record_post.topic is record_topic
+            assert record_post.to_record() == post.to_record()
+            assert record_post.creator.id == post.creator.id and record_post.creator.name == post.creator.name
+            assert record_post.content_markdown == post.content_markdown
+            assert ( record_post.prev_post and record_post.prev_post.id ) == ( post.prev_post and post.prev_post.id )
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_detach(self, backend: str):
+        """
+        Tests that detached posts give the same fields as the parsed page and share one copy of the topic
+        """
+        topic    = self.get_topic(backend)
+        detached = [ post.detach() for post in topic.posts ]
+
+        assert topic.detach() is detached[0].topic
+        for post, detached_post in zip(topic.posts, detached, strict=True):
+            assert isinstance(detached_post, RecordPost)
+            assert detached_post.detach() is detached_post
+            assert detached_post.to_record() == post.to_record()
+            assert detached_post.content_markdown == post.content_markdown
+            assert ( detached_post.prev_post and detached_post.prev_post.id ) == ( post.prev_post and post.prev_post.id )
+            assert ( detached_post.topic.id, detached_post.topic.name ) == ( topic.id, topic.name )
+
+
+    def test_detach_missing(self):
+        """
+        Tests that detaching a post missing from its topic's record raises a ParserError
+        """
+        topic  = self.get_topic()
+        record = topic.to_record()
+
+        # As if the record was made from the page without the post on it
+        topic._TopicBase__detached = RecordTopic(dataclasses.replace(record, posts=record.posts[:1]))
+
+        assert topic.posts[0].detach().id == topic.posts[0].id
+        with pytest.raises(ParserError):
+            topic.posts[3].detach()
+
+
+    def test_detach_memory(self):
+        """
+        Tests that detached posts do not keep the parsed page alive. Only done with the 'bs4' backend,
+        since lxml's trees are not allocated by Python and are not traced.
+        """
+        gc.collect()
+        tracemalloc.start()
+        try:
+            mem_start = tracemalloc.get_traced_memory()[0]
+
+            topic = self.get_topic('bs4')
+            posts = topic.posts
+            [ post.id for post in posts ]
+            mem_attached = tracemalloc.get_traced_memory()[0] - mem_start
+
+            detached = [ post.detach() for post in posts ]
+            del topic, posts
+            gc.collect()
+            mem_detached = tracemalloc.get_traced_memory()[0] - mem_start
+        finally:
+            tracemalloc.stop()
+
+        self.__logger.info(f'Attached: {mem_attached/1024:.1f} KiB   Detached: {mem_detached/1024:.1f} KiB for {len(detached)} posts')
+
+        assert mem_attached > 1024*1024, 'The parsed page is expected to take megabytes'
+        assert mem_detached / len(detached) < 8*1024, 'A detached post should retain a few kilobytes at most'
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_missing_fields(self, backend: str):
+        """
+        Tests that a page that is not a topic page fails to parse with a ParserError
+        """
+        html = '<html><body><p>Page Missing</p></body></html>'
+        if backend == 'lxml':
+            topic = LxmlTopic(lxml.html.document_fromstring(html))
+        else:
+            topic = Topic(BeautifulSoup(html, 'lxml'))
+
+        with pytest.raises(ParserError):
+            topic.first_post
+
+
+    def test_backend_equivalence(self):
+        """
+        Tests that the lxml backend gives the same fields as the BeautifulSoup backend for every post on the page.
+        The contents html is serialized differently by each, so the text and markdown made from it are compared instead.
+        """
+        topic_bs4  = self.get_topic('bs4')
+        topic_lxml = self.get_topic('lxml')
+
+        record_bs4  = dataclasses.replace(topic_bs4.to_record(),  posts=())
+        record_lxml = dataclasses.replace(topic_lxml.to_record(), posts=())
+        assert record_bs4 == record_lxml
+
+        assert len(topic_bs4.posts) == len(topic_lxml.posts)
+        for post_bs4, post_lxml in zip(topic_bs4.posts, topic_lxml.posts):
+            assert dataclasses.replace(post_bs4.to_record(), contents_html='') == dataclasses.replace(post_lxml.to_record(), contents_html=''), f'Post id {post_bs4.id} differs'
+            assert post_bs4.content_markdown == post_lxml.content_markdown, f'Post id {post_bs4.id} markdown differs'
+
+
+    def get_response(self, url: str = 'https://osu.ppy.sh/community/forums/topics/1790280') -> Response:
+        page = Response()
+        page.status_code = 200
+        page.encoding    = 'utf-8'
+        page.url         = url
+        page._content    = self.page.encode('utf-8')
+        return page
+
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_backend_config(self, backend: str):
+        """
+        Tests that the session manager parses pages with the backend set in BotConfig
+        """
+        page = self.get_response()
+
+        old_backend = BotConfig['Core'].get('parser_backend', 'bs4')
+        BotConfig['Core']['parser_backend'] = backend
+
+        try: topic = SessionMgrV2.parse_topic(page)
+        finally:
+            BotConfig['Core']['parser_backend'] = old_backend
+
+        assert isinstance(topic, LxmlTopic) == (backend == 'lxml')
+        assert hasattr(topic, 'index') == (backend == 'bs4'), 'Only the bs4 backend has a class index'
+        assert topic.first_post.id == 9190565
+
+
+    def test_extract_post(self):
+        """
+        Tests that every post extracted on its own gives the same fields and previous post as the fully parsed page
+        """
+        content = self.page.encode('utf-8')
+        topic   = self.get_topic('lxml')
+
+        for topic_post in topic.posts:
+            post = extract_post(content, topic_post.id, chunk_size=4096)
+
+            assert post.to_record() == topic_post.to_record()
+            assert post.topic.first_post.id == topic.first_post.id
+            if topic_post.prev_post is None:
+                assert post.prev_post is None
+            else:
+                assert post.prev_post.id == topic_post.prev_post.id
+
+
+    def test_extract_post_rest(self):
+        """
+        Tests that posts after the extracted one are parsed once the topic's posts are needed
+        """
+        content = self.page.encode('utf-8')
+        topic   = self.get_topic('lxml')
+
+        post = extract_post(content, topic.posts[2].id, chunk_size=4096)
+        assert len(post.topic.post_roots) < len(topic.posts)
+
+        assert [ p.id for p in post.topic.posts ] == [ p.id for p in topic.posts ]
+        assert post.topic.to_record() == topic.to_record()
+        assert SessionMgrV2.get_next_post(post).id == topic.posts[3].id
+
+
+    def test_extract_post_missing(self):
+        """
+        Tests that extracting a post that is not on the page fails with a ParserError
+        """
+        with pytest.raises(ParserError):
+            extract_post(self.page.encode('utf-8'), 1)
+
+
+    def test_extract_topic_ids(self):
+        """
+        Tests that the subforum and topic ids read from the page header match the parsed topic's
+        """
+        topic = self.get_topic()
+        assert extract_topic_ids(self.page.encode('utf-8')) == ( topic.subforum_id, topic.id )
+
+        # No posts, or no header
+        assert extract_topic_ids(self.page[:self.page.find('data-post-id=')].encode('utf-8')) is None
+        assert extract_topic_ids(b'<div class="js-forum-post" data-post-id="1"></div>') is None
+
+
+    def test_targeted_get_post(self):
+        """
+        Tests that the session manager extracts just the requested post when targeted post parsing is enabled
+        """
+        post_url = 'https://osu.ppy.sh/community/forums/posts/9190570'
+
+        BotConfig['Core']['targeted_post_parsing'] = True
+        try:
+            post = SessionMgrV2.get_post(9190570, page=self.get_response(post_url))
+
+            with pytest.raises(BotException):
+                SessionMgrV2.get_post(1, page=self.get_response('https://osu.ppy.sh/community/forums/posts/1'))
+        finally:
+            BotConfig['Core']['targeted_post_parsing'] = False
+
+        assert post.id == 9190570
+        assert post.prev_post.id == 9190565
+        assert post.creator.name == 'sametdze'
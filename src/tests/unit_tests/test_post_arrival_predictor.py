@@ -0,0 +1,93 @@
+import logging
+import calendar
+
+from core.PostArrivalPredictor import PostArrivalPredictor
+
+
+
+class TestPostArrivalPredictor:
+
+    # Monday 2024-01-01 00:00:00 UTC
+    __MONDAY = calendar.timegm(( 2024, 1, 1, 0, 0, 0 ))
+    __HOUR   = 60*60
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def test_no_data(self):
+        """
+        Tests that there is no prediction until there is an inter-arrival time to go by
+        """
+        predictor = PostArrivalPredictor(alpha=0.5, max_interval=3600)
+        assert predictor.predict(self.__MONDAY) is None
+
+        predictor.record(self.__MONDAY)
+        assert predictor.predict(self.__MONDAY) is None, 'First arrival has nothing to measure against'
+
+
+    def test_ewma(self):
+        """
+        Tests that the inter-arrival time is averaged with more weight on recent arrivals
+        """
+        predictor = PostArrivalPredictor(alpha=0.5, max_interval=3600)
+
+        predictor.record(self.__MONDAY)
+        predictor.record(self.__MONDAY + 10)
+        assert predictor.predict(self.__MONDAY) == 10
+
+        predictor.record(self.__MONDAY + 40)
+        assert predictor.predict(self.__MONDAY) == 20
+
+
+    def test_hour_of_week(self):
+        """
+        Tests that each hour of the week has its own estimate, with hours without data
+        falling back to the overall one
+        """
+        predictor = PostArrivalPredictor(alpha=1.0, max_interval=3600)
+
+        # Busy Monday 00:00
+        predictor.record(self.__MONDAY)
+        predictor.record(self.__MONDAY + 5)
+
+        # Quiet Monday 04:00
+        predictor.record(self.__MONDAY + 4*self.__HOUR - 600)
+        predictor.record(self.__MONDAY + 4*self.__HOUR)
+
+        assert predictor.predict(self.__MONDAY + 30)              == 5
+        assert predictor.predict(self.__MONDAY + 4*self.__HOUR)   == 600
+        assert predictor.predict(self.__MONDAY + 24*self.__HOUR)  == 600, 'Hour without data should use the overall estimate'
+
+
+    def test_batch_and_clamp(self):
+        """
+        Tests that several posts found at once split the time between them, and
+        that long gaps are clamped
+        """
+        predictor = PostArrivalPredictor(alpha=1.0, max_interval=100)
+
+        predictor.record(self.__MONDAY)
+        predictor.record(self.__MONDAY + 30, count=3)
+        assert predictor.predict(self.__MONDAY) == 10
+
+        predictor.record(self.__MONDAY + 10000)
+        assert predictor.predict(self.__MONDAY + 10000) == 100
+
+
+    def test_save_load(self):
+        """
+        Tests that estimates survive a round trip through the db format
+        """
+        predictor = PostArrivalPredictor(alpha=0.5, max_interval=3600)
+        predictor.record(self.__MONDAY)
+        predictor.record(self.__MONDAY + 10)
+
+        loaded = PostArrivalPredictor(alpha=0.5, max_interval=3600)
+        loaded.from_dict(predictor.to_dict())
+
+        assert loaded.to_dict() == predictor.to_dict()
+        assert loaded.predict(self.__MONDAY) == 10
@@ -0,0 +1,185 @@
+import time
+import logging
+import threading
+
+from core.PostEditor import PostEditor
+from core.SessionMgrV2 import SessionMgrV2
+
+
+
+class TestPostEditor:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    @staticmethod
+    def new_editor(interval: float) -> PostEditor:
+        return type(PostEditor)(interval=interval)
+
+
+    @staticmethod
+    def wait_for(condition, timeout: float = 2.0):
+        time_end = time.monotonic() + timeout
+        while not condition() and time.monotonic() < time_end:
+            time.sleep(0.005)
+
+
+    def test_coalesce(self, monkeypatch):
+        """
+        Tests that edits submitted while waiting out the interval are written as one edit with the latest content
+        """
+        edits = []
+        monkeypatch.setattr(SessionMgrV2, 'edit_post', lambda post_id, content, append: edits.append(( post_id, content )))
+
+        editor = self.new_editor(interval=0.3)
+
+        # The first edit of a post is not held back
+        editor.submit(1, 'a')
+        self.wait_for(lambda: len(edits) == 1)
+        assert edits == [ ( 1, 'a' ) ]
+
+        for content in [ 'b', 'c', 'd' ]:
+            editor.submit(1, content)
+
+        time.sleep(0.1)
+        assert len(edits) == 1, 'Edits should wait out the interval'
+
+        self.wait_for(lambda: len(edits) == 2)
+        assert edits == [ ( 1, 'a' ), ( 1, 'd' ) ]
+
+        stats = editor.get_stats()
+        assert stats['submitted'] == 4
+        assert stats['edits']     == 2
+        assert stats['coalesced'] == 2
+        assert stats['pending']   == 0
+
+
+    def test_unchanged(self, monkeypatch):
+        """
+        Tests that content the same as what was last written to the post is not written again
+        """
+        edits = []
+        monkeypatch.setattr(SessionMgrV2, 'edit_post', lambda post_id, content, append: edits.append(( post_id, content )))
+
+        editor = self.new_editor(interval=60)
+
+        editor.submit(1, 'a')
+        editor.flush()
+        assert edits == [ ( 1, 'a' ) ]
+
+        # Changed and changed back before it was written
+        editor.submit(1, 'b')
+        editor.submit(1, 'a')
+        editor.flush()
+        assert edits == [ ( 1, 'a' ) ]
+
+        stats = editor.get_stats()
+        assert stats['unchanged'] == 1
+        assert stats['coalesced'] == 1
+        assert stats['pending']   == 0
+
+
+    def test_unchanged_in_flight(self, monkeypatch):
+        """
+        Tests that content submitted while an edit is being written is compared against that edit's content,
+        not what was written before it
+        """
+        edits   = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def edit_post(post_id: int, content: str, append: bool):
+            if len(edits) > 0:
+                started.set()
+                release.wait(2)
+
+            edits.append(( post_id, content ))
+
+        monkeypatch.setattr(SessionMgrV2, 'edit_post', edit_post)
+
+        editor = self.new_editor(interval=60)
+
+        editor.submit(1, 'a')
+        editor.flush()
+
+        editor.submit(1, 'b', immediate=True)
+        assert started.wait(2), 'The edit should be in flight'
+
+        # Same as the edit in flight, then back to what was written before it
+        editor.submit(1, 'b')
+        assert editor.get_stats()['unchanged'] == 1
+        editor.submit(1, 'a')
+        assert editor.get_stats()['pending'] == 1, 'Content written before the edit in flight should not count as unchanged'
+
+        release.set()
+        editor.flush()
+        assert edits == [ ( 1, 'a' ), ( 1, 'b' ), ( 1, 'a' ) ]
+
+
+    def test_immediate(self, monkeypatch):
+        """
+        Tests that immediate edits don't wait out the interval, and that posts are held back separately
+        """
+        edits = []
+        monkeypatch.setattr(SessionMgrV2, 'edit_post', lambda post_id, content, append: edits.append(( post_id, content )))
+
+        editor = self.new_editor(interval=60)
+
+        editor.submit(1, 'a')
+        editor.submit(2, 'a')
+        self.wait_for(lambda: len(edits) == 2)
+
+        editor.submit(1, 'b')
+        editor.submit(2, 'b', immediate=True)
+        self.wait_for(lambda: len(edits) == 3)
+        time.sleep(0.05)
+
+        assert sorted(edits[:2]) == [ ( 1, 'a' ), ( 2, 'a' ) ]
+        assert edits[2:] == [ ( 2, 'b' ) ]
+        assert editor.get_stats()['pending'] == 1
+
+        editor.flush(1)
+        assert edits[3:] == [ ( 1, 'b' ) ]
+
+
+    def test_failed_edit(self, monkeypatch):
+        """
+        Tests that a failed edit is tried again, with newer content if some was submitted meanwhile
+        """
+        edits = []
+        fail  = threading.Event()
+        fail.set()
+
+        def edit_post(post_id: int, content: str, append: bool):
+            if fail.is_set():
+                raise Exception('Edit failed')
+
+            edits.append(( post_id, content ))
+
+        monkeypatch.setattr(SessionMgrV2, 'edit_post', edit_post)
+
+        editor = self.new_editor(interval=60)
+
+        # Left to the worker; flushing right away could have it tried twice, once by each
+        editor.submit(1, 'a')
+        self.wait_for(lambda: editor.get_stats()['failed'] == 1)
+        assert edits == [] and editor.get_stats()['failed'] == 1
+        assert editor.get_stats()['pending'] == 1, 'Failed edit should be kept to try again'
+
+        fail.clear()
+        editor.flush()
+        assert edits == [ ( 1, 'a' ) ]
+
+        fail.set()
+        editor.submit(1, 'b')
+        editor.flush()
+        editor.submit(1, 'c')
+
+        fail.clear()
+        editor.flush()
+        assert edits == [ ( 1, 'a' ), ( 1, 'c' ) ]
+        assert editor.get_stats()['failed'] == 2
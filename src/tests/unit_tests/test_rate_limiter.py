@@ -0,0 +1,125 @@
+import time
+import logging
+import threading
+
+from core.RateLimiter import RateLimiter
+
+
+
+class TestRateLimiter:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    @staticmethod
+    def new_limiter(**kwargs) -> RateLimiter:
+        settings = dict(rate_max=20.0, rate_min=1.0, burst=2, increase=1.0, decrease=0.5)
+        settings.update(kwargs)
+
+        return type(RateLimiter)(**settings)
+
+
+    def test_burst_then_rate(self):
+        """
+        Tests that the bucket allows `burst` requests back to back and then paces requests at the rate
+        """
+        limiter = self.new_limiter()
+
+        time_start = time.monotonic()
+        for _ in range(2):
+            limiter.acquire(RateLimiter.PRIORITY_LOOKUP)
+        assert time.monotonic() - time_start < 0.02, 'Burst requests should not wait'
+
+        time_start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire(RateLimiter.PRIORITY_LOOKUP)
+
+        # 4 more tokens at 20 req/s take ~0.2s to refill
+        time_taken = time.monotonic() - time_start
+        assert 0.15 < time_taken < 0.4, f'Unexpected time taken | time_taken = {time_taken}'
+
+
+    def test_aimd(self):
+        """
+        Tests that 429 responses halve the rate down to the minimum and other responses increase it back up to the maximum
+        """
+        limiter = self.new_limiter(rate_max=8.0)
+
+        limiter.update(429)
+        assert limiter.get_rate() == 4.0
+
+        for _ in range(10):
+            limiter.update(429)
+        assert limiter.get_rate() == 1.0, 'Rate should not go below minimum'
+
+        limiter.update(200)
+        assert limiter.get_rate() == 2.0
+
+        for _ in range(10):
+            limiter.update(404)
+        assert limiter.get_rate() == 8.0, 'Rate should not go above maximum'
+
+
+    def test_retry_after(self):
+        """
+        Tests that a `Retry-After` header holds off all requests until it expires
+        """
+        limiter = self.new_limiter()
+        limiter.update(429, '0.3')
+
+        time_start = time.monotonic()
+        limiter.acquire(RateLimiter.PRIORITY_MONITOR)
+
+        time_taken = time.monotonic() - time_start
+        assert time_taken >= 0.25, f'Request should have waited for Retry-After | time_taken = {time_taken}'
+
+
+    def test_priority(self):
+        """
+        Tests that when requests are waiting on tokens, higher priority ones are let through first
+        """
+        limiter = self.new_limiter(rate_max=10.0, burst=1)
+        limiter.acquire(RateLimiter.PRIORITY_LOOKUP)
+
+        order = []
+        order_lock = threading.Lock()
+
+        def request(priority: int):
+            limiter.acquire(priority)
+            with order_lock:
+                order.append(priority)
+
+        # The lookup starts waiting first, but the monitor request should still go first
+        threads = [ threading.Thread(target=request, args=( RateLimiter.PRIORITY_LOOKUP, )) ]
+        threads[0].start()
+        time.sleep(0.02)
+
+        threads.append(threading.Thread(target=request, args=( RateLimiter.PRIORITY_MONITOR, )))
+        threads[1].start()
+
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == [ RateLimiter.PRIORITY_MONITOR, RateLimiter.PRIORITY_LOOKUP ], f'Unexpected order | order = {order}'
+
+
+    def test_stats(self):
+        """
+        Tests that requests and rate limits are counted per priority class
+        """
+        limiter = self.new_limiter(burst=5)
+
+        limiter.acquire(RateLimiter.PRIORITY_MONITOR)
+        limiter.acquire(RateLimiter.PRIORITY_MONITOR)
+        limiter.update(429, priority=RateLimiter.PRIORITY_MONITOR)
+        limiter.acquire(RateLimiter.PRIORITY_EDIT)
+
+        stats = limiter.get_stats()
+        assert stats['classes']['monitor']['requests']     == 2
+        assert stats['classes']['monitor']['rate_limited'] == 1
+        assert stats['classes']['edit']['requests']        == 1
+        assert stats['classes']['lookup']['requests']      == 0
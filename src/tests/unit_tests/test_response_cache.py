@@ -0,0 +1,208 @@
+import logging
+import threading
+import http.server
+
+import requests
+
+from core.ResponseCache import ResponseCache
+from core.SessionMgrBase import SessionMgrBase
+
+
+class TopicPageHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the test forum page with an ETag, answering 304 when the client already has it
+    """
+
+    page = b''
+    etag = '"v1"'
+
+    # Called with the path of conditional requests before they are answered
+    on_conditional = None
+
+    def do_GET(self):
+        if self.path == '/no-validators':
+            self.send_page(self.page, with_etag=False)
+            return
+
+        if 'If-None-Match' in self.headers and TopicPageHandler.on_conditional is not None:
+            TopicPageHandler.on_conditional(self.path)
+
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+
+        self.send_page(self.page)
+
+
+    def send_page(self, body: bytes, with_etag: bool = True):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if with_etag:
+            self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def log_message(self, format, *args):
+        pass
+
+
+
+class TestResponseCache:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+        with open('src/tests/unit_tests/forum_test_page.htm', 'rb') as test_forum_page:
+            TopicPageHandler.page = test_forum_page.read()
+
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), TopicPageHandler)
+        cls.url    = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+    @staticmethod
+    def make_response(url: str, status_code: int, body: bytes = b'', headers: dict = {}) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response.url         = url
+        response.encoding    = 'utf-8'
+        response.headers.update(headers)
+        response._content    = body
+        return response
+
+
+    def test_revalidate(self):
+        """
+        Tests that a page with validators is stored, revalidated with them, and served from the cache on 304
+        """
+        cache = ResponseCache(max_entries=4, max_bytes=1024*1024, ttl=60)
+        url   = 'https://osu.ppy.sh/community/forums/topics/1'
+
+        assert cache.get_request_headers(url, time_now=0) == {}
+
+        cache.update(url, self.make_response(url, 200, b'page', { 'ETag' : '"a"', 'Last-Modified' : 'Sun, 09 Jul 2023 00:41:56 GMT' }), time_now=0)
+        assert cache.get_request_headers(url, time_now=1) == { 'If-None-Match' : '"a"', 'If-Modified-Since' : 'Sun, 09 Jul 2023 00:41:56 GMT' }
+
+        response = cache.update(url, self.make_response(url, 304), time_now=1)
+        assert response.status_code == 200
+        assert response.content == b'page'
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1 and stats['bytes_saved'] == 4, f'Unexpected stats | stats = {stats}'
+
+
+    def test_no_validators(self):
+        """
+        Tests that pages without validators and error pages are not stored
+        """
+        cache = ResponseCache(max_entries=4, max_bytes=1024*1024, ttl=60)
+
+        cache.update('a', self.make_response('a', 200, b'page'), time_now=0)
+        cache.update('b', self.make_response('b', 404, b'page', { 'ETag' : '"b"' }), time_now=0)
+        assert len(cache) == 0
+        assert cache.get_stats()['misses'] == 0, 'Pages that could not be revalidated should not count as misses'
+
+
+    def test_eviction(self):
+        """
+        Tests that pages are evicted least recently used first by count and size, and once they expire
+        """
+        cache = ResponseCache(max_entries=2, max_bytes=1024*1024, ttl=60)
+
+        for url in [ 'a', 'b' ]:
+            cache.update(url, self.make_response(url, 200, b'page', { 'ETag' : '"1"' }), time_now=0)
+
+        cache.update('a', self.make_response('a', 304), time_now=1)  # "a" is now the most recently used
+        cache.update('c', self.make_response('c', 200, b'page', { 'ETag' : '"1"' }), time_now=2)
+
+        assert cache.get_request_headers('a', time_now=2) != {}
+        assert cache.get_request_headers('b', time_now=2) == {}
+        assert cache.get_request_headers('c', time_now=2) != {}
+
+        assert cache.get_request_headers('c', time_now=100) == {}
+        assert len(cache) == 0
+
+        cache = ResponseCache(max_entries=4, max_bytes=64, ttl=60)
+        cache.update('a', self.make_response('a', 200, bytes(range(256)), { 'ETag' : '"1"' }), time_now=0)
+        assert len(cache) == 0
+        assert cache.get_stats()['bytes'] == 0
+
+
+    def test_parsed_reuse(self):
+        """
+        Tests that a topic parsed from a cached page is reused when the server says the page did not change,
+        and that it is dropped when the page is downloaded again
+        """
+        session = SessionMgrBase()
+        url     = f'{self.url}/community/forums/topics/1790280'
+
+        page  = session.fetch_web_data(url, cache=True)
+        topic = session.parse_topic(page, url)
+        assert topic.id == 1790280
+
+        page = session.fetch_web_data(url, cache=True)
+        assert page.status_code == 200
+        assert session.parse_topic(page, url) is topic
+
+        stats = session.get_cache_stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1, f'Unexpected stats | stats = {stats}'
+        assert stats['bytes_saved'] == len(TopicPageHandler.page)
+        assert stats['bytes'] < len(TopicPageHandler.page)
+
+        TopicPageHandler.etag = '"v2"'
+        try:
+            page = session.fetch_web_data(url, cache=True)
+            assert session.parse_topic(page, url) is not topic
+        finally:
+            TopicPageHandler.etag = '"v1"'
+
+
+    def test_not_modified_evicted(self):
+        """
+        Tests that a 304 for a page dropped from the cache while it was being revalidated is fetched again
+        without conditional headers
+        """
+        session = SessionMgrBase()
+        cache   = session._SessionMgrBase__cache
+        url     = f'{self.url}/community/forums/topics/1790280'
+
+        session.fetch_web_data(url, cache=True)
+
+        TopicPageHandler.on_conditional = lambda path: cache.update(url, self.make_response(url, 404))
+        try:
+            page = session.fetch_web_data(url, cache=True)
+        finally:
+            TopicPageHandler.on_conditional = None
+
+        assert page.status_code == 200
+        assert page.content == TopicPageHandler.page
+
+        stats = session.get_cache_stats()
+        assert stats['entries'] == 1 and stats['hits'] == 0, f'Unexpected stats | stats = {stats}'
+
+
+    def test_no_cache(self):
+        """
+        Tests that requests made without `cache` are not cached
+        """
+        session = SessionMgrBase()
+        url     = f'{self.url}/community/forums/topics/1790280'
+
+        session.fetch_web_data(url)
+        session.fetch_web_data(f'{self.url}/no-validators', cache=True)
+
+        stats = session.get_cache_stats()
+        assert stats['entries'] == 0 and stats['hits'] == 0 and stats['misses'] == 0, f'Unexpected stats | stats = {stats}'
@@ -0,0 +1,52 @@
+import random
+import logging
+
+from tinydb import table
+
+from bots.ThreadNecroBotCore import TopScores
+
+
+
+class TestTopScores:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def test_random(self):
+        """
+        Tests against keeping every entry in a dict and scanning it for the lowest score, the way the table used to be updated
+        """
+        random.seed(0)
+
+        top_scores = TopScores(10)
+        entries: dict[int, table.Document] = {}
+
+        for i in range(1000):
+            added_score = float(random.randint(0, 100))
+
+            if len(entries) < 10:
+                expected = len(entries)
+            else:
+                min_idx  = min(entries, key=lambda doc_id: ( float(entries[doc_id]['added_score']), doc_id ))
+                expected = None if added_score <= entries[min_idx]['added_score'] else min_idx
+
+            doc_id = top_scores.get_slot(added_score)
+            assert doc_id == expected, f'Wrong slot at step {i}'
+
+            if doc_id is None:
+                continue
+
+            entries[doc_id] = table.Document({ 'post_id' : i, 'added_score' : added_score }, doc_id=doc_id)
+            top_scores.put(entries[doc_id])
+
+            expected_sorted = sorted(entries.values(), key=lambda entry: ( -entry['added_score'], entry.doc_id ))
+            assert top_scores.get_sorted() == expected_sorted
+            assert [ entry.doc_id for entry in top_scores.get_sorted() ] == [ entry.doc_id for entry in expected_sorted ]
+
+        loaded = TopScores(10)
+        loaded.load(entries.values())
+        assert loaded.get_sorted() == top_scores.get_sorted()
@@ -0,0 +1,84 @@
+import logging
+
+from core.UnresolvedPosts import UnresolvedPosts
+
+
+
+class TestUnresolvedPosts:
+
+    __logger = logging.getLogger(__qualname__)
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def test_add_resolve(self):
+        """
+        Tests that ranges of post ids are tracked and resolved post ids are split out
+        """
+        unresolved = UnresolvedPosts(max_ids=100, max_attempts=3, retry_delay=10)
+        unresolved.add(10, 15, 0)
+
+        assert len(unresolved) == 5
+        assert 12 in unresolved and 15 not in unresolved
+
+        unresolved.resolve(12)
+
+        assert len(unresolved) == 4
+        assert 12 not in unresolved
+        assert unresolved.to_list() == [ [ 10, 12, 0, 10 ], [ 13, 15, 0, 10 ] ]
+
+
+    def test_due_backoff(self):
+        """
+        Tests that post ids only become due after the retry delay, which doubles with each retry,
+        and that they are dropped once they run out of retries
+        """
+        unresolved = UnresolvedPosts(max_ids=100, max_attempts=3, retry_delay=10)
+        unresolved.add(1, 3, 0)
+
+        assert unresolved.get_due(5)  == []
+        assert unresolved.get_due(10) == [ 1, 2 ]
+        assert unresolved.get_due(10, limit=1) == [ 1 ]
+
+        unresolved.retry_later([ 1, 2 ], 10)
+        assert unresolved.get_due(29) == []
+        assert unresolved.get_due(30) == [ 1, 2 ]
+
+        # Retried post ids with the same schedule are merged back together
+        assert unresolved.to_list() == [ [ 1, 3, 1, 30 ] ]
+
+        unresolved.retry_later([ 1, 2 ], 30)
+        assert unresolved.get_due(69) == []
+        assert unresolved.get_due(70) == [ 1, 2 ]
+
+        unresolved.retry_later([ 1, 2 ], 70)
+        assert len(unresolved) == 0, f'Post ids should have been dropped | unresolved = {unresolved.to_list()}'
+
+
+    def test_bounded(self):
+        """
+        Tests that the lowest post ids are dropped once too many are tracked
+        """
+        unresolved = UnresolvedPosts(max_ids=10, max_attempts=3, retry_delay=10)
+        unresolved.add(0, 4, 0)
+        unresolved.add(5, 10, 0)
+        unresolved.add(20, 24, 0)
+
+        assert len(unresolved) == 10
+        assert unresolved.to_list() == [ [ 3, 4, 0, 10 ], [ 5, 10, 0, 10 ], [ 20, 24, 0, 10 ] ]
+
+
+    def test_save_load(self):
+        """
+        Tests that tracked post ids survive a round trip through the db format
+        """
+        unresolved = UnresolvedPosts(max_ids=100, max_attempts=3, retry_delay=10)
+        unresolved.add(1, 3, 0)
+        unresolved.add(7, 8, 5)
+
+        loaded = UnresolvedPosts(max_ids=100, max_attempts=3, retry_delay=10)
+        loaded.from_list(unresolved.to_list())
+
+        assert loaded.to_list() == unresolved.to_list()
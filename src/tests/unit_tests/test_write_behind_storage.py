@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import shutil
+import logging
+
+import tinydb
+
+from misc.write_behind_storage import WriteBehindStorage
+
+
+
+class TestWriteBehindStorage:
+
+    __logger = logging.getLogger(__qualname__)
+
+    __DB_DIR = 'db/test_storage'
+
+    @classmethod
+    def setup_class(cls):
+        cls.__logger.setLevel(logging.DEBUG)
+
+
+    def setup_method(self, method):
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+        os.makedirs(self.__DB_DIR, exist_ok=True)
+
+
+    def teardown_method(self, method):
+        shutil.rmtree(self.__DB_DIR, ignore_errors=True)
+
+
+    def read_file(self, path: str) -> dict:
+        with open(path, 'r') as f:
+            contents = f.read()
+
+        return {} if contents == '' else json.loads(contents)
+
+
+    def test_write_behind(self):
+        """
+        Tests that writes are served from memory right away and reach the file only once flushed
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        db = tinydb.TinyDB(path, storage=WriteBehindStorage, flush_delay=60)
+
+        db.table('users').insert({ 'points' : 1.0 })
+        db.table('users').insert({ 'points' : 2.0 })
+
+        assert len(db.table('users')) == 2
+        assert self.read_file(path) == {}, 'Writes should not be on disk before the flush'
+
+        db.storage.flush()
+        assert len(self.read_file(path)['users']) == 2
+
+        db.table('users').insert({ 'points' : 3.0 })
+        db.close()
+        assert len(self.read_file(path)['users']) == 3, 'Closing should flush'
+
+
+    def test_flush_delay(self):
+        """
+        Tests that writes made within the flush delay are written out together after it
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        db = tinydb.TinyDB(path, storage=WriteBehindStorage, flush_delay=0.1)
+
+        for i in range(10):
+            db.table('users').insert({ 'points' : float(i) })
+
+        time.sleep(0.3)
+        assert len(self.read_file(path)['users']) == 10
+        assert not os.path.exists(f'{path}.tmp')
+
+        db.close()
+
+
+    def test_batch(self):
+        """
+        Tests that writes made in a batch are flushed together at the end of it, even without a flush delay
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        db = tinydb.TinyDB(path, storage=WriteBehindStorage, flush_delay=0)
+
+        with db.storage.batch():
+            db.table('scores').insert({ 'points' : 1.0 })
+            db.table('scores_monthly').insert({ 'points' : 1.0 })
+            assert self.read_file(path) == {}, 'Writes should not be on disk before the batch ends'
+
+        data = self.read_file(path)
+        assert len(data['scores']) == 1 and len(data['scores_monthly']) == 1
+
+        db.close()
+
+
+    def test_reload(self):
+        """
+        Tests that reloading drops writes that were not flushed, and that a batch left unflushed stays in memory
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        db = tinydb.TinyDB(path, storage=WriteBehindStorage, flush_delay=0)
+        db.table('users').insert({ 'points' : 1.0 })
+
+        with db.storage.batch(flush=False):
+            db.table('users').insert({ 'points' : 2.0 })
+
+        assert db.storage.dirty, 'Batch should not have been flushed'
+        assert len(self.read_file(path)['users']) == 1
+
+        db.storage.reload()
+        assert not db.storage.dirty
+        assert db.storage.read() == { 'users' : { '1' : { 'points' : 1.0 } } }
+
+        db.close()
+
+
+    def test_reopen(self):
+        """
+        Tests that a database reopened after closing has the same data
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        with tinydb.TinyDB(path, storage=WriteBehindStorage, flush_delay=0) as db:
+            db.table('users').insert({ 'points' : 1.0 })
+
+        with tinydb.TinyDB(path, storage=WriteBehindStorage) as db:
+            assert db.table('users').all() == [ { 'points' : 1.0 } ]
+
+
+    def test_recover_unrenamed(self):
+        """
+        Tests that a fully written temporary file left by a crash before the rename is used
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        with open(path, 'w') as f:
+            json.dump({ 'users' : { '1' : { 'points' : 1.0 } } }, f)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump({ 'users' : { '1' : { 'points' : 2.0 } } }, f)
+
+        with tinydb.TinyDB(path, storage=WriteBehindStorage) as db:
+            assert db.table('users').get(doc_id=1)['points'] == 2.0
+
+        assert not os.path.exists(f'{path}.tmp')
+        assert self.read_file(path)['users']['1']['points'] == 2.0
+
+
+    def test_recover_partial(self):
+        """
+        Tests that a partially written temporary file left by a crash during the write is discarded
+        """
+        path = f'{self.__DB_DIR}/db.json'
+        with open(path, 'w') as f:
+            json.dump({ 'users' : { '1' : { 'points' : 1.0 } } }, f)
+        with open(f'{path}.tmp', 'w') as f:
+            f.write('{"users": {"1": {"poi')
+
+        with tinydb.TinyDB(path, storage=WriteBehindStorage) as db:
+            assert db.table('users').get(doc_id=1)['points'] == 1.0
+
+        assert not os.path.exists(f'{path}.tmp')